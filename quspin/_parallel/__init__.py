@@ -0,0 +1,2 @@
+from .parallel_utils import num_threads,get_num_threads,set_num_threads
+from .parallel_utils import _numa_zeros,_numa_array,_numa_csr
@@ -0,0 +1,211 @@
+# cython: embedsignature=True
+# cython: language_level=2
+# distutils: language=c++
+import numpy as _np
+cimport numpy as _np
+from numpy cimport npy_intp
+from cython.parallel cimport prange
+from libc.string cimport memset,memcpy
+import scipy.sparse as _sp
+
+__all__ = ["get_num_threads","set_num_threads","num_threads"]
+
+
+cdef extern from "openmp.h":
+    int omp_get_max_threads() nogil
+    void omp_set_num_threads(int) nogil
+
+
+def get_num_threads():
+    """ Returns the number of OpenMP threads used by QuSpin's parallel kernels in the calling thread.
+
+    Returns
+    -------
+    int
+        number of threads, this is always 1 if QuSpin was not built with OpenMP.
+
+    Examples
+    --------
+
+    >>> n = get_num_threads()
+
+    """
+    return omp_get_max_threads()
+
+def set_num_threads(n_threads):
+    """ Sets the number of OpenMP threads used by QuSpin's parallel kernels in the calling thread.
+
+    The OpenMP thread count is a per-thread setting: calling this function from a python thread does not 
+    affect the kernels launched from other python threads or processes. Has no effect if QuSpin was not 
+    built with OpenMP.
+
+    Parameters
+    -----------
+    n_threads : int
+        number of threads to use, must be positive.
+
+    Examples
+    --------
+
+    >>> set_num_threads(4)
+
+    """
+    cdef int n = _check_num_threads(n_threads)
+    omp_set_num_threads(n)
+
+def _check_num_threads(n_threads):
+    try:
+        n = int(n_threads)
+    except (TypeError,ValueError):
+        raise TypeError("n_threads must be a positive integer.")
+
+    if n != n_threads or n < 1:
+        raise ValueError("n_threads must be a positive integer.")
+
+    return n
+
+
+class num_threads(object):
+    """ Context manager which limits the number of OpenMP threads used by QuSpin within a `with` block.
+
+    The previous thread count of the calling thread is restored upon exit. This can be used to nest 
+    process-level parallelism (e.g. `joblib`) with the thread-level parallelism of QuSpin's kernels 
+    without oversubscribing the cores of the machine.
+
+    Parameters
+    -----------
+    n_threads : int, None
+        number of threads to use inside the `with` block. If `None`, the thread count is not changed.
+
+    Examples
+    --------
+
+    >>> with num_threads(2):
+    >>>     v = H.dot(v0)
+
+    """
+    def __init__(self,n_threads):
+        if n_threads is not None:
+            n_threads = _check_num_threads(n_threads)
+
+        self._n_threads = n_threads
+        self._n_threads_old = []
+
+    def __enter__(self):
+        self._n_threads_old.append(omp_get_max_threads())
+        if self._n_threads is not None:
+            omp_set_num_threads(self._n_threads)
+
+        return self
+
+    def __exit__(self,exc_type,exc_value,traceback):
+        omp_set_num_threads(self._n_threads_old.pop())
+        return False
+
+
+# arrays smaller than this (in bytes) are allocated by numpy directly.
+cdef npy_intp MIN_FIRST_TOUCH = 1<<20
+
+cdef void first_touch(char * dst,const char * src,const npy_intp n_blocks,const npy_intp block_size,
+    const npy_intp * bounds,const int nthreads) nogil:
+    # thread t writes bytes [bounds[t],bounds[t+1]) of every block, using the same static thread partition 
+    # as the kernels which operate on the data so that the pages are placed on the memory of that thread.
+    cdef int t
+    cdef npy_intp b,begin,n
+
+    for t in prange(nthreads,schedule="static",chunksize=1,num_threads=nthreads):
+        begin = bounds[t]
+        n = bounds[t+1] - begin
+        for b in range(n_blocks):
+            if src == NULL:
+                memset(dst + b*block_size + begin,0,n)
+            else:
+                memcpy(dst + b*block_size + begin,src + b*block_size + begin,n)
+
+
+cdef _first_touch_array(_np.ndarray out,_np.ndarray src,object bounds):
+    cdef int nthreads = omp_get_max_threads()
+    cdef npy_intp n_blocks = 1
+    cdef npy_intp block_size = out.nbytes
+    cdef npy_intp itemsize = out.itemsize
+    cdef _np.ndarray[npy_intp,ndim=1] byte_bounds
+    cdef char * src_ptr = NULL
+
+    if out.ndim > 1 and not out.flags["C_CONTIGUOUS"]: # fortran ordered: split every column.
+        n_blocks = out.size // out.shape[0]
+        block_size = out.shape[0] * itemsize
+
+    if bounds is None:
+        bounds = (_np.arange(nthreads+1,dtype=_np.intp)*(block_size//itemsize))//nthreads
+    else:
+        nthreads = len(bounds) - 1
+
+    byte_bounds = _np.ascontiguousarray(bounds,dtype=_np.intp)*itemsize
+
+    if src is not None:
+        src_ptr = <char*>_np.PyArray_DATA(src)
+
+    with nogil:
+        first_touch(<char*>_np.PyArray_DATA(out),src_ptr,n_blocks,block_size,&byte_bounds[0],nthreads)
+
+
+def _numa_zeros(shape,dtype=_np.float64,order="C"):
+    """ Allocates an array of zeros which is first-touched by the OpenMP threads.
+
+    On NUMA machines the memory pages of an array are placed on the socket of the thread which writes to them 
+    first. `numpy.zeros` leaves this to the (single) thread which later fills the array, while this function 
+    zeros the array with the same static partition of the rows which the parallel kernels use. Small arrays, 
+    or builds without OpenMP, fall back to `numpy.zeros`.
+
+    """
+    cdef _np.ndarray out
+    cdef npy_intp nbytes = _np.dtype(dtype).itemsize * _np.prod(shape,dtype=_np.intp)
+
+    if omp_get_max_threads() == 1 or nbytes < MIN_FIRST_TOUCH:
+        return _np.zeros(shape,dtype=dtype,order=order)
+
+    out = _np.empty(shape,dtype=dtype,order=order)
+    _first_touch_array(out,None,None)
+    return out
+
+def _numa_array(a,dtype=None,order="C"):
+    """ Copies `a` into an array which is first-touched by the OpenMP threads, see `_numa_zeros`. """
+    cdef _np.ndarray src = _np.asarray(a)
+    cdef _np.ndarray out
+
+    if dtype is None:
+        dtype = src.dtype
+
+    if src.dtype == _np.dtype(dtype) and src.flags[order+"_CONTIGUOUS"] and src.ndim <= 2:
+        out = _np.empty(src.shape,dtype=dtype,order=order)
+        if omp_get_max_threads() == 1 or out.nbytes < MIN_FIRST_TOUCH:
+            out[...] = src
+        else:
+            _first_touch_array(out,src,None)
+    else:
+        out = _numa_zeros(src.shape,dtype=dtype,order=order)
+        out[...] = src
+
+    return out
+
+def _numa_csr(A):
+    """ Copies the arrays of a csr matrix such that the entries of every row are first-touched by the thread 
+    which processes that row in the parallel csr kernels, see `_numa_zeros`. Other matrices are returned as is.
+
+    """
+    cdef int nthreads = omp_get_max_threads()
+    cdef _np.ndarray indptr,row_bounds,nnz_bounds
+
+    if not _sp.isspmatrix_csr(A) or nthreads == 1 or A.data.nbytes < MIN_FIRST_TOUCH:
+        return A
+
+    indptr = _numa_array(A.indptr)
+    row_bounds = (_np.arange(nthreads+1,dtype=_np.intp)*A.shape[0])//nthreads
+    nnz_bounds = indptr[row_bounds].astype(_np.intp)
+
+    indices = _np.empty_like(A.indices)
+    data = _np.empty_like(A.data)
+    _first_touch_array(indices,_np.ascontiguousarray(A.indices),nnz_bounds)
+    _first_touch_array(data,_np.ascontiguousarray(A.data),nnz_bounds)
+
+    return _sp.csr_matrix((data,indices,indptr),shape=A.shape,copy=False)
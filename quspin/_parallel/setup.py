@@ -0,0 +1,51 @@
+def get_include_dirs():
+	import numpy,os
+
+	package_dir = os.path.dirname(os.path.realpath(__file__))
+	package_dir = os.path.expandvars(package_dir)
+
+	include_dirs = [numpy.get_include()]
+	include_dirs.append(os.path.join(package_dir,"source"))
+
+	return include_dirs
+
+
+def cython_files():
+	import os
+	from Cython.Build import cythonize
+
+	package_dir = os.path.dirname(os.path.realpath(__file__))
+	package_dir = os.path.expandvars(package_dir)
+
+	cython_src = [
+					os.path.join(package_dir,"parallel_utils.pyx"),
+				]
+	cythonize(cython_src,include_path=get_include_dirs())
+
+
+
+def configuration(parent_package='',top_path=None):
+	from numpy.distutils.misc_util import Configuration
+	import os,sys
+	config = Configuration('_parallel', parent_package, top_path)
+
+	cython_files()
+
+	package_dir = os.path.dirname(os.path.realpath(__file__))
+	package_dir = os.path.expandvars(package_dir)
+	extra_compile_args=["-fno-strict-aliasing"]
+	extra_link_args=[]  
+	  
+	if sys.platform == "darwin":
+		extra_compile_args.append("-std=c++11")
+
+	depends = [os.path.join(package_dir,"source","openmp.h")]
+	parallel_utils_src = os.path.join(package_dir,"parallel_utils.cpp")	
+	config.add_extension('parallel_utils',sources=parallel_utils_src,include_dirs=get_include_dirs(),
+							language="c++",depends=depends,extra_compile_args=extra_compile_args,extra_link_args=extra_link_args)
+
+	return config
+
+if __name__ == '__main__':
+	from numpy.distutils.core import setup
+	setup(**configuration(top_path='').todict())
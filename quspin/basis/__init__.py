@@ -74,6 +74,7 @@ a) custom large integer data types supported in general basis
 .. autosummary::
    :toctree: generated/
 
+   uint128
    uint256
    uint1024
    uint4096
@@ -2,6 +2,7 @@ from __future__ import print_function
 import numpy as _np
 import scipy.sparse as _sp
 import warnings,numba
+from .._parallel import num_threads as _num_threads
 
 
 @numba.njit
@@ -120,7 +121,39 @@ class basis(object):
 
 		_coo_dot(v_in.reshape((self.Ns,-1)),v_out.reshape((self.Ns,-1)),row,col,ME)
 
-		return v_out			
+		return v_out
+
+	def _make_csr(self,op_list,dtype):
+		""" default version for all basis classes which works so long as _Op is implemented.
+
+		Builds the csr matrix of the sum of all terms (opstr,indx,J) in `op_list`. The matrix elements of all
+		terms are collected into one coordinate format buffer which is converted to csr in a single step.
+		"""
+		ME_list = []
+		row_list = []
+		col_list = []
+		for opstr,indx,J in op_list:
+			ME,row,col = self.Op(opstr,indx,J,dtype)
+			ME_list.append(ME)
+			row_list.append(row)
+			col_list.append(col)
+
+		if ME_list:
+			ME = _np.concatenate(ME_list)
+			row = _np.concatenate(row_list)
+			col = _np.concatenate(col_list)
+		else:
+			ME = _np.array([],dtype=dtype)
+			row = _np.array([],dtype=_np.int32)
+			col = _np.array([],dtype=_np.int32)
+
+		del ME_list,row_list,col_list
+
+		H = _sp.coo_matrix((ME,(row,col)),shape=(self.Ns,self.Ns),dtype=dtype).tocsr()
+		H.sum_duplicates()
+		H.eliminate_zeros()
+
+		return H
 
 	def inplace_Op(self,v_in,opstr,indx,J,dtype,transposed=False,conjugated=False,v_out=None):
 		"""Calculates the action of an operator on a state.
@@ -172,7 +205,7 @@ class basis(object):
 		"""
 		return self._inplace_Op(v_in,opstr,indx,J,dtype,transposed=transposed,conjugated=conjugated,v_out=v_out)
 
-	def Op(self,opstr,indx,J,dtype):
+	def Op(self,opstr,indx,J,dtype,n_threads=None):
 		"""Constructs operator from a site-coupling list and an operator string in a lattice basis.
 
 		Parameters
@@ -189,6 +222,9 @@ class basis(object):
 			Coupling strength.
 		dtype : 'type'
 			Data type (e.g. numpy.float64) to construct the operator with.
+		n_threads : int, optional
+			Number of OpenMP threads used to construct the operator, see `quspin.tools.misc.num_threads`. Default 
+			is `None`, which uses the current thread count of the calling thread.
 
 		Returns
 		--------
@@ -210,6 +246,10 @@ class basis(object):
 		>>> ME, row, col = Op(opstr,indx,J,dtype)
 
 		"""
+		if n_threads is not None:
+			with _num_threads(n_threads):
+				return self._Op(opstr,indx,J,dtype)
+
 		return self._Op(opstr,indx,J,dtype)
 
 
@@ -4,9 +4,9 @@ from .fermion import spinless_fermion_basis_general,spinful_fermion_basis_genera
 from ._basis_general_core import (bitwise_not,bitwise_and,bitwise_or,bitwise_xor,
 						bitwise_leftshift,bitwise_rightshift,basis_zeros,basis_ones,
 						python_int_to_basis_int, basis_int_to_python_int,get_basis_type,
-						uint32,uint64,uint256,uint1024,uint4096,uint16384)
+						uint32,uint64,uint128,uint256,uint1024,uint4096,uint16384)
 __all__=["spin_basis_general","boson_basis_general",
  			"spinless_fermion_basis_general","spinful_fermion_basis_general",
  			"bitwise_not","bitwise_and","bitwise_or","bitwise_xor","bitwise_leftshift","bitwise_rightshift",
  			"basis_zeros","basis_ones","get_basis_type","python_int_to_basis_int", "basis_int_to_python_int",
- 			"get_basis_type","uint32","uint64","uint256","uint1024","uint4096","uint16384"]
\ No newline at end of file
+ 			"get_basis_type","uint32","uint64","uint128","uint256","uint1024","uint4096","uint16384"]
\ No newline at end of file
@@ -6,13 +6,14 @@ import numpy as _np
 cimport numpy as _np
 from numpy cimport npy_intp
 
-__all__ = ["uint32","uint64","uint256","uint1024","uint4096","uint16384",
+__all__ = ["uint32","uint64","uint128","uint256","uint1024","uint4096","uint16384",
             "basis_int_to_python_int","python_int_to_basis_int","basis_zeros",
             "basis_ones","get_basis_type","bitwise_not","bitwise_and","bitwise_or",
             "bitwise_xor","bitwise_leftshift","bitwise_rightshift"]
 
 uint32 = _np.uint32
 uint64 = _np.uint64
+uint128 = _np.dtype((_np.void,sizeof(uint128_t)))
 uint256 = _np.dtype((_np.void,sizeof(uint256_t)))
 uint1024 = _np.dtype((_np.void,sizeof(uint1024_t)))
 uint4096 = _np.dtype((_np.void,sizeof(uint4096_t)))
@@ -64,6 +65,8 @@ def basis_int_to_python_int(basis_int):
         return basis_to_python[uint32_t](<uint32_t*>ptr)
     elif basis_int_wrapper.dtype == uint64:
         return basis_to_python[uint64_t](<uint64_t*>ptr)
+    elif basis_int_wrapper.dtype == uint128:
+        return basis_to_python[uint128_t](<uint128_t*>ptr)
     elif basis_int_wrapper.dtype == uint256:
         return basis_to_python[uint256_t](<uint256_t*>ptr)
     elif basis_int_wrapper.dtype == uint1024:
@@ -87,7 +90,7 @@ def python_int_to_basis_int(python_int,dtype=None):
     python_int : int
         integer to be converted
     dtype : dtype, optional
-        data type used to represent the python integer:  `uint32`,`uint64`,`uint256`,`uint1024`,`uint4096`,`uint16384` or `numpy.object`
+        data type used to represent the python integer:  `uint32`,`uint64`,`uint128`,`uint256`,`uint1024`,`uint4096`,`uint16384` or `numpy.object`
 
     Returns
     -------
@@ -116,6 +119,8 @@ def python_int_to_basis_int(python_int,dtype=None):
             dtype = uint32
         elif nbits <= 64:
             dtype = uint64
+        elif nbits <= 128:
+            dtype = uint128
         elif nbits <= 256:
             dtype = uint256
         elif nbits <= 1024:
@@ -142,6 +147,11 @@ def python_int_to_basis_int(python_int,dtype=None):
             raise ValueError("python integer too large for bassis type uint64.")
         python_to_basis_inplace[uint64_t](python_int,<uint64_t*>ptr)
 
+    elif dtype == uint128:
+        if nbits > 128:
+            raise ValueError("python integer too large for bassis type uint128.")
+        python_to_basis_inplace[uint128_t](python_int,<uint128_t*>ptr)
+
     elif dtype == uint256:
         if nbits > 256:
             raise ValueError("python integer too large for bassis type uint256.")
@@ -192,6 +202,8 @@ def _get_basis_index(_np.ndarray basis,object val):
         i = search_array[uint32_t](<uint32_t*>ptr,n,value)
     elif basis.dtype == uint64:
         i = search_array[uint64_t](<uint64_t*>ptr,n,value)
+    elif basis.dtype == uint128:
+        i = search_array[uint128_t](<uint128_t*>ptr,n,value)
     elif basis.dtype == uint256:
         i = search_array[uint256_t](<uint256_t*>ptr,n,value)
     elif basis.dtype == uint1024:
@@ -212,8 +224,6 @@ def _get_basis_index(_np.ndarray basis,object val):
 #################################
 
 
-
-
 def basis_zeros(shape,dtype=uint32):
     """ Allocates initialized array using the QuSpin basis integers.
 
@@ -225,7 +235,7 @@ def basis_zeros(shape,dtype=uint32):
     shape : tuple
         shape of the numpy array.
     dtype : numpy.dtype, optional
-        numpy dtype used to create the array, one can use QuSpin defined dtypes here: `uint32`,`uint64`,`uint256`,`uint1024`,`uint4096`, or `uint16384`.
+        numpy dtype used to create the array, one can use QuSpin defined dtypes here: `uint32`,`uint64`,`uint128`,`uint256`,`uint1024`,`uint4096`, or `uint16384`.
 
 
     Returns
@@ -239,7 +249,7 @@ def basis_zeros(shape,dtype=uint32):
     >>> a = basis_zeros((100,))  
 
     """
-    if dtype not in [uint32,uint64,uint256,uint1024,uint4096,uint16384]:
+    if dtype not in [uint32,uint64,uint128,uint256,uint1024,uint4096,uint16384]:
         raise TypeError("dtype must be one of the possible dtypes used as the representatives for the general basis class.")
 
     cdef _np.ndarray array = _np.zeros(shape,dtype=dtype)
@@ -254,6 +264,9 @@ def basis_zeros(shape,dtype=uint32):
     elif array.dtype == uint64:
         with nogil:
             set_zeros[uint64_t](<uint64_t*>ptr,N)
+    elif array.dtype == uint128:
+        with nogil:
+            set_zeros[uint128_t](<uint128_t*>ptr,N)
     elif array.dtype == uint256:
         with nogil:
             set_zeros[uint256_t](<uint256_t*>ptr,N)
@@ -281,7 +294,7 @@ def basis_ones(shape,dtype=uint32):
     shape : tuple
         shape of the numpy array.
     dtype : numpy.dtype, optional
-        numpy dtype used to create the array, one can use QuSpin defined dtypes here: `uint32`,`uint64`,`uint256`,`uint1024`,`uint4096`, or `uint16384`.
+        numpy dtype used to create the array, one can use QuSpin defined dtypes here: `uint32`,`uint64`,`uint128`,`uint256`,`uint1024`,`uint4096`, or `uint16384`.
 
 
     Returns
@@ -295,7 +308,7 @@ def basis_ones(shape,dtype=uint32):
     >>> a = basis_ones((100,))  
 
     """
-    if dtype not in [uint32,uint64,uint256,uint1024,uint4096,uint16384]:
+    if dtype not in [uint32,uint64,uint128,uint256,uint1024,uint4096,uint16384]:
         raise TypeError("dtype must be one of the possible dtypes used as the representatives for the general basis class.")
 
     cdef _np.ndarray array = _np.zeros(shape,dtype=dtype)
@@ -310,6 +323,9 @@ def basis_ones(shape,dtype=uint32):
     elif array.dtype == uint64:
         with nogil:
             set_ones[uint64_t](<uint64_t*>ptr,N)
+    elif array.dtype == uint128:
+        with nogil:
+            set_ones[uint128_t](<uint128_t*>ptr,N)
     elif array.dtype == uint256:
         with nogil:
             set_ones[uint256_t](<uint256_t*>ptr,N)
@@ -343,7 +359,7 @@ def get_basis_type(N, Np, sps):
     Returns
     -------
     numpy.dtype object
-        the appropriate dtype size to represent the system. will be one of:  `uint32`,`uint64`,`uint256`,`uint1024`,`uint4096`, or `uint16384`.
+        the appropriate dtype size to represent the system. will be one of:  `uint32`,`uint64`,`uint128`,`uint256`,`uint1024`,`uint4096`, or `uint16384`.
 
     Examples
     --------
@@ -391,6 +407,8 @@ def get_basis_type(N, Np, sps):
         return uint32
     elif nbits <= 64:
         return uint64
+    elif nbits <= 128:
+        return uint128
     elif nbits <= 256:
         return uint256
     elif nbits <= 1024:
@@ -468,7 +486,7 @@ def bitwise_not(x, out=None, where=None):
     if x.ndim!=1:
         raise TypeError("x must be a 1d array.")
     
-    if x.dtype not in [uint32,uint64,uint256,uint1024,uint4096,uint16384]:
+    if x.dtype not in [uint32,uint64,uint128,uint256,uint1024,uint4096,uint16384]:
         raise TypeError("dtype must be one of the possible dtypes used as the representatives for the general basis class.")
 
     if out is None:
@@ -477,7 +495,7 @@ def bitwise_not(x, out=None, where=None):
         if out.shape!=x.shape:
             raise TypeError("expecting same shape for out and x arrays.")
 
-        if out.dtype not in [uint32,uint64,uint256,uint1024,uint4096,uint16384]:
+        if out.dtype not in [uint32,uint64,uint128,uint256,uint1024,uint4096,uint16384]:
            raise TypeError("unsupported dtype for variable out. Expecting array of unsigned integers.")
 
     py_array_out = out
@@ -495,6 +513,8 @@ def bitwise_not(x, out=None, where=None):
         bitwise_not_op_core(<uint32_t*>x_ptr, where_ptr, <uint32_t*>out_ptr, Ns)
     elif x.dtype == uint64:
         bitwise_not_op_core(<uint64_t*>x_ptr, where_ptr, <uint64_t*>out_ptr, Ns)
+    elif x.dtype == uint128:
+        bitwise_not_op_core(<uint128_t*>x_ptr, where_ptr, <uint128_t*>out_ptr, Ns)
     elif x.dtype == uint256:
         bitwise_not_op_core(<uint256_t*>x_ptr, where_ptr, <uint256_t*>out_ptr, Ns)
     elif x.dtype == uint1024:
@@ -584,9 +604,9 @@ def bitwise_and(x1, x2, out=None, where=None):
         raise TypeError("x2 must be a 1d array.")
 
     
-    if x1.dtype not in [uint32,uint64,uint256,uint1024,uint4096,uint16384]:
+    if x1.dtype not in [uint32,uint64,uint128,uint256,uint1024,uint4096,uint16384]:
         raise TypeError("dtype must be one of the possible dtypes used as the representatives for the general basis class.")
-    if x2.dtype not in [uint32,uint64,uint256,uint1024,uint4096,uint16384]:
+    if x2.dtype not in [uint32,uint64,uint128,uint256,uint1024,uint4096,uint16384]:
         raise TypeError("dtype must be one of the possible dtypes used as the representatives for the general basis class.")
 
     if out is None:
@@ -595,7 +615,7 @@ def bitwise_and(x1, x2, out=None, where=None):
         if out.shape!=x1.shape:
             raise TypeError("expecting same shape for out and x1 arrays.")
 
-        if out.dtype not in [uint32,uint64,uint256,uint1024,uint4096,uint16384]:
+        if out.dtype not in [uint32,uint64,uint128,uint256,uint1024,uint4096,uint16384]:
            raise TypeError("unsupported dtype for variable out. Expecting array of unsigned integers.")
 
     py_array_out = out
@@ -612,6 +632,8 @@ def bitwise_and(x1, x2, out=None, where=None):
         bitwise_and_op_core(<uint32_t*>x1_ptr, <uint32_t*>x2_ptr, where_ptr, <uint32_t*>out_ptr, Ns)
     elif x1.dtype == uint64:
         bitwise_and_op_core(<uint64_t*>x1_ptr, <uint64_t*>x2_ptr, where_ptr, <uint64_t*>out_ptr, Ns )
+    elif x1.dtype == uint128:
+        bitwise_and_op_core(<uint128_t*>x1_ptr, <uint128_t*>x2_ptr, where_ptr, <uint128_t*>out_ptr, Ns )
     elif x1.dtype == uint256:
         bitwise_and_op_core(<uint256_t*>x1_ptr, <uint256_t*>x2_ptr, where_ptr, <uint256_t*>out_ptr, Ns )
     elif x1.dtype == uint1024:
@@ -701,9 +723,9 @@ def bitwise_or(x1, x2, out=None, where=None):
         raise TypeError("x2 must be a 1d array.")
 
     
-    if x1.dtype not in [uint32,uint64,uint256,uint1024,uint4096,uint16384]:
+    if x1.dtype not in [uint32,uint64,uint128,uint256,uint1024,uint4096,uint16384]:
         raise TypeError("dtype must be one of the possible dtypes used as the representatives for the general basis class.")
-    if x2.dtype not in [uint32,uint64,uint256,uint1024,uint4096,uint16384]:
+    if x2.dtype not in [uint32,uint64,uint128,uint256,uint1024,uint4096,uint16384]:
         raise TypeError("dtype must be one of the possible dtypes used as the representatives for the general basis class.")
 
     if out is None:
@@ -712,7 +734,7 @@ def bitwise_or(x1, x2, out=None, where=None):
         if out.shape!=x1.shape:
             raise TypeError("expecting same shape for out and x1 arrays.")
 
-        if out.dtype not in [uint32,uint64,uint256,uint1024,uint4096,uint16384]:
+        if out.dtype not in [uint32,uint64,uint128,uint256,uint1024,uint4096,uint16384]:
            raise TypeError("unsupported dtype for variable out. Expecting array of unsigned integers.")
 
     py_array_out = out
@@ -729,6 +751,8 @@ def bitwise_or(x1, x2, out=None, where=None):
         bitwise_or_op_core(<uint32_t*>x1_ptr, <uint32_t*>x2_ptr, where_ptr, <uint32_t*>out_ptr, Ns)
     elif x1.dtype == uint64:
         bitwise_or_op_core(<uint64_t*>x1_ptr, <uint64_t*>x2_ptr, where_ptr, <uint64_t*>out_ptr, Ns )
+    elif x1.dtype == uint128:
+        bitwise_or_op_core(<uint128_t*>x1_ptr, <uint128_t*>x2_ptr, where_ptr, <uint128_t*>out_ptr, Ns )
     elif x1.dtype == uint256:
         bitwise_or_op_core(<uint256_t*>x1_ptr, <uint256_t*>x2_ptr, where_ptr, <uint256_t*>out_ptr, Ns )
     elif x1.dtype == uint1024:
@@ -818,9 +842,9 @@ def bitwise_xor(x1, x2, out=None, where=None):
         raise TypeError("x2 must be a 1d array.")
 
     
-    if x1.dtype not in [uint32,uint64,uint256,uint1024,uint4096,uint16384]:
+    if x1.dtype not in [uint32,uint64,uint128,uint256,uint1024,uint4096,uint16384]:
         raise TypeError("dtype must be one of the possible dtypes used as the representatives for the general basis class.")
-    if x2.dtype not in [uint32,uint64,uint256,uint1024,uint4096,uint16384]:
+    if x2.dtype not in [uint32,uint64,uint128,uint256,uint1024,uint4096,uint16384]:
         raise TypeError("dtype must be one of the possible dtypes used as the representatives for the general basis class.")
 
     if out is None:
@@ -829,7 +853,7 @@ def bitwise_xor(x1, x2, out=None, where=None):
         if out.shape!=x1.shape:
             raise TypeError("expecting same shape for out and x1 arrays.")
 
-        if out.dtype not in [uint32,uint64,uint256,uint1024,uint4096,uint16384]:
+        if out.dtype not in [uint32,uint64,uint128,uint256,uint1024,uint4096,uint16384]:
            raise TypeError("unsupported dtype for variable out. Expecting array of unsigned integers.")
 
     py_array_out = out
@@ -846,6 +870,8 @@ def bitwise_xor(x1, x2, out=None, where=None):
         bitwise_xor_op_core(<uint32_t*>x1_ptr, <uint32_t*>x2_ptr, where_ptr, <uint32_t*>out_ptr, Ns)
     elif x1.dtype == uint64:
         bitwise_xor_op_core(<uint64_t*>x1_ptr, <uint64_t*>x2_ptr, where_ptr, <uint64_t*>out_ptr, Ns )
+    elif x1.dtype == uint128:
+        bitwise_xor_op_core(<uint128_t*>x1_ptr, <uint128_t*>x2_ptr, where_ptr, <uint128_t*>out_ptr, Ns )
     elif x1.dtype == uint256:
         bitwise_xor_op_core(<uint256_t*>x1_ptr, <uint256_t*>x2_ptr, where_ptr, <uint256_t*>out_ptr, Ns )
     elif x1.dtype == uint1024:
@@ -976,7 +1002,7 @@ def _bitwise_left_shift(x1, shift_type[:] x2, out=None, where=None):
     if x1.ndim!=1:
         raise TypeError("x1 must be a 1d array.")
 
-    if x1.dtype not in [uint32,uint64,uint256,uint1024,uint4096,uint16384]:
+    if x1.dtype not in [uint32,uint64,uint128,uint256,uint1024,uint4096,uint16384]:
         raise TypeError("x1 dtype must be one of the possible dtypes used as the representatives for the general basis class.")
    
     if out is None:
@@ -985,7 +1011,7 @@ def _bitwise_left_shift(x1, shift_type[:] x2, out=None, where=None):
         if out.shape!=x1.shape:
             raise TypeError("expecting same shape for out and x1 arrays.")
 
-        if out.dtype not in [uint32,uint64,uint256,uint1024,uint4096,uint16384]:
+        if out.dtype not in [uint32,uint64,uint128,uint256,uint1024,uint4096,uint16384]:
            raise TypeError("unsupported dtype for variable out. Expecting array of unsigned integers.")
 
     py_array_out = out
@@ -1003,6 +1029,8 @@ def _bitwise_left_shift(x1, shift_type[:] x2, out=None, where=None):
         bitwise_left_shift_op_core(<uint32_t*>x1_ptr, &x2[0], where_ptr, <uint32_t*>out_ptr, Ns)
     elif x1.dtype == uint64:
         bitwise_left_shift_op_core(<uint64_t*>x1_ptr, &x2[0], where_ptr, <uint64_t*>out_ptr, Ns )
+    elif x1.dtype == uint128:
+        bitwise_left_shift_op_core(<uint128_t*>x1_ptr, &x2[0], where_ptr, <uint128_t*>out_ptr, Ns )
     elif x1.dtype == uint256:
         bitwise_left_shift_op_core(<uint256_t*>x1_ptr, &x2[0], where_ptr, <uint256_t*>out_ptr, Ns )
     elif x1.dtype == uint1024:
@@ -1047,7 +1075,7 @@ def _bitwise_right_shift(x1, shift_type[:] x2, out=None, where=None):
     if x1.ndim!=1:
         raise TypeError("x1 must be a 1d array.")
 
-    if x1.dtype not in [uint32,uint64,uint256,uint1024,uint4096,uint16384]:
+    if x1.dtype not in [uint32,uint64,uint128,uint256,uint1024,uint4096,uint16384]:
         raise TypeError("x1 dtype must be one of the possible dtypes used as the representatives for the general basis class.")
    
     if out is None:
@@ -1056,7 +1084,7 @@ def _bitwise_right_shift(x1, shift_type[:] x2, out=None, where=None):
         if out.shape!=x1.shape:
             raise TypeError("expecting same shape for out and x1 arrays.")
 
-        if out.dtype not in [uint32,uint64,uint256,uint1024,uint4096,uint16384]:
+        if out.dtype not in [uint32,uint64,uint128,uint256,uint1024,uint4096,uint16384]:
            raise TypeError("unsupported dtype for variable out. Expecting array of unsigned integers.")
 
     py_array_out = out
@@ -1073,6 +1101,8 @@ def _bitwise_right_shift(x1, shift_type[:] x2, out=None, where=None):
         bitwise_right_shift_op_core(<uint32_t*>x1_ptr, &x2[0], where_ptr, <uint32_t*>out_ptr, Ns)
     elif x1.dtype == uint64:
         bitwise_right_shift_op_core(<uint64_t*>x1_ptr, &x2[0], where_ptr, <uint64_t*>out_ptr, Ns )
+    elif x1.dtype == uint128:
+        bitwise_right_shift_op_core(<uint128_t*>x1_ptr, &x2[0], where_ptr, <uint128_t*>out_ptr, Ns )
     elif x1.dtype == uint256:
         bitwise_right_shift_op_core(<uint256_t*>x1_ptr, &x2[0], where_ptr, <uint256_t*>out_ptr, Ns )
     elif x1.dtype == uint1024:
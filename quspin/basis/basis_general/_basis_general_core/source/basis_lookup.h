@@ -0,0 +1,171 @@
+#ifndef _BASIS_LOOKUP_H
+#define _BASIS_LOOKUP_H
+
+#include <vector>
+#include <algorithm>
+#include "numpy/ndarraytypes.h"
+#include "misc.h"
+#include "openmp.h"
+
+namespace basis_general {
+
+// secondary index of a basis (sorted in descending order) which replaces the binary search over the whole basis.
+//
+// hash:   open addressing hash table (linear probing) which maps a state to its position in the basis. A lookup
+//         costs a single probe into the table and one read of the basis on average.
+// prefix: table of the positions of the first state for each value of the highest prefix_bits bits of the states.
+//         The binary search is restricted to the (cache resident) window of states which share the prefix of s.
+
+enum basis_lookup_type {no_lookup=0,hash_lookup=1,prefix_lookup=2};
+
+template<class I>
+inline npy_uint64 hash_state(I s){
+	npy_uint64 h = 0;
+	do{
+		h ^= (npy_uint64)(s & I(0xffffffff));
+		h *= 0x9E3779B97F4A7C15ull;
+		h ^= (h >> 32);
+		s >>= 16; s >>= 16; // two shifts: well defined for 32 bit integers.
+	}while(s != I(0));
+
+	return h;
+}
+
+template<class I>
+class basis_lookup
+{
+	int type;
+	const I * basis;
+	// hash table
+	std::vector<npy_intp> table;
+	npy_uint64 mask;
+	// prefix table
+	int shift;
+	npy_uintp max_prefix;
+	std::vector<npy_intp> bounds;
+
+	npy_uintp reverse_prefix(const I s) const {
+		return max_prefix - (npy_uintp)(s >> shift);
+	}
+
+	public:
+		npy_intp Ns; // number of states in the indexed basis, -1 if no index is set.
+
+		basis_lookup() : type(no_lookup), basis(NULL), mask(0), shift(0), max_prefix(0), Ns(-1) {}
+
+		~basis_lookup() {}
+
+		void clear(){
+			std::vector<npy_intp>().swap(table);
+			std::vector<npy_intp>().swap(bounds);
+			type = no_lookup;
+			basis = NULL;
+			Ns = -1;
+		}
+
+		bool matches(const npy_intp _Ns,const I _basis[]) const {
+			return type != no_lookup && Ns == _Ns && basis == _basis;
+		}
+
+		bool init_hash(const npy_intp _Ns,const I _basis[],const npy_intp max_size){
+			clear();
+
+			npy_intp size = 1;
+			while(size < 2*_Ns){
+				size <<= 1;
+			}
+
+			if(size > max_size){
+				return false;
+			}
+
+			table.assign(size,-1);
+			mask = (npy_uint64)(size-1);
+
+			for(npy_intp i=0;i<_Ns;i++){
+				npy_uint64 h = hash_state(_basis[i]) & mask;
+				while(table[h] >= 0){
+					h = (h+1) & mask;
+				}
+				table[h] = i;
+			}
+
+			type = hash_lookup;
+			basis = _basis;
+			Ns = _Ns;
+			return true;
+		}
+
+		bool init_prefix(const npy_intp _Ns,const I _basis[],int prefix_bits){
+			clear();
+
+			if(_Ns <= 0){
+				return false;
+			}
+
+			// number of bits of the largest state.
+			int n_bits = 0;
+			I s = _basis[0];
+			while(s != I(0)){
+				s >>= 1;
+				n_bits++;
+			}
+
+			prefix_bits = std::min(prefix_bits,n_bits);
+			shift = n_bits - prefix_bits;
+			max_prefix = ((npy_uintp)1 << prefix_bits) - 1;
+			bounds.resize(max_prefix+2);
+
+			const npy_intp n_bounds = (npy_intp)max_prefix + 1;
+
+			// bounds[r]: position of the first state with reverse_prefix >= r, found by bisection.
+			#pragma omp parallel for schedule(static)
+			for(npy_intp r=0;r<n_bounds;r++){
+				npy_intp lo = 0, hi = _Ns;
+				while(lo < hi){
+					const npy_intp mid = lo + (hi-lo)/2;
+					if(max_prefix - (npy_uintp)(_basis[mid] >> shift) < (npy_uintp)r){
+						lo = mid + 1;
+					}
+					else{
+						hi = mid;
+					}
+				}
+				bounds[r] = lo;
+			}
+			bounds[n_bounds] = _Ns;
+
+			type = prefix_lookup;
+			basis = _basis;
+			Ns = _Ns;
+			return true;
+		}
+
+		npy_intp index(const I s) const {
+			// returns the position of s in the basis, -1 if s is not in the basis.
+			if(type == hash_lookup){
+				npy_uint64 h = hash_state(s) & mask;
+				npy_intp j;
+				while((j = table[h]) >= 0){
+					if(basis[j] == s){
+						return j;
+					}
+					h = (h+1) & mask;
+				}
+				return -1;
+			}
+			else{
+				if((s >> shift) > I(max_prefix)){
+					return -1;
+				}
+				const npy_uintp r = reverse_prefix(s);
+				const npy_intp lo = bounds[r];
+				const npy_intp j = binary_search(bounds[r+1]-lo,basis+lo,s);
+				return (j < 0 ? -1 : lo + j);
+			}
+		}
+};
+
+}
+
+#endif
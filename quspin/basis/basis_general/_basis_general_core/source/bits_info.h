@@ -6,7 +6,12 @@
 
 namespace basis_general {
 
+#if defined(__SIZEOF_INT128__)
+// native 128 bit integer: shifts, compares and bit counts compile to a few 64 bit instructions.
+typedef unsigned __int128 uint128_t;
+#else
 typedef boost::multiprecision::uint128_t uint128_t;
+#endif
 typedef boost::multiprecision::uint256_t uint256_t;
 typedef boost::multiprecision::uint512_t uint512_t;
 typedef boost::multiprecision::uint1024_t uint1024_t;
@@ -115,6 +120,13 @@ int inline bit_count(T v,int l){
 
 }
 
+#if defined(__SIZEOF_INT128__)
+template<>
+int inline bit_count<uint128_t>(uint128_t v,int l){
+  v = v & (((~(uint128_t)0) >> 1) >> (bit_info<uint128_t>::bits - 1 - l));
+  return __builtin_popcountll((npy_uint64)v) + __builtin_popcountll((npy_uint64)(v >> 64));
+}
+#endif
 
 }
 
@@ -10,6 +10,9 @@
 #include <stdlib.h>
 #include "numpy/ndarraytypes.h"
 #include "bits_info.h"
+#include "pcon_rank.h"
+#include "basis_lookup.h"
+#include "misc.h"
 #include <set>
 
 #define __GENERAL_BASIS_CORE__max_nt 32
@@ -25,6 +28,8 @@ class general_basis_core{
 		const int * maps;
 		const int * pers;
 		const int * qs;
+		pcon_rank<I> pcon_index; // O(1) index of the particle conserving basis without symmetries.
+		basis_lookup<I> lookup; // optional hash/prefix index of the basis.
 
 		general_basis_core(const int _N) : \
 			 N(_N), nt(0), maps(NULL), pers(NULL), qs(NULL) {}
@@ -51,9 +56,64 @@ class general_basis_core{
 		virtual int get_nt() const{
 			return nt;
 		}
+
+		virtual bool fermionic() const{
+			// true if map_state produces the fermionic signs of the transformations.
+			return false;
+		}
+
+		bool set_pcon_index(const int n_sites,const int sps,const std::vector<int> &Np,const npy_intp max_size){
+			return pcon_index.init(n_sites,sps,Np,max_size);
+		}
+
+		void clear_pcon_index(){
+			pcon_index.clear();
+		}
+
+		bool set_lookup(const int type,const npy_intp Ns,const I basis[],const npy_intp max_size,const int prefix_bits){
+			if(type == hash_lookup){
+				return lookup.init_hash(Ns,basis,max_size);
+			}
+			else if(type == prefix_lookup){
+				return lookup.init_prefix(Ns,basis,prefix_bits);
+			}
+			else{
+				lookup.clear();
+				return false;
+			}
+		}
 };
 
 
+template<class K,class I>
+K inline basis_index(general_basis_core<I> *B,const bool full_basis,const npy_intp Ns,const I basis[],const I s){
+	// position of the representative s in the basis (sorted in descending order), -1 if s is not in the basis.
+	if(full_basis){
+		return Ns - (npy_intp)s - 1;
+	}
+	else if(B->nt <= 0 && B->pcon_index.matches(Ns,basis)){
+		return (K)B->pcon_index.index(s);
+	}
+	else if(B->lookup.matches(Ns,basis)){
+		return (K)B->lookup.index(s);
+	}
+	else{
+		return binary_search(Ns,basis,s);
+	}
+}
+
+template<class I>
+npy_intp inline pcon_basis_index(general_basis_core<I> *B,const npy_intp Ns_full,const I basis_pcon[],const I s){
+	// position of s in the particle conserving basis without symmetries basis_pcon.
+	if(B->pcon_index.matches(Ns_full,basis_pcon)){
+		return B->pcon_index.index(s);
+	}
+	else{
+		return binary_search(Ns_full,basis_pcon,s);
+	}
+}
+
+
 template<class I>
 double check_state_core_unrolled(general_basis_core<I> *B,const I s,const int nt){
 
@@ -11,14 +11,27 @@ cdef extern from "general_basis_core.h" namespace "basis_general":
         const int pers[]
         const int qs[]
         void map_state(I[],npy_intp,int,signed char[]) nogil
+        bool set_pcon_index(const int,const int,vector[int],const npy_intp) nogil
+        void clear_pcon_index() nogil
+        bool set_lookup(const int,const npy_intp,const I[],const npy_intp,const int) except + nogil
+
+    npy_intp pcon_basis_index[I](general_basis_core[I]*,const npy_intp,const I[],const I) nogil
+    K basis_index[K,I](general_basis_core[I]*,const bool,const npy_intp,const I[],const I) nogil
 
 cdef extern from "make_general_basis.h" namespace "basis_general":
     npy_intp make_basis[I,J](general_basis_core[I]*,npy_intp,npy_intp,I[], J[]) nogil
     npy_intp make_basis_pcon[I,J](general_basis_core[I]*,npy_intp,npy_intp,I,I[], J[]) nogil
 
+cdef extern from "general_basis_count.h" namespace "basis_general":
+    npy_intp count_basis[I](general_basis_core[I]*,const int[],const int,const int,vector[int]) nogil
+
 cdef extern from "general_basis_op.h" namespace "basis_general":
     int general_op[I,J,K,T](general_basis_core[I] *B,const int,const char[], const int[],
                           const double complex, const bool, const npy_intp, const I[], const J[], K[], K[], T[]) nogil
+    int general_op_list[I,J,K,T](general_basis_core[I] *B,const int,const int[],const char[], const int[],
+                          const double complex[], const bool, const npy_intp, const npy_intp, const npy_intp, const I[], const J[], K[], T[]) nogil
+    int general_op_list_csr[I,J,K,T](general_basis_core[I] *B,const int,const int[],const char[], const int[],
+                          const double complex[], const bool, const npy_intp, const I[], const J[], const bool, K[], K[], T[]) nogil
     int general_inplace_op[I,J,K](general_basis_core[I] *B,const bool,const bool,const int,const char[], const int[],
                           const double complex, const bool, const npy_intp,const npy_intp, const I[], const J[],const K[], K[]) nogil
     int general_op_bra_ket[I,T](general_basis_core[I] *B,const int,const char[], const int[],
@@ -43,6 +56,15 @@ cdef extern from "general_basis_rep.h" namespace "basis_general":
     int general_normalization[I,J](general_basis_core[I] *B, I[], J[], const npy_intp) nogil
 
 cdef extern from "bits_info.h" namespace "basis_general":
+    cdef cppclass uint128_t:
+        uint128_t operator&(int)
+        uint128_t operator>>(int)
+        uint128_t operator<<(int)
+        uint128_t operator^(uint128_t)
+        bool operator==(uint128_t)
+        bool operator!=(uint128_t)
+        bool operator!=(int)
+
     cdef cppclass uint256_t:
         uint256_t operator&(int)
         uint256_t operator>>(int)
@@ -109,6 +131,7 @@ ctypedef fused npy_uint:
 ctypedef fused state_type:
     uint32_t
     uint64_t
+    uint128_t
     uint256_t
     uint1024_t
     uint4096_t
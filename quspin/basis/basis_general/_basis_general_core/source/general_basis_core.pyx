@@ -8,7 +8,7 @@ import numpy as _np
 from libcpp.vector cimport vector
 from libcpp.set cimport set
 
-from .general_basis_utils import uint32,uint64,uint256,uint1024,uint4096,uint16384
+from .general_basis_utils import uint32,uint64,uint128,uint256,uint1024,uint4096,uint16384
 
 
 
@@ -123,7 +123,7 @@ cdef get_proj_pcon_helper(general_basis_core[state_type] * B, state_type * basis
                 with nogil:
                     for i in range(Ns):
                         c[i] *= sign[i]
-                        indices[i] = <npy_intp>binary_search(Ns_full,basis_pcon,basis[i])
+                        indices[i] = pcon_basis_index(B,Ns_full,basis_pcon,basis[i])
 
                 P = P + _sp.csc_matrix((c,indices,indptr),shape=P.shape,copy=False)
 
@@ -135,7 +135,7 @@ cdef get_proj_pcon_helper(general_basis_core[state_type] * B, state_type * basis
                 with nogil:
                     for i in range(Ns):
                         c[i] *= sign[i]
-                        indices[i] = <npy_intp>binary_search(Ns_full,basis_pcon,basis[i])
+                        indices[i] = pcon_basis_index(B,Ns_full,basis_pcon,basis[i])
 
                 P = P + _sp.csc_matrix((c,indices,indptr),shape=P.shape,copy=False)
                 with nogil:
@@ -210,11 +210,18 @@ cdef set[vector[int]] load_pcon_list(object Np):
 
 
 
+# maximum number of entries of the tables used by the combinatorial index of particle conserving bases.
+cdef npy_intp MAX_PCON_INDEX_SIZE = 1<<22
+# states per window of the prefix index.
+cdef int PREFIX_WINDOW_BITS = 4
+
+
 cdef class general_basis_core_wrap:
     cdef int _N
     cdef int _nt
     cdef int _sps
     cdef object _Ns_full
+    cdef object _lookup_basis
     cdef void * _basis_core
 
     def __cinit__(self):
@@ -240,6 +247,9 @@ cdef class general_basis_core_wrap:
         elif basis.dtype == uint64:
             with nogil:
                 err = general_op(<general_basis_core[uint64_t]*>B,n_op,&c_opstr[0],&indx[0],JJ,basis_full,Ns,<uint64_t*>basis_ptr,&n[0],&row[0],&col[0],&M[0])
+        elif basis.dtype == uint128:
+            with nogil:
+                err = general_op(<general_basis_core[uint128_t]*>B,n_op,&c_opstr[0],&indx[0],JJ,basis_full,Ns,<uint128_t*>basis_ptr,&n[0],&row[0],&col[0],&M[0])
         elif basis.dtype == uint256:
             with nogil:
                 err = general_op(<general_basis_core[uint256_t]*>B,n_op,&c_opstr[0],&indx[0],JJ,basis_full,Ns,<uint256_t*>basis_ptr,&n[0],&row[0],&col[0],&M[0])
@@ -260,6 +270,102 @@ cdef class general_basis_core_wrap:
         elif err == 1:
             raise TypeError("attemping to use real type for complex matrix elements.")
  
+    @cython.boundscheck(False)
+    def op_list(self,index_type[::1] row,dtype[::1] M,int[::1] n_op,object opstr,int[::1] indx,double complex[::1] J,npy_intp start,npy_intp stop,_np.ndarray basis,norm_type[::1] n):
+        cdef char[::1] c_opstr = bytearray(opstr+" ","utf-8") # padding so that the buffer is never empty
+        cdef int n_terms = n_op.shape[0]
+        cdef npy_intp Ns = basis.shape[0]
+        cdef bool basis_full = self._Ns_full == basis.shape[0]
+        cdef int err = 0;
+        cdef void * basis_ptr = _np.PyArray_GETPTR1(basis,0) # use standard numpy API function
+        cdef void * B = self._basis_core # must define local cdef variable to do the pointer casting
+
+        if not basis.flags["CARRAY"]:
+            raise ValueError("basis array must be writable and C-contiguous")
+
+        if start < 0 or stop > Ns or start > stop:
+            raise ValueError("invalid range of states [{},{}).".format(start,stop))
+
+        if row.shape[0] < (stop-start)*n_terms or M.shape[0] < (stop-start)*n_terms:
+            raise ValueError("output arrays too small for range of states.")
+
+        if basis.dtype == uint32:
+            with nogil:
+                err = general_op_list(<general_basis_core[uint32_t]*>B,n_terms,&n_op[0],&c_opstr[0],&indx[0],&J[0],basis_full,Ns,start,stop,<uint32_t*>basis_ptr,&n[0],&row[0],&M[0])
+        elif basis.dtype == uint64:
+            with nogil:
+                err = general_op_list(<general_basis_core[uint64_t]*>B,n_terms,&n_op[0],&c_opstr[0],&indx[0],&J[0],basis_full,Ns,start,stop,<uint64_t*>basis_ptr,&n[0],&row[0],&M[0])
+        elif basis.dtype == uint128:
+            with nogil:
+                err = general_op_list(<general_basis_core[uint128_t]*>B,n_terms,&n_op[0],&c_opstr[0],&indx[0],&J[0],basis_full,Ns,start,stop,<uint128_t*>basis_ptr,&n[0],&row[0],&M[0])
+        elif basis.dtype == uint256:
+            with nogil:
+                err = general_op_list(<general_basis_core[uint256_t]*>B,n_terms,&n_op[0],&c_opstr[0],&indx[0],&J[0],basis_full,Ns,start,stop,<uint256_t*>basis_ptr,&n[0],&row[0],&M[0])
+        elif basis.dtype == uint1024:
+            with nogil:
+                err = general_op_list(<general_basis_core[uint1024_t]*>B,n_terms,&n_op[0],&c_opstr[0],&indx[0],&J[0],basis_full,Ns,start,stop,<uint1024_t*>basis_ptr,&n[0],&row[0],&M[0])
+        elif basis.dtype == uint4096:
+            with nogil:
+                err = general_op_list(<general_basis_core[uint4096_t]*>B,n_terms,&n_op[0],&c_opstr[0],&indx[0],&J[0],basis_full,Ns,start,stop,<uint4096_t*>basis_ptr,&n[0],&row[0],&M[0])
+        elif basis.dtype == uint16384:
+            with nogil:
+                err = general_op_list(<general_basis_core[uint16384_t]*>B,n_terms,&n_op[0],&c_opstr[0],&indx[0],&J[0],basis_full,Ns,start,stop,<uint16384_t*>basis_ptr,&n[0],&row[0],&M[0])
+        else:
+            raise TypeError("basis dtype {} not recognized.".format(basis.dtype))
+
+        if err == -1:
+            raise ValueError("operator not recognized.")
+        elif err == 1:
+            raise TypeError("attemping to use real type for complex matrix elements.")
+
+    @cython.boundscheck(False)
+    def op_list_csr(self,index_type[::1] indptr,index_type[::1] indices,dtype[::1] data,int[::1] n_op,object opstr,int[::1] indx,double complex[::1] J,bool fill,_np.ndarray basis,norm_type[::1] n):
+        cdef char[::1] c_opstr = bytearray(opstr+" ","utf-8") # padding so that the buffer is never empty
+        cdef int n_terms = n_op.shape[0]
+        cdef npy_intp Ns = basis.shape[0]
+        cdef bool basis_full = self._Ns_full == basis.shape[0]
+        cdef int err = 0;
+        cdef void * basis_ptr = _np.PyArray_GETPTR1(basis,0) # use standard numpy API function
+        cdef void * B = self._basis_core # must define local cdef variable to do the pointer casting
+
+        if not basis.flags["CARRAY"]:
+            raise ValueError("basis array must be writable and C-contiguous")
+
+        if indptr.shape[0] != Ns+1:
+            raise ValueError("indptr must have size Ns+1.")
+
+        if fill and (indices.shape[0] < indptr[Ns] or data.shape[0] < indptr[Ns]):
+            raise ValueError("indices and data arrays too small for number of non-zero elements.")
+
+        if basis.dtype == uint32:
+            with nogil:
+                err = general_op_list_csr(<general_basis_core[uint32_t]*>B,n_terms,&n_op[0],&c_opstr[0],&indx[0],&J[0],basis_full,Ns,<uint32_t*>basis_ptr,&n[0],fill,&indptr[0],&indices[0],&data[0])
+        elif basis.dtype == uint64:
+            with nogil:
+                err = general_op_list_csr(<general_basis_core[uint64_t]*>B,n_terms,&n_op[0],&c_opstr[0],&indx[0],&J[0],basis_full,Ns,<uint64_t*>basis_ptr,&n[0],fill,&indptr[0],&indices[0],&data[0])
+        elif basis.dtype == uint128:
+            with nogil:
+                err = general_op_list_csr(<general_basis_core[uint128_t]*>B,n_terms,&n_op[0],&c_opstr[0],&indx[0],&J[0],basis_full,Ns,<uint128_t*>basis_ptr,&n[0],fill,&indptr[0],&indices[0],&data[0])
+        elif basis.dtype == uint256:
+            with nogil:
+                err = general_op_list_csr(<general_basis_core[uint256_t]*>B,n_terms,&n_op[0],&c_opstr[0],&indx[0],&J[0],basis_full,Ns,<uint256_t*>basis_ptr,&n[0],fill,&indptr[0],&indices[0],&data[0])
+        elif basis.dtype == uint1024:
+            with nogil:
+                err = general_op_list_csr(<general_basis_core[uint1024_t]*>B,n_terms,&n_op[0],&c_opstr[0],&indx[0],&J[0],basis_full,Ns,<uint1024_t*>basis_ptr,&n[0],fill,&indptr[0],&indices[0],&data[0])
+        elif basis.dtype == uint4096:
+            with nogil:
+                err = general_op_list_csr(<general_basis_core[uint4096_t]*>B,n_terms,&n_op[0],&c_opstr[0],&indx[0],&J[0],basis_full,Ns,<uint4096_t*>basis_ptr,&n[0],fill,&indptr[0],&indices[0],&data[0])
+        elif basis.dtype == uint16384:
+            with nogil:
+                err = general_op_list_csr(<general_basis_core[uint16384_t]*>B,n_terms,&n_op[0],&c_opstr[0],&indx[0],&J[0],basis_full,Ns,<uint16384_t*>basis_ptr,&n[0],fill,&indptr[0],&indices[0],&data[0])
+        else:
+            raise TypeError("basis dtype {} not recognized.".format(basis.dtype))
+
+        if err == -1:
+            raise ValueError("operator not recognized.")
+        elif err == 1:
+            raise TypeError("attemping to use real type for complex matrix elements.")
+
     @cython.boundscheck(False)
     def inplace_op(self,dtype[:,::1] v_in,dtype[:,::1] v_out,bool transposed,bool conjugated,object opstr,int[::1] indx,object J,_np.ndarray basis,norm_type[::1] n):
         cdef char[::1] c_opstr = bytearray(opstr,"utf-8")
@@ -283,6 +389,10 @@ cdef class general_basis_core_wrap:
             with nogil:
                 err = general_inplace_op(<general_basis_core[uint64_t]*>B,transposed,conjugated,n_op,&c_opstr[0],&indx[0],JJ,basis_full,Ns,nvecs,
                                                         <uint64_t*>basis_ptr,&n[0],&v_in[0,0],&v_out[0,0])
+        elif basis.dtype == uint128:
+            with nogil:
+                err = general_inplace_op(<general_basis_core[uint128_t]*>B,transposed,conjugated,n_op,&c_opstr[0],&indx[0],JJ,basis_full,Ns,nvecs,
+                                                        <uint128_t*>basis_ptr,&n[0],&v_in[0,0],&v_out[0,0])
         elif basis.dtype == uint256:
             with nogil:
                 err = general_inplace_op(<general_basis_core[uint256_t]*>B,transposed,conjugated,n_op,&c_opstr[0],&indx[0],JJ,basis_full,Ns,nvecs,
@@ -336,6 +446,9 @@ cdef class general_basis_core_wrap:
             elif basis.dtype == uint64:
                 with nogil:
                     err = get_vec_general_pcon_dense(<general_basis_core[uint64_t]*>B,<uint64_t*>basis_ptr,&n[0],n_vec,Ns,Ns_full,<uint64_t*>basis_pcon_ptr,&v_in[0,0],&v_out[0,0])            
+            elif basis.dtype == uint128:
+                with nogil:
+                    err = get_vec_general_pcon_dense(<general_basis_core[uint128_t]*>B,<uint128_t*>basis_ptr,&n[0],n_vec,Ns,Ns_full,<uint128_t*>basis_pcon_ptr,&v_in[0,0],&v_out[0,0])
             elif basis.dtype == uint256:
                 with nogil:
                     err = get_vec_general_pcon_dense(<general_basis_core[uint256_t]*>B,<uint256_t*>basis_ptr,&n[0],n_vec,Ns,Ns_full,<uint256_t*>basis_pcon_ptr,&v_in[0,0],&v_out[0,0])
@@ -433,6 +546,9 @@ cdef class general_basis_core_wrap:
                 elif basis.dtype == uint64:
                     return get_proj_pcon_helper[uint64_t,dtype,index_type](<general_basis_core[uint64_t]*>B,<uint64_t*>basis_ptr,self._nt,self._nt,
                         sign,c,indices,indptr,<uint64_t*>basis_pcon_ptr,P)             
+                elif basis.dtype == uint128:
+                    return get_proj_pcon_helper[uint128_t,dtype,index_type](<general_basis_core[uint128_t]*>B,<uint128_t*>basis_ptr,self._nt,self._nt,
+                        sign,c,indices,indptr,<uint128_t*>basis_pcon_ptr,P)             
                 elif basis.dtype == uint256:
                     return get_proj_pcon_helper[uint256_t,dtype,index_type](<general_basis_core[uint256_t]*>B,<uint256_t*>basis_ptr,self._nt,self._nt,
                         sign,c,indices,indptr,<uint256_t*>basis_pcon_ptr,P)             
@@ -478,6 +594,7 @@ cdef class general_basis_core_wrap:
         cdef void * B = self._basis_core
         cdef uint32_t s32 = <uint32_t>(0)
         cdef uint64_t s64 = <uint64_t>(0)
+        cdef uint128_t s_u128 = <uint128_t>(0)
         cdef uint256_t s128 = <uint256_t>(0)
         cdef uint1024_t s256 = <uint1024_t>(0)
         cdef uint4096_t s512 = <uint4096_t>(0)
@@ -487,6 +604,9 @@ cdef class general_basis_core_wrap:
         if not basis.flags["CARRAY"]:
             raise ValueError("basis array must be writable and C-contiguous")
 
+        # the combinatorial index of the sector is used to split the construction into independent chunks.
+        self.set_pcon_index(basis,Np)
+
         if basis.dtype == uint32:
             s32 = python_to_basis_int(s,s32)
             with nogil:
@@ -495,6 +615,10 @@ cdef class general_basis_core_wrap:
             s64 = python_to_basis_int(s,s64)
             with nogil:
                 Ns = make_basis_pcon(<general_basis_core[uint64_t]*>B,Ns,mem_MAX,s64,<uint64_t*>basis_ptr,&n[0])
+        elif basis.dtype == uint128:
+            s_u128 = python_to_basis_int(s,s_u128)
+            with nogil:
+                Ns = make_basis_pcon(<general_basis_core[uint128_t]*>B,Ns,mem_MAX,s_u128,<uint128_t*>basis_ptr,&n[0])
         elif basis.dtype == uint256:
             s128 = python_to_basis_int(s,s128)
             with nogil:
@@ -517,6 +641,236 @@ cdef class general_basis_core_wrap:
         return Ns
 
 
+    def _Np_list(self,object Np):
+        # particle numbers of each species for a single particle sector Np, None if Np is not a single sector.
+        if isinstance(Np,(int,_np.integer)):
+            return [int(Np)]
+        else:
+            return None
+
+    def set_pcon_index(self,_np.ndarray basis,object Np):
+        return self._set_pcon_index(basis,self._Np_list(Np))
+
+    def _set_pcon_index(self,_np.ndarray basis,object Np_list):
+        # enables the O(1) lookup of states in the particle conserving basis with the sector(s) in Np_list 
+        # (one for each species), using the combinatorial number system instead of a binary search of the basis. 
+        # Np_list = None disables the index.
+        cdef vector[int] Np_vec
+        cdef int n_sites = self._N
+        cdef int sps = self._sps
+        cdef npy_intp max_size = MAX_PCON_INDEX_SIZE
+        cdef bool success = False
+        cdef void * B = self._basis_core
+
+        if Np_list is None:
+            if basis.dtype == uint32:
+                (<general_basis_core[uint32_t]*>B).clear_pcon_index()
+            elif basis.dtype == uint64:
+                (<general_basis_core[uint64_t]*>B).clear_pcon_index()
+            elif basis.dtype == uint128:
+                (<general_basis_core[uint128_t]*>B).clear_pcon_index()
+            elif basis.dtype == uint256:
+                (<general_basis_core[uint256_t]*>B).clear_pcon_index()
+            elif basis.dtype == uint1024:
+                (<general_basis_core[uint1024_t]*>B).clear_pcon_index()
+            elif basis.dtype == uint4096:
+                (<general_basis_core[uint4096_t]*>B).clear_pcon_index()
+            elif basis.dtype == uint16384:
+                (<general_basis_core[uint16384_t]*>B).clear_pcon_index()
+            else:
+                raise TypeError("basis dtype {} not recognized.".format(basis.dtype))
+
+            return False
+
+        for np in Np_list:
+            Np_vec.push_back(np)
+
+        if basis.dtype == uint32:
+            success = (<general_basis_core[uint32_t]*>B).set_pcon_index(n_sites,sps,Np_vec,max_size)
+        elif basis.dtype == uint64:
+            success = (<general_basis_core[uint64_t]*>B).set_pcon_index(n_sites,sps,Np_vec,max_size)
+        elif basis.dtype == uint128:
+            success = (<general_basis_core[uint128_t]*>B).set_pcon_index(n_sites,sps,Np_vec,max_size)
+        elif basis.dtype == uint256:
+            success = (<general_basis_core[uint256_t]*>B).set_pcon_index(n_sites,sps,Np_vec,max_size)
+        elif basis.dtype == uint1024:
+            success = (<general_basis_core[uint1024_t]*>B).set_pcon_index(n_sites,sps,Np_vec,max_size)
+        elif basis.dtype == uint4096:
+            success = (<general_basis_core[uint4096_t]*>B).set_pcon_index(n_sites,sps,Np_vec,max_size)
+        elif basis.dtype == uint16384:
+            success = (<general_basis_core[uint16384_t]*>B).set_pcon_index(n_sites,sps,Np_vec,max_size)
+        else:
+            raise TypeError("basis dtype {} not recognized.".format(basis.dtype))
+
+        return success
+
+    def count_states(self,object dtype,int[::1] qs,object Np):
+        # exact number of states with quantum numbers qs in the particle sector(s) Np (None: no particle conservation),
+        # computed without constructing the basis. returns -1 if the number can not be computed.
+        cdef npy_intp Ns = 0
+        cdef npy_intp Ns_sector = 0
+        cdef vector[int] Np_vec
+        cdef int n_sites = self._N
+        cdef int sps = self._sps
+        cdef int * qs_ptr = NULL
+        cdef void * B = self._basis_core
+
+        if qs.shape[0] > 0:
+            qs_ptr = &qs[0]
+
+        if Np is None:
+            sectors = [[]]
+        elif self._Np_list(Np) is not None:
+            sectors = [self._Np_list(Np)]
+        else:
+            sectors = [self._Np_list(np) for np in Np]
+            if any(Np_list is None for Np_list in sectors):
+                raise ValueError("particle sector(s) {} not recognized.".format(Np))
+
+        for Np_list in sectors:
+            Np_vec.clear()
+            for np in Np_list:
+                Np_vec.push_back(np)
+
+            if dtype == uint32:
+                with nogil:
+                    Ns_sector = count_basis(<general_basis_core[uint32_t]*>B,qs_ptr,n_sites,sps,Np_vec)
+            elif dtype == uint64:
+                with nogil:
+                    Ns_sector = count_basis(<general_basis_core[uint64_t]*>B,qs_ptr,n_sites,sps,Np_vec)
+            elif dtype == uint128:
+                with nogil:
+                    Ns_sector = count_basis(<general_basis_core[uint128_t]*>B,qs_ptr,n_sites,sps,Np_vec)
+            elif dtype == uint256:
+                with nogil:
+                    Ns_sector = count_basis(<general_basis_core[uint256_t]*>B,qs_ptr,n_sites,sps,Np_vec)
+            elif dtype == uint1024:
+                with nogil:
+                    Ns_sector = count_basis(<general_basis_core[uint1024_t]*>B,qs_ptr,n_sites,sps,Np_vec)
+            elif dtype == uint4096:
+                with nogil:
+                    Ns_sector = count_basis(<general_basis_core[uint4096_t]*>B,qs_ptr,n_sites,sps,Np_vec)
+            elif dtype == uint16384:
+                with nogil:
+                    Ns_sector = count_basis(<general_basis_core[uint16384_t]*>B,qs_ptr,n_sites,sps,Np_vec)
+            else:
+                raise TypeError("basis dtype {} not recognized.".format(dtype))
+
+            if Ns_sector < 0:
+                return -1
+
+            Ns += Ns_sector
+
+        return Ns
+
+    def set_lookup(self,_np.ndarray basis,object index):
+        # builds the secondary index (index="hash" or "prefix") used to find states in basis, index=None removes it.
+        cdef int lookup_type = 0
+        cdef npy_intp Ns = basis.shape[0]
+        cdef npy_intp max_size = _np.iinfo(_np.intp).max // 8
+        cdef int prefix_bits = 0
+        cdef bool success = False
+        cdef void * basis_ptr = NULL
+        cdef void * B = self._basis_core
+
+        if index is None:
+            lookup_type = 0
+        elif index == "hash":
+            lookup_type = 1
+        elif index == "prefix":
+            lookup_type = 2
+        else:
+            raise ValueError("index must be one of: None, 'hash' or 'prefix'.")
+
+        if lookup_type != 0 and not basis.flags["C_CONTIGUOUS"]:
+            raise ValueError("basis array must be C-contiguous")
+
+        if Ns == 0:
+            lookup_type = 0
+        else:
+            basis_ptr = _np.PyArray_GETPTR1(basis,0)
+
+        # about 2**PREFIX_WINDOW_BITS states per prefix.
+        while (<npy_intp>1 << (prefix_bits+PREFIX_WINDOW_BITS)) < Ns:
+            prefix_bits += 1
+
+        if basis.dtype == uint32:
+            with nogil:
+                success = (<general_basis_core[uint32_t]*>B).set_lookup(lookup_type,Ns,<uint32_t*>basis_ptr,max_size,prefix_bits)
+        elif basis.dtype == uint64:
+            with nogil:
+                success = (<general_basis_core[uint64_t]*>B).set_lookup(lookup_type,Ns,<uint64_t*>basis_ptr,max_size,prefix_bits)
+        elif basis.dtype == uint128:
+            with nogil:
+                success = (<general_basis_core[uint128_t]*>B).set_lookup(lookup_type,Ns,<uint128_t*>basis_ptr,max_size,prefix_bits)
+        elif basis.dtype == uint256:
+            with nogil:
+                success = (<general_basis_core[uint256_t]*>B).set_lookup(lookup_type,Ns,<uint256_t*>basis_ptr,max_size,prefix_bits)
+        elif basis.dtype == uint1024:
+            with nogil:
+                success = (<general_basis_core[uint1024_t]*>B).set_lookup(lookup_type,Ns,<uint1024_t*>basis_ptr,max_size,prefix_bits)
+        elif basis.dtype == uint4096:
+            with nogil:
+                success = (<general_basis_core[uint4096_t]*>B).set_lookup(lookup_type,Ns,<uint4096_t*>basis_ptr,max_size,prefix_bits)
+        elif basis.dtype == uint16384:
+            with nogil:
+                success = (<general_basis_core[uint16384_t]*>B).set_lookup(lookup_type,Ns,<uint16384_t*>basis_ptr,max_size,prefix_bits)
+        else:
+            raise TypeError("basis dtype {} not recognized.".format(basis.dtype))
+
+        # the index points into the memory of basis, keep it alive.
+        self._lookup_basis = basis if success else None
+
+        return success
+
+    def index(self,_np.ndarray basis,object s):
+        # position of the state s in the basis, -1 if s is not in the basis.
+        cdef npy_intp Ns = basis.shape[0]
+        cdef npy_intp i = -1
+        cdef void * basis_ptr = NULL
+        cdef void * B = self._basis_core
+        cdef uint32_t s32 = <uint32_t>(0)
+        cdef uint64_t s64 = <uint64_t>(0)
+        cdef uint128_t s_u128 = <uint128_t>(0)
+        cdef uint256_t s128 = <uint256_t>(0)
+        cdef uint1024_t s256 = <uint1024_t>(0)
+        cdef uint4096_t s512 = <uint4096_t>(0)
+        cdef uint16384_t s1024 = <uint16384_t>(0)
+
+        if Ns == 0:
+            return -1
+
+        if not basis.flags["C_CONTIGUOUS"]:
+            raise ValueError("basis array must be C-contiguous")
+
+        basis_ptr = _np.PyArray_GETPTR1(basis,0)
+
+        if basis.dtype == uint32:
+            s32 = python_to_basis_int(s,s32)
+            i = basis_index[npy_intp,uint32_t](<general_basis_core[uint32_t]*>B,False,Ns,<uint32_t*>basis_ptr,s32)
+        elif basis.dtype == uint64:
+            s64 = python_to_basis_int(s,s64)
+            i = basis_index[npy_intp,uint64_t](<general_basis_core[uint64_t]*>B,False,Ns,<uint64_t*>basis_ptr,s64)
+        elif basis.dtype == uint128:
+            s_u128 = python_to_basis_int(s,s_u128)
+            i = basis_index[npy_intp,uint128_t](<general_basis_core[uint128_t]*>B,False,Ns,<uint128_t*>basis_ptr,s_u128)
+        elif basis.dtype == uint256:
+            s128 = python_to_basis_int(s,s128)
+            i = basis_index[npy_intp,uint256_t](<general_basis_core[uint256_t]*>B,False,Ns,<uint256_t*>basis_ptr,s128)
+        elif basis.dtype == uint1024:
+            s256 = python_to_basis_int(s,s256)
+            i = basis_index[npy_intp,uint1024_t](<general_basis_core[uint1024_t]*>B,False,Ns,<uint1024_t*>basis_ptr,s256)
+        elif basis.dtype == uint4096:
+            s512 = python_to_basis_int(s,s512)
+            i = basis_index[npy_intp,uint4096_t](<general_basis_core[uint4096_t]*>B,False,Ns,<uint4096_t*>basis_ptr,s512)
+        elif basis.dtype == uint16384:
+            s1024 = python_to_basis_int(s,s1024)
+            i = basis_index[npy_intp,uint16384_t](<general_basis_core[uint16384_t]*>B,False,Ns,<uint16384_t*>basis_ptr,s1024)
+        else:
+            raise TypeError("basis dtype {} not recognized.".format(basis.dtype))
+
+        return i
+
     @cython.boundscheck(False)
     def op_bra_ket(self,_np.ndarray ket,_np.ndarray bra,dtype[::1] M,object opstr,int[::1] indx,object J, object Np):
         cdef char[::1] c_opstr = bytearray(opstr,"utf-8")
@@ -546,6 +900,9 @@ cdef class general_basis_core_wrap:
             elif ket.dtype == uint64:
                 with nogil:
                     err = general_op_bra_ket(<general_basis_core[uint64_t]*>B,n_op,&c_opstr[0],&indx[0],JJ,Ns,<uint64_t*>ket_ptr,<uint64_t*>bra_ptr,&M[0])
+            elif ket.dtype == uint128:
+                with nogil:
+                    err = general_op_bra_ket(<general_basis_core[uint128_t]*>B,n_op,&c_opstr[0],&indx[0],JJ,Ns,<uint128_t*>ket_ptr,<uint128_t*>bra_ptr,&M[0])
             elif ket.dtype == uint256:
                 with nogil:
                     err = general_op_bra_ket(<general_basis_core[uint256_t]*>B,n_op,&c_opstr[0],&indx[0],JJ,Ns,<uint256_t*>ket_ptr,<uint256_t*>bra_ptr,&M[0])
@@ -569,6 +926,9 @@ cdef class general_basis_core_wrap:
             elif ket.dtype == uint64:
                 with nogil:
                     err = general_op_bra_ket_pcon(<general_basis_core[uint64_t]*>B,n_op,&c_opstr[0],&indx[0],JJ,Ns,Np_set,<uint64_t*>ket_ptr,<uint64_t*>bra_ptr,&M[0])
+            elif ket.dtype == uint128:
+                with nogil:
+                    err = general_op_bra_ket_pcon(<general_basis_core[uint128_t]*>B,n_op,&c_opstr[0],&indx[0],JJ,Ns,Np_set,<uint128_t*>ket_ptr,<uint128_t*>bra_ptr,&M[0])
             elif ket.dtype == uint256:
                 with nogil:
                     err = general_op_bra_ket_pcon(<general_basis_core[uint256_t]*>B,n_op,&c_opstr[0],&indx[0],JJ,Ns,Np_set,<uint256_t*>ket_ptr,<uint256_t*>bra_ptr,&M[0])
@@ -620,6 +980,9 @@ cdef class general_basis_core_wrap:
         elif states.dtype == uint64:
             with nogil:
                 general_representative(<general_basis_core[uint64_t]*>B,<uint64_t*>states_ptr,<uint64_t*>ref_states_ptr,g_out_ptr,sign_out_ptr,Ns)
+        elif states.dtype == uint128:
+            with nogil:
+                general_representative(<general_basis_core[uint128_t]*>B,<uint128_t*>states_ptr,<uint128_t*>ref_states_ptr,g_out_ptr,sign_out_ptr,Ns)
         elif states.dtype == uint256:
             with nogil:
                 general_representative(<general_basis_core[uint256_t]*>B,<uint256_t*>states_ptr,<uint256_t*>ref_states_ptr,g_out_ptr,sign_out_ptr,Ns)
@@ -653,6 +1016,9 @@ cdef class general_basis_core_wrap:
         elif states.dtype == uint64:
             with nogil:
                 err = general_normalization(<general_basis_core[uint64_t]*>B,<uint64_t*>states_ptr,&norms[0],Ns)
+        elif states.dtype == uint128:
+            with nogil:
+                err = general_normalization(<general_basis_core[uint128_t]*>B,<uint128_t*>states_ptr,&norms[0],Ns)
         elif states.dtype == uint256:
             with nogil:
                 err = general_normalization(<general_basis_core[uint256_t]*>B,<uint256_t*>states_ptr,&norms[0],Ns)
@@ -0,0 +1,200 @@
+#ifndef _GENERAL_BASIS_COUNT_H
+#define _GENERAL_BASIS_COUNT_H
+
+#include <vector>
+#include <cmath>
+#include "general_basis_core.h"
+#include "numpy/ndarraytypes.h"
+#include "openmp.h"
+
+namespace basis_general {
+
+// number of states in a symmetry sector without constructing the basis, from the character sum
+//
+//     Ns = 1/|G| sum_g conj(chi(g)) Tr[U_g],
+//
+// where the sum runs over the group elements g = prod_d t_d^{g_d} which are visited by check_state. The elements act
+// as signed site permutations: a state is invariant under g if its local states are constant along each cycle of
+// the permutation (up to the inversions), hence Tr[U_g] restricted to the particle sector(s) follows from a
+// polynomial in the particle numbers of the cycles of g and no states are visited. The fermionic sign of g is the
+// parity of the permutation of the occupied sites: (-1)^(l-1) for an occupied cycle of length l. Fermionic bases with
+// particle-hole transformations are not supported.
+
+
+struct site_cycle
+{
+	std::vector<int> sites;
+	std::vector<int> flips; // inversions between the first site of the cycle and each site.
+	bool odd; // odd number of inversions around the cycle.
+};
+
+
+inline void group_element_cycles(const int N,const int maps[],const int nt,const int g[],std::vector<site_cycle> &cycles){
+	// signed permutation of the group element: the local state on site i is moved to site pos[i], inverted if flip[i].
+	std::vector<int> pos(N),flip(N,0);
+	for(int i=0;i<N;i++){pos[i] = i;}
+
+	for(int d=0;d<nt;d++){
+		const int * map = maps + d*N;
+		for(int r=0;r<g[d];r++){
+			for(int i=0;i<N;i++){
+				const int j = map[pos[i]];
+				if(j < 0){
+					pos[i] = -(j+1);
+					flip[i] ^= 1;
+				}
+				else{
+					pos[i] = j;
+				}
+			}
+		}
+	}
+
+	cycles.clear();
+	std::vector<bool> visited(N,false);
+	for(int i=0;i<N;i++){
+		if(visited[i]){continue;}
+
+		site_cycle c;
+		int f = 0;
+		int j = i;
+		do{
+			visited[j] = true;
+			c.sites.push_back(j);
+			c.flips.push_back(f);
+			f ^= flip[j];
+			j = pos[j];
+		}while(j != i);
+
+		c.odd = f;
+		cycles.push_back(c);
+	}
+}
+
+
+template<class I>
+long double group_element_trace(general_basis_core<I> *B,const std::vector<site_cycle> &cycles,
+	const int n_sites,const int sps,const std::vector<int> &Np){
+	const int n_blocks = Np.size();
+	const bool fermionic = B->fermionic();
+
+	// poly[m]: weighted number of invariant states on the cycles visited so far with particle numbers m (mixed radix).
+	std::vector<npy_intp> strides(n_blocks+1,1);
+	for(int b=n_blocks-1;b>=0;b--){
+		strides[b] = strides[b+1]*(Np[b]+1);
+	}
+	const npy_intp size = strides[0];
+	std::vector<long double> poly(size,0),new_poly(size);
+	std::vector<int> dNp(n_blocks);
+	poly[0] = 1;
+
+	for(size_t n=0;n<cycles.size();n++){
+		const site_cycle &c = cycles[n];
+		const int l = c.sites.size();
+		int v_begin = 0, v_end = sps;
+		if(c.odd){
+			if(sps%2 == 0){
+				return 0;
+			}
+			v_begin = (sps-1)/2; // the local state must be invariant under the inversion.
+			v_end = v_begin + 1;
+		}
+
+		std::fill(new_poly.begin(),new_poly.end(),0);
+		for(int v=v_begin;v<v_end;v++){
+			std::fill(dNp.begin(),dNp.end(),0);
+			npy_intp shift = 0;
+			bool allowed = true;
+			for(int t=0;t<l;t++){
+				const int b = c.sites[t]/n_sites;
+				if(n_blocks > 0){
+					dNp[b] += (c.flips[t] ? sps-v-1 : v);
+				}
+			}
+			for(int b=0;b<n_blocks;b++){
+				allowed &= (dNp[b] <= Np[b]);
+				shift += dNp[b]*strides[b+1];
+			}
+			if(!allowed){continue;}
+
+			const long double w = ((fermionic && v && l%2 == 0) ? -1 : 1);
+
+			for(npy_intp m=0;m<size;m++){
+				if(poly[m] == 0){continue;}
+				bool fits = true;
+				for(int b=0;b<n_blocks;b++){
+					fits &= ((m / strides[b+1]) % (Np[b]+1) + dNp[b] <= Np[b]);
+				}
+				if(fits){
+					new_poly[m+shift] += w*poly[m];
+				}
+			}
+		}
+		poly.swap(new_poly);
+	}
+
+	return poly[size-1];
+}
+
+
+template<class I>
+npy_intp count_basis(general_basis_core<I> *B,const int qs[],const int n_sites,const int sps,const std::vector<int> &Np){
+	// number of states in the basis with quantum numbers qs in the particle sector Np (one particle number per
+	// species, empty: no particle conservation). returns -1 if the number can not be computed.
+	const int N = B->N;
+	const int nt = B->nt;
+	const int n_blocks = Np.size();
+
+	if(n_blocks > 0 && n_blocks*n_sites != N){
+		return -1;
+	}
+	for(int b=0;b<n_blocks;b++){
+		if(Np[b] < 0 || Np[b] > n_sites*(sps-1)){
+			return 0;
+		}
+	}
+
+	npy_intp n_elements = 1;
+	for(int d=0;d<nt;d++){
+		n_elements *= B->pers[d];
+	}
+
+	if(B->fermionic()){
+		// the signs of fermionic inversions depend on the order of the transformations in check_state.
+		for(npy_intp i=0;i<(npy_intp)nt*N;i++){
+			if(B->maps[i] < 0){
+				return -1;
+			}
+		}
+	}
+
+	long double total = 0;
+
+	#pragma omp parallel for schedule(dynamic) reduction(+:total)
+	for(npy_intp e=0;e<n_elements;e++){
+		std::vector<int> g(nt+1,0);
+		std::vector<site_cycle> cycles;
+		double k = 0;
+		npy_intp r = e;
+		for(int d=nt-1;d>=0;d--){
+			g[d] = r % B->pers[d];
+			r /= B->pers[d];
+			k += (2.0 * M_PI * qs[d] * g[d]) / B->pers[d];
+		}
+
+		group_element_cycles(N,B->maps,nt,&g[0],cycles);
+		total += std::cos(k) * group_element_trace(B,cycles,n_sites,sps,Np);
+	}
+
+	const long double Ns = total / n_elements;
+
+	if(!(Ns < 4e18)){
+		return -1;
+	}
+
+	return (npy_intp)std::llround(Ns);
+}
+
+}
+
+#endif
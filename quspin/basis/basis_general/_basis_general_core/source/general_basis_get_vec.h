@@ -91,7 +91,7 @@ bool get_vec_rep_pcon(general_basis_core<I> *B,
 {
 	bool err = true;
 	if(nt<=0){
-		const npy_intp full = binary_search(Ns_full,basis_pcon,s)*n_vec;
+		const npy_intp full = pcon_basis_index(B,Ns_full,basis_pcon,s)*n_vec;
 		err = update_out_dense(c,sign,n_vec,in,&out[full]);		
 		return err;
 	}
@@ -109,7 +109,7 @@ bool get_vec_rep_pcon(general_basis_core<I> *B,
 	}
 	else{
 		for(int j=0;j<per && err;j++){
-			const npy_intp full = binary_search(Ns_full,basis_pcon,s)*n_vec;
+			const npy_intp full = pcon_basis_index(B,Ns_full,basis_pcon,s)*n_vec;
 			err = update_out_dense(c,sign,n_vec,in,&out[full]);
 			c *= cc;
 			s = B->map_state(s,depth,sign);
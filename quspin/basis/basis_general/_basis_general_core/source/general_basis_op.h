@@ -5,6 +5,8 @@
 #include <complex>
 #include <algorithm>
 #include <limits>
+#include <vector>
+#include <utility>
 #include "general_basis_core.h"
 #include "numpy/ndarraytypes.h"
 #include "misc.h"
@@ -75,12 +77,7 @@ int general_op(general_basis_core<I> *B,
 				K j = i;
 				if(r != basis[i]){
 					I rr = B->ref_state(r,g,sign);
-					if(full_basis){
-						j = Ns - (npy_intp)rr - 1;
-					}
-					else{
-						j = binary_search(Ns,basis,rr);
-					}
+					j = basis_index<K>(B,full_basis,Ns,basis,rr);
 					
 				}
 				if(j >= 0){
@@ -112,6 +109,279 @@ int general_op(general_basis_core<I> *B,
 }
 
 
+template<class I, class J, class K>
+int inline op_matrix_element(general_basis_core<I> *B,
+						  const int nt,
+						  int g[],
+						  const int n_op,
+						  const char opstr[],
+						  const int indx[],
+						  const std::complex<double> A,
+						  const bool full_basis,
+						  const npy_intp Ns,
+						  const I basis[],
+						  const J n[],
+						  const npy_intp i,
+						  		K &j,
+						  		std::complex<double> &m
+						  )
+{
+	// computes <j|O|i> for a single term, j is set to -1 if the state is not in the basis.
+	I r = basis[i];
+	m = A;
+	int err = B->op(r,m,n_op,opstr,indx);
+
+	if(err == 0){
+		int sign = 1;
+
+		for(int k=0;k<nt;k++){
+			g[k]=0;
+		}
+
+		j = i;
+		if(r != basis[i]){
+			I rr = B->ref_state(r,g,sign);
+			j = basis_index<K>(B,full_basis,Ns,basis,rr);
+		}
+
+		if(j >= 0){
+			for(int k=0;k<nt;k++){
+				double q = (2.0*M_PI*B->qs[k]*g[k])/B->pers[k];
+				m *= std::exp(std::complex<double>(0,-q));
+			}
+			m *= sign * std::sqrt(double(n[j])/double(n[i]));
+		}
+	}
+
+	return err;
+}
+
+template<class I, class J, class K, class T>
+int inline state_matrix_elements(general_basis_core<I> *B,
+						  const int nt,
+						  int g[],
+						  const int n_terms,
+						  const int n_op[],
+						  const int offset[],
+						  const char opstr[],
+						  const int indx[],
+						  const std::complex<double> A[],
+						  const bool full_basis,
+						  const npy_intp Ns,
+						  const I basis[],
+						  const J n[],
+						  const npy_intp i,
+						  		std::vector<std::pair<K,std::complex<double> > > &elements
+						  )
+{
+	// applies all terms to state i and stores the non-zero elements of column i
+	// sorted by row with duplicate rows summed up.
+	elements.clear();
+
+	for(int t=0;t<n_terms;t++){
+		K j = -1;
+		std::complex<double> m;
+		int err = op_matrix_element(B,nt,g,n_op[t],opstr+offset[t],indx+offset[t],A[t],full_basis,Ns,basis,n,i,j,m);
+
+		if(err != 0){
+			return err;
+		}
+
+		if(j >= 0){
+			T me;
+			err = check_imag(m,&me);
+			if(err != 0){
+				return err;
+			}
+			elements.push_back(std::make_pair(j,std::complex<double>(me)));
+		}
+	}
+
+	std::sort(elements.begin(),elements.end(),
+		[](const std::pair<K,std::complex<double> > &a,const std::pair<K,std::complex<double> > &b){return a.first < b.first;});
+
+	npy_intp nnz = 0;
+	for(npy_intp k=0;k<(npy_intp)elements.size();k++){
+		if(nnz > 0 && elements[nnz-1].first == elements[k].first){
+			elements[nnz-1].second += elements[k].second;
+		}
+		else{
+			elements[nnz++] = elements[k];
+		}
+	}
+
+	npy_intp nz = 0;
+	for(npy_intp k=0;k<nnz;k++){
+		if(elements[k].second != 0.0){
+			elements[nz++] = elements[k];
+		}
+	}
+	elements.resize(nz);
+
+	return 0;
+}
+
+template<class I, class J, class K, class T>
+int general_op_list(general_basis_core<I> *B,
+						  const int n_terms,
+						  const int n_op[],
+						  const char opstr[],
+						  const int indx[],
+						  const std::complex<double> A[],
+						  const bool full_basis,
+						  const npy_intp Ns,
+						  const npy_intp start,
+						  const npy_intp stop,
+						  const I basis[],
+						  const J n[],
+						  		K row[],
+						  		T M[]
+						  )
+{
+	// applies a list of terms to the states [start,stop) in one pass. Column i gets the 
+	// n_terms slots starting at (i-start)*n_terms, unused slots are marked with row = -1.
+	int err = 0;
+	std::vector<int> offset(n_terms+1,0);
+	for(int t=0;t<n_terms;t++){
+		offset[t+1] = offset[t] + n_op[t];
+	}
+
+	#pragma omp parallel 
+	{
+		const int nt = B->get_nt();
+		const npy_intp Ns_block = stop - start;
+		const npy_intp chunk = std::max(Ns_block/(100*omp_get_num_threads()),(npy_intp)1);
+		int g[__GENERAL_BASIS_CORE__max_nt];
+		std::vector<std::pair<K,std::complex<double> > > elements;
+		elements.reserve(n_terms);
+
+		#pragma omp for schedule(dynamic,chunk)
+		for(npy_intp i=start;i<stop;i++){
+			if(err != 0){
+				continue;
+			}
+
+			int local_err = state_matrix_elements<I,J,K,T>(B,nt,g,n_terms,n_op,&offset[0],opstr,indx,A,full_basis,Ns,basis,n,i,elements);
+
+			if(local_err == 0){
+				K * row_i = row + (i-start)*n_terms;
+				T * M_i = M + (i-start)*n_terms;
+				npy_intp k = 0;
+				for(;k<(npy_intp)elements.size();k++){
+					row_i[k] = elements[k].first;
+					check_imag(elements[k].second,&M_i[k]);
+				}
+				for(;k<n_terms;k++){
+					row_i[k] = -1;
+					M_i[k] = 0;
+				}
+			}
+			else{
+				#pragma omp critical
+				err = local_err;
+			}
+		}
+	}
+	return err;
+}
+
+template<class I, class J, class K, class T>
+int general_op_list_csr(general_basis_core<I> *B,
+						  const int n_terms,
+						  const int n_op[],
+						  const char opstr[],
+						  const int indx[],
+						  const std::complex<double> A[],
+						  const bool full_basis,
+						  const npy_intp Ns,
+						  const I basis[],
+						  const J n[],
+						  const bool fill,
+						  		K indptr[],
+						  		K indices[],
+						  		T data[]
+						  )
+{
+	// two pass construction of the csr matrix of a list of terms:
+	// fill = false: counts the non-zero elements of every row, the count of row j is added to indptr[j+1].
+	// fill = true: indptr holds the row offsets, the elements are written directly into indices/data 
+	//              and every row is sorted by column index afterwards.
+	int err = 0;
+	std::vector<int> offset(n_terms+1,0);
+	for(int t=0;t<n_terms;t++){
+		offset[t+1] = offset[t] + n_op[t];
+	}
+
+	std::vector<K> pos;
+	if(fill){
+		pos.assign(indptr,indptr+Ns);
+	}
+
+	#pragma omp parallel 
+	{
+		const int nt = B->get_nt();
+		const npy_intp chunk = std::max(Ns/(100*omp_get_num_threads()),(npy_intp)1);
+		int g[__GENERAL_BASIS_CORE__max_nt];
+		std::vector<std::pair<K,std::complex<double> > > elements;
+		elements.reserve(n_terms);
+
+		#pragma omp for schedule(dynamic,chunk)
+		for(npy_intp i=0;i<Ns;i++){
+			if(err != 0){
+				continue;
+			}
+
+			int local_err = state_matrix_elements<I,J,K,T>(B,nt,g,n_terms,n_op,&offset[0],opstr,indx,A,full_basis,Ns,basis,n,i,elements);
+
+			if(local_err == 0){
+				for(npy_intp k=0;k<(npy_intp)elements.size();k++){
+					const K j = elements[k].first;
+					if(fill){
+						K p;
+						#pragma omp atomic capture
+						p = pos[j]++;
+
+						indices[p] = i;
+						check_imag(elements[k].second,&data[p]);
+					}
+					else{
+						#pragma omp atomic
+						indptr[j+1]++;
+					}
+				}
+			}
+			else{
+				#pragma omp critical
+				err = local_err;
+			}
+		}
+
+		if(fill && err == 0){
+			std::vector<std::pair<K,T> > row;
+
+			#pragma omp for schedule(dynamic,chunk)
+			for(npy_intp j=0;j<Ns;j++){
+				row.clear();
+				for(K p=indptr[j];p<indptr[j+1];p++){
+					row.push_back(std::make_pair(indices[p],data[p]));
+				}
+
+				std::sort(row.begin(),row.end(),
+					[](const std::pair<K,T> &a,const std::pair<K,T> &b){return a.first < b.first;});
+
+				K p = indptr[j];
+				for(npy_intp k=0;k<(npy_intp)row.size();k++,p++){
+					indices[p] = row[k].first;
+					data[p] = row[k].second;
+				}
+			}
+		}
+	}
+	return err;
+}
+
+
+
 
 
 
@@ -178,12 +448,7 @@ int general_inplace_op(general_basis_core<I> *B,
 				npy_intp j = i;
 				if(r != basis[i]){
 					I rr = B->ref_state(r,g,sign);
-					if(full_basis){
-						j = Ns - (npy_intp)rr - 1;
-					}
-					else{
-						j = binary_search(Ns,basis,rr);
-					}
+					j = basis_index<npy_intp>(B,full_basis,Ns,basis,rr);
 					
 				}
 
@@ -24,14 +24,14 @@ npy_intp make_basis_sequential(general_basis_core<I> *B,npy_intp MAX,npy_intp me
 	bool insuff_mem = false;
 
 	while(MAX != 0){
-		if(Ns>=mem_MAX){
-			insuff_mem = true;
-			break;
-		}
 		double norm = B->check_state(s);
 		npy_intp int_norm = norm;
 		
 		if(!check_nan(norm) && int_norm>0 ){
+			if(Ns>=mem_MAX){
+				insuff_mem = true;
+				break;
+			}
 			basis[Ns] = s;
 			n[Ns] = norm;
 			Ns++;
@@ -55,14 +55,14 @@ npy_intp make_basis_pcon_sequential(general_basis_core<I> *B,npy_intp MAX,npy_in
 	bool insuff_mem = false;
 
 	while(MAX!=0){
-		if(Ns>=mem_MAX){
-			insuff_mem = true;
-			break;
-		}
 		double norm = B->check_state(s);
 		npy_intp int_norm = norm;
 
 		if(!check_nan(norm) && int_norm>0 ){
+			if(Ns>=mem_MAX){
+				insuff_mem = true;
+				break;
+			}
 			basis[Ns] = s;
 			n[Ns] = norm;
 			Ns++;
@@ -127,14 +127,14 @@ npy_intp make_basis_parallel(general_basis_core<I> *B,const npy_intp MAX,const n
 			s += nthread;
 			chunk-=nthread;
 
-			if(Ns>=mem_MAX){
+			if(Ns>mem_MAX){
 				#pragma omp critical
 				insuff_mem=true;
 			}
 
 		}
 
-
+		#pragma omp barrier // all threads must see the final value of insuff_mem before the collective copy below.
 
 		if(!insuff_mem){
 
@@ -223,12 +223,14 @@ npy_intp make_basis_pcon_parallel(general_basis_core<I> *B,const npy_intp MAX,co
 			for(int i=0;i<nthread;i++){s=B->next_state_pcon(s);}
 			chunk-=nthread;
 
-			if(Ns>=mem_MAX){
+			if(Ns>mem_MAX){
 				#pragma omp critical
 				insuff_mem=true;
 			}
 		}
 
+		#pragma omp barrier
+
 		if(!insuff_mem){
 			master_pos_data[threadn+1] = thread_block.size();
 
@@ -282,6 +284,80 @@ npy_intp make_basis_pcon_parallel(general_basis_core<I> *B,const npy_intp MAX,co
 
 
 
+template<class I,class J>
+npy_intp make_basis_pcon_unrank(general_basis_core<I> *B,const npy_intp MAX,const npy_intp mem_MAX,I basis[],J n[]){
+	// the particle sector is split into contiguous chunks of equal size, the first state of each chunk is found from 
+	// the combinatorial index of the sector (B->pcon_index). Each chunk is searched independently and the chunks are
+	// concatenated in order, which gives the basis in ascending order without sorting.
+	const int nthread = omp_get_max_threads();
+	const npy_intp n_chunks = std::min((npy_intp)(8*nthread),MAX);
+	std::vector<std::vector<I> > chunk_states(n_chunks);
+	std::vector<std::vector<J> > chunk_norms(n_chunks);
+	std::vector<npy_intp> chunk_pos(n_chunks+1,0);
+	npy_intp Ns = 0;
+	bool insuff_mem = false;
+
+	#pragma omp parallel for schedule(dynamic,1)
+	for(npy_intp c=0;c<n_chunks;c++){
+		const npy_intp start = (MAX/n_chunks)*c + std::min(c,MAX%n_chunks);
+		const npy_intp size = MAX/n_chunks + (c < MAX%n_chunks ? 1 : 0);
+		std::vector<I> &states = chunk_states[c];
+		std::vector<J> &norms = chunk_norms[c];
+
+		bool abort;
+		#pragma omp atomic read
+		abort = insuff_mem;
+
+		if(abort){
+			continue;
+		}
+
+		I s = B->pcon_index.state(start);
+
+		for(npy_intp i=0;i<size;i++){
+			double norm = B->check_state(s);
+			npy_intp int_norm = norm;
+
+			if(!check_nan(norm) && int_norm>0 ){
+				states.push_back(s);
+				norms.push_back(int_norm);
+			}
+
+			if(i+1 < size){
+				s = B->next_state_pcon(s);
+			}
+		}
+
+		npy_intp Ns_tot;
+		#pragma omp atomic capture
+		{Ns += (npy_intp)states.size(); Ns_tot = Ns;}
+
+		if(Ns_tot > mem_MAX){
+			#pragma omp atomic write
+			insuff_mem = true;
+		}
+	}
+
+	if(insuff_mem){
+		return -1;
+	}
+
+	for(npy_intp c=0;c<n_chunks;c++){
+		chunk_pos[c+1] = chunk_pos[c] + chunk_states[c].size();
+	}
+
+	#pragma omp parallel for schedule(dynamic,1)
+	for(npy_intp c=0;c<n_chunks;c++){
+		std::copy(chunk_states[c].begin(),chunk_states[c].end(),basis+chunk_pos[c]);
+		std::copy(chunk_norms[c].begin(),chunk_norms[c].end(),n+chunk_pos[c]);
+		std::vector<I>().swap(chunk_states[c]);
+		std::vector<J>().swap(chunk_norms[c]);
+	}
+
+	return Ns;
+}
+
+
 template<class I,class J>
 npy_intp make_basis(general_basis_core<I> *B,npy_intp MAX,npy_intp mem_MAX,I basis[],J n[]){
 	const int nt =  B->get_nt();
@@ -300,7 +376,10 @@ npy_intp make_basis_pcon(general_basis_core<I> *B,npy_intp MAX,npy_intp mem_MAX,
 	const int nt =  B->get_nt();
 	const int nthreads = omp_get_max_threads();
 
-	if(nthreads>1 && MAX > nthreads && nt>0){
+	if(nthreads>1 && MAX > nthreads && B->pcon_index.Ns == MAX){
+		return make_basis_pcon_unrank(B,MAX,mem_MAX,basis,n);
+	}
+	else if(nthreads>1 && MAX > nthreads && nt>0){
 		return make_basis_pcon_parallel(B,MAX,mem_MAX,s,basis,n);
 	}
 	else{
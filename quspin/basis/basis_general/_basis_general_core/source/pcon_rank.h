@@ -0,0 +1,214 @@
+#ifndef _PCON_RANK_H
+#define _PCON_RANK_H
+
+#include <vector>
+#include <limits>
+#include "numpy/ndarraytypes.h"
+
+namespace basis_general {
+
+// index of a particle conserving basis without symmetries using the combinatorial number system.
+//
+// The states are numbers with n_species blocks of n_sites digits in base sps, the block of species 0 holds the
+// most significant digits. The basis contains all states with Np[b] particles (sum of digits) in block b,
+// sorted in descending order. The position of a state in the basis is computed digit by digit from the least
+// significant digit: the number of basis states smaller than s is the sum over all digits k of the number of
+// states which agree with s above digit k and have a smaller digit at k. This only requires a small table of
+// the number of ways to distribute m particles over k sites, so that no search over the basis array is needed.
+// The same table gives the inverse map (unranking) from the position of a state in the sector to the state.
+
+template<class I>
+class pcon_rank
+{
+	int n_sites;
+	int sps;
+	std::vector<int> Np;
+	// table[b][(k*(Np[b]+1)+m)*sps+d]: number of states of block b with digit v<d at site k, m particles
+	// on the sites 0,...,k and the same digits as s above site k.
+	std::vector<std::vector<npy_uintp> > table;
+	// count[b][k*(Np[b]+1)+m]: number of ways to put m particles on k sites.
+	std::vector<std::vector<npy_uintp> > count;
+	std::vector<npy_uintp> Ns_block;
+	// first and last state of the sector in descending order, they differ between sectors of equal size.
+	I s_max;
+	I s_min;
+
+	public:
+		npy_intp Ns; // number of states in the sector, -1 if the index is not set.
+
+		pcon_rank() : n_sites(0), sps(2), Ns(-1) {}
+
+		~pcon_rank() {}
+
+		void clear(){
+			Np.clear();
+			table.clear();
+			count.clear();
+			Ns_block.clear();
+			Ns = -1;
+		}
+
+		bool init(const int _n_sites,const int _sps,const std::vector<int> &_Np,const npy_intp max_size){
+			clear();
+
+			const npy_uintp max_count = (npy_uintp)std::numeric_limits<npy_intp>::max();
+			npy_uintp Ns_total = 1;
+			npy_intp size = 0;
+
+			for(int b=0;b<(int)_Np.size();b++){
+				if(_Np[b] < 0 || _Np[b] > _n_sites*(_sps-1)){
+					return false;
+				}
+				size += (npy_intp)_n_sites*(_Np[b]+1)*_sps;
+			}
+
+			if(size > max_size){
+				return false;
+			}
+
+			n_sites = _n_sites;
+			sps = _sps;
+			Np = _Np;
+			table.resize(Np.size());
+			count.resize(Np.size());
+			Ns_block.resize(Np.size());
+
+			for(int b=0;b<(int)Np.size();b++){
+				const int n = Np[b];
+				// counts saturated at max_count.
+				std::vector<npy_uintp> &C = count[b];
+				C.assign((n_sites+1)*(n+1),0);
+				C[0] = 1;
+				for(int k=1;k<=n_sites;k++){
+					for(int m=0;m<=n;m++){
+						npy_uintp c = 0;
+						for(int v=0;v<sps && v<=m;v++){
+							c = std::min(c + C[(k-1)*(n+1)+m-v],max_count);
+						}
+						C[k*(n+1)+m] = c;
+					}
+				}
+
+				std::vector<npy_uintp> &T = table[b];
+				T.assign((npy_intp)n_sites*(n+1)*sps,0);
+				for(int k=0;k<n_sites;k++){
+					for(int m=0;m<=n;m++){
+						npy_uintp c = 0;
+						for(int d=1;d<sps;d++){
+							if(m-d+1 >= 0){
+								c = std::min(c + C[k*(n+1)+m-d+1],max_count);
+							}
+							T[(k*(n+1)+m)*sps+d] = c;
+						}
+					}
+				}
+
+				Ns_block[b] = C[n_sites*(n+1)+n];
+				if(Ns_block[b] >= max_count || Ns_total > max_count/Ns_block[b]){
+					clear();
+					return false;
+				}
+				Ns_total *= Ns_block[b];
+			}
+
+			Ns = Ns_total;
+			s_max = state(Ns-1);
+			s_min = state(0);
+			return true;
+		}
+
+		bool matches(const npy_intp _Ns,const I _basis[]) const {
+			// true if _basis is the sector of the index, comparing the size alone does not distinguish sectors 
+			// with the same number of states (e.g. Np and n_sites*(sps-1)-Np).
+			return Ns > 0 && Ns == _Ns && _basis[0] == s_max && _basis[_Ns-1] == s_min;
+		}
+
+		npy_intp index(I s) const {
+			// returns the position of s in the basis, -1 if s is not part of the sector.
+			npy_uintp rank = 0;
+			npy_uintp stride = 1;
+
+			for(int b=(int)Np.size()-1;b>=0;b--){
+				const int n = Np[b];
+				const npy_uintp * T = &table[b][0];
+				npy_uintp rank_b = 0;
+				int m = 0;
+
+				for(int k=0;k<n_sites;k++){
+					int d;
+					if(sps == 2){
+						d = (int)(s & I(1));
+						s >>= 1;
+					}
+					else{
+						d = (int)(s % sps);
+						s /= sps;
+					}
+
+					if(d){
+						m += d;
+						if(m > n){
+							return -1;
+						}
+						rank_b += T[(k*(n+1)+m)*sps+d];
+					}
+				}
+
+				if(m != n){
+					return -1;
+				}
+
+				rank += rank_b * stride;
+				stride *= Ns_block[b];
+			}
+
+			if(s != I(0)){
+				return -1;
+			}
+
+			return Ns - (npy_intp)rank - 1;
+		}
+
+		I state(npy_intp rank) const {
+			// returns the state with rank smaller states in the sector, 0 <= rank < Ns.
+			std::vector<npy_uintp> rank_b(Np.size());
+			for(int b=(int)Np.size()-1;b>=0;b--){
+				rank_b[b] = (npy_uintp)rank % Ns_block[b];
+				rank /= Ns_block[b];
+			}
+
+			I s = 0;
+			for(int b=0;b<(int)Np.size();b++){
+				const int n = Np[b];
+				const npy_uintp * C = &count[b][0];
+				npy_uintp r = rank_b[b];
+				int m = n;
+
+				// digits from the most significant site: the states with a smaller digit at site k come first.
+				for(int k=n_sites-1;k>=0;k--){
+					int d = 0;
+					for(;d<sps-1 && d<m;d++){
+						const npy_uintp c = C[k*(n+1)+m-d];
+						if(r < c){
+							break;
+						}
+						r -= c;
+					}
+					m -= d;
+
+					if(sps == 2){
+						s = (s << 1) | I(d);
+					}
+					else{
+						s = s * I(sps) + I(d);
+					}
+				}
+			}
+
+			return s;
+		}
+};
+
+}
+
+#endif
@@ -118,6 +118,10 @@ class spinless_fermion_basis_core : public hcb_basis_core<I>
 
 		~spinless_fermion_basis_core(){}
 
+		bool fermionic() const{
+			return true;
+		}
+
 
 		// I map_state(I s,int n_map,int &sign){
 		// 	if(general_basis_core<I>::nt<=0){
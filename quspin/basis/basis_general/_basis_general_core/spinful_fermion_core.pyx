@@ -35,6 +35,11 @@ cdef class spinful_fermion_basis_core_wrap(general_basis_core_wrap):
                 self._basis_core = <void *> new spinful_fermion_basis_core[uint64_t](N,self._nt,&maps[0,0],&pers[0],&qs[0])
             else:
                 self._basis_core = <void *> new spinful_fermion_basis_core[uint64_t](N)
+        elif dtype == uint128:
+            if self._nt>0:
+                self._basis_core = <void *> new spinful_fermion_basis_core[uint128_t](N,self._nt,&maps[0,0],&pers[0],&qs[0])
+            else:
+                self._basis_core = <void *> new spinful_fermion_basis_core[uint128_t](N)
         elif dtype == uint256:
             if self._nt>0:
                 self._basis_core = <void *> new spinful_fermion_basis_core[uint256_t](N,self._nt,&maps[0,0],&pers[0],&qs[0])
@@ -66,6 +71,12 @@ cdef class spinful_fermion_basis_core_wrap(general_basis_core_wrap):
     def get_Ns_pcon(self,object Np):
         return comb(self._N,Np[0],exact=True)*comb(self._N,Np[1],exact=True)
 
+    def _Np_list(self,object Np):
+        if type(Np) is tuple and len(Np) == 2 and all(isinstance(np,(int,_np.integer)) for np in Np):
+            return [int(np) for np in Np]
+        else:
+            return None
+
     @cython.boundscheck(False)
     def make_basis(self,_np.ndarray basis,norm_type[:] n,object Np=None,uint8_t[:] count=None):
         cdef long Ns_1 = 0
@@ -32,6 +32,11 @@ cdef class spinless_fermion_basis_core_wrap(general_basis_core_wrap):
                 self._basis_core = <void *> new spinless_fermion_basis_core[uint64_t](N,self._nt,&maps[0,0],&pers[0],&qs[0])
             else:
                 self._basis_core = <void *> new spinless_fermion_basis_core[uint64_t](N)
+        elif dtype == uint128:
+            if self._nt>0:
+                self._basis_core = <void *> new spinless_fermion_basis_core[uint128_t](N,self._nt,&maps[0,0],&pers[0],&qs[0])
+            else:
+                self._basis_core = <void *> new spinless_fermion_basis_core[uint128_t](N)
         elif dtype == uint256:
             if self._nt>0:
                 self._basis_core = <void *> new spinless_fermion_basis_core[uint256_t](N,self._nt,&maps[0,0],&pers[0],&qs[0])
@@ -1,10 +1,14 @@
 import numpy as _np
 import scipy.sparse as _sp
 import os
-from ._basis_general_core.general_basis_utils import basis_int_to_python_int,_get_basis_index
+from ._basis_general_core.general_basis_utils import basis_int_to_python_int
+from ..._parallel import num_threads as _num_threads
 from ..lattice import lattice_basis
 import warnings
 
+# maximum number of matrix elements held in the scratch buffers of `_make_csr`.
+_MAX_BLOCK_ELEMENTS = 1<<22
+
 class GeneralBasisWarning(Warning):
 	pass
 
@@ -135,9 +139,13 @@ class basis_general(lattice_basis):
 		if sorted_items:
 			blocks,items = zip(*sorted_items)
 			items = list(items)
+			blocks = list(blocks)
 
 			for i in remove_index:
 				items.pop(i)
+				blocks.pop(i)
+
+			self._block_names = blocks # names of the blocks in the order of self._maps
 
 			n_maps = len(items)
 			maps,pers,qs,_ = zip(*items)
@@ -162,6 +170,7 @@ class basis_general(lattice_basis):
 						ValueError("repeated map in maps list.")
 
 		else:
+			self._block_names = []
 			self._maps = _np.array([[]],dtype=_np.int32)
 			self._qs   = _np.array([],dtype=_np.int32)
 			self._pers = _np.array([],dtype=_np.int32)
@@ -219,7 +228,11 @@ class basis_general(lattice_basis):
 		if type(s) is str:
 			s = int(s,self.sps)
 
-		return _get_basis_index(self.states,s)
+		i = self._core.index(self._basis,basis_int_to_python_int(s))
+		if i < 0:
+			raise ValueError("s must be representive state in basis. ")
+
+		return i
 	
 
 	def _reduce_n_dtype(self):
@@ -233,17 +246,7 @@ class basis_general(lattice_basis):
 		if not self._made_basis:
 			raise AttributeError('this function requires the basis to be constructed first; use basis.make().')
 
-		indx = _np.asarray(indx,dtype=_np.int32)
-
-		if len(opstr) != len(indx):
-			raise ValueError('length of opstr does not match length of indx')
-
-		if _np.any(indx >= self._N) or _np.any(indx < 0):
-			raise ValueError('values in indx falls outside of system')
-
-		extra_ops = set(opstr) - self._allowed_ops
-		if extra_ops:
-			raise ValueError("unrecognized characters {} in operator string.".format(extra_ops))
+		opstr,indx,J = self._core_term(opstr,indx,J)
 
 		if self._Ns <= 0:
 			return _np.array([],dtype=dtype),_np.array([],dtype=self._index_type),_np.array([],dtype=self._index_type)
@@ -280,11 +283,103 @@ class basis_general(lattice_basis):
 			if v_out.shape != v_in.shape:
 				raise ValueError("v_in.shape != v_out.shape")
 
-		indx = _np.ascontiguousarray(indx,dtype=_np.int32)
+		opstr,indx,J = self._core_term(opstr,indx,J)
 
 		self._core.inplace_op(v_in.reshape((self._Ns,-1)),v_out.reshape((self._Ns,-1)),conjugated,transposed,opstr,indx,J,self._basis,self._n)
 
 		return v_out
+
+	def _core_term(self,opstr,indx,J):
+		"""checks a term and brings it into the form (opstr,indx,J) which is passed to the basis core. All methods
+		which pass operator strings to the core (_Op, _inplace_Op, _make_csr) go through this method, subclasses 
+		override it to rewrite the terms (e.g. pauli matrices, spinful fermion sites)."""
+		indx = _np.ascontiguousarray(indx,dtype=_np.int32)
+
+		if len(opstr) != len(indx):
+			raise ValueError('length of opstr does not match length of indx')
+
+		if _np.any(indx >= self._N) or _np.any(indx < 0):
+			raise ValueError('values in indx falls outside of system')
+
+		extra_ops = set(opstr) - self._allowed_ops
+		if extra_ops:
+			raise ValueError("unrecognized characters {} in operator string.".format(extra_ops))
+
+		return opstr,indx,J
+
+	def _make_csr(self,op_list,dtype,two_pass=None):
+		"""builds the csr matrix of the sum of all terms (opstr,indx,J) in `op_list`.
+
+		All terms are applied to a basis state in a single parallel pass over the basis, the matrix elements of
+		every column are summed up in the core before they are written out. The states are processed in blocks
+		so that the scratch memory for the output stays bounded.
+
+		With `two_pass=True` the core first counts the non-zero elements of every row and then writes the
+		matrix elements directly into exactly sized `indptr/indices/data` arrays. This applies the operators twice
+		but avoids all intermediate buffers, so the peak memory is close to the size of the final matrix. By default
+		the two pass construction is used whenever the states would not fit into a single block.
+		"""
+		if not self._made_basis:
+			raise AttributeError('this function requires the basis to be constructed first; use basis.make().')
+
+		Ns = self._Ns
+		terms = [self._core_term(opstr,indx,J) for opstr,indx,J in op_list]
+
+		if Ns <= 0 or len(terms) == 0:
+			return _sp.csr_matrix((max(Ns,0),max(Ns,0)),dtype=dtype)
+
+		opstrs,indxs,Js = zip(*terms)
+		n_terms = len(terms)
+		n_op = _np.array([len(opstr) for opstr in opstrs],dtype=_np.int32)
+		opstr = "".join(opstrs)
+		indx = _np.ascontiguousarray(_np.concatenate(indxs),dtype=_np.int32)
+		J = _np.array(Js,dtype=_np.complex128)
+
+		if two_pass is None:
+			two_pass = Ns*n_terms > _MAX_BLOCK_ELEMENTS
+
+		if two_pass:
+			indptr = _np.zeros(Ns+1,dtype=self._index_type)
+			self._core.op_list_csr(indptr,indptr[:0],_np.zeros(0,dtype=dtype),n_op,opstr,indx,J,False,self._basis,self._n)
+
+			nnz = int(indptr.sum())
+			index_type = _np.result_type(_np.min_scalar_type(max(nnz,Ns)),_np.int32)
+			indptr = _np.cumsum(indptr,dtype=index_type)
+			indices = _np.empty(nnz,dtype=index_type)
+			data = _np.empty(nnz,dtype=dtype)
+			self._core.op_list_csr(indptr,indices,data,n_op,opstr,indx,J,True,self._basis,self._n)
+
+			return _sp.csr_matrix((data,indices,indptr),shape=(Ns,Ns),copy=False)
+
+		Ns_block = max(_MAX_BLOCK_ELEMENTS//n_terms,1)
+		row = _np.empty(min(Ns_block,Ns)*n_terms,dtype=self._index_type)
+		ME = _np.empty(min(Ns_block,Ns)*n_terms,dtype=dtype)
+
+		nnz = _np.zeros(Ns,dtype=_np.int64)
+		data_list = []
+		indices_list = []
+		for start in range(0,Ns,Ns_block):
+			stop = min(start+Ns_block,Ns)
+			self._core.op_list(row,ME,n_op,opstr,indx,J,start,stop,self._basis,self._n)
+
+			block_row = row[:(stop-start)*n_terms].reshape((stop-start,n_terms))
+			mask = block_row >= 0
+			nnz[start:stop] = mask.sum(axis=1)
+			indices_list.append(block_row[mask])
+			data_list.append(ME[:(stop-start)*n_terms].reshape((stop-start,n_terms))[mask])
+
+		del row,ME
+
+		indptr = _np.zeros(Ns+1,dtype=_np.int64)
+		_np.cumsum(nnz,out=indptr[1:])
+		indices = _np.concatenate(indices_list)
+		data = _np.concatenate(data_list)
+		del indices_list,data_list,nnz
+
+		# column i holds the matrix elements <j|O|i>, i.e. this is the csc format of the operator.
+		H = _sp.csc_matrix((data,indices,indptr),shape=(Ns,Ns),copy=False)
+
+		return H.tocsr()
 	
 	def get_proj(self,dtype,pcon=False):
 		"""Calculates transformation/projector from symmetry-reduced basis to full (symmetry-free) basis.
@@ -458,13 +553,62 @@ class basis_general(lattice_basis):
 		return static_blocks,dynamic_blocks
 
 
-	def make(self,Ns_block_est=None):
+	def count_states(self,**blocks):
+		"""Counts the states in a symmetry sector of the basis, without constructing the basis.
+
+		Notes
+		-----
+		The number of states follows from the characters of the symmetry group and the number of states which are invariant
+		under each group element; it is not available for fermionic bases with particle-hole symmetries.
+
+		Parameters
+		-----------
+		**blocks: optional
+			Quantum numbers of the symmetry blocks of the basis, e.g. `kxblock=1`, which replace the quantum numbers the basis 
+			was constructed with. The particle sector(s) are those of the basis.
+
+		Returns
+		--------
+		int
+			Number of states in the (symmetry-reduced) Hilbert space.
+
+		Examples
+		--------
+
+		>>> N = 8
+		>>> T = (np.arange(N)+1)%N
+		>>> basis = spin_basis_general(N,Nup=N//2,kblock=(T,0),make_basis=False)
+		>>> print([basis.count_states(kblock=k) for k in range(N)])
+
+		"""
+		qs = self._qs.copy()
+		for block,q in blocks.items():
+			if block not in self._blocks:
+				raise ValueError("{} is not a symmetry block of the basis.".format(block))
+
+			if block in self._block_names: # blocks of identity maps are removed.
+				qs[self._block_names.index(block)] = q
+
+		Ns = self._core.count_states(self._basis_dtype,qs,self._Np)
+		if Ns < 0:
+			raise ValueError("number of states can not be computed for the symmetries of this basis.")
+
+		return int(Ns)
+
+	def make(self,Ns_block_est=None,n_threads=None,index=None):
 		"""Creates the entire basis by calling the basis constructor.
 
 		Parameters
 		-----------
 		Ns_block_est: int, optional
-			Overwrites the internal estimate of the size of the reduced Hilbert space for the given symmetries. This can be used to help conserve memory if the exact size of the H-space is known ahead of time. 
+			Overwrites the size of the reduced Hilbert space for the given symmetries, which is used to allocate the basis. By default the exact size is computed beforehand (see `count_states`), or estimated if it is not available.
+		n_threads: int, optional
+			Number of OpenMP threads used to construct the basis, see `quspin.tools.misc.num_threads`. Default is `None`, which uses the current thread count of the calling thread.
+		index: str, optional
+			Secondary index used to find states in the (symmetry-reduced) basis when constructing operators, instead of a binary search over the whole basis:
+				* "hash": open addressing hash table, 16 to 32 bytes per state; a lookup costs about one random memory access.
+				* "prefix": table of the positions of the states for each value of their highest bits, about 0.5 bytes per state; the binary search is restricted to a small window of states.
+			Default is `None`, which uses the binary search. Particle conserving bases without symmetries in a single particle sector always use a combinatorial index.
 				
 		Returns
 		--------
@@ -482,22 +626,24 @@ class basis_general(lattice_basis):
 
 		"""
 
+		if index not in [None,"hash","prefix"]:
+			raise ValueError("index must be one of: None, 'hash' or 'prefix'.")
+
+		exact = False
 		if Ns_block_est is not None:
 			Ns = Ns_block_est
 		else:
-			Ns = max(self._Ns,1000)
+			with _num_threads(n_threads):
+				Ns = self._core.count_states(self._basis_dtype,self._qs,self._Np)
 
-		# preallocate variables
-		basis = _np.zeros(Ns,dtype=self._basis_dtype)
-		n = _np.zeros(Ns,dtype=self._n_dtype)
+			exact = Ns >= 0
+			Ns = max(Ns,1) if exact else max(self._Ns,1000)
 
-		# make basis
-		if self._count_particles and (self._Np is not None):
-			Np_list = _np.zeros_like(basis,dtype=_np.uint8)
-			Ns = self._core.make_basis(basis,n,Np=self._Np,count=Np_list)
-		else:
-			Np_list = None
-			Ns = self._core.make_basis(basis,n,Np=self._Np)
+		Ns,basis,n,Np_list = self._make_basis(Ns,n_threads)
+
+		if Ns < 0 and exact:
+			# the count assumes that the quantum numbers are compatible with the (non-commuting) symmetries.
+			Ns,basis,n,Np_list = self._make_basis(max(self._Ns,1000),n_threads)
 
 		if Ns < 0:
 				raise ValueError("estimate for size of reduced Hilbert-space is too low, please double check that transformation mappings are correct or use 'Ns_block_est' argument to give an upper bound of the block size.")
@@ -524,8 +670,29 @@ class basis_general(lattice_basis):
 		self._index_type = _np.result_type(_np.min_scalar_type(self._Ns),_np.int32)
 		self._reduce_n_dtype()
 
+		# O(1) index of the states in a single particle sector, replaces the binary search over the basis.
+		self._core.set_pcon_index(self._basis,self._Np)
+		with _num_threads(n_threads):
+			self._core.set_lookup(self._basis,index)
+
 		self._made_basis = True
 
+	def _make_basis(self,Ns,n_threads):
+		# preallocate variables
+		basis = _np.zeros(Ns,dtype=self._basis_dtype)
+		n = _np.zeros(Ns,dtype=self._n_dtype)
+
+		# make basis
+		with _num_threads(n_threads):
+			if self._count_particles and (self._Np is not None):
+				Np_list = _np.zeros_like(basis,dtype=_np.uint8)
+				Ns = self._core.make_basis(basis,n,Np=self._Np,count=Np_list)
+			else:
+				Np_list = None
+				Ns = self._core.make_basis(basis,n,Np=self._Np)
+
+		return Ns,basis,n,Np_list
+
 	def Op_bra_ket(self,opstr,indx,J,dtype,ket_states,reduce_output=True):
 		"""Finds bra states which connect given ket states by operator from a site-coupling list and an operator string.
 
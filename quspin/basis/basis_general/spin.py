@@ -174,25 +174,7 @@ class spin_basis_general(hcb_basis_general,higher_spin_basis_general):
 
 
 
-	def _Op(self,opstr,indx,J,dtype):
-		
-		if self._S == "1/2":
-			ME,row,col = hcb_basis_general._Op(self,opstr,indx,J,dtype)
-			if self._pauli==1:
-				n = len(opstr.replace("I",""))
-				ME *= (1<<n)
-			elif self._pauli==-1:
-				n = len(opstr.replace("I","").replace("+","").replace("-",""))
-				ME *= (1<<n)
-
-			return ME,row,col
-
-		else:
-			return higher_spin_basis_general._Op(self,opstr,indx,J,dtype)
-
-		
-
-	def _inplace_Op(self,v_in,opstr,indx,J,dtype,transposed=False,conjugated=False,v_out=None):
+	def _core_term(self,opstr,indx,J):
 		if self._S == "1/2":
 
 			if self._pauli==1:
@@ -202,12 +184,10 @@ class spin_basis_general(hcb_basis_general,higher_spin_basis_general):
 				n = len(opstr.replace("I","").replace("+","").replace("-",""))
 				J *= (1<<n)
 
-			return hcb_basis_general._inplace_Op(self,v_in,opstr,indx,J,dtype,transposed=transposed,conjugated=conjugated,v_out=v_out)
+			return hcb_basis_general._core_term(self,opstr,indx,J)
 
 		else:
-			return higher_spin_basis_general._inplace_Op(self,v_in,opstr,indx,J,dtype,transposed=transposed,conjugated=conjugated,v_out=v_out)
-
-		return ME,row,col		
+			return higher_spin_basis_general._core_term(self,opstr,indx,J)
 
 	def __type__(self):
 		return "<type 'qspin.basis.general_hcb'>"
@@ -34,6 +34,8 @@ classes
    quantum_operator
    exp_op
    quantum_LinearOperator
+   operator_cache
+   symbolic_plans
 
 functions
 ----------
@@ -53,4 +55,6 @@ from .quantum_operator_core import *
 from .quantum_LinearOperator_core import *
 from .hamiltonian_core import *
 from .exp_op_core import *
+from .operator_cache_core import *
+from .symbolic_plan_core import *
 
@@ -2,10 +2,48 @@
 
 
 
+import numpy as _np
+import threading as _threading
+
+# per thread state of the `memoize` context: the nesting depth and the last evaluation of every (f,args) pair
+# {(f,args):(t,f(t,*args))}, so that threads which evaluate drives concurrently do not share a cache.
+_memo_state = _threading.local()
+
+def _get_memo():
+	try:
+		return _memo_state.depth,_memo_state.memo
+	except AttributeError:
+		_memo_state.depth,_memo_state.memo = 0,{}
+		return _memo_state.depth,_memo_state.memo
+
+
+class memoize(object):
+	"""Context in which every (f,args) pair is evaluated at most once per time.
+
+	The right hand sides of the equations of motion evaluate all drives at the same time, inside this context
+	terms which share a drive (also within products and conjugates of functions) only call it once. The cache is
+	cleared when the outermost context is left, so that drives which depend on external state are never stale.
+	The context and its cache are local to the calling thread.
+	"""
+
+	def __enter__(self):
+		depth,_ = _get_memo()
+		_memo_state.depth = depth + 1
+		return self
+
+	def __exit__(self,exc_type,exc_value,traceback):
+		depth,memo = _get_memo()
+		_memo_state.depth = depth - 1
+		if _memo_state.depth == 0:
+			memo.clear()
+
+
 class function(object):
 	def __init__(self,f,args=()):
 		self._f = f
 		self._args = args
+		# the drive can declare whether it accepts arrays of times, otherwise this is tested on the first call of vectorized.
+		self._vectorizes = getattr(f,"vectorize",None)
 
 	def conjugate(self):
 		return conjugate_function(function(self._f,self._args))
@@ -39,7 +77,47 @@ class function(object):
 		return hash(hash_list)
 
 	def __call__(self,*args):
-		return self._f(*(args+self._args))
+		depth,memo = _get_memo()
+		if depth == 0 or len(args) != 1 or not _np.isscalar(args[0]):
+			return self._f(*(args+self._args))
+
+		t = args[0]
+		key = (self._f,self._args)
+		if key in memo:
+			t_memo,value = memo[key]
+			if t_memo == t:
+				return value
+
+		value = self._f(t,*self._args)
+		memo[key] = (t,value)
+		return value
+
+	def vectorized(self,times):
+		"""Evaluates the function at all times in the 1-d array `times` and returns the values as array.
+
+		The function is called with the whole array if it supports this, otherwise it is called once per time. 
+		Drives declare this with the attribute `f.vectorize = True/False`, without it the first call tries the 
+		array and falls back to single times on TypeError or ValueError (the drive is then evaluated twice).
+		"""
+		times = _np.asarray(times)
+
+		if self._vectorizes is None:
+			try:
+				values = _np.asarray(self._f(times,*self._args))
+			except (TypeError,ValueError):
+				values = None
+
+			self._vectorizes = values is not None and values.shape == times.shape
+			if self._vectorizes:
+				return values
+
+		if self._vectorizes:
+			values = _np.asarray(self._f(times,*self._args))
+			if values.shape != times.shape:
+				raise ValueError("vectorized drive returned an array of shape {0} for times of shape {1}.".format(values.shape,times.shape))
+			return values
+
+		return _np.array([self(t) for t in times])
 
 	def __mul__(self,other):
 		if self == other:
@@ -80,6 +158,9 @@ class mul_function(comm_binary_function):
 	def __call__(self,*args):
 		return self._function1(*args)*self._function2(*args)
 
+	def vectorized(self,times):
+		return self._function1.vectorized(times)*self._function2.vectorized(times)
+
 	def __str__(self):
 		return "({0} * {1})".format(self._function1.__str__(),self._function2.__str__())
 
@@ -105,6 +186,9 @@ class conjugate_function(function):
 	def __call__(self,*args):
 		return self._function1(*args).conjugate()
 
+	def vectorized(self,times):
+		return self._function1.vectorized(times).conjugate()
+
 	def conjugate(self):
 		return self._function1
 
@@ -129,6 +213,9 @@ class pow_function(function):
 	def __call__(self,*args):
 		return self._function1(*args)**self._p
 
+	def vectorized(self,times):
+		return self._function1.vectorized(times)**self._p
+
 	def __str__(self):
 		return "{0}^{1}".format(self._function1.__str__(),self._p)
 
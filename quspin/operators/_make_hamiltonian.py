@@ -2,17 +2,26 @@ from __future__ import print_function, division
 
 # the final version the sparse matrices are stored as, good format for dot produces with vectors.
 import scipy.sparse as _sp
+from scipy.sparse.csgraph import reverse_cuthill_mckee as _reverse_cuthill_mckee
 import warnings
 import numpy as _np
 from ._functions import function
+from ._oputils import _fused_csr_dot,_format_dot
+from .operator_cache_core import _get_active_cache
+from .symbolic_plan_core import _get_active_plans
+from .._parallel import _numa_csr
+from ..basis.base import basis as _basis
 
 
 
 def _check_almost_zero(matrix):
-	""" Check if matrix is almost zero. """
+	""" Check if matrix is almost zero. For matrix free operators only the couplings are checked, terms whose 
+	operator vanishes on the basis are removed when the operator is built (see _nonvanishing_terms). """
 	atol = 100*_np.finfo(matrix.dtype).eps
 
-	if _sp.issparse(matrix):
+	if isinstance(matrix,_matrix_free_operator):
+		return all(_np.abs(J) <= atol for _,_,J,_,_ in matrix._terms)
+	elif _sp.issparse(matrix) or isinstance(matrix,_custom_sparse_formats):
 		return _np.allclose(matrix.data,0,atol=atol)
 	else:
 		return _np.allclose(matrix,0,atol=atol)
@@ -86,11 +95,1060 @@ def test_function(func,func_args,dtype):
 
 
 
-def make_static(basis,static_list,dtype):
+def _assemble_csr(basis,op_list,dtype):
+	"""
+	args:
+		op_list=[(opstr_1,indx_1,J_1),...,(opstr_n,indx_n,J_n)], consolidated list of terms to add up.
+		dtype = the low level C-type which the matrix should store its values with.
+	returns:
+		H: a csr_matrix representation of the sum of all terms in op_list.
+
+	description:
+		this function hands the whole list of terms to the basis, which builds the matrix in one go. Basis 
+		classes with a compiled core (e.g. the general basis) apply all terms to a state in a single pass over 
+		the basis, the rest concatenate the output of basis.Op for every term and convert it to csr in one step.
+		If an operator_cache is active the matrix is looked up in (and stored to) the cache first. If symbolic_plans
+		are active the sparsity pattern of previous builds with the same terms is reused. The arrays of the new 
+		matrix are copied with the row partition of the parallel csr kernels, such that on NUMA machines every
+		thread reads the rows it multiplies from local memory.
+	"""
+	plans = _get_active_plans()
+	if plans is None:
+		make = lambda:_numa_csr(basis._make_csr(op_list,dtype))
+	else:
+		make = lambda:_numa_csr(plans.make_csr(basis,op_list,dtype))
+
+	cache = _get_active_cache()
+	if cache is None:
+		return make()
+	else:
+		return cache.make_csr(basis,op_list,dtype,make)
+
+
+def _nonvanishing_terms(basis,op_list,dtype):
+	"""
+	args:
+		op_list=[(opstr_1,indx_1,J_1),...,(opstr_n,indx_n,J_n)], consolidated list of terms.
+		dtype = the low level C-type of the matrix elements.
+	returns:
+		list of the terms in op_list which have nonzero matrix elements in the basis.
+
+	description:
+		a matrix free operator applies every term in each product, terms which vanish on the basis (e.g. 
+		spin flips in a magnetization sector) are removed once here. The matrix elements are computed for 
+		one term at a time, so that the memory of the full matrix is never needed.
+	"""
+	atol = 100*_np.finfo(dtype).eps
+	terms = []
+	for opstr,indx,J in op_list:
+		ME,_,_ = basis.Op(opstr,indx,J,dtype)
+		if _np.any(_np.abs(ME) > atol):
+			terms.append((opstr,indx,J))
+
+	return terms
+
+
+class _matrix_free_operator(object):
+	"""
+	description:
+		stores a list of terms (opstr,indx,J) together with the basis instead of the matrix. The terms are 
+		applied to vectors on the fly with basis.inplace_Op, which for the general basis runs the compiled 
+		inplace kernels. Each term carries a transposed and conjugated flag so that transposing or conjugating 
+		the operator does not require any matrix elements. The operator supports the parts of the sparse matrix 
+		interface used by the hamiltonian class: addition of other matrix free operators, multiplication by 
+		scalars, T, conj(), astype(), diagonal() and tocsr().
+	"""
+	def __init__(self,basis,terms,dtype):
+		if type(basis)._inplace_Op is _basis._inplace_Op:
+			# the default inplace_Op builds the matrix elements of every term in each product.
+			raise TypeError("matrix free operators require a basis with compiled inplace operators (e.g. spin_basis_general), not {}.".format(type(basis).__name__))
+
+		self._basis = basis
+		self._terms = list(terms)
+		self._dtype = _np.dtype(dtype)
+		self._shape = (basis.Ns,basis.Ns)
+
+	@property
+	def shape(self):
+		return self._shape
+
+	@property
+	def ndim(self):
+		return 2
+
+	@property
+	def dtype(self):
+		return self._dtype
+
+	@property
+	def nbytes(self):
+		return 0
+
+	@property
+	def T(self):
+		return self.transpose()
+
+	@property
+	def H(self):
+		return self.getH()
+
+	def transpose(self):
+		terms = [(opstr,indx,J,not transposed,conjugated) for opstr,indx,J,transposed,conjugated in self._terms]
+		return _matrix_free_operator(self._basis,terms,self._dtype)
+
+	def conj(self):
+		terms = [(opstr,indx,J,transposed,not conjugated) for opstr,indx,J,transposed,conjugated in self._terms]
+		return _matrix_free_operator(self._basis,terms,self._dtype)
+
+	def conjugate(self):
+		return self.conj()
+
+	def getH(self):
+		return self.conj().transpose()
+
+	def astype(self,dtype,copy=False):
+		return _matrix_free_operator(self._basis,self._terms,dtype)
+
+	def copy(self):
+		return _matrix_free_operator(self._basis,self._terms,self._dtype)
+
+	def _scale(self,a):
+		terms = [(opstr,indx,(_np.conj(a) if conjugated else a)*J,transposed,conjugated) for opstr,indx,J,transposed,conjugated in self._terms]
+		return _matrix_free_operator(self._basis,terms,_np.result_type(self._dtype,a))
+
+	def __neg__(self):
+		return self._scale(-1)
+
+	def __mul__(self,other):
+		if _np.isscalar(other):
+			return self._scale(other)
+		else:
+			return self.dot(other)
+
+	def __rmul__(self,other):
+		if _np.isscalar(other):
+			return self._scale(other)
+		else:
+			return NotImplemented
+
+	def __add__(self,other):
+		if isinstance(other,_matrix_free_operator):
+			if other._basis is not self._basis:
+				raise ValueError("matrix free operators must share the same basis.")
+			return _matrix_free_operator(self._basis,self._terms+other._terms,_np.result_type(self._dtype,other._dtype))
+		elif _sp.issparse(other) and other.nnz == 0: # empty parts of a hamiltonian
+			if other.shape != self._shape:
+				raise ValueError('shapes do not match')
+			return self.copy()
+		else:
+			raise TypeError("matrix free operators can only be added to other matrix free operators.")
+
+	def __radd__(self,other):
+		return self.__add__(other)
+
+	def __sub__(self,other):
+		return self.__add__(-other)
+
+	def __rsub__(self,other):
+		return (-self).__add__(other)
+
+	def _matvec(self,V,out=None,a=1.0,overwrite_out=False):
+		""" same signature as the matvec functions in _oputils: out (+)= a * self.dot(V). """
+		if _sp.issparse(V) or isinstance(V,_custom_sparse_base):
+			raise TypeError("matrix free operators can only be applied to dense arrays, use dot() for sparse matrices.")
+
+		V = _np.asarray(V)
+		result_dtype = _np.result_type(self._dtype,V.dtype)
+		if out is None:
+			out = _np.zeros(V.shape,dtype=result_dtype,order="C")
+			v_out = out
+		elif out.flags["C_CONTIGUOUS"] and out.dtype == result_dtype:
+			if overwrite_out:
+				out[...] = 0
+			v_out = out
+		else:
+			v_out = _np.zeros(V.shape,dtype=result_dtype,order="C")
+
+		v_in = _np.ascontiguousarray(V,dtype=result_dtype)
+		for opstr,indx,J,transposed,conjugated in self._terms:
+			JJ = (_np.conj(a) if conjugated else a)*J
+			self._basis.inplace_Op(v_in,opstr,indx,JJ,result_dtype,
+				transposed=transposed,conjugated=conjugated,v_out=v_out)
+
+		if v_out is not out:
+			if overwrite_out:
+				out[...] = v_out
+			else:
+				out += v_out
+
+		return out
+
+	def dot(self,V):
+		if _sp.issparse(V) or isinstance(V,_custom_sparse_base):
+			# the inplace operators only act on dense vectors.
+			return self.tocsr() * V
+
+		return self._matvec(V)
+
+	def diagonal(self):
+		diagonal = _np.zeros(self._shape[0],dtype=self._dtype)
+		for opstr,indx,J,transposed,conjugated in self._terms:
+			ME,row,col = self._basis.Op(opstr,indx,J,self._dtype)
+			mask = (row == col)
+			ME = ME[mask].conj() if conjugated else ME[mask]
+			_np.add.at(diagonal,row[mask],ME)
+
+		return diagonal
+
+	def tocsr(self):
+		groups = {}
+		for opstr,indx,J,transposed,conjugated in self._terms:
+			groups.setdefault((transposed,conjugated),[]).append((opstr,indx,J))
+
+		H = _sp.csr_matrix(self._shape,dtype=self._dtype)
+		for (transposed,conjugated),op_list in groups.items():
+			Ht = _assemble_csr(self._basis,op_list,self._dtype)
+			if conjugated:
+				Ht = Ht.conj()
+			if transposed:
+				Ht = Ht.T.tocsr()
+			H = H + Ht
+
+		return H
+
+	def __repr__(self):
+		return "<{0}x{1} matrix free operator of type '{2}' with {3} terms>".format(self._shape[0],self._shape[1],self._dtype,len(self._terms))
+
+	def __str__(self):
+		return "\n".join("{0} {1} {2}".format(opstr,indx,J) for opstr,indx,J,_,_ in self._terms)
+
+
+class _fused_csr_matrix(object):
+	"""
+	description:
+		joint csr storage of the static part and the dynamic parts of a hamiltonian. All parts share one row pointer,
+		every entry stores its column, the part (term) it belongs to and its value. The product H(t).V is computed by a 
+		single kernel which takes the coefficients [1,f_1(t),...,f_k(t)] of the parts, so that V and the output are 
+		streamed from memory only once instead of once per part.
+	"""
+	# the term ids are stored as uint16.
+	max_terms = 1<<16
+
+	def __init__(self,static,dynamic,dtype):
+		"""
+		args:
+			static = sparse matrix of the static part.
+			dynamic = dict with function objects as keys and sparse matrices as values.
+			dtype = the low level C-type which the matrix should store its values with.
+		"""
+		self._funcs = list(dynamic.keys())
+		matrices = [static] + [dynamic[func] for func in self._funcs]
+
+		if len(matrices) > self.max_terms:
+			raise ValueError("fused csr format supports at most {0} terms.".format(self.max_terms))
+
+		Ns = static.shape[0]
+		# place the parts next to each other, the block of an entry is its term id.
+		H = _sp.hstack([_sp.csr_matrix(M) for M in matrices],format="csr")
+		H.sort_indices()
+
+		index_type = _np.result_type(_np.min_scalar_type(max(H.nnz,Ns)),_np.int32)
+		self.indptr = H.indptr.astype(index_type)
+		self.indices = (H.indices % Ns).astype(index_type)
+		self.terms = (H.indices // Ns).astype(_np.uint16)
+		self.n_terms = len(matrices)
+		self.data = H.data.astype(dtype)
+		self.shape = static.shape
+		self.dtype = _np.dtype(dtype)
+
+	@property
+	def nbytes(self):
+		return self.indptr.nbytes + self.indices.nbytes + self.terms.nbytes + self.data.nbytes
+
+	def coefficients(self,time):
+		""" coefficients of the parts at time `time`. """
+		return [1.0] + [func(time) for func in self._funcs]
+
+	def coefficient_table(self,times):
+		""" (n_terms,len(times)) array with the coefficients of the parts at each time in `times`. """
+		table = _np.ones((self.n_terms,len(times)),dtype=_np.result_type(self.dtype,_np.float64))
+		for i,func in enumerate(self._funcs):
+			table[i+1,:] = func.vectorized(times)
+
+		return table
+
+	def dot(self,V,time,out=None,a=1.0,overwrite_out=True):
+		""" out (+)= a * H(time).V in a single sweep over V and out. """
+		return _fused_csr_dot(self,self.coefficients(time),V,out=out,a=a,overwrite_out=overwrite_out)
+
+
+class _custom_sparse_base(object):
+	"""
+	description:
+		base class of the custom sparse formats. It implements the scipy sparse matrix interface which hamiltonian and
+		quantum_operator use on top of the following hooks of the subclasses:
+
+			* tocsr(): the matrix as a csr matrix.
+			* _from_csr(matrix): a new matrix of the same format (and parameters) from a csr matrix.
+			* _map(func): a new matrix with the same structure whose stored arrays are mapped by func, which is one of 
+				conj(), astype(), negation or multiplication by a scalar.
+
+		dot products with states use the kernel of the `format` in _oputils._format_kernels. Subclasses override the 
+		methods below whenever the format allows for a cheaper implementation.
+	"""
+	# make sure numpy arrays defer the binary operators to this class.
+	__array_priority__ = 10.1
+
+	def _from_csr(self,matrix):
+		return type(self)(matrix)
+
+	def _map(self,func):
+		raise NotImplementedError
+
+	def _add_sparse(self,other):
+		""" sum with a sparse or custom sparse matrix of the same shape. """
+		return self._from_csr((self.tocsr() + other.tocsr()).tocsr())
+
+	@property
+	def ndim(self):
+		return 2
+
+	@property
+	def T(self):
+		return self.transpose()
+
+	@property
+	def H(self):
+		return self.getH()
+
+	def transpose(self,copy=False):
+		return self._from_csr(self.tocsr().transpose().tocsr())
+
+	def conj(self,copy=True):
+		return self._map(lambda x:x.conj())
+
+	def conjugate(self,copy=True):
+		return self.conj()
+
+	def getH(self,copy=False):
+		return self._from_csr(self.tocsr().getH().tocsr())
+
+	def astype(self,dtype,copy=False):
+		if _np.dtype(dtype) == self.dtype and not copy:
+			return self
+		return self._map(lambda x:x.astype(dtype))
+
+	def copy(self):
+		return type(self)(self,copy=True)
+
+	def sum_duplicates(self):
+		pass
+
+	def eliminate_zeros(self):
+		pass
+
+	def diagonal(self,k=0):
+		return self.tocsr().diagonal(k=k)
+
+	def tocsc(self,copy=False):
+		return self.tocsr().tocsc()
+
+	def tocoo(self,copy=False):
+		return self.tocsr().tocoo()
+
+	def toarray(self,order=None,out=None):
+		return self.tocsr().toarray(order=order,out=out)
+
+	def todense(self,order=None,out=None):
+		return self.tocsr().todense(order=order,out=out)
+
+	def _scale(self,a):
+		a = _np.asarray(a,dtype=_np.result_type(self.dtype,_np.min_scalar_type(a)))
+		return self._map(lambda x:x * a)
+
+	def __neg__(self):
+		return self._map(lambda x:-x)
+
+	def dot(self,other):
+		if _sp.issparse(other) or isinstance(other,_custom_sparse_base):
+			return self.tocsr() * other
+		
+		other = _np.asarray(other)
+		if other.ndim not in [1,2]:
+			raise ValueError("expecting 1 or 2 dimensional array.")
+
+		other = other.astype(_np.result_type(self.dtype,other.dtype),copy=False)
+		return _format_dot(self,other)
+
+	def __mul__(self,other):
+		if _np.isscalar(other):
+			return self._scale(other)
+		else:
+			return self.dot(other)
+
+	def __rmul__(self,other):
+		if _np.isscalar(other):
+			return self._scale(other)
+		else:
+			return other * self.tocsr()
+
+	def __add__(self,other):
+		if _sp.issparse(other) or isinstance(other,_custom_sparse_base):
+			if other.shape != self.shape:
+				raise ValueError('shapes do not match')
+			if _sp.issparse(other) and other.nnz == 0: # empty parts of a hamiltonian
+				return self.astype(_np.result_type(self.dtype,other.dtype),copy=True)
+			return self._add_sparse(other)
+		else:
+			return self.tocsr() + other
+
+	def __radd__(self,other):
+		return self.__add__(other)
+
+	def __sub__(self,other):
+		return self.__add__(-other)
+
+	def __rsub__(self,other):
+		return (-self).__add__(other)
+
+	def __str__(self):
+		return self.tocsr().__str__()
+
+class _herm_csr_matrix(_custom_sparse_base):
+	"""
+	description:
+		hermitian matrix which only stores its upper triangle (including the diagonal) in csr format, the lower 
+		triangle follows from hermiticity. This halves the memory of the matrix as well as the memory traffic of
+		the matrix-vector products, which are computed by the hermitian csr kernels in _oputils. Operations which 
+		keep the matrix hermitian (T, conj(), H, scaling by real numbers and addition of other hermitian matrices) 
+		return _herm_csr_matrix objects, all other operations fall back to the full csr matrix.
+	"""
+	format = "herm"
+
+	def __init__(self,matrix,copy=False):
+		"""
+		args:
+			matrix = hermitian matrix (sparse, dense or one of _custom_sparse_formats). Raises ValueError if the matrix is not hermitian.
+			copy = copy the upper triangle if matrix is a _herm_csr_matrix.
+		"""
+		if isinstance(matrix,_herm_csr_matrix):
+			self._upper = matrix._upper.copy() if copy else matrix._upper
+			return
+
+		if isinstance(matrix,_custom_sparse_base):
+			matrix = matrix.tocsr()
+
+		matrix = _sp.csr_matrix(matrix)
+		if matrix.shape[0] != matrix.shape[1]:
+			raise ValueError("hermitian format requires a square matrix.")
+
+		diff = matrix - matrix.getH()
+		if diff.nnz > 0:
+			atol = 100*_np.finfo(matrix.dtype).eps*max(1.0,abs(matrix).max())
+			if abs(diff).max() > atol:
+				raise ValueError("hermitian format requires a hermitian matrix.")
+
+		self._upper = _sp.triu(matrix,format="csr")
+		self._upper.sum_duplicates()
+		self._upper.sort_indices()
+
+	@classmethod
+	def _from_upper(cls,upper):
+		new = cls.__new__(cls)
+		new._upper = upper
+		return new
+
+	def _map(self,func):
+		return _herm_csr_matrix._from_upper(func(self._upper))
+
+	def _add_sparse(self,other):
+		if isinstance(other,_herm_csr_matrix):
+			return _herm_csr_matrix._from_upper(self._upper + other._upper)
+		else: # the sum is not hermitian in general.
+			return self.tocsr() + other.tocsr()
+
+	@property
+	def data(self):
+		return self._upper.data
+
+	@property
+	def indices(self):
+		return self._upper.indices
+
+	@property
+	def indptr(self):
+		return self._upper.indptr
+
+	@property
+	def shape(self):
+		return self._upper.shape
+
+	@property
+	def dtype(self):
+		return self._upper.dtype
+
+	@property
+	def nnz(self):
+		""" number of non-zero elements of the full matrix. """
+		n_diag = _np.count_nonzero(self._upper.diagonal())
+		return 2*self._upper.nnz - n_diag
+
+	@property
+	def nbytes(self):
+		return self.data.nbytes + self.indices.nbytes + self.indptr.nbytes
+
+	def transpose(self,copy=False):
+		return self.conj()
+
+	def getH(self,copy=False):
+		return self.copy()
+
+	def sum_duplicates(self):
+		self._upper.sum_duplicates()
+
+	def eliminate_zeros(self):
+		self._upper.eliminate_zeros()
+
+	def diagonal(self,k=0):
+		return self.tocsr().diagonal(k=k) if k != 0 else self._upper.diagonal()
+
+	def tocsr(self,copy=False):
+		strict_upper = _sp.triu(self._upper,k=1,format="csr")
+		H = (self._upper + strict_upper.getH()).tocsr()
+		H.sort_indices()
+		return H
+
+	def _scale(self,a):
+		if _np.isreal(a):
+			return _herm_csr_matrix._from_upper(self._upper * _np.real(a))
+		else:
+			return self.tocsr() * a
+
+	def __repr__(self):
+		return "<{0}x{1} hermitian matrix of type '{2}' with {3} stored elements in upper triangular Compressed Sparse Row format>".format(
+			self.shape[0],self.shape[1],self.dtype,self._upper.nnz)
+
+class _sell_matrix(_custom_sparse_base):
+	"""
+	description:
+		sparse matrix in sliced ELLPACK (SELL-C-sigma) format. The rows are sorted by their number of nonzeros within 
+		windows of `sigma` rows, and the sorted rows are grouped into slices of `C` rows. Each slice is padded to its 
+		longest row and stored column major, so that the matrix-vector product processes the `C` rows of a slice in 
+		lockstep with unit stride memory access, which can be vectorized by the compiler. For the nearly uniform row 
+		lengths of many-body Hamiltonians the padding is small. Structure changing operations (T, H, sums with other 
+		matrices) rebuild the format from the csr matrix.
+	"""
+	format = "sell"
+
+	def __init__(self,matrix,C=8,sigma=256,copy=False):
+		"""
+		args:
+			matrix = sparse, dense or one of _custom_sparse_formats to convert.
+			C = number of rows per slice.
+			sigma = number of rows within which the rows are sorted by length.
+			copy = copy the arrays if matrix is a _sell_matrix, otherwise the arrays are shared.
+		"""
+		if isinstance(matrix,_sell_matrix):
+			self._C,self._sigma,self._shape = matrix._C,matrix._sigma,matrix._shape
+			self._Sp,self._Sj,self._Sx,self._perm,self._row_nnz = matrix._Sp,matrix._Sj,matrix._Sx,matrix._perm,matrix._row_nnz
+			if copy:
+				self._Sp,self._Sj,self._Sx = self._Sp.copy(),self._Sj.copy(),self._Sx.copy()
+				self._perm,self._row_nnz = self._perm.copy(),self._row_nnz.copy()
+			return
+
+		C = int(C)
+		sigma = int(sigma)
+		if C < 1 or sigma < 1:
+			raise ValueError("C and sigma must be positive integers.")
+
+		if isinstance(matrix,_custom_sparse_base):
+			matrix = matrix.tocsr()
+
+		matrix = _sp.csr_matrix(matrix)
+		matrix.sum_duplicates()
+
+		n_row,n_col = matrix.shape
+		n_slices = (n_row + C - 1)//C
+		row_nnz = _np.diff(matrix.indptr)
+
+		# sort the rows by decreasing length within each window of sigma rows.
+		perm = _np.lexsort((-row_nnz,_np.arange(n_row)//sigma))
+		width = _np.zeros(n_slices*C,dtype=row_nnz.dtype)
+		width[:n_row] = row_nnz[perm]
+		width = width.reshape((n_slices,C)).max(axis=1)
+
+		nnz_padded = C*int(width.sum())
+		index_type = _np.result_type(_np.min_scalar_type(max(nnz_padded,n_row,n_col)),_np.int32)
+
+		self._C = C
+		self._sigma = sigma
+		self._shape = (n_row,n_col)
+		self._perm = perm.astype(index_type)
+		self._row_nnz = row_nnz
+		self._Sp = _np.zeros(n_slices+1,dtype=index_type)
+		_np.cumsum(C*width,out=self._Sp[1:])
+
+		pos = self._positions()
+		self._Sj = _np.zeros(nnz_padded,dtype=index_type)
+		self._Sx = _np.zeros(nnz_padded,dtype=matrix.dtype)
+		self._Sj[pos] = matrix.indices
+		self._Sx[pos] = matrix.data
+
+	def _positions(self):
+		""" positions of the entries of the csr matrix (in csr order) in the arrays of the sliced format. """
+		C = self._C
+		n_row = self._shape[0]
+		slot = _np.empty(n_row,dtype=_np.intp)
+		slot[self._perm] = _np.arange(n_row)
+
+		indptr = _np.zeros(n_row+1,dtype=_np.intp)
+		_np.cumsum(self._row_nnz,out=indptr[1:])
+		rows = _np.repeat(_np.arange(n_row),self._row_nnz)
+		k = _np.arange(indptr[-1]) - indptr[rows]
+		slot = slot[rows]
+		return self._Sp[slot//C] + k*C + slot%C
+
+	def _map(self,func):
+		new = _sell_matrix(self)
+		new._Sx = func(self._Sx)
+		return new
+
+	def _from_csr(self,matrix):
+		return _sell_matrix(matrix,C=self._C,sigma=self._sigma)
+
+	@property
+	def C(self):
+		return self._C
+
+	@property
+	def sigma(self):
+		return self._sigma
+
+	@property
+	def slice_ptr(self):
+		return self._Sp
+
+	@property
+	def indices(self):
+		return self._Sj
+
+	@property
+	def data(self):
+		return self._Sx
+
+	@property
+	def perm(self):
+		return self._perm
+
+	@property
+	def shape(self):
+		return self._shape
+
+	@property
+	def dtype(self):
+		return self._Sx.dtype
+
+	@property
+	def nnz(self):
+		""" number of stored elements without padding. """
+		return int(self._row_nnz.sum())
+
+	@property
+	def nbytes(self):
+		return self._Sx.nbytes + self._Sj.nbytes + self._Sp.nbytes + self._perm.nbytes
+
+	def tocsr(self,copy=False):
+		pos = self._positions()
+		indptr = _np.zeros(self._shape[0]+1,dtype=self._Sp.dtype)
+		_np.cumsum(self._row_nnz,out=indptr[1:])
+		return _sp.csr_matrix((self._Sx[pos],self._Sj[pos],indptr),shape=self._shape)
+
+	def __repr__(self):
+		return "<{0}x{1} sparse matrix of type '{2}' with {3} stored elements in Sliced ELLPACK format (C={4}, sigma={5})>".format(
+			self.shape[0],self.shape[1],self.dtype,self.nnz,self._C,self._sigma)
+
+class _palette_csr_matrix(_custom_sparse_base):
+	"""
+	description:
+		csr matrix which stores the table of its distinct matrix elements and for every nonzero a uint8 (up to 256 
+		distinct values) or uint16 (up to 65536 distinct values) code into this table instead of the matrix element 
+		itself. Operators with uniform couplings only have a handful of distinct matrix elements, for which this 
+		reduces the memory per nonzero from 12-20 bytes (complex128 value and column index) to 5-6 bytes. The 
+		matrix-vector kernels in _oputils decode the values on the fly. Operations which only act on the values 
+		(conj(), scaling, astype) keep the codes, structure changing operations rebuild the format from the csr matrix.
+	"""
+	format = "palette"
+	max_values = 1 << 16
+
+	def __init__(self,matrix,copy=False):
+		"""
+		args:
+			matrix = sparse, dense or one of _custom_sparse_formats to convert. Raises ValueError if the matrix has
+				more than 65536 distinct nonzero elements.
+			copy = copy the arrays if matrix is a _palette_csr_matrix, otherwise the arrays are shared.
+		"""
+		if isinstance(matrix,_palette_csr_matrix):
+			self._shape,self._indptr,self._indices = matrix._shape,matrix._indptr,matrix._indices
+			self._codes,self._values = matrix._codes,matrix._values
+			if copy:
+				self._indptr,self._indices = self._indptr.copy(),self._indices.copy()
+				self._codes,self._values = self._codes.copy(),self._values.copy()
+			return
+
+		if isinstance(matrix,_custom_sparse_base):
+			matrix = matrix.tocsr()
+
+		matrix = _sp.csr_matrix(matrix)
+		matrix.sum_duplicates()
+
+		values,codes = _np.unique(matrix.data,return_inverse=True)
+		if len(values) > self.max_values:
+			raise ValueError("palette format supports at most {0} distinct matrix elements, found {1}.".format(self.max_values,len(values)))
+
+		self._shape = matrix.shape
+		self._indptr = matrix.indptr
+		self._indices = matrix.indices
+		self._codes = codes.astype(_np.uint8 if len(values) <= 256 else _np.uint16)
+		self._values = values
+
+	def _map(self,func):
+		new = _palette_csr_matrix(self)
+		new._values = func(self._values)
+		return new
+
+	def _add_sparse(self,other):
+		H = (self.tocsr() + other.tocsr()).tocsr()
+		try:
+			return _palette_csr_matrix(H)
+		except ValueError: # too many distinct values, keep the csr matrix.
+			return H
+
+	@property
+	def indptr(self):
+		return self._indptr
+
+	@property
+	def indices(self):
+		return self._indices
+
+	@property
+	def codes(self):
+		return self._codes
+
+	@property
+	def values(self):
+		return self._values
+
+	@property
+	def data(self):
+		""" decoded nonzero elements. """
+		return self._values[self._codes]
+
+	@property
+	def shape(self):
+		return self._shape
+
+	@property
+	def dtype(self):
+		return self._values.dtype
+
+	@property
+	def nnz(self):
+		return len(self._indices)
+
+	@property
+	def nbytes(self):
+		return self._values.nbytes + self._codes.nbytes + self._indices.nbytes + self._indptr.nbytes
+
+	def tocsr(self,copy=False):
+		return _sp.csr_matrix((self.data,self._indices.copy(),self._indptr.copy()),shape=self._shape)
+
+	def __repr__(self):
+		return "<{0}x{1} sparse matrix of type '{2}' with {3} stored elements and {4} distinct values in palette Compressed Sparse Row format>".format(
+			self.shape[0],self.shape[1],self.dtype,self.nnz,len(self._values))
+
+class _split_diag_matrix(_custom_sparse_base):
+	"""
+	description:
+		square matrix which stores its diagonal as a dense vector and its off-diagonal entries as a csr matrix without 
+		diagonal entries. Diagonal terms (e.g. 'z' and 'zz' operator strings) do not need column indices in this format,
+		and the matrix-vector kernels in _oputils add the diagonal to the sweep over the off-diagonal rows. diagonal(), 
+		trace and the addition of diagonal matrices (e.g. shifts by a multiple of the identity) only act on the dense 
+		vector. Sums with other sparse matrices keep the format.
+	"""
+	format = "split"
+
+	def __init__(self,matrix,copy=False):
+		"""
+		args:
+			matrix = square matrix (sparse, dense or one of _custom_sparse_formats) to convert.
+			copy = copy the arrays if matrix is a _split_diag_matrix, otherwise the arrays are shared.
+		"""
+		if isinstance(matrix,_split_diag_matrix):
+			self._diag,self._offdiag = matrix._diag,matrix._offdiag
+			if copy:
+				self._diag,self._offdiag = self._diag.copy(),self._offdiag.copy()
+			return
+
+		if isinstance(matrix,_custom_sparse_base):
+			matrix = matrix.tocsr()
+
+		if not _sp.issparse(matrix):
+			matrix = _sp.csr_matrix(matrix)
+
+		if matrix.shape[0] != matrix.shape[1]:
+			raise ValueError("split diagonal format requires a square matrix.")
+
+		n = matrix.shape[0]
+		if _sp.isspmatrix_dia(matrix) and _np.all(matrix.offsets == 0): # purely diagonal, e.g. shifts by the identity.
+			diag = matrix.diagonal()
+			offdiag = _sp.csr_matrix(matrix.shape,dtype=matrix.dtype)
+		else:
+			matrix = _sp.csr_matrix(matrix)
+			matrix.sum_duplicates()
+			diag = matrix.diagonal()
+
+			rows = _np.repeat(_np.arange(n,dtype=matrix.indices.dtype),_np.diff(matrix.indptr))
+			mask = matrix.indices != rows
+			indptr = _np.zeros_like(matrix.indptr)
+			_np.cumsum(_np.bincount(rows[mask],minlength=n),out=indptr[1:])
+			offdiag = _sp.csr_matrix((matrix.data[mask],matrix.indices[mask],indptr),shape=matrix.shape)
+
+		self._diag = _np.ascontiguousarray(diag,dtype=matrix.dtype)
+		self._offdiag = offdiag
+
+	@classmethod
+	def _from_parts(cls,diag,offdiag):
+		dtype = _np.result_type(diag.dtype,offdiag.dtype)
+		new = cls.__new__(cls)
+		new._diag = _np.ascontiguousarray(diag,dtype=dtype)
+		new._offdiag = offdiag.astype(dtype,copy=False)
+		return new
+
+	def _map(self,func):
+		return _split_diag_matrix._from_parts(func(self._diag),func(self._offdiag))
+
+	def _add_sparse(self,other):
+		if not isinstance(other,_split_diag_matrix):
+			other = _split_diag_matrix(other)
+		if other._offdiag.nnz == 0: # only the diagonal changes.
+			return _split_diag_matrix._from_parts(self._diag + other._diag,self._offdiag.copy())
+		return _split_diag_matrix._from_parts(self._diag + other._diag,(self._offdiag + other._offdiag).tocsr())
+
+	@property
+	def diag(self):
+		return self._diag
+
+	@property
+	def offdiag(self):
+		return self._offdiag
+
+	@property
+	def indptr(self):
+		return self._offdiag.indptr
+
+	@property
+	def indices(self):
+		return self._offdiag.indices
+
+	@property
+	def offdiag_data(self):
+		return self._offdiag.data
+
+	@property
+	def data(self):
+		""" stored diagonal and off-diagonal elements. """
+		return _np.concatenate((self._diag,self._offdiag.data))
+
+	@property
+	def shape(self):
+		return self._offdiag.shape
+
+	@property
+	def dtype(self):
+		return self._diag.dtype
+
+	@property
+	def nnz(self):
+		return _np.count_nonzero(self._diag) + self._offdiag.nnz
+
+	@property
+	def nbytes(self):
+		return self._diag.nbytes + self._offdiag.data.nbytes + self._offdiag.indices.nbytes + self._offdiag.indptr.nbytes
+
+	def transpose(self,copy=False):
+		return _split_diag_matrix._from_parts(self._diag,self._offdiag.transpose().tocsr())
+
+	def getH(self,copy=False):
+		return _split_diag_matrix._from_parts(self._diag.conj(),self._offdiag.getH().tocsr())
+
+	def sum_duplicates(self):
+		self._offdiag.sum_duplicates()
+
+	def eliminate_zeros(self):
+		self._offdiag.eliminate_zeros()
+
+	def diagonal(self,k=0):
+		return self.tocsr().diagonal(k=k) if k != 0 else self._diag.copy()
+
+	def trace(self):
+		return self._diag.sum()
+
+	def tocsr(self,copy=False):
+		H = (self._offdiag + _sp.diags(self._diag,format="csr")).tocsr()
+		H.sort_indices()
+		return H
+
+	def __repr__(self):
+		return "<{0}x{1} sparse matrix of type '{2}' with {3} stored off-diagonal elements and a dense diagonal in split Compressed Sparse Row format>".format(
+			self.shape[0],self.shape[1],self.dtype,self._offdiag.nnz)
+
+class _reordered_csr_matrix(_custom_sparse_base):
+	"""
+	description:
+		square csr matrix whose rows and columns are stored in a bandwidth reducing order, i.e. the stored matrix is 
+		A[perm,:][:,perm] with the reverse Cuthill-McKee ordering perm of the sparsity graph of A (or a user supplied
+		permutation). The general basis is sorted by integer value, which scatters the column indices of the matrix 
+		over the whole state once Ns exceeds the cache. In the reordered matrix the nonzeros are close to the diagonal,
+		so the matrix-vector product reads the state from nearby memory. Iterative methods of hamiltonian (evolve, 
+		eigsh) permute the states into the order of the matrix once and back on exit. The matvec kernels in _oputils
+		read and write the states through the permutation, so that all other methods act on states in the order of 
+		the basis. Structure changing operations reuse the permutation of the matrix.
+	"""
+	format = "rcm"
+
+	def __init__(self,matrix,perm=None,copy=False):
+		"""
+		args:
+			matrix = square matrix (sparse, dense or one of _custom_sparse_formats) to reorder.
+			perm = permutation of the rows and columns, default is the reverse Cuthill-McKee ordering of the matrix.
+			copy = copy the arrays if matrix is a _reordered_csr_matrix, otherwise the arrays are shared.
+		"""
+		if isinstance(matrix,_reordered_csr_matrix) and perm is None:
+			self._perm,self._inv_perm,self._reordered = matrix._perm,matrix._inv_perm,matrix._reordered
+			if copy:
+				self._reordered = self._reordered.copy()
+			return
+
+		if isinstance(matrix,_custom_sparse_base):
+			matrix = matrix.tocsr()
+
+		matrix = _sp.csr_matrix(matrix)
+		if matrix.shape[0] != matrix.shape[1]:
+			raise ValueError("reordered format requires a square matrix.")
+
+		matrix.sum_duplicates()
+		n = matrix.shape[0]
+
+		if perm is None:
+			pattern = _sp.csr_matrix((_np.ones_like(matrix.indices),matrix.indices,matrix.indptr),shape=matrix.shape)
+			perm = _reverse_cuthill_mckee((pattern + pattern.T).tocsr(),symmetric_mode=True)
+
+		perm = _np.asarray(perm,dtype=_np.intp)
+		if perm.shape != (n,) or _np.any(_np.bincount(perm,minlength=n) != 1):
+			raise ValueError("perm must be a permutation of the {0} rows of the matrix.".format(n))
+
+		self._perm = perm
+		self._inv_perm = _np.empty_like(perm)
+		self._inv_perm[perm] = _np.arange(n,dtype=_np.intp)
+		self._reordered = matrix[perm,:][:,perm].tocsr()
+		self._reordered.sort_indices()
+
+	def _new(self,reordered):
+		new = _reordered_csr_matrix(self)
+		new._reordered = reordered
+		return new
+
+	def _map(self,func):
+		return self._new(func(self._reordered))
+
+	def _from_csr(self,matrix):
+		return _reordered_csr_matrix(matrix,perm=self._perm)
+
+	def _add_sparse(self,other):
+		if isinstance(other,_reordered_csr_matrix) and _np.array_equal(other._perm,self._perm):
+			return self._new((self._reordered + other._reordered).tocsr())
+		return self._from_csr((self.tocsr() + other.tocsr()).tocsr())
+
+	@property
+	def perm(self):
+		return self._perm
+
+	@property
+	def inv_perm(self):
+		return self._inv_perm
+
+	@property
+	def reordered(self):
+		return self._reordered
+
+	@property
+	def bandwidth(self):
+		""" largest distance of a stored element from the diagonal of the reordered matrix. """
+		if self._reordered.nnz == 0:
+			return 0
+		rows = _np.repeat(_np.arange(self.shape[0]),_np.diff(self._reordered.indptr))
+		return int(_np.abs(self._reordered.indices - rows).max())
+
+	@property
+	def data(self):
+		return self._reordered.data
+
+	@property
+	def shape(self):
+		return self._reordered.shape
+
+	@property
+	def dtype(self):
+		return self._reordered.dtype
+
+	@property
+	def nnz(self):
+		return self._reordered.nnz
+
+	@property
+	def nbytes(self):
+		R = self._reordered
+		return R.data.nbytes + R.indices.nbytes + R.indptr.nbytes + self._perm.nbytes + self._inv_perm.nbytes
+
+	def transpose(self,copy=False):
+		return self._new(self._reordered.transpose().tocsr())
+
+	def getH(self,copy=False):
+		return self._new(self._reordered.getH().tocsr())
+
+	def sum_duplicates(self):
+		self._reordered.sum_duplicates()
+
+	def eliminate_zeros(self):
+		self._reordered.eliminate_zeros()
+
+	def diagonal(self,k=0):
+		if k != 0:
+			return self.tocsr().diagonal(k=k)
+		return self._reordered.diagonal()[self._inv_perm]
+
+	def tocsr(self,copy=False):
+		H = self._reordered[self._inv_perm,:][:,self._inv_perm].tocsr()
+		H.sort_indices()
+		return H
+
+	def __repr__(self):
+		return "<{0}x{1} sparse matrix of type '{2}' with {3} stored elements and bandwidth {4} in reordered Compressed Sparse Row format>".format(
+			self.shape[0],self.shape[1],self.dtype,self.nnz,self.bandwidth)
+
+
+# sparse formats which are implemented in this module on top of the _oputils kernels.
+_custom_sparse_formats = (_herm_csr_matrix,_sell_matrix,_palette_csr_matrix,_split_diag_matrix,_reordered_csr_matrix)
+
+
+
+def make_static(basis,static_list,dtype,matrix_free=False):
 	"""
 	args:
 		static=[[opstr_1,indx_1],...,[opstr_n,indx_n]], list of opstr,indx to add up for static piece of Hamiltonian.
 		dtype = the low level C-type which the matrix should store its values with.
+		matrix_free = if True, returns a _matrix_free_operator which stores the list instead of the matrix.
 	returns:
 		H: a csr_matrix representation of the list static
 
@@ -103,24 +1161,26 @@ def make_static(basis,static_list,dtype):
 		to a csr_matrix class which has optimal sparse matrix vector multiplication.
 	"""
 	Ns=basis.Ns
-	H = _sp.dia_matrix((Ns,Ns),dtype=dtype)
 	static_list = _consolidate_static(static_list)
-	for opstr,indx,J in static_list:
-		
-		ME,row,col = basis.Op(opstr,indx,J,dtype)
-		H=H+_sp.csr_matrix((ME,(row,col)),shape=(Ns,Ns),dtype=dtype) 
+	if matrix_free:
+		static_list = _nonvanishing_terms(basis,static_list,dtype)
+		return _matrix_free_operator(basis,[(opstr,indx,J,False,False) for opstr,indx,J in static_list],dtype)
+
+	if not static_list:
+		return _sp.dia_matrix((Ns,Ns),dtype=dtype)
 
-	return H 
+	return _assemble_csr(basis,static_list,dtype)
 
 
 
 
 
-def make_dynamic(basis,dynamic_list,dtype):
+def make_dynamic(basis,dynamic_list,dtype,matrix_free=False):
 	"""
 	args:
 	dynamic=[[opstr_1,indx_1,func_1,func_1_args],...,[opstr_n,indx_n,func_n,func_n_args]], list of opstr,indx and functions to drive with
 	dtype = the low level C-type which the matrix should store its values with.
+	matrix_free = if True, the driven parts are stored as _matrix_free_operator objects.
 
 	returns:
 	tuple((func_1,func_1_args,H_1),...,(func_n_func_n_args,H_n))
@@ -134,29 +1194,28 @@ def make_dynamic(basis,dynamic_list,dtype):
 		representation of all the different driven parts. This way one can construct the time dependent 
 		Hamiltonian simply by looping over the tuple returned by this function. 
 	"""
-	Ns=basis.Ns
-	dynamic={}
+	dynamic_terms={}
 	dynamic_list = _consolidate_dynamic(dynamic_list)
 	for opstr,indx,J,f,f_args in dynamic_list:
 		if _np.isscalar(f_args): raise TypeError("function arguments must be array type")
 		test_function(f,f_args,dtype)
 
-		#indx = _np.asarray(indx,_np.int32)
-		ME,row,col = basis.Op(opstr,indx,J,dtype)
-		Ht =_sp.csr_matrix((ME,(row,col)),shape=(Ns,Ns),dtype=dtype) 
-
 		func = function(f,tuple(f_args))
-		if func in dynamic:
-			try:
-				dynamic[func] += Ht
-			except:
-				dynamic[func] = dynamic[func] + Ht
+		if func in dynamic_terms:
+			dynamic_terms[func].append((opstr,indx,J))
 		else:
-			dynamic[func] = Ht
+			dynamic_terms[func] = [(opstr,indx,J)]
 
-		if _check_almost_zero(dynamic[func]):
-			dynamic.pop(func)
+	dynamic={}
+	for func,op_list in dynamic_terms.items():
+		if matrix_free:
+			op_list = _nonvanishing_terms(basis,op_list,dtype)
+			Ht = _matrix_free_operator(basis,[(opstr,indx,J,False,False) for opstr,indx,J in op_list],dtype)
+		else:
+			Ht = _assemble_csr(basis,op_list,dtype)
 
+		if not _check_almost_zero(Ht):
+			dynamic[func] = Ht
 
 	return dynamic
 
@@ -165,13 +1224,5 @@ def make_dynamic(basis,dynamic_list,dtype):
 
 
 def make_op(basis,opstr,bonds,dtype):
-	Ns=basis.Ns
-	H=_sp.csr_matrix(([],([],[])),shape=(Ns,Ns),dtype=dtype)
-	for bond in bonds:
-		J=bond[0]
-		indx=bond[1:]
-		ME,row,col = basis.Op(opstr,indx,J,dtype)
-		H=H+_sp.csr_matrix((ME,(row,col)),shape=(Ns,Ns),dtype=dtype) 
-
-	
-	return H
+	op_list = [(opstr,bond[1:],bond[0]) for bond in bonds]
+	return _assemble_csr(basis,op_list,dtype)
@@ -8,6 +8,7 @@ from libcpp cimport bool
 from libcpp.vector cimport vector
 import scipy.sparse as _sp
 import numpy as _np
+from .._parallel import _numa_zeros
 from numpy cimport npy_intp,PyArray_Descr,ndarray,import_array
 
 
@@ -20,43 +21,127 @@ cdef extern from "oputils_impl.h": # generated by script generate_oputils.py
   #csr 
 
   void csr_matvec_gil(const int,const bool,const npy_intp,const npy_intp,void*,void*,void*,void*,
-    const npy_intp,void*,const npy_intp,void*)
+    const npy_intp,void*,const npy_intp,void*) nogil
 
   void csr_matvec_nogil(const int,const bool,const npy_intp,const npy_intp,void*,void*,void*,void*,
     const npy_intp,void*,const npy_intp,void*) nogil
 
   void csr_matvecs_gil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,void*,void*,void*,void*,
-    const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*)
+    const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*) nogil
 
   void csr_matvecs_nogil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,void*,void*,void*,void*,
     const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*) nogil
 
   # csc
   void csc_matvec_gil(const int,const bool,const npy_intp,const npy_intp,void*,void*,void*,void*,
-    const npy_intp,void*,const npy_intp,void*)
+    const npy_intp,void*,const npy_intp,void*) nogil
 
   void csc_matvec_nogil(const int,const bool,const npy_intp,const npy_intp,void*,void*,void*,void*,
     const npy_intp,void*,const npy_intp,void*) nogil
 
   void csc_matvecs_gil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,void*,void*,void*,void*,
-    const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*)
+    const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*) nogil
 
   void csc_matvecs_nogil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,void*,void*,void*,void*,
     const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*) nogil
 
   # dia
   void dia_matvec_gil(const int, const bool,const npy_intp,const npy_intp,const npy_intp,const npy_intp,
-                   void *,void *,void *,const npy_intp,void *,const npy_intp,void *)
+                   void *,void *,void *,const npy_intp,void *,const npy_intp,void *) nogil
 
   void dia_matvec_nogil(const int, const bool,const npy_intp,const npy_intp,const npy_intp,const npy_intp,
                    void *,void *,void *,const npy_intp,void *,const npy_intp,void *) nogil
 
   void dia_matvecs_gil(const int, const bool,const npy_intp,const npy_intp,const npy_intp,const npy_intp,const npy_intp,
-                   void *,void *,void *,const npy_intp,const npy_intp,void *,const npy_intp,const npy_intp,void *)
+                   void *,void *,void *,const npy_intp,const npy_intp,void *,const npy_intp,const npy_intp,void *) nogil
 
   void dia_matvecs_nogil(const int, const bool,const npy_intp,const npy_intp,const npy_intp,const npy_intp,const npy_intp,
                    void *,void *,void *,const npy_intp,const npy_intp,void *,const npy_intp,const npy_intp,void *) nogil
 
+  # hermitian csr
+  void herm_csr_matvec_gil(const int,const bool,const npy_intp,const npy_intp,void*,void*,void*,void*,
+    const npy_intp,void*,const npy_intp,void*) nogil
+
+  void herm_csr_matvec_nogil(const int,const bool,const npy_intp,const npy_intp,void*,void*,void*,void*,
+    const npy_intp,void*,const npy_intp,void*) nogil
+
+  void herm_csr_matvecs_gil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,void*,void*,void*,void*,
+    const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*) nogil
+
+  void herm_csr_matvecs_nogil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,void*,void*,void*,void*,
+    const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*) nogil
+
+  # fused csr
+  void fused_csr_matvec_gil(const int,const bool,const npy_intp,const npy_intp,void*,void*,void*,void*,void*,
+    const npy_intp,void*,const npy_intp,void*) nogil
+
+  void fused_csr_matvec_nogil(const int,const bool,const npy_intp,const npy_intp,void*,void*,void*,void*,void*,
+    const npy_intp,void*,const npy_intp,void*) nogil
+
+  void fused_csr_matvecs_gil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,void*,void*,void*,void*,void*,
+    const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*) nogil
+
+  void fused_csr_matvecs_nogil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,void*,void*,void*,void*,void*,
+    const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*) nogil
+
+  void fused_csr_matvecs_coeffs_gil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,void*,void*,void*,void*,void*,
+    const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*) nogil
+
+  void fused_csr_matvecs_coeffs_nogil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,void*,void*,void*,void*,void*,
+    const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*) nogil
+
+  # sliced ellpack
+  void sell_matvec_gil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,void*,void*,void*,void*,void*,
+    const npy_intp,void*,const npy_intp,void*) nogil
+
+  void sell_matvec_nogil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,void*,void*,void*,void*,void*,
+    const npy_intp,void*,const npy_intp,void*) nogil
+
+  void sell_matvecs_gil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,const npy_intp,void*,void*,void*,void*,void*,
+    const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*) nogil
+
+  void sell_matvecs_nogil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,const npy_intp,void*,void*,void*,void*,void*,
+    const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*) nogil
+
+  # palette csr
+  void palette_csr_matvec_gil(const int,const bool,const npy_intp,const npy_intp,void*,void*,const int,void*,void*,void*,
+    const npy_intp,void*,const npy_intp,void*) nogil
+
+  void palette_csr_matvec_nogil(const int,const bool,const npy_intp,const npy_intp,void*,void*,const int,void*,void*,void*,
+    const npy_intp,void*,const npy_intp,void*) nogil
+
+  void palette_csr_matvecs_gil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,void*,void*,const int,void*,void*,void*,
+    const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*) nogil
+
+  void palette_csr_matvecs_nogil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,void*,void*,const int,void*,void*,void*,
+    const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*) nogil
+
+  # split csr
+  void split_csr_matvec_gil(const int,const bool,const npy_intp,const npy_intp,void*,void*,void*,void*,void*,
+    const npy_intp,void*,const npy_intp,void*) nogil
+
+  void split_csr_matvec_nogil(const int,const bool,const npy_intp,const npy_intp,void*,void*,void*,void*,void*,
+    const npy_intp,void*,const npy_intp,void*) nogil
+
+  void split_csr_matvecs_gil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,void*,void*,void*,void*,void*,
+    const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*) nogil
+
+  void split_csr_matvecs_nogil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,void*,void*,void*,void*,void*,
+    const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*) nogil
+
+
+  # reordered csr
+  void rcm_csr_matvec_gil(const int,const bool,const npy_intp,const npy_intp,void*,void*,void*,void*,void*,
+    const npy_intp,void*,const npy_intp,void*) nogil
+
+  void rcm_csr_matvec_nogil(const int,const bool,const npy_intp,const npy_intp,void*,void*,void*,void*,void*,
+    const npy_intp,void*,const npy_intp,void*) nogil
+
+  void rcm_csr_matvecs_gil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,void*,void*,void*,void*,void*,
+    const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*) nogil
+
+  void rcm_csr_matvecs_nogil(const int,const bool,const npy_intp,const npy_intp,const npy_intp,void*,void*,void*,void*,void*,
+    const npy_intp,const npy_intp,void*,const npy_intp,const npy_intp,void*) nogil
 
 
 DEF MAX_NOGIL=100
@@ -80,10 +165,10 @@ cdef void _csr_matvec(bool overwrite_y, ndarray Ap,ndarray Aj, ndarray Ax,ndarra
   if switch_num < 0:
     raise TypeError("invalid types")
 
-  if nr < MAX_NOGIL:
-    csr_matvec_gil(switch_num,overwrite_y,nr,nc,Ap_ptr,Aj_ptr,Ax_ptr,a_ptr,xs,Xx_ptr,ys,Yx_ptr)
-  else:
-    with nogil: # uses openmp if QuSpin build against openmp.
+  with nogil: # allows concurrent matvecs from several python threads.
+    if nr < MAX_NOGIL: # serial kernels for small matrices.
+      csr_matvec_gil(switch_num,overwrite_y,nr,nc,Ap_ptr,Aj_ptr,Ax_ptr,a_ptr,xs,Xx_ptr,ys,Yx_ptr)
+    else: # uses openmp if QuSpin build against openmp.
       csr_matvec_nogil(switch_num,overwrite_y,nr,nc,Ap_ptr,Aj_ptr,Ax_ptr,a_ptr,xs,Xx_ptr,ys,Yx_ptr)
 
 cdef void _csr_matvecs(bool overwrite_y, ndarray Ap,ndarray Aj, ndarray Ax,ndarray a,ndarray Xx,ndarray Yx) except *:
@@ -108,10 +193,10 @@ cdef void _csr_matvecs(bool overwrite_y, ndarray Ap,ndarray Aj, ndarray Ax,ndarr
   if switch_num < 0:
     raise TypeError("invalid types")
 
-  if nr < MAX_NOGIL:
-    csr_matvecs_gil(switch_num,overwrite_y,nr,nc,nv,Ap_ptr,Aj_ptr,Ax_ptr,a_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
-  else:
-    with nogil: # uses openmp if QuSpin build against openmp.
+  with nogil: # allows concurrent matvecs from several python threads.
+    if nr < MAX_NOGIL: # serial kernels for small matrices.
+      csr_matvecs_gil(switch_num,overwrite_y,nr,nc,nv,Ap_ptr,Aj_ptr,Ax_ptr,a_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
+    else: # uses openmp if QuSpin build against openmp.
       csr_matvecs_nogil(switch_num,overwrite_y,nr,nc,nv,Ap_ptr,Aj_ptr,Ax_ptr,a_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
 
 
@@ -134,10 +219,10 @@ cdef void _csc_matvec(bool overwrite_y, ndarray Ap,ndarray Aj, ndarray Ax,ndarra
   if switch_num < 0:
     raise TypeError("invalid types")
 
-  if nr < MAX_NOGIL:
-    csc_matvec_gil(switch_num,overwrite_y,nr,nc,Ap_ptr,Aj_ptr,Ax_ptr,a_ptr,xs,Xx_ptr,ys,Yx_ptr)
-  else:
-    with nogil: # uses openmp if QuSpin build against openmp.
+  with nogil: # allows concurrent matvecs from several python threads.
+    if nr < MAX_NOGIL: # serial kernels for small matrices.
+      csc_matvec_gil(switch_num,overwrite_y,nr,nc,Ap_ptr,Aj_ptr,Ax_ptr,a_ptr,xs,Xx_ptr,ys,Yx_ptr)
+    else: # uses openmp if QuSpin build against openmp.
       csc_matvec_nogil(switch_num,overwrite_y,nr,nc,Ap_ptr,Aj_ptr,Ax_ptr,a_ptr,xs,Xx_ptr,ys,Yx_ptr)
 
 cdef void _csc_matvecs(bool overwrite_y, ndarray Ap,ndarray Aj, ndarray Ax,ndarray a,ndarray Xx,ndarray Yx) except *:
@@ -162,13 +247,298 @@ cdef void _csc_matvecs(bool overwrite_y, ndarray Ap,ndarray Aj, ndarray Ax,ndarr
   if switch_num < 0:
     raise TypeError("invalid types")
 
-  if nr < MAX_NOGIL:
-    csc_matvecs_gil(switch_num,overwrite_y,nr,nc,nv,Ap_ptr,Aj_ptr,Ax_ptr,a_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
-  else:
-    with nogil: # uses openmp if QuSpin build against openmp.
+  with nogil: # allows concurrent matvecs from several python threads.
+    if nr < MAX_NOGIL: # serial kernels for small matrices.
+      csc_matvecs_gil(switch_num,overwrite_y,nr,nc,nv,Ap_ptr,Aj_ptr,Ax_ptr,a_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
+    else: # uses openmp if QuSpin build against openmp.
       csc_matvecs_nogil(switch_num,overwrite_y,nr,nc,nv,Ap_ptr,Aj_ptr,Ax_ptr,a_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
 
 
+cdef void _herm_csr_matvec(bool overwrite_y, ndarray Ap,ndarray Aj, ndarray Ax,ndarray a,ndarray Xx,ndarray Yx) except *:
+  cdef PyArray_Descr * dtype1 = np.PyArray_DESCR(Ap)
+  cdef PyArray_Descr * dtype2 = np.PyArray_DESCR(Ax)
+  cdef PyArray_Descr * dtype3 = np.PyArray_DESCR(Xx)
+  cdef npy_intp ys = np.PyArray_STRIDE(Yx,0)
+  cdef npy_intp xs = np.PyArray_STRIDE(Xx,0)
+  cdef int switch_num = get_switch_num(dtype1,dtype2,dtype3)
+  cdef void * Ap_ptr = np.PyArray_DATA(Ap)
+  cdef void * Aj_ptr = np.PyArray_DATA(Aj)
+  cdef void * Ax_ptr = np.PyArray_DATA(Ax)
+  cdef void * Xx_ptr = np.PyArray_DATA(Xx)
+  cdef void * Yx_ptr = np.PyArray_DATA(Yx)
+  cdef void * a_ptr  = np.PyArray_DATA(a)
+  cdef npy_intp nr = np.PyArray_DIM(Yx,0)
+  cdef npy_intp nc = np.PyArray_DIM(Xx,0)
+
+  if switch_num < 0:
+    raise TypeError("invalid types")
+
+  with nogil: # allows concurrent matvecs from several python threads.
+    if nr < MAX_NOGIL: # serial kernels for small matrices.
+      herm_csr_matvec_gil(switch_num,overwrite_y,nr,nc,Ap_ptr,Aj_ptr,Ax_ptr,a_ptr,xs,Xx_ptr,ys,Yx_ptr)
+    else: # uses openmp if QuSpin build against openmp.
+      herm_csr_matvec_nogil(switch_num,overwrite_y,nr,nc,Ap_ptr,Aj_ptr,Ax_ptr,a_ptr,xs,Xx_ptr,ys,Yx_ptr)
+
+cdef void _herm_csr_matvecs(bool overwrite_y, ndarray Ap,ndarray Aj, ndarray Ax,ndarray a,ndarray Xx,ndarray Yx) except *:
+  cdef PyArray_Descr * dtype1 = np.PyArray_DESCR(Ap)
+  cdef PyArray_Descr * dtype2 = np.PyArray_DESCR(Ax)
+  cdef PyArray_Descr * dtype3 = np.PyArray_DESCR(Xx)
+  cdef npy_intp ysr = np.PyArray_STRIDE(Yx,0)
+  cdef npy_intp xsr = np.PyArray_STRIDE(Xx,0)
+  cdef npy_intp ysc = np.PyArray_STRIDE(Yx,1)
+  cdef npy_intp xsc = np.PyArray_STRIDE(Xx,1)
+  cdef int switch_num = get_switch_num(dtype1,dtype2,dtype3)
+  cdef void * Ap_ptr = np.PyArray_DATA(Ap)
+  cdef void * Aj_ptr = np.PyArray_DATA(Aj)
+  cdef void * Ax_ptr = np.PyArray_DATA(Ax)
+  cdef void * Xx_ptr = np.PyArray_DATA(Xx)
+  cdef void * Yx_ptr = np.PyArray_DATA(Yx)
+  cdef void * a_ptr  = np.PyArray_DATA(a)
+  cdef npy_intp nr = np.PyArray_DIM(Yx,0)
+  cdef npy_intp nc = np.PyArray_DIM(Xx,0)
+  cdef npy_intp nv = np.PyArray_DIM(Yx,1)
+
+  if switch_num < 0:
+    raise TypeError("invalid types")
+
+  with nogil: # allows concurrent matvecs from several python threads.
+    if nr < MAX_NOGIL: # serial kernels for small matrices.
+      herm_csr_matvecs_gil(switch_num,overwrite_y,nr,nc,nv,Ap_ptr,Aj_ptr,Ax_ptr,a_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
+    else: # uses openmp if QuSpin build against openmp.
+      herm_csr_matvecs_nogil(switch_num,overwrite_y,nr,nc,nv,Ap_ptr,Aj_ptr,Ax_ptr,a_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
+
+
+cdef void _sell_matvec(bool overwrite_y,npy_intp C,ndarray Sp,ndarray Sj,ndarray Sx,ndarray perm,ndarray a,ndarray Xx,ndarray Yx) except *:
+  cdef PyArray_Descr * dtype1 = np.PyArray_DESCR(Sp)
+  cdef PyArray_Descr * dtype2 = np.PyArray_DESCR(Sx)
+  cdef PyArray_Descr * dtype3 = np.PyArray_DESCR(Xx)
+  cdef npy_intp ys = np.PyArray_STRIDE(Yx,0)
+  cdef npy_intp xs = np.PyArray_STRIDE(Xx,0)
+  cdef int switch_num = get_switch_num(dtype1,dtype2,dtype3)
+  cdef void * Sp_ptr = np.PyArray_DATA(Sp)
+  cdef void * Sj_ptr = np.PyArray_DATA(Sj)
+  cdef void * Sx_ptr = np.PyArray_DATA(Sx)
+  cdef void * perm_ptr = np.PyArray_DATA(perm)
+  cdef void * Xx_ptr = np.PyArray_DATA(Xx)
+  cdef void * Yx_ptr = np.PyArray_DATA(Yx)
+  cdef void * a_ptr  = np.PyArray_DATA(a)
+  cdef npy_intp nr = np.PyArray_DIM(Yx,0)
+  cdef npy_intp nc = np.PyArray_DIM(Xx,0)
+
+  if switch_num < 0:
+    raise TypeError("invalid types")
+
+  with nogil: # allows concurrent matvecs from several python threads.
+    if nr < MAX_NOGIL: # serial kernels for small matrices.
+      sell_matvec_gil(switch_num,overwrite_y,nr,nc,C,Sp_ptr,Sj_ptr,Sx_ptr,perm_ptr,a_ptr,xs,Xx_ptr,ys,Yx_ptr)
+    else: # uses openmp if QuSpin build against openmp.
+      sell_matvec_nogil(switch_num,overwrite_y,nr,nc,C,Sp_ptr,Sj_ptr,Sx_ptr,perm_ptr,a_ptr,xs,Xx_ptr,ys,Yx_ptr)
+
+cdef void _sell_matvecs(bool overwrite_y,npy_intp C,ndarray Sp,ndarray Sj,ndarray Sx,ndarray perm,ndarray a,ndarray Xx,ndarray Yx) except *:
+  cdef PyArray_Descr * dtype1 = np.PyArray_DESCR(Sp)
+  cdef PyArray_Descr * dtype2 = np.PyArray_DESCR(Sx)
+  cdef PyArray_Descr * dtype3 = np.PyArray_DESCR(Xx)
+  cdef npy_intp ysr = np.PyArray_STRIDE(Yx,0)
+  cdef npy_intp xsr = np.PyArray_STRIDE(Xx,0)
+  cdef npy_intp ysc = np.PyArray_STRIDE(Yx,1)
+  cdef npy_intp xsc = np.PyArray_STRIDE(Xx,1)
+  cdef int switch_num = get_switch_num(dtype1,dtype2,dtype3)
+  cdef void * Sp_ptr = np.PyArray_DATA(Sp)
+  cdef void * Sj_ptr = np.PyArray_DATA(Sj)
+  cdef void * Sx_ptr = np.PyArray_DATA(Sx)
+  cdef void * perm_ptr = np.PyArray_DATA(perm)
+  cdef void * Xx_ptr = np.PyArray_DATA(Xx)
+  cdef void * Yx_ptr = np.PyArray_DATA(Yx)
+  cdef void * a_ptr  = np.PyArray_DATA(a)
+  cdef npy_intp nr = np.PyArray_DIM(Yx,0)
+  cdef npy_intp nc = np.PyArray_DIM(Xx,0)
+  cdef npy_intp nv = np.PyArray_DIM(Yx,1)
+
+  if switch_num < 0:
+    raise TypeError("invalid types")
+
+  with nogil: # allows concurrent matvecs from several python threads.
+    if nr < MAX_NOGIL: # serial kernels for small matrices.
+      sell_matvecs_gil(switch_num,overwrite_y,nr,nc,nv,C,Sp_ptr,Sj_ptr,Sx_ptr,perm_ptr,a_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
+    else: # uses openmp if QuSpin build against openmp.
+      sell_matvecs_nogil(switch_num,overwrite_y,nr,nc,nv,C,Sp_ptr,Sj_ptr,Sx_ptr,perm_ptr,a_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
+
+cdef void _palette_csr_matvec(bool overwrite_y,ndarray Ap,ndarray Aj,ndarray Ak,ndarray V,ndarray a,ndarray Xx,ndarray Yx) except *:
+  cdef PyArray_Descr * dtype1 = np.PyArray_DESCR(Ap)
+  cdef PyArray_Descr * dtype2 = np.PyArray_DESCR(V)
+  cdef PyArray_Descr * dtype3 = np.PyArray_DESCR(Xx)
+  cdef npy_intp ys = np.PyArray_STRIDE(Yx,0)
+  cdef npy_intp xs = np.PyArray_STRIDE(Xx,0)
+  cdef int switch_num = get_switch_num(dtype1,dtype2,dtype3)
+  cdef int code_size = np.PyArray_ITEMSIZE(Ak)
+  cdef void * Ap_ptr = np.PyArray_DATA(Ap)
+  cdef void * Aj_ptr = np.PyArray_DATA(Aj)
+  cdef void * Ak_ptr = np.PyArray_DATA(Ak)
+  cdef void * V_ptr = np.PyArray_DATA(V)
+  cdef void * Xx_ptr = np.PyArray_DATA(Xx)
+  cdef void * Yx_ptr = np.PyArray_DATA(Yx)
+  cdef void * a_ptr  = np.PyArray_DATA(a)
+  cdef npy_intp nr = np.PyArray_DIM(Yx,0)
+  cdef npy_intp nc = np.PyArray_DIM(Xx,0)
+
+  if switch_num < 0:
+    raise TypeError("invalid types")
+
+  if code_size not in [1,2]:
+    raise TypeError("palette codes must be uint8 or uint16.")
+
+  with nogil: # allows concurrent matvecs from several python threads.
+    if nr < MAX_NOGIL: # serial kernels for small matrices.
+      palette_csr_matvec_gil(switch_num,overwrite_y,nr,nc,Ap_ptr,Aj_ptr,code_size,Ak_ptr,V_ptr,a_ptr,xs,Xx_ptr,ys,Yx_ptr)
+    else: # uses openmp if QuSpin build against openmp.
+      palette_csr_matvec_nogil(switch_num,overwrite_y,nr,nc,Ap_ptr,Aj_ptr,code_size,Ak_ptr,V_ptr,a_ptr,xs,Xx_ptr,ys,Yx_ptr)
+
+cdef void _palette_csr_matvecs(bool overwrite_y,ndarray Ap,ndarray Aj,ndarray Ak,ndarray V,ndarray a,ndarray Xx,ndarray Yx) except *:
+  cdef PyArray_Descr * dtype1 = np.PyArray_DESCR(Ap)
+  cdef PyArray_Descr * dtype2 = np.PyArray_DESCR(V)
+  cdef PyArray_Descr * dtype3 = np.PyArray_DESCR(Xx)
+  cdef npy_intp ysr = np.PyArray_STRIDE(Yx,0)
+  cdef npy_intp xsr = np.PyArray_STRIDE(Xx,0)
+  cdef npy_intp ysc = np.PyArray_STRIDE(Yx,1)
+  cdef npy_intp xsc = np.PyArray_STRIDE(Xx,1)
+  cdef int switch_num = get_switch_num(dtype1,dtype2,dtype3)
+  cdef int code_size = np.PyArray_ITEMSIZE(Ak)
+  cdef void * Ap_ptr = np.PyArray_DATA(Ap)
+  cdef void * Aj_ptr = np.PyArray_DATA(Aj)
+  cdef void * Ak_ptr = np.PyArray_DATA(Ak)
+  cdef void * V_ptr = np.PyArray_DATA(V)
+  cdef void * Xx_ptr = np.PyArray_DATA(Xx)
+  cdef void * Yx_ptr = np.PyArray_DATA(Yx)
+  cdef void * a_ptr  = np.PyArray_DATA(a)
+  cdef npy_intp nr = np.PyArray_DIM(Yx,0)
+  cdef npy_intp nc = np.PyArray_DIM(Xx,0)
+  cdef npy_intp nv = np.PyArray_DIM(Yx,1)
+
+  if switch_num < 0:
+    raise TypeError("invalid types")
+
+  if code_size not in [1,2]:
+    raise TypeError("palette codes must be uint8 or uint16.")
+
+  with nogil: # allows concurrent matvecs from several python threads.
+    if nr < MAX_NOGIL: # serial kernels for small matrices.
+      palette_csr_matvecs_gil(switch_num,overwrite_y,nr,nc,nv,Ap_ptr,Aj_ptr,code_size,Ak_ptr,V_ptr,a_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
+    else: # uses openmp if QuSpin build against openmp.
+      palette_csr_matvecs_nogil(switch_num,overwrite_y,nr,nc,nv,Ap_ptr,Aj_ptr,code_size,Ak_ptr,V_ptr,a_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
+
+
+cdef void _split_csr_matvec(bool overwrite_y,ndarray Ap,ndarray Aj,ndarray Ax,ndarray Ad,ndarray a,ndarray Xx,ndarray Yx) except *:
+  cdef PyArray_Descr * dtype1 = np.PyArray_DESCR(Ap)
+  cdef PyArray_Descr * dtype2 = np.PyArray_DESCR(Ax)
+  cdef PyArray_Descr * dtype3 = np.PyArray_DESCR(Xx)
+  cdef npy_intp ys = np.PyArray_STRIDE(Yx,0)
+  cdef npy_intp xs = np.PyArray_STRIDE(Xx,0)
+  cdef int switch_num = get_switch_num(dtype1,dtype2,dtype3)
+  cdef void * Ap_ptr = np.PyArray_DATA(Ap)
+  cdef void * Aj_ptr = np.PyArray_DATA(Aj)
+  cdef void * Ax_ptr = np.PyArray_DATA(Ax)
+  cdef void * Ad_ptr = np.PyArray_DATA(Ad)
+  cdef void * Xx_ptr = np.PyArray_DATA(Xx)
+  cdef void * Yx_ptr = np.PyArray_DATA(Yx)
+  cdef void * a_ptr  = np.PyArray_DATA(a)
+  cdef npy_intp nr = np.PyArray_DIM(Yx,0)
+  cdef npy_intp nc = np.PyArray_DIM(Xx,0)
+
+  if switch_num < 0:
+    raise TypeError("invalid types")
+
+  with nogil: # allows concurrent matvecs from several python threads.
+    if nr < MAX_NOGIL: # serial kernels for small matrices.
+      split_csr_matvec_gil(switch_num,overwrite_y,nr,nc,Ap_ptr,Aj_ptr,Ax_ptr,Ad_ptr,a_ptr,xs,Xx_ptr,ys,Yx_ptr)
+    else: # uses openmp if QuSpin build against openmp.
+      split_csr_matvec_nogil(switch_num,overwrite_y,nr,nc,Ap_ptr,Aj_ptr,Ax_ptr,Ad_ptr,a_ptr,xs,Xx_ptr,ys,Yx_ptr)
+
+cdef void _split_csr_matvecs(bool overwrite_y,ndarray Ap,ndarray Aj,ndarray Ax,ndarray Ad,ndarray a,ndarray Xx,ndarray Yx) except *:
+  cdef PyArray_Descr * dtype1 = np.PyArray_DESCR(Ap)
+  cdef PyArray_Descr * dtype2 = np.PyArray_DESCR(Ax)
+  cdef PyArray_Descr * dtype3 = np.PyArray_DESCR(Xx)
+  cdef npy_intp ysr = np.PyArray_STRIDE(Yx,0)
+  cdef npy_intp xsr = np.PyArray_STRIDE(Xx,0)
+  cdef npy_intp ysc = np.PyArray_STRIDE(Yx,1)
+  cdef npy_intp xsc = np.PyArray_STRIDE(Xx,1)
+  cdef int switch_num = get_switch_num(dtype1,dtype2,dtype3)
+  cdef void * Ap_ptr = np.PyArray_DATA(Ap)
+  cdef void * Aj_ptr = np.PyArray_DATA(Aj)
+  cdef void * Ax_ptr = np.PyArray_DATA(Ax)
+  cdef void * Ad_ptr = np.PyArray_DATA(Ad)
+  cdef void * Xx_ptr = np.PyArray_DATA(Xx)
+  cdef void * Yx_ptr = np.PyArray_DATA(Yx)
+  cdef void * a_ptr  = np.PyArray_DATA(a)
+  cdef npy_intp nr = np.PyArray_DIM(Yx,0)
+  cdef npy_intp nc = np.PyArray_DIM(Xx,0)
+  cdef npy_intp nv = np.PyArray_DIM(Yx,1)
+
+  if switch_num < 0:
+    raise TypeError("invalid types")
+
+  with nogil: # allows concurrent matvecs from several python threads.
+    if nr < MAX_NOGIL: # serial kernels for small matrices.
+      split_csr_matvecs_gil(switch_num,overwrite_y,nr,nc,nv,Ap_ptr,Aj_ptr,Ax_ptr,Ad_ptr,a_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
+    else: # uses openmp if QuSpin build against openmp.
+      split_csr_matvecs_nogil(switch_num,overwrite_y,nr,nc,nv,Ap_ptr,Aj_ptr,Ax_ptr,Ad_ptr,a_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
+
+
+cdef void _rcm_csr_matvec(bool overwrite_y,ndarray Ap,ndarray Aj,ndarray Ax,ndarray P,ndarray a,ndarray Xx,ndarray Yx) except *:
+  cdef PyArray_Descr * dtype1 = np.PyArray_DESCR(Ap)
+  cdef PyArray_Descr * dtype2 = np.PyArray_DESCR(Ax)
+  cdef PyArray_Descr * dtype3 = np.PyArray_DESCR(Xx)
+  cdef npy_intp ys = np.PyArray_STRIDE(Yx,0)
+  cdef npy_intp xs = np.PyArray_STRIDE(Xx,0)
+  cdef int switch_num = get_switch_num(dtype1,dtype2,dtype3)
+  cdef void * Ap_ptr = np.PyArray_DATA(Ap)
+  cdef void * Aj_ptr = np.PyArray_DATA(Aj)
+  cdef void * Ax_ptr = np.PyArray_DATA(Ax)
+  cdef void * P_ptr = np.PyArray_DATA(P)
+  cdef void * Xx_ptr = np.PyArray_DATA(Xx)
+  cdef void * Yx_ptr = np.PyArray_DATA(Yx)
+  cdef void * a_ptr  = np.PyArray_DATA(a)
+  cdef npy_intp nr = np.PyArray_DIM(Yx,0)
+  cdef npy_intp nc = np.PyArray_DIM(Xx,0)
+
+  if switch_num < 0:
+    raise TypeError("invalid types")
+
+  with nogil: # allows concurrent matvecs from several python threads.
+    if nr < MAX_NOGIL: # serial kernels for small matrices.
+      rcm_csr_matvec_gil(switch_num,overwrite_y,nr,nc,Ap_ptr,Aj_ptr,Ax_ptr,P_ptr,a_ptr,xs,Xx_ptr,ys,Yx_ptr)
+    else: # uses openmp if QuSpin build against openmp.
+      rcm_csr_matvec_nogil(switch_num,overwrite_y,nr,nc,Ap_ptr,Aj_ptr,Ax_ptr,P_ptr,a_ptr,xs,Xx_ptr,ys,Yx_ptr)
+
+cdef void _rcm_csr_matvecs(bool overwrite_y,ndarray Ap,ndarray Aj,ndarray Ax,ndarray P,ndarray a,ndarray Xx,ndarray Yx) except *:
+  cdef PyArray_Descr * dtype1 = np.PyArray_DESCR(Ap)
+  cdef PyArray_Descr * dtype2 = np.PyArray_DESCR(Ax)
+  cdef PyArray_Descr * dtype3 = np.PyArray_DESCR(Xx)
+  cdef npy_intp ysr = np.PyArray_STRIDE(Yx,0)
+  cdef npy_intp xsr = np.PyArray_STRIDE(Xx,0)
+  cdef npy_intp ysc = np.PyArray_STRIDE(Yx,1)
+  cdef npy_intp xsc = np.PyArray_STRIDE(Xx,1)
+  cdef int switch_num = get_switch_num(dtype1,dtype2,dtype3)
+  cdef void * Ap_ptr = np.PyArray_DATA(Ap)
+  cdef void * Aj_ptr = np.PyArray_DATA(Aj)
+  cdef void * Ax_ptr = np.PyArray_DATA(Ax)
+  cdef void * P_ptr = np.PyArray_DATA(P)
+  cdef void * Xx_ptr = np.PyArray_DATA(Xx)
+  cdef void * Yx_ptr = np.PyArray_DATA(Yx)
+  cdef void * a_ptr  = np.PyArray_DATA(a)
+  cdef npy_intp nr = np.PyArray_DIM(Yx,0)
+  cdef npy_intp nc = np.PyArray_DIM(Xx,0)
+  cdef npy_intp nv = np.PyArray_DIM(Yx,1)
+
+  if switch_num < 0:
+    raise TypeError("invalid types")
+
+  with nogil: # allows concurrent matvecs from several python threads.
+    if nr < MAX_NOGIL: # serial kernels for small matrices.
+      rcm_csr_matvecs_gil(switch_num,overwrite_y,nr,nc,nv,Ap_ptr,Aj_ptr,Ax_ptr,P_ptr,a_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
+    else: # uses openmp if QuSpin build against openmp.
+      rcm_csr_matvecs_nogil(switch_num,overwrite_y,nr,nc,nv,Ap_ptr,Aj_ptr,Ax_ptr,P_ptr,a_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
+
+
 cdef void _dia_matvec(bool overwrite_y, ndarray offsets ,ndarray diags, ndarray a, ndarray Xx, ndarray Yx) except *:
   cdef PyArray_Descr * dtype1 = np.PyArray_DESCR(offsets)
   cdef PyArray_Descr * dtype2 = np.PyArray_DESCR(diags)
@@ -190,10 +560,10 @@ cdef void _dia_matvec(bool overwrite_y, ndarray offsets ,ndarray diags, ndarray
   if switch_num < 0:
     raise TypeError("invalid types")
 
-  if nr < MAX_NOGIL:
-    dia_matvec_gil(switch_num,overwrite_y,nr,nc,nd,L,offsets_ptr,diags_ptr,a_ptr,xs,Xx_ptr,ys,Yx_ptr)
-  else:
-    with nogil: # uses openmp if QuSpin build against openmp.
+  with nogil: # allows concurrent matvecs from several python threads.
+    if nr < MAX_NOGIL: # serial kernels for small matrices.
+      dia_matvec_gil(switch_num,overwrite_y,nr,nc,nd,L,offsets_ptr,diags_ptr,a_ptr,xs,Xx_ptr,ys,Yx_ptr)
+    else: # uses openmp if QuSpin build against openmp.
       dia_matvec_nogil(switch_num,overwrite_y,nr,nc,nd,L,offsets_ptr,diags_ptr,a_ptr,xs,Xx_ptr,ys,Yx_ptr)
 
 cdef void _dia_matvecs(bool overwrite_y, ndarray offsets ,ndarray diags, ndarray a, ndarray Xx, ndarray Yx) except *:
@@ -219,16 +589,104 @@ cdef void _dia_matvecs(bool overwrite_y, ndarray offsets ,ndarray diags, ndarray
   if switch_num < 0:
     raise TypeError("invalid types")
 
-  if nr < MAX_NOGIL:
-    dia_matvecs_gil(switch_num,overwrite_y,nr,nc,nv,nd,L,offsets_ptr,diags_ptr,a_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
-  else:
-    with nogil: # uses openmp if QuSpin build against openmp.
+  with nogil: # allows concurrent matvecs from several python threads.
+    if nr < MAX_NOGIL: # serial kernels for small matrices.
+      dia_matvecs_gil(switch_num,overwrite_y,nr,nc,nv,nd,L,offsets_ptr,diags_ptr,a_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
+    else: # uses openmp if QuSpin build against openmp.
       dia_matvecs_nogil(switch_num,overwrite_y,nr,nc,nv,nd,L,offsets_ptr,diags_ptr,a_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
 
 
 
 
 
+cdef void _fused_csr_matvec(bool overwrite_y, ndarray Ap,ndarray Aj,ndarray At,ndarray Ax,ndarray c,ndarray Xx,ndarray Yx) except *:
+  cdef PyArray_Descr * dtype1 = np.PyArray_DESCR(Ap)
+  cdef PyArray_Descr * dtype2 = np.PyArray_DESCR(Ax)
+  cdef PyArray_Descr * dtype3 = np.PyArray_DESCR(Xx)
+  cdef npy_intp ys = np.PyArray_STRIDE(Yx,0)
+  cdef npy_intp xs = np.PyArray_STRIDE(Xx,0)
+  cdef int switch_num = get_switch_num(dtype1,dtype2,dtype3)
+  cdef void * Ap_ptr = np.PyArray_DATA(Ap)
+  cdef void * Aj_ptr = np.PyArray_DATA(Aj)
+  cdef void * At_ptr = np.PyArray_DATA(At)
+  cdef void * Ax_ptr = np.PyArray_DATA(Ax)
+  cdef void * Xx_ptr = np.PyArray_DATA(Xx)
+  cdef void * Yx_ptr = np.PyArray_DATA(Yx)
+  cdef void * c_ptr  = np.PyArray_DATA(c)
+  cdef npy_intp nr = np.PyArray_DIM(Yx,0)
+  cdef npy_intp nc = np.PyArray_DIM(Xx,0)
+
+  if switch_num < 0:
+    raise TypeError("invalid types")
+
+  with nogil: # allows concurrent matvecs from several python threads.
+    if nr < MAX_NOGIL: # serial kernels for small matrices.
+      fused_csr_matvec_gil(switch_num,overwrite_y,nr,nc,Ap_ptr,Aj_ptr,At_ptr,Ax_ptr,c_ptr,xs,Xx_ptr,ys,Yx_ptr)
+    else: # uses openmp if QuSpin build against openmp.
+      fused_csr_matvec_nogil(switch_num,overwrite_y,nr,nc,Ap_ptr,Aj_ptr,At_ptr,Ax_ptr,c_ptr,xs,Xx_ptr,ys,Yx_ptr)
+
+cdef void _fused_csr_matvecs(bool overwrite_y, ndarray Ap,ndarray Aj,ndarray At,ndarray Ax,ndarray c,ndarray Xx,ndarray Yx) except *:
+  cdef PyArray_Descr * dtype1 = np.PyArray_DESCR(Ap)
+  cdef PyArray_Descr * dtype2 = np.PyArray_DESCR(Ax)
+  cdef PyArray_Descr * dtype3 = np.PyArray_DESCR(Xx)
+  cdef npy_intp ysr = np.PyArray_STRIDE(Yx,0)
+  cdef npy_intp xsr = np.PyArray_STRIDE(Xx,0)
+  cdef npy_intp ysc = np.PyArray_STRIDE(Yx,1)
+  cdef npy_intp xsc = np.PyArray_STRIDE(Xx,1)
+  cdef int switch_num = get_switch_num(dtype1,dtype2,dtype3)
+  cdef void * Ap_ptr = np.PyArray_DATA(Ap)
+  cdef void * Aj_ptr = np.PyArray_DATA(Aj)
+  cdef void * At_ptr = np.PyArray_DATA(At)
+  cdef void * Ax_ptr = np.PyArray_DATA(Ax)
+  cdef void * Xx_ptr = np.PyArray_DATA(Xx)
+  cdef void * Yx_ptr = np.PyArray_DATA(Yx)
+  cdef void * c_ptr  = np.PyArray_DATA(c)
+  cdef npy_intp nr = np.PyArray_DIM(Yx,0)
+  cdef npy_intp nc = np.PyArray_DIM(Xx,0)
+  cdef npy_intp nv = np.PyArray_DIM(Yx,1)
+
+  if switch_num < 0:
+    raise TypeError("invalid types")
+
+  with nogil: # allows concurrent matvecs from several python threads.
+    if nr < MAX_NOGIL: # serial kernels for small matrices.
+      fused_csr_matvecs_gil(switch_num,overwrite_y,nr,nc,nv,Ap_ptr,Aj_ptr,At_ptr,Ax_ptr,c_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
+    else: # uses openmp if QuSpin build against openmp.
+      fused_csr_matvecs_nogil(switch_num,overwrite_y,nr,nc,nv,Ap_ptr,Aj_ptr,At_ptr,Ax_ptr,c_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
+
+cdef void _fused_csr_matvecs_coeffs(bool overwrite_y, ndarray Ap,ndarray Aj,object At,ndarray Ax,ndarray c,ndarray Xx,ndarray Yx) except *:
+  cdef PyArray_Descr * dtype1 = np.PyArray_DESCR(Ap)
+  cdef PyArray_Descr * dtype2 = np.PyArray_DESCR(Ax)
+  cdef PyArray_Descr * dtype3 = np.PyArray_DESCR(Xx)
+  cdef npy_intp ysr = np.PyArray_STRIDE(Yx,0)
+  cdef npy_intp xsr = np.PyArray_STRIDE(Xx,0)
+  cdef npy_intp ysc = np.PyArray_STRIDE(Yx,1)
+  cdef npy_intp xsc = np.PyArray_STRIDE(Xx,1)
+  cdef int switch_num = get_switch_num(dtype1,dtype2,dtype3)
+  cdef void * Ap_ptr = np.PyArray_DATA(Ap)
+  cdef void * Aj_ptr = np.PyArray_DATA(Aj)
+  cdef void * At_ptr = NULL # all entries belong to the first term.
+  cdef void * Ax_ptr = np.PyArray_DATA(Ax)
+  cdef void * Xx_ptr = np.PyArray_DATA(Xx)
+  cdef void * Yx_ptr = np.PyArray_DATA(Yx)
+  cdef void * c_ptr  = np.PyArray_DATA(c)
+  cdef npy_intp nr = np.PyArray_DIM(Yx,0)
+  cdef npy_intp nc = np.PyArray_DIM(Xx,0)
+  cdef npy_intp nv = np.PyArray_DIM(Yx,1)
+
+  if At is not None:
+    At_ptr = np.PyArray_DATA(At)
+
+  if switch_num < 0:
+    raise TypeError("invalid types")
+
+  with nogil: # allows concurrent matvecs from several python threads.
+    if nr < MAX_NOGIL: # serial kernels for small matrices.
+      fused_csr_matvecs_coeffs_gil(switch_num,overwrite_y,nr,nc,nv,Ap_ptr,Aj_ptr,At_ptr,Ax_ptr,c_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
+    else: # uses openmp if QuSpin build against openmp.
+      fused_csr_matvecs_coeffs_nogil(switch_num,overwrite_y,nr,nc,nv,Ap_ptr,Aj_ptr,At_ptr,Ax_ptr,c_ptr,xsr,xsc,Xx_ptr,ysr,ysc,Yx_ptr)
+
+
 """
 
 
@@ -500,49 +958,117 @@ def _dia_matvecs(bool overwrite_y, indtype[::1] offsets ,T1[:,::1] diags, T1 a,
 """
 
 
-def _csr_dot(mat_obj,other,overwrite_out=False,out=None,a=1.0):
+# kernels of the sparse formats, called as kernel(overwrite_y,mat_obj,a,Xx,Yx) for 1 and 2 dimensional Xx.
+
+def _csr_kernel(overwrite_y,mat_obj,a,Xx,Yx):
+  if Xx.ndim == 1:
+    _csr_matvec(overwrite_y,mat_obj.indptr,mat_obj.indices,mat_obj.data,a,Xx,Yx)
+  else:
+    _csr_matvecs(overwrite_y,mat_obj.indptr,mat_obj.indices,mat_obj.data,a,Xx,Yx)
+
+
+def _csc_kernel(overwrite_y,mat_obj,a,Xx,Yx):
+  if Xx.ndim == 1:
+    _csc_matvec(overwrite_y,mat_obj.indptr,mat_obj.indices,mat_obj.data,a,Xx,Yx)
+  else:
+    _csc_matvecs(overwrite_y,mat_obj.indptr,mat_obj.indices,mat_obj.data,a,Xx,Yx)
+
+
+def _dia_kernel(overwrite_y,mat_obj,a,Xx,Yx):
+  if Xx.ndim == 1:
+    _dia_matvec(overwrite_y,mat_obj.offsets,mat_obj.data,a,Xx,Yx)
+  else:
+    _dia_matvecs(overwrite_y,mat_obj.offsets,mat_obj.data,a,Xx,Yx)
+
+
+def _herm_csr_kernel(overwrite_y,mat_obj,a,Xx,Yx):
+  if Xx.ndim == 1:
+    _herm_csr_matvec(overwrite_y,mat_obj.indptr,mat_obj.indices,mat_obj.data,a,Xx,Yx)
+  else:
+    _herm_csr_matvecs(overwrite_y,mat_obj.indptr,mat_obj.indices,mat_obj.data,a,Xx,Yx)
+
+
+def _sell_kernel(overwrite_y,mat_obj,a,Xx,Yx):
+  if Xx.ndim == 1:
+    _sell_matvec(overwrite_y,mat_obj.C,mat_obj.slice_ptr,mat_obj.indices,mat_obj.data,mat_obj.perm,a,Xx,Yx)
+  else:
+    _sell_matvecs(overwrite_y,mat_obj.C,mat_obj.slice_ptr,mat_obj.indices,mat_obj.data,mat_obj.perm,a,Xx,Yx)
+
+
+def _palette_csr_kernel(overwrite_y,mat_obj,a,Xx,Yx):
+  if Xx.ndim == 1:
+    _palette_csr_matvec(overwrite_y,mat_obj.indptr,mat_obj.indices,mat_obj.codes,mat_obj.values,a,Xx,Yx)
+  else:
+    _palette_csr_matvecs(overwrite_y,mat_obj.indptr,mat_obj.indices,mat_obj.codes,mat_obj.values,a,Xx,Yx)
+
+
+def _split_csr_kernel(overwrite_y,mat_obj,a,Xx,Yx):
+  if Xx.ndim == 1:
+    _split_csr_matvec(overwrite_y,mat_obj.indptr,mat_obj.indices,mat_obj.offdiag_data,mat_obj.diag,a,Xx,Yx)
+  else:
+    _split_csr_matvecs(overwrite_y,mat_obj.indptr,mat_obj.indices,mat_obj.offdiag_data,mat_obj.diag,a,Xx,Yx)
+
+
+def _reordered_csr_kernel(overwrite_y,mat_obj,a,Xx,Yx):
+  # the kernels read and write the states through the permutation of the matrix.
+  R = mat_obj.reordered
+  if Xx.ndim == 1:
+    _rcm_csr_matvec(overwrite_y,R.indptr,R.indices,R.data,mat_obj.perm,a,Xx,Yx)
+  else:
+    _rcm_csr_matvecs(overwrite_y,R.indptr,R.indices,R.data,mat_obj.perm,a,Xx,Yx)
+
+
+# matrix format -> kernel, formats which are not in this table use the dot method of the matrix.
+_format_kernels = {
+  "csr":_csr_kernel,
+  "csc":_csc_kernel,
+  "dia":_dia_kernel,
+  "herm":_herm_csr_kernel,
+  "sell":_sell_kernel,
+  "palette":_palette_csr_kernel,
+  "split":_split_csr_kernel,
+  "rcm":_reordered_csr_kernel,
+}
+
+
+def _format_dot(mat_obj,other,overwrite_out=False,out=None,a=1.0):
   if out is None:
     overwrite_out = True
     result_dtype = _np.result_type(mat_obj.dtype,other.dtype)
-    out = _np.zeros(mat_obj.shape[:1]+other.shape[1:],dtype=result_dtype,order="C")
+    out = _numa_zeros(mat_obj.shape[:1]+other.shape[1:],dtype=result_dtype)
 
   a = _np.array(a,dtype=mat_obj.dtype)
-  if other.ndim == 1:
-    _csr_matvec(overwrite_out,mat_obj.indptr,mat_obj.indices,mat_obj.data,a,other,out)
-  else:
-    _csr_matvecs(overwrite_out,mat_obj.indptr,mat_obj.indices,mat_obj.data,a,other,out)
+  _format_kernels[mat_obj.format](overwrite_out,mat_obj,a,other,out)
 
   return out
 
 
-
-
-def _csc_dot(mat_obj,other,overwrite_out=False,out=None,a=1.0):
+def _fused_csr_dot(mat_obj,coeffs,other,overwrite_out=False,out=None,a=1.0):
   if out is None:
     overwrite_out = True
     result_dtype = _np.result_type(mat_obj.dtype,other.dtype)
-    out = _np.zeros(mat_obj.shape[:1]+other.shape[1:],dtype=result_dtype,order="C")
+    out = _numa_zeros(mat_obj.shape[:1]+other.shape[1:],dtype=result_dtype)
 
-  a = _np.array(a,dtype=mat_obj.dtype)
+  c = _np.array(a*_np.asarray(coeffs),dtype=mat_obj.dtype)
   if other.ndim == 1:
-    _csc_matvec(overwrite_out,mat_obj.indptr,mat_obj.indices,mat_obj.data,a,other,out)
+    _fused_csr_matvec(overwrite_out,mat_obj.indptr,mat_obj.indices,mat_obj.terms,mat_obj.data,c,other,out)
   else:
-    _csc_matvecs(overwrite_out,mat_obj.indptr,mat_obj.indices,mat_obj.data,a,other,out)
+    _fused_csr_matvecs(overwrite_out,mat_obj.indptr,mat_obj.indices,mat_obj.terms,mat_obj.data,c,other,out)
 
   return out
 
 
-def _dia_dot(mat_obj,other,overwrite_out=False,out=None,a=1.0):
+def _csr_dot_coeffs(mat_obj,coeffs,other,overwrite_out=False,out=None):
+  """out[:,i] (+)= (sum_t coeffs[t,i] A_t).dot(other[:,i]) where A_t are the terms of a csr or fused csr matrix."""
   if out is None:
     overwrite_out = True
     result_dtype = _np.result_type(mat_obj.dtype,other.dtype)
-    out = _np.zeros(mat_obj.shape[:1]+other.shape[1:],dtype=result_dtype,order="C")
+    out = _numa_zeros(other.shape,dtype=result_dtype)
 
-  a = _np.array(a,dtype=mat_obj.dtype)
-  if other.ndim == 1:
-    _dia_matvec(overwrite_out,mat_obj.offsets,mat_obj.data,a,other,out)
-  else:
-    _dia_matvecs(overwrite_out,mat_obj.offsets,mat_obj.data,a,other,out)
+  terms = getattr(mat_obj,"terms",None)
+  n_terms = 1 if terms is None else mat_obj.n_terms
+  c = _np.ascontiguousarray(_np.broadcast_to(coeffs,(n_terms,other.shape[1])),dtype=mat_obj.dtype)
+  _fused_csr_matvecs_coeffs(overwrite_out,mat_obj.indptr,mat_obj.indices,terms,mat_obj.data,c,other,out)
 
   return out
 
@@ -551,7 +1077,7 @@ def _other_dot(mat_obj,other,overwrite_out=False,out=None,a=1.0):
   if out is None:
     overwrite_out = True
     result_dtype = _np.result_type(mat_obj.dtype,other.dtype)
-    out = _np.zeros(mat_obj.shape[:1]+other.shape[1:],dtype=result_dtype,order="C")
+    out = _numa_zeros(mat_obj.shape[:1]+other.shape[1:],dtype=result_dtype)
 
   inter_res = mat_obj.dot(other)
 
@@ -567,23 +1093,12 @@ def _other_dot(mat_obj,other,overwrite_out=False,out=None,a=1.0):
   return out
 
 
-def matvec(mat_obj,*args,**kwargs):
-  if _sp.isspmatrix_csr(mat_obj):
-    return _csr_dot(mat_obj,*args,**kwargs)
-  elif _sp.isspmatrix_csc(mat_obj):
-    return _csc_dot(mat_obj,*args,**kwargs)
-  elif _sp.isspmatrix_dia(mat_obj):
-    return _dia_dot(mat_obj,*args,**kwargs)
-  else:
-    return _other_dot(mat_obj,*args,**kwargs)
-
-
 def _get_matvec_function(mat_obj):
-  if _sp.isspmatrix_csr(mat_obj):
-    return _csr_dot
-  elif _sp.isspmatrix_csc(mat_obj):
-    return _csc_dot
-  elif _sp.isspmatrix_dia(mat_obj):
-    return _dia_dot
+  if getattr(mat_obj,"format",None) in _format_kernels:
+    return _format_dot
   else:
     return _other_dot
+
+
+def matvec(mat_obj,*args,**kwargs):
+  return _get_matvec_function(mat_obj)(mat_obj,*args,**kwargs)
@@ -123,8 +123,10 @@ void csc_matvecs_noomp_strided(const bool overwrite_y,
 #if defined(_OPENMP)
 
 #include "openmp.h"
+#include "csrmv_merge.h"
 
-
+// the columns are distributed with the merge-path partition of columns and nonzeros if the number of 
+// nonzeros of evenly split columns is unbalanced (see csrmv_merge.h).
 
 template<typename I, typename T1,typename T2>
 void csc_matvec_omp_contig(const bool overwrite_y,
@@ -137,6 +139,14 @@ void csc_matvec_omp_contig(const bool overwrite_y,
                         const T2 x[],
                               T2 y[])
 {
+	if(use_merge_path(n_col,Ap,omp_get_max_threads())){
+		#pragma omp parallel
+		{
+			cscmv_merge(overwrite_y,n_row,n_col,Ap,Ai,Ax,a,(npy_intp)1,x,(npy_intp)1,y);
+		}
+		return;
+	}
+
 	#pragma omp parallel
 	{
 	    const int nthread = omp_get_num_threads();
@@ -176,6 +186,14 @@ void csc_matvec_omp_strided(const bool overwrite_y,
                         const npy_intp y_stride,
                               T2 y[])
 {
+	if(use_merge_path(n_col,Ap,omp_get_max_threads())){
+		#pragma omp parallel
+		{
+			cscmv_merge(overwrite_y,n_row,n_col,Ap,Ai,Ax,a,x_stride,x,y_stride,y);
+		}
+		return;
+	}
+
 	#pragma omp parallel
 	{
 	    const int nthread = omp_get_num_threads();
@@ -218,7 +236,60 @@ inline void csc_matvecs_omp_strided(const bool overwrite_y,
                         const npy_intp y_stride_col,
                               T2 y[])
 {
-	csc_matvecs_noomp_strided(overwrite_y,n_row,n_col,n_vecs,Ap,Ai,Ax,a,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+	// if there are enough blocks of vectors, each thread computes the product for its own blocks of vectors,
+	// otherwise the columns are distributed over the threads and the results are added atomically.
+	const npy_intp n_block = matvecs_block_size<T2>();
+	const npy_intp n_blocks = (n_vecs + n_block - 1)/n_block;
+	const bool merge = use_merge_path(n_col,Ap,omp_get_max_threads());
+
+	#pragma omp parallel
+	{
+	    const int nthread = omp_get_num_threads();
+	    if(overwrite_y){
+	        #pragma omp for schedule(static)
+	        for(I i = 0; i < n_row; i++){
+	            for(npy_intp v = 0; v < n_vecs; v++){
+	                y[i * y_stride_row + v * y_stride_col] = 0;
+	            }
+	        }
+	    }
+
+	    if(n_blocks >= nthread){
+	        #pragma omp for schedule(dynamic,1)
+	        for(npy_intp b = 0; b < n_blocks; b++){
+	            const npy_intp v0 = b * n_block;
+	            const npy_intp nv = std::min(n_block,n_vecs - v0);
+
+	            for(I j = 0; j < n_col; j++){
+	                const T2 * x_row = x + x_stride_row * j + x_stride_col * v0;
+	                for(I ii = Ap[j]; ii < Ap[j+1]; ii++){
+	                    const T2 ax = a * Ax[ii];
+	                    T2 * y_row = y + y_stride_row * Ai[ii] + y_stride_col * v0;
+	                    axpy_strided(nv, ax, x_stride_col, x_row, y_stride_col, y_row);
+	                }
+	            }
+	        }
+	    }
+	    else if(merge){
+	        // y has been zeroed already.
+	        cscmv_merge_multi(false,n_row,n_col,n_vecs,Ap,Ai,Ax,a,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+	    }
+	    else{
+	        const I chunk = std::max((I)1,n_col/(100*nthread));
+	        #pragma omp for schedule(dynamic,chunk)
+	        for(I j = 0; j < n_col; j++){
+	            const T2 * x_row = x + x_stride_row * j;
+	            for(I ii = Ap[j]; ii < Ap[j+1]; ii++){
+	                const T2 ax = a * Ax[ii];
+	                T2 * y_row = y + y_stride_row * Ai[ii];
+	                for(npy_intp v = 0; v < n_vecs; v++){
+	                    const T2 aa = ax * x_row[v * x_stride_col];
+	                    atomic_add(y_row[v * y_stride_col],aa);
+	                }
+	            }
+	        }
+	    }
+	}
 }
 
 
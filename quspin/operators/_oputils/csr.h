@@ -144,6 +144,36 @@ void csr_matvecs_noomp_strided(const bool overwrite_y,
 #include "csrmv_merge.h"
 #include "openmp.h"
 
+// The rows are split evenly over the threads if the number of nonzeros per thread is balanced, 
+// otherwise the merge-path partition of rows and nonzeros is used (see csrmv_merge.h).
+
+template<typename I, typename T1,typename T2>
+void csr_matvec_omp_rows(const bool overwrite_y,
+                        const I n_row,
+                        const I Ap[],
+                        const I Aj[],
+                        const T1 Ax[],
+                        const T1 a,
+                        const npy_intp x_stride,
+                        const T2 x[],
+                        const npy_intp y_stride,
+                              T2 y[])
+{
+	#pragma omp parallel for schedule(static)
+	for(I k = 0; k<n_row; k++){
+		T2 sum = 0;
+		for(I jj = Ap[k]; jj < Ap[k+1]; jj++){
+			sum += Ax[jj] * x[Aj[jj] * x_stride];
+		}
+		if(overwrite_y){
+			y[k * y_stride] = a * sum;
+		}
+		else{
+			y[k * y_stride] += a * sum;
+		}
+	}
+}
+
 template<typename I, typename T1,typename T2>
 inline void csr_matvec_omp_contig(const bool overwrite_y,
                         const I n_row,
@@ -155,6 +185,11 @@ inline void csr_matvec_omp_contig(const bool overwrite_y,
                               T2 y[])
 {
 	const int nthread = omp_get_max_threads();
+	if(!use_merge_path(n_row,Ap,nthread)){
+		csr_matvec_omp_rows(overwrite_y,n_row,Ap,Aj,Ax,a,(npy_intp)1,x,(npy_intp)1,y);
+		return;
+	}
+
 	std::vector<I> rco_vec(nthread);
 	std::vector<T2> vco_vec(nthread);
 	I * rco = &rco_vec[0];
@@ -178,6 +213,10 @@ inline void csr_matvec_omp_strided(const bool overwrite_y,
                               T2 y[])
 {
 	const int nthread = omp_get_max_threads();
+	if(!use_merge_path(n_row,Ap,nthread)){
+		csr_matvec_omp_rows(overwrite_y,n_row,Ap,Aj,Ax,a,x_stride,x,y_stride,y);
+		return;
+	}
 
 	std::vector<I> rco_vec(nthread);
 	std::vector<T2> vco_vec(nthread);
@@ -205,7 +244,51 @@ inline void csr_matvecs_omp_strided(const bool overwrite_y,
                         const npy_intp y_stride_col,
                               T2 y[])
 {
-    csr_matvecs_noomp_strided(overwrite_y,n_row,n_vecs,Ap,Aj,Ax,a,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+    if(use_merge_path(n_row,Ap,omp_get_max_threads())){
+        const int nthread = omp_get_max_threads();
+        std::vector<I> rco_vec(nthread);
+        std::vector<T2> vco_vec(nthread * n_vecs);
+        I * rco = &rco_vec[0];
+        T2 * vco = &vco_vec[0];
+        #pragma omp parallel
+        {
+            csrmv_merge_multi(overwrite_y,n_row,n_vecs,Ap,Aj,Ax,a,x_stride_row,x_stride_col,x,rco,vco,y_stride_row,y_stride_col,y);
+        }
+        return;
+    }
+
+    // rows are distributed over the threads, the vectors are processed in blocks so that the rows of x 
+    // which are gathered stay in cache while the block is computed.
+    const npy_intp n_block = matvecs_block_size<T2>();
+
+    #pragma omp parallel
+    {
+        const int nthread = omp_get_num_threads();
+        const I chunk = std::max((I)1,n_row/(100*nthread));
+
+        for(npy_intp v0 = 0; v0 < n_vecs; v0 += n_block){
+            const npy_intp nv = std::min(n_block,n_vecs - v0);
+            const T2 * x_block = x + x_stride_col * v0;
+                  T2 * y_block = y + y_stride_col * v0;
+
+            #pragma omp for schedule(dynamic,chunk) nowait
+            for(I k = 0; k<n_row; k++){
+                T2 * y_row = y_block + y_stride_row * k;
+
+                if(overwrite_y){
+                    for(npy_intp i = 0; i < nv; i++){
+                        y_row[i * y_stride_col] = 0;
+                    }
+                }
+
+                for(I jj = Ap[k]; jj < Ap[k+1]; jj++){
+                    const T2 ax = a * Ax[jj];
+                    const T2 * x_row = x_block + x_stride_row * Aj[jj];
+                    axpy_strided(nv, ax, x_stride_col, x_row, y_stride_col, y_row);
+                }
+            }
+        }
+    }
 }
 
 #else
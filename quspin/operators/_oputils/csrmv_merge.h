@@ -5,6 +5,7 @@
 #include "complex_ops.h"
 #include "openmp.h"
 #include "numpy/ndarraytypes.h"
+#include "utils.h"
 
 
 // See work my Merrill et. al. (http://ieeexplore.ieee.org/abstract/document/7877136/) for original work and implementation.
@@ -49,6 +50,27 @@ CoordinateT<I> MergePathSearch(I diagonal, I a_len, I b_len, AIteratorT a, BIter
 	diagonal - x_min); // y coordinate in B
 }
 
+// Returns true if distributing the rows evenly over the threads gives some thread more than 10% more nonzeros 
+// than the average, i.e. the row lengths vary too much for a static partition of the rows. Only the number of 
+// nonzeros in the blocks of rows of every thread is needed, which is O(num_threads).
+template<class I>
+bool use_merge_path(const I num_rows,const I row_offsets[],const int num_threads)
+{
+	const npy_intp num_nonzeros = row_offsets[num_rows];
+	if(num_threads < 2 || num_nonzeros == 0){
+		return false;
+	}
+
+	npy_intp max_nonzeros = 0;
+	for(int tid = 0; tid < num_threads; tid++){
+		const I row_begin = ((npy_intp)num_rows * tid) / num_threads;
+		const I row_end = ((npy_intp)num_rows * (tid + 1)) / num_threads;
+		max_nonzeros = std::max<npy_intp>(max_nonzeros,row_offsets[row_end] - row_offsets[row_begin]);
+	}
+
+	return 10 * max_nonzeros * num_threads > 11 * num_nonzeros;
+}
+
 template<class I,class T1,class T2,class T3>
 void csrmv_merge(const bool overwrite_y,
 				const I num_rows,
@@ -185,6 +207,210 @@ void csrmv_merge_strided(const bool overwrite_y,
 }
 
 
+// merge-path product with a block of vectors, the carry-outs of the threads are rows of value_carry_out with 
+// n_vecs elements each. Rows which are completed by a thread are added to y directly.
+template<class I,class T1,class T2,class T3>
+void csrmv_merge_multi(const bool overwrite_y,
+						const I num_rows,
+						const npy_intp n_vecs,
+						const I row_offsets[],
+						const I column_indices[],
+						const T1 values[],
+						const T2 alpha,
+						const npy_intp x_stride_row,
+						const npy_intp x_stride_col,
+						const T3 x[],
+							  I row_carry_out[],
+							  T3 value_carry_out[],
+						const npy_intp y_stride_row,
+						const npy_intp y_stride_col,
+							  T3 y[])
+{
+
+	const I* row_end_offsets = row_offsets + 1; // Merge list A: row end-offsets
+	const I num_nonzeros = row_offsets[num_rows];
+	int num_threads = omp_get_num_threads();
+	CountingInputIterator<I> nz_indices(0); // Merge list B: Natural numbers(NZ indices)
+	I num_merge_items = num_rows + num_nonzeros; // Merge path total length
+	I items_per_thread = (num_merge_items + num_threads - 1) / num_threads; // Merge items per thread
+
+	if(overwrite_y){
+		#pragma omp for schedule(static)
+		for(I i=0;i<num_rows;i++){
+			for(npy_intp v=0;v<n_vecs;v++){
+				y[i * y_stride_row + v * y_stride_col] = 0;
+			}
+		}
+	}
+	// Spawn parallel threads
+	#pragma omp for schedule(static,1)
+	for (int tid = 0; tid < num_threads; tid++)
+	{
+		// Find starting and ending MergePath coordinates (row-idx, nonzero-idx) for each thread
+		I diagonal = std::min(items_per_thread * tid, num_merge_items);
+		I diagonal_end = std::min(diagonal + items_per_thread, num_merge_items);
+		CoordinateT<I> thread_coord = MergePathSearch(diagonal, num_rows, num_nonzeros, row_end_offsets, nz_indices);
+		CoordinateT<I> thread_coord_end = MergePathSearch(diagonal_end, num_rows, num_nonzeros,row_end_offsets, nz_indices);
+
+		// Consume merge items, whole rows first
+		for (; thread_coord.x < thread_coord_end.x; ++thread_coord.x)
+		{
+			T3 * y_row = y + y_stride_row * thread_coord.x;
+			for (; thread_coord.y < row_end_offsets[thread_coord.x]; ++thread_coord.y){
+				const T3 ax = alpha * values[thread_coord.y];
+				axpy_strided(n_vecs, ax, x_stride_col, x + x_stride_row * column_indices[thread_coord.y], y_stride_col, y_row);
+			}
+		}
+
+		// Consume partial portion of thread's last row
+		T3 * carry = value_carry_out + n_vecs * tid;
+		for(npy_intp v=0;v<n_vecs;v++){
+			carry[v] = 0;
+		}
+		for (; thread_coord.y < thread_coord_end.y; ++thread_coord.y){
+			const T3 ax = alpha * values[thread_coord.y];
+			axpy_strided(n_vecs, ax, x_stride_col, x + x_stride_row * column_indices[thread_coord.y], (npy_intp)1, carry);
+		}
+
+		// Save carry-outs
+		row_carry_out[tid] = thread_coord_end.x;
+	}
+
+	// Carry-out fix-up (rows spanning multiple threads)
+	#pragma omp single
+	{
+		for (int tid = 0; tid < num_threads - 1; ++tid)
+		if (row_carry_out[tid] < num_rows){
+			const T3 * carry = value_carry_out + n_vecs * tid;
+			T3 * y_row = y + y_stride_row * row_carry_out[tid];
+			for(npy_intp v=0;v<n_vecs;v++){
+				y_row[v * y_stride_col] += carry[v];
+			}
+		}
+	}
+
+}
+
+
+// merge-path partition for the transposed problem: the matrix is stored in csc format (equivalently, the 
+// transpose of a csr matrix) and every thread gets the same number of columns plus nonzeros. The products 
+// are scattered into y, which requires atomic updates, but no carry-outs.
+template<class I,class T1,class T2,class T3>
+void cscmv_merge(const bool overwrite_y,
+				const I num_rows,
+				const I num_cols,
+				const I col_offsets[],
+				const I row_indices[],
+				const T1 values[],
+				const T2 alpha,
+				const npy_intp stride_x,
+				const T3 x[],
+				const npy_intp stride_y,
+					  T3 y[])
+{
+
+	const I* col_end_offsets = col_offsets + 1; // Merge list A: column end-offsets
+	const I num_nonzeros = col_offsets[num_cols];
+	int num_threads = omp_get_num_threads();
+	CountingInputIterator<I> nz_indices(0); // Merge list B: Natural numbers(NZ indices)
+	I num_merge_items = num_cols + num_nonzeros; // Merge path total length
+	I items_per_thread = (num_merge_items + num_threads - 1) / num_threads; // Merge items per thread
+
+	if(overwrite_y){
+		#pragma omp for schedule(static)
+		for(I i=0;i<num_rows;i++){
+			y[i * stride_y] = 0;
+		}
+	}
+
+	#pragma omp for schedule(static,1)
+	for (int tid = 0; tid < num_threads; tid++)
+	{
+		I diagonal = std::min(items_per_thread * tid, num_merge_items);
+		I diagonal_end = std::min(diagonal + items_per_thread, num_merge_items);
+		CoordinateT<I> thread_coord = MergePathSearch(diagonal, num_cols, num_nonzeros, col_end_offsets, nz_indices);
+		CoordinateT<I> thread_coord_end = MergePathSearch(diagonal_end, num_cols, num_nonzeros,col_end_offsets, nz_indices);
+
+		// whole columns (the first one may have been started by the previous thread)
+		for (; thread_coord.x < thread_coord_end.x; ++thread_coord.x)
+		{
+			const T3 alpha_x = alpha * x[thread_coord.x * stride_x];
+			for (; thread_coord.y < col_end_offsets[thread_coord.x]; ++thread_coord.y){
+				const T3 aa = values[thread_coord.y] * alpha_x;
+				atomic_add(y[row_indices[thread_coord.y] * stride_y],aa);
+			}
+		}
+
+		// partial portion of thread's last column
+		if(thread_coord.y < thread_coord_end.y){
+			const T3 alpha_x = alpha * x[thread_coord.x * stride_x];
+			for (; thread_coord.y < thread_coord_end.y; ++thread_coord.y){
+				const T3 aa = values[thread_coord.y] * alpha_x;
+				atomic_add(y[row_indices[thread_coord.y] * stride_y],aa);
+			}
+		}
+	}
+}
+
+
+template<class I,class T1,class T2,class T3>
+void cscmv_merge_multi(const bool overwrite_y,
+						const I num_rows,
+						const I num_cols,
+						const npy_intp n_vecs,
+						const I col_offsets[],
+						const I row_indices[],
+						const T1 values[],
+						const T2 alpha,
+						const npy_intp x_stride_row,
+						const npy_intp x_stride_col,
+						const T3 x[],
+						const npy_intp y_stride_row,
+						const npy_intp y_stride_col,
+							  T3 y[])
+{
+
+	const I* col_end_offsets = col_offsets + 1; // Merge list A: column end-offsets
+	const I num_nonzeros = col_offsets[num_cols];
+	int num_threads = omp_get_num_threads();
+	CountingInputIterator<I> nz_indices(0); // Merge list B: Natural numbers(NZ indices)
+	I num_merge_items = num_cols + num_nonzeros; // Merge path total length
+	I items_per_thread = (num_merge_items + num_threads - 1) / num_threads; // Merge items per thread
+
+	if(overwrite_y){
+		#pragma omp for schedule(static)
+		for(I i=0;i<num_rows;i++){
+			for(npy_intp v=0;v<n_vecs;v++){
+				y[i * y_stride_row + v * y_stride_col] = 0;
+			}
+		}
+	}
+
+	#pragma omp for schedule(static,1)
+	for (int tid = 0; tid < num_threads; tid++)
+	{
+		I diagonal = std::min(items_per_thread * tid, num_merge_items);
+		I diagonal_end = std::min(diagonal + items_per_thread, num_merge_items);
+		CoordinateT<I> thread_coord = MergePathSearch(diagonal, num_cols, num_nonzeros, col_end_offsets, nz_indices);
+		CoordinateT<I> thread_coord_end = MergePathSearch(diagonal_end, num_cols, num_nonzeros,col_end_offsets, nz_indices);
+
+		for (; thread_coord.y < thread_coord_end.y; ++thread_coord.y)
+		{
+			// skip to the column of the nonzero (empty columns are part of the merge path).
+			while(col_end_offsets[thread_coord.x] <= thread_coord.y){
+				++thread_coord.x;
+			}
+
+			const T3 ax = alpha * values[thread_coord.y];
+			const T3 * x_row = x + x_stride_row * thread_coord.x;
+			      T3 * y_row = y + y_stride_row * row_indices[thread_coord.y];
+			for(npy_intp v=0;v<n_vecs;v++){
+				const T3 aa = ax * x_row[v * x_stride_col];
+				atomic_add(y_row[v * y_stride_col],aa);
+			}
+		}
+	}
+}
 
 
 
@@ -277,7 +277,48 @@ inline void dia_matvecs_omp_strided(const bool overwrite_y,
                         const npy_intp y_stride_col,
                               T2 y[])
 {
-    dia_matvecs_noomp_strided(overwrite_y,n_row,n_col,n_vecs,n_diags,L,offsets,diags,a,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+    // every thread computes a contiguous range of rows. The range is split into blocks of rows which fit
+    // into cache, all diagonals are applied to a block before moving on to the next one.
+    const I row_block = std::max<npy_intp>(1,(1<<15)/(n_vecs * sizeof(T2)));
+
+    #pragma omp parallel
+    {
+        const int nthread = omp_get_num_threads();
+        const int tid = omp_get_thread_num();
+        const I r_begin = ((npy_intp)n_row * tid)/nthread;
+        const I r_end = ((npy_intp)n_row * (tid + 1))/nthread;
+
+        for(I b_begin = r_begin; b_begin < r_end; b_begin += row_block){
+            const I b_end = std::min<I>(b_begin + row_block,r_end);
+
+            if(overwrite_y){
+                for(I r = b_begin; r < b_end; r++){
+                    for(npy_intp v = 0; v < n_vecs; v++){
+                        y[r * y_stride_row + v * y_stride_col] = 0;
+                    }
+                }
+            }
+
+            for(I i = 0; i < n_diags; i++){
+                const I k = offsets[i];  //diagonal offset
+
+                const I i_start = std::max<I>(0,-k);
+                const I j_start = std::max<I>(0, k);
+                const I j_end   = std::min<I>(std::min<I>(n_row + k, n_col),L);
+                const I i_end   = i_start + (j_end - j_start);
+
+                const I r0 = std::max<I>(b_begin,i_start);
+                const I r1 = std::min<I>(b_end,i_end);
+
+                for(I r = r0; r < r1; r++){
+                    const T2 ad = a * diags[(npy_intp)i*L + r + k];
+                    const T2 * x_row = x + x_stride_row * (r + k);
+                          T2 * y_row = y + y_stride_row * r;
+                    axpy_strided(n_vecs, ad, x_stride_col, x_row, y_stride_col, y_row);
+                }
+            }
+        }
+    }
 }
 
 
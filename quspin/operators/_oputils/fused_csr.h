@@ -0,0 +1,290 @@
+#ifndef __FUSED_CSR_H
+#define __FUSED_CSR_H
+
+#include "complex_ops.h"
+#include "utils.h"
+#include "openmp.h"
+
+// fused csr format: the sum of n_terms matrices with a joint row pointer Ap. Each entry jj stores the column Aj[jj],
+// the term At[jj] the entry belongs to and the value Ax[jj]. The product y = sum_t c[t] A_t x is computed in a
+// single sweep over x and y, with the coefficients of the terms taken from c[At[jj]].
+
+template<typename I, typename K, typename T1,typename T2>
+void fused_csr_matvec(const bool parallel,
+                const bool overwrite_y,
+                const I n_row,
+                const I Ap[],
+                const I Aj[],
+                const K At[],
+                const T1 Ax[],
+                const T1 c[],
+                const npy_intp x_stride,
+                const T2 x[],
+                const npy_intp y_stride,
+                      T2 y[])
+{
+    #pragma omp parallel for schedule(static) if(parallel)
+    for(I k = 0; k<n_row; k++){
+        T2 sum = 0;
+        for(I jj = Ap[k]; jj < Ap[k+1]; jj++){
+            const T2 ax = c[At[jj]] * Ax[jj];
+            sum += ax * x[Aj[jj] * x_stride];
+        }
+
+        if(overwrite_y){
+            y[k * y_stride] = sum;
+        }
+        else{
+            y[k * y_stride] += sum;
+        }
+    }
+}
+
+template<typename I, typename K, typename T1,typename T2>
+void fused_csr_matvecs(const bool parallel,
+                const bool overwrite_y,
+                const I n_row,
+                const npy_intp n_vecs,
+                const I Ap[],
+                const I Aj[],
+                const K At[],
+                const T1 Ax[],
+                const T1 c[],
+                const npy_intp x_stride_row,
+                const npy_intp x_stride_col,
+                const T2 x[],
+                const npy_intp y_stride_row,
+                const npy_intp y_stride_col,
+                      T2 y[])
+{
+    #pragma omp parallel for schedule(static) if(parallel)
+    for(I k = 0; k<n_row; k++){
+        T2 * y_row = y + y_stride_row * k;
+
+        if(overwrite_y){
+            for(npy_intp i = 0; i < n_vecs; i++){
+                y_row[i * y_stride_col] = 0;
+            }
+        }
+
+        for(I jj = Ap[k]; jj < Ap[k+1]; jj++){
+            const T2 ax = c[At[jj]] * Ax[jj];
+            const T2 * x_row = x + x_stride_row * Aj[jj];
+            axpy_strided(n_vecs, ax, x_stride_col, x_row, y_stride_col, y_row);
+        }
+    }
+}
+
+
+// y[:,i] = sum_t c[t,i] A_t x[:,i], every column is multiplied with the operator at a different time. 
+// If At is NULL all entries belong to term 0.
+template<typename I, typename K, typename T1,typename T2>
+void fused_csr_matvecs_coeffs(const bool parallel,
+                const bool overwrite_y,
+                const I n_row,
+                const npy_intp n_vecs,
+                const I Ap[],
+                const I Aj[],
+                const K At[],
+                const T1 Ax[],
+                const T1 c[],
+                const npy_intp x_stride_row,
+                const npy_intp x_stride_col,
+                const T2 x[],
+                const npy_intp y_stride_row,
+                const npy_intp y_stride_col,
+                      T2 y[])
+{
+    #pragma omp parallel for schedule(static) if(parallel)
+    for(I k = 0; k<n_row; k++){
+        T2 * y_row = y + y_stride_row * k;
+
+        if(overwrite_y){
+            for(npy_intp i = 0; i < n_vecs; i++){
+                y_row[i * y_stride_col] = 0;
+            }
+        }
+
+        for(I jj = Ap[k]; jj < Ap[k+1]; jj++){
+            const T1 * c_row = c + (At ? n_vecs * At[jj] : 0);
+            const T2 * x_row = x + x_stride_row * Aj[jj];
+            for(npy_intp i = 0; i < n_vecs; i++){
+                const T2 cax = c_row[i] * Ax[jj];
+                y_row[i * y_stride_col] += cax * x_row[i * x_stride_col];
+            }
+        }
+    }
+}
+
+template<typename I, typename K, typename T1,typename T2>
+inline void fused_csr_matvecs_coeffs_noomp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const npy_intp n_vecs,
+                        const I Ap[],
+                        const I Aj[],
+                        const K At[],
+                        const T1 Ax[],
+                        const T1 c[],
+                        const npy_intp x_stride_row_byte,
+                        const npy_intp x_stride_col_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_row_byte,
+                        const npy_intp y_stride_col_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride_row = y_stride_row_byte/sizeof(T2);
+    const npy_intp y_stride_col = y_stride_col_byte/sizeof(T2);
+    const npy_intp x_stride_row = x_stride_row_byte/sizeof(T2);
+    const npy_intp x_stride_col = x_stride_col_byte/sizeof(T2);
+
+    if(y_stride_col == 1 && x_stride_col == 1){
+        fused_csr_matvecs_coeffs(false,overwrite_y,n_row,n_vecs,Ap,Aj,At,Ax,c,x_stride_row,1,x,y_stride_row,1,y);
+    }
+    else{
+        fused_csr_matvecs_coeffs(false,overwrite_y,n_row,n_vecs,Ap,Aj,At,Ax,c,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+    }
+}
+
+template<typename I, typename K, typename T1,typename T2>
+inline void fused_csr_matvecs_coeffs_omp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const npy_intp n_vecs,
+                        const I Ap[],
+                        const I Aj[],
+                        const K At[],
+                        const T1 Ax[],
+                        const T1 c[],
+                        const npy_intp x_stride_row_byte,
+                        const npy_intp x_stride_col_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_row_byte,
+                        const npy_intp y_stride_col_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride_row = y_stride_row_byte/sizeof(T2);
+    const npy_intp y_stride_col = y_stride_col_byte/sizeof(T2);
+    const npy_intp x_stride_row = x_stride_row_byte/sizeof(T2);
+    const npy_intp x_stride_col = x_stride_col_byte/sizeof(T2);
+
+    if(y_stride_col == 1 && x_stride_col == 1){
+        fused_csr_matvecs_coeffs(true,overwrite_y,n_row,n_vecs,Ap,Aj,At,Ax,c,x_stride_row,1,x,y_stride_row,1,y);
+    }
+    else{
+        fused_csr_matvecs_coeffs(true,overwrite_y,n_row,n_vecs,Ap,Aj,At,Ax,c,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+    }
+}
+
+
+template<typename I, typename K, typename T1,typename T2>
+inline void fused_csr_matvec_noomp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const I Ap[],
+                        const I Aj[],
+                        const K At[],
+                        const T1 Ax[],
+                        const T1 c[],
+                        const npy_intp x_stride_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride = y_stride_byte/sizeof(T2);
+    const npy_intp x_stride = x_stride_byte/sizeof(T2);
+
+    if(y_stride == 1 && x_stride == 1){
+        fused_csr_matvec(false,overwrite_y,n_row,Ap,Aj,At,Ax,c,1,x,1,y);
+    }
+    else{
+        fused_csr_matvec(false,overwrite_y,n_row,Ap,Aj,At,Ax,c,x_stride,x,y_stride,y);
+    }
+}
+
+template<typename I, typename K, typename T1,typename T2>
+inline void fused_csr_matvec_omp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const I Ap[],
+                        const I Aj[],
+                        const K At[],
+                        const T1 Ax[],
+                        const T1 c[],
+                        const npy_intp x_stride_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride = y_stride_byte/sizeof(T2);
+    const npy_intp x_stride = x_stride_byte/sizeof(T2);
+
+    if(y_stride == 1 && x_stride == 1){
+        fused_csr_matvec(true,overwrite_y,n_row,Ap,Aj,At,Ax,c,1,x,1,y);
+    }
+    else{
+        fused_csr_matvec(true,overwrite_y,n_row,Ap,Aj,At,Ax,c,x_stride,x,y_stride,y);
+    }
+}
+
+template<typename I, typename K, typename T1,typename T2>
+inline void fused_csr_matvecs_noomp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const npy_intp n_vecs,
+                        const I Ap[],
+                        const I Aj[],
+                        const K At[],
+                        const T1 Ax[],
+                        const T1 c[],
+                        const npy_intp x_stride_row_byte,
+                        const npy_intp x_stride_col_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_row_byte,
+                        const npy_intp y_stride_col_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride_row = y_stride_row_byte/sizeof(T2);
+    const npy_intp y_stride_col = y_stride_col_byte/sizeof(T2);
+    const npy_intp x_stride_row = x_stride_row_byte/sizeof(T2);
+    const npy_intp x_stride_col = x_stride_col_byte/sizeof(T2);
+
+    if(y_stride_col == 1 && x_stride_col == 1){
+        fused_csr_matvecs(false,overwrite_y,n_row,n_vecs,Ap,Aj,At,Ax,c,x_stride_row,1,x,y_stride_row,1,y);
+    }
+    else{
+        fused_csr_matvecs(false,overwrite_y,n_row,n_vecs,Ap,Aj,At,Ax,c,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+    }
+}
+
+template<typename I, typename K, typename T1,typename T2>
+inline void fused_csr_matvecs_omp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const npy_intp n_vecs,
+                        const I Ap[],
+                        const I Aj[],
+                        const K At[],
+                        const T1 Ax[],
+                        const T1 c[],
+                        const npy_intp x_stride_row_byte,
+                        const npy_intp x_stride_col_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_row_byte,
+                        const npy_intp y_stride_col_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride_row = y_stride_row_byte/sizeof(T2);
+    const npy_intp y_stride_col = y_stride_col_byte/sizeof(T2);
+    const npy_intp x_stride_row = x_stride_row_byte/sizeof(T2);
+    const npy_intp x_stride_col = x_stride_col_byte/sizeof(T2);
+
+    if(y_stride_col == 1 && x_stride_col == 1){
+        fused_csr_matvecs(true,overwrite_y,n_row,n_vecs,Ap,Aj,At,Ax,c,x_stride_row,1,x,y_stride_row,1,y);
+    }
+    else{
+        fused_csr_matvecs(true,overwrite_y,n_row,n_vecs,Ap,Aj,At,Ax,c,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+    }
+}
+
+#endif
@@ -0,0 +1,342 @@
+#ifndef __HERM_CSR_H
+#define __HERM_CSR_H
+
+#include "complex_ops.h"
+#include "utils.h"
+
+// hermitian csr format: only the upper triangle (including the diagonal) of a hermitian matrix A is stored as a csr
+// matrix U. The product y = a * A x is computed from U by using A_jk = conj(A_kj): every stored off-diagonal entry
+// contributes to row k (gather) and to row j (scatter), so that each matrix element is read from memory only once.
+
+inline float herm_conj(const float a){
+    return a;
+}
+
+inline double herm_conj(const double a){
+    return a;
+}
+
+inline npy_cfloat_wrapper herm_conj(const npy_cfloat_wrapper a){
+    return npy_cfloat_wrapper(a.real,-a.imag);
+}
+
+inline npy_cdouble_wrapper herm_conj(const npy_cdouble_wrapper a){
+    return npy_cdouble_wrapper(a.real,-a.imag);
+}
+
+
+template<typename I, typename T1,typename T2>
+void herm_csr_matvec_noomp_strided(const bool overwrite_y,
+                const I n_row,
+                const I Ap[],
+                const I Aj[],
+                const T1 Ax[],
+                const T1 a,
+                const npy_intp x_stride,
+                const T2 x[],
+                const npy_intp y_stride,
+                      T2 y[])
+{
+    if(overwrite_y){
+        for(I k = 0; k<n_row; k++){
+            y[k * y_stride] = 0;
+        }
+    }
+
+    for(I k = 0; k<n_row; k++){
+        const T2 x_k = x[k * x_stride];
+        T2 sum = 0;
+        for(I jj = Ap[k]; jj < Ap[k+1]; jj++){
+            const I j = Aj[jj];
+            sum += Ax[jj] * x[j * x_stride];
+            if(j != k){
+                y[j * y_stride] += (a * herm_conj(Ax[jj])) * x_k;
+            }
+        }
+        y[k * y_stride] += a * sum;
+    }
+}
+
+template<typename I, typename T1,typename T2>
+void herm_csr_matvecs_noomp_strided(const bool overwrite_y,
+                        const I n_row,
+                        const npy_intp n_vecs,
+                        const I Ap[],
+                        const I Aj[],
+                        const T1 Ax[],
+                        const T1 a,
+                        const npy_intp x_stride_row,
+                        const npy_intp x_stride_col,
+                        const T2 x[],
+                        const npy_intp y_stride_row,
+                        const npy_intp y_stride_col,
+                              T2 y[])
+{
+    if(overwrite_y){
+        for(I k = 0; k<n_row; k++){
+            for(npy_intp i = 0; i < n_vecs; i++){
+                y[k * y_stride_row + i * y_stride_col] = 0;
+            }
+        }
+    }
+
+    for(I k = 0; k<n_row; k++){
+        const T2 * x_k = x + x_stride_row * k;
+              T2 * y_k = y + y_stride_row * k;
+        for(I jj = Ap[k]; jj < Ap[k+1]; jj++){
+            const I j = Aj[jj];
+            const T2 ax = a * Ax[jj];
+            axpy_strided(n_vecs, ax, x_stride_col, x + x_stride_row * j, y_stride_col, y_k);
+            if(j != k){
+                const T2 ax_conj = a * herm_conj(Ax[jj]);
+                axpy_strided(n_vecs, ax_conj, x_stride_col, x_k, y_stride_col, y + y_stride_row * j);
+            }
+        }
+    }
+}
+
+
+
+#if defined(_OPENMP)
+#include "openmp.h"
+
+// rows are distributed over the threads, the scattered contributions to y are added atomically.
+template<typename I, typename T1,typename T2>
+void herm_csr_matvec_omp_strided(const bool overwrite_y,
+                const I n_row,
+                const I Ap[],
+                const I Aj[],
+                const T1 Ax[],
+                const T1 a,
+                const npy_intp x_stride,
+                const T2 x[],
+                const npy_intp y_stride,
+                      T2 y[])
+{
+	#pragma omp parallel
+	{
+	    const int nthread = omp_get_num_threads();
+	    const I chunk = std::max((I)1,n_row/(100*nthread));
+	    if(overwrite_y){
+	        #pragma omp for schedule(static)
+	        for(I k = 0; k < n_row; k++){
+	            y[k * y_stride] = 0;
+	        }
+	    }
+
+	    #pragma omp for schedule(dynamic,chunk)
+	    for(I k = 0; k<n_row; k++){
+	        const T2 x_k = x[k * x_stride];
+	        T2 sum = 0;
+	        for(I jj = Ap[k]; jj < Ap[k+1]; jj++){
+	            const I j = Aj[jj];
+	            sum += Ax[jj] * x[j * x_stride];
+	            if(j != k){
+	                const T2 aa = (a * herm_conj(Ax[jj])) * x_k;
+	                atomic_add(y[j * y_stride],aa);
+	            }
+	        }
+	        const T2 aa = a * sum;
+	        atomic_add(y[k * y_stride],aa);
+	    }
+	}
+}
+
+template<typename I, typename T1,typename T2>
+void herm_csr_matvecs_omp_strided(const bool overwrite_y,
+                        const I n_row,
+                        const npy_intp n_vecs,
+                        const I Ap[],
+                        const I Aj[],
+                        const T1 Ax[],
+                        const T1 a,
+                        const npy_intp x_stride_row,
+                        const npy_intp x_stride_col,
+                        const T2 x[],
+                        const npy_intp y_stride_row,
+                        const npy_intp y_stride_col,
+                              T2 y[])
+{
+	#pragma omp parallel
+	{
+	    const int nthread = omp_get_num_threads();
+	    const I chunk = std::max((I)1,n_row/(100*nthread));
+	    if(overwrite_y){
+	        #pragma omp for schedule(static)
+	        for(I k = 0; k < n_row; k++){
+	            for(npy_intp i = 0; i < n_vecs; i++){
+	                y[k * y_stride_row + i * y_stride_col] = 0;
+	            }
+	        }
+	    }
+
+	    #pragma omp for schedule(dynamic,chunk)
+	    for(I k = 0; k<n_row; k++){
+	        const T2 * x_k = x + x_stride_row * k;
+	              T2 * y_k = y + y_stride_row * k;
+	        for(I jj = Ap[k]; jj < Ap[k+1]; jj++){
+	            const I j = Aj[jj];
+	            const T2 ax = a * Ax[jj];
+	            const T2 ax_conj = a * herm_conj(Ax[jj]);
+	            const T2 * x_j = x + x_stride_row * j;
+	                  T2 * y_j = y + y_stride_row * j;
+	            for(npy_intp i = 0; i < n_vecs; i++){
+	                const T2 aa = ax * x_j[i * x_stride_col];
+	                atomic_add(y_k[i * y_stride_col],aa);
+	            }
+	            if(j != k){
+	                for(npy_intp i = 0; i < n_vecs; i++){
+	                    const T2 aa = ax_conj * x_k[i * x_stride_col];
+	                    atomic_add(y_j[i * y_stride_col],aa);
+	                }
+	            }
+	        }
+	    }
+	}
+}
+
+#else
+
+template<typename I, typename T1,typename T2>
+inline void herm_csr_matvec_omp_strided(const bool overwrite_y,
+                const I n_row,
+                const I Ap[],
+                const I Aj[],
+                const T1 Ax[],
+                const T1 a,
+                const npy_intp x_stride,
+                const T2 x[],
+                const npy_intp y_stride,
+                      T2 y[])
+{
+    herm_csr_matvec_noomp_strided(overwrite_y,n_row,Ap,Aj,Ax,a,x_stride,x,y_stride,y);
+}
+
+template<typename I, typename T1,typename T2>
+inline void herm_csr_matvecs_omp_strided(const bool overwrite_y,
+                        const I n_row,
+                        const npy_intp n_vecs,
+                        const I Ap[],
+                        const I Aj[],
+                        const T1 Ax[],
+                        const T1 a,
+                        const npy_intp x_stride_row,
+                        const npy_intp x_stride_col,
+                        const T2 x[],
+                        const npy_intp y_stride_row,
+                        const npy_intp y_stride_col,
+                              T2 y[])
+{
+    herm_csr_matvecs_noomp_strided(overwrite_y,n_row,n_vecs,Ap,Aj,Ax,a,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+}
+
+#endif
+
+
+template<typename I, typename T1,typename T2>
+inline void herm_csr_matvec_noomp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const I Ap[],
+                        const I Aj[],
+                        const T1 Ax[],
+                        const T1 a,
+                        const npy_intp x_stride_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride = y_stride_byte/sizeof(T2);
+    const npy_intp x_stride = x_stride_byte/sizeof(T2);
+
+    if(y_stride == 1 && x_stride == 1){
+        herm_csr_matvec_noomp_strided(overwrite_y,n_row,Ap,Aj,Ax,a,1,x,1,y);
+    }
+    else{
+        herm_csr_matvec_noomp_strided(overwrite_y,n_row,Ap,Aj,Ax,a,x_stride,x,y_stride,y);
+    }
+}
+
+template<typename I, typename T1,typename T2>
+inline void herm_csr_matvec_omp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const I Ap[],
+                        const I Aj[],
+                        const T1 Ax[],
+                        const T1 a,
+                        const npy_intp x_stride_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride = y_stride_byte/sizeof(T2);
+    const npy_intp x_stride = x_stride_byte/sizeof(T2);
+
+    if(y_stride == 1 && x_stride == 1){
+        herm_csr_matvec_omp_strided(overwrite_y,n_row,Ap,Aj,Ax,a,1,x,1,y);
+    }
+    else{
+        herm_csr_matvec_omp_strided(overwrite_y,n_row,Ap,Aj,Ax,a,x_stride,x,y_stride,y);
+    }
+}
+
+template<typename I, typename T1,typename T2>
+inline void herm_csr_matvecs_noomp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const npy_intp n_vecs,
+                        const I Ap[],
+                        const I Aj[],
+                        const T1 Ax[],
+                        const T1 a,
+                        const npy_intp x_stride_row_byte,
+                        const npy_intp x_stride_col_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_row_byte,
+                        const npy_intp y_stride_col_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride_row = y_stride_row_byte/sizeof(T2);
+    const npy_intp y_stride_col = y_stride_col_byte/sizeof(T2);
+    const npy_intp x_stride_row = x_stride_row_byte/sizeof(T2);
+    const npy_intp x_stride_col = x_stride_col_byte/sizeof(T2);
+
+    if(y_stride_col == 1 && x_stride_col == 1){
+        herm_csr_matvecs_noomp_strided(overwrite_y,n_row,n_vecs,Ap,Aj,Ax,a,x_stride_row,1,x,y_stride_row,1,y);
+    }
+    else{
+        herm_csr_matvecs_noomp_strided(overwrite_y,n_row,n_vecs,Ap,Aj,Ax,a,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+    }
+}
+
+template<typename I, typename T1,typename T2>
+inline void herm_csr_matvecs_omp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const npy_intp n_vecs,
+                        const I Ap[],
+                        const I Aj[],
+                        const T1 Ax[],
+                        const T1 a,
+                        const npy_intp x_stride_row_byte,
+                        const npy_intp x_stride_col_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_row_byte,
+                        const npy_intp y_stride_col_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride_row = y_stride_row_byte/sizeof(T2);
+    const npy_intp y_stride_col = y_stride_col_byte/sizeof(T2);
+    const npy_intp x_stride_row = x_stride_row_byte/sizeof(T2);
+    const npy_intp x_stride_col = x_stride_col_byte/sizeof(T2);
+
+    if(y_stride_col == 1 && x_stride_col == 1){
+        herm_csr_matvecs_omp_strided(overwrite_y,n_row,n_vecs,Ap,Aj,Ax,a,x_stride_row,1,x,y_stride_row,1,y);
+    }
+    else{
+        herm_csr_matvecs_omp_strided(overwrite_y,n_row,n_vecs,Ap,Aj,Ax,a,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+    }
+}
+
+#endif
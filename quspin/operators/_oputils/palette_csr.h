@@ -0,0 +1,242 @@
+#ifndef __PALETTE_CSR_H
+#define __PALETTE_CSR_H
+
+#include "complex_ops.h"
+#include "utils.h"
+#include "openmp.h"
+
+// palette csr format: csr matrix in which the value of entry jj is stored as a code Ak[jj] into the table V of the
+// distinct matrix elements, i.e. A[k,Aj[jj]] = V[Ak[jj]]. The codes are npy_uint8 or npy_uint16 (code_size 1 or 2
+// bytes) and the table is small enough to stay in cache, so the values are decoded on the fly while streaming
+// through the much smaller code array.
+
+template<typename I, typename K, typename T1,typename T2>
+void palette_csr_matvec(const bool parallel,
+                const bool overwrite_y,
+                const I n_row,
+                const I Ap[],
+                const I Aj[],
+                const K Ak[],
+                const T1 V[],
+                const T1 a,
+                const npy_intp x_stride,
+                const T2 x[],
+                const npy_intp y_stride,
+                      T2 y[])
+{
+    #pragma omp parallel for schedule(static) if(parallel)
+    for(I k = 0; k<n_row; k++){
+        T2 sum = 0;
+        for(I jj = Ap[k]; jj < Ap[k+1]; jj++){
+            sum += V[Ak[jj]] * x[Aj[jj] * x_stride];
+        }
+
+        if(overwrite_y){
+            y[k * y_stride] = a * sum;
+        }
+        else{
+            y[k * y_stride] += a * sum;
+        }
+    }
+}
+
+template<typename I, typename K, typename T1,typename T2>
+void palette_csr_matvecs(const bool parallel,
+                const bool overwrite_y,
+                const I n_row,
+                const npy_intp n_vecs,
+                const I Ap[],
+                const I Aj[],
+                const K Ak[],
+                const T1 V[],
+                const T1 a,
+                const npy_intp x_stride_row,
+                const npy_intp x_stride_col,
+                const T2 x[],
+                const npy_intp y_stride_row,
+                const npy_intp y_stride_col,
+                      T2 y[])
+{
+    #pragma omp parallel for schedule(static) if(parallel)
+    for(I k = 0; k<n_row; k++){
+        T2 * y_row = y + y_stride_row * k;
+
+        if(overwrite_y){
+            for(npy_intp i = 0; i < n_vecs; i++){
+                y_row[i * y_stride_col] = 0;
+            }
+        }
+
+        for(I jj = Ap[k]; jj < Ap[k+1]; jj++){
+            const T2 ax = a * V[Ak[jj]];
+            const T2 * x_row = x + x_stride_row * Aj[jj];
+            axpy_strided(n_vecs, ax, x_stride_col, x_row, y_stride_col, y_row);
+        }
+    }
+}
+
+// dispatch on the size of the codes and on unit strides.
+template<typename I, typename T1,typename T2>
+inline void palette_csr_matvec_strided(const bool parallel,
+                        const bool overwrite_y,
+                        const I n_row,
+                        const I Ap[],
+                        const I Aj[],
+                        const int code_size,
+                        const void * Ak,
+                        const T1 V[],
+                        const T1 a,
+                        const npy_intp x_stride,
+                        const T2 x[],
+                        const npy_intp y_stride,
+                              T2 y[])
+{
+    if(code_size == 1){
+        if(y_stride == 1 && x_stride == 1){
+            palette_csr_matvec(parallel,overwrite_y,n_row,Ap,Aj,(const npy_uint8*)Ak,V,a,1,x,1,y);
+        }
+        else{
+            palette_csr_matvec(parallel,overwrite_y,n_row,Ap,Aj,(const npy_uint8*)Ak,V,a,x_stride,x,y_stride,y);
+        }
+    }
+    else{
+        if(y_stride == 1 && x_stride == 1){
+            palette_csr_matvec(parallel,overwrite_y,n_row,Ap,Aj,(const npy_uint16*)Ak,V,a,1,x,1,y);
+        }
+        else{
+            palette_csr_matvec(parallel,overwrite_y,n_row,Ap,Aj,(const npy_uint16*)Ak,V,a,x_stride,x,y_stride,y);
+        }
+    }
+}
+
+template<typename I, typename T1,typename T2>
+inline void palette_csr_matvecs_strided(const bool parallel,
+                        const bool overwrite_y,
+                        const I n_row,
+                        const npy_intp n_vecs,
+                        const I Ap[],
+                        const I Aj[],
+                        const int code_size,
+                        const void * Ak,
+                        const T1 V[],
+                        const T1 a,
+                        const npy_intp x_stride_row,
+                        const npy_intp x_stride_col,
+                        const T2 x[],
+                        const npy_intp y_stride_row,
+                        const npy_intp y_stride_col,
+                              T2 y[])
+{
+    if(code_size == 1){
+        if(y_stride_col == 1 && x_stride_col == 1){
+            palette_csr_matvecs(parallel,overwrite_y,n_row,n_vecs,Ap,Aj,(const npy_uint8*)Ak,V,a,x_stride_row,1,x,y_stride_row,1,y);
+        }
+        else{
+            palette_csr_matvecs(parallel,overwrite_y,n_row,n_vecs,Ap,Aj,(const npy_uint8*)Ak,V,a,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+        }
+    }
+    else{
+        if(y_stride_col == 1 && x_stride_col == 1){
+            palette_csr_matvecs(parallel,overwrite_y,n_row,n_vecs,Ap,Aj,(const npy_uint16*)Ak,V,a,x_stride_row,1,x,y_stride_row,1,y);
+        }
+        else{
+            palette_csr_matvecs(parallel,overwrite_y,n_row,n_vecs,Ap,Aj,(const npy_uint16*)Ak,V,a,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+        }
+    }
+}
+
+template<typename I, typename T1,typename T2>
+inline void palette_csr_matvec_noomp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const I Ap[],
+                        const I Aj[],
+                        const int code_size,
+                        const void * Ak,
+                        const T1 V[],
+                        const T1 a,
+                        const npy_intp x_stride_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride = y_stride_byte/sizeof(T2);
+    const npy_intp x_stride = x_stride_byte/sizeof(T2);
+
+    palette_csr_matvec_strided(false,overwrite_y,n_row,Ap,Aj,code_size,Ak,V,a,x_stride,x,y_stride,y);
+}
+
+template<typename I, typename T1,typename T2>
+inline void palette_csr_matvec_omp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const I Ap[],
+                        const I Aj[],
+                        const int code_size,
+                        const void * Ak,
+                        const T1 V[],
+                        const T1 a,
+                        const npy_intp x_stride_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride = y_stride_byte/sizeof(T2);
+    const npy_intp x_stride = x_stride_byte/sizeof(T2);
+
+    palette_csr_matvec_strided(true,overwrite_y,n_row,Ap,Aj,code_size,Ak,V,a,x_stride,x,y_stride,y);
+}
+
+template<typename I, typename T1,typename T2>
+inline void palette_csr_matvecs_noomp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const npy_intp n_vecs,
+                        const I Ap[],
+                        const I Aj[],
+                        const int code_size,
+                        const void * Ak,
+                        const T1 V[],
+                        const T1 a,
+                        const npy_intp x_stride_row_byte,
+                        const npy_intp x_stride_col_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_row_byte,
+                        const npy_intp y_stride_col_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride_row = y_stride_row_byte/sizeof(T2);
+    const npy_intp y_stride_col = y_stride_col_byte/sizeof(T2);
+    const npy_intp x_stride_row = x_stride_row_byte/sizeof(T2);
+    const npy_intp x_stride_col = x_stride_col_byte/sizeof(T2);
+
+    palette_csr_matvecs_strided(false,overwrite_y,n_row,n_vecs,Ap,Aj,code_size,Ak,V,a,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+}
+
+template<typename I, typename T1,typename T2>
+inline void palette_csr_matvecs_omp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const npy_intp n_vecs,
+                        const I Ap[],
+                        const I Aj[],
+                        const int code_size,
+                        const void * Ak,
+                        const T1 V[],
+                        const T1 a,
+                        const npy_intp x_stride_row_byte,
+                        const npy_intp x_stride_col_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_row_byte,
+                        const npy_intp y_stride_col_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride_row = y_stride_row_byte/sizeof(T2);
+    const npy_intp y_stride_col = y_stride_col_byte/sizeof(T2);
+    const npy_intp x_stride_row = x_stride_row_byte/sizeof(T2);
+    const npy_intp x_stride_col = x_stride_col_byte/sizeof(T2);
+
+    palette_csr_matvecs_strided(true,overwrite_y,n_row,n_vecs,Ap,Aj,code_size,Ak,V,a,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+}
+
+#endif
@@ -0,0 +1,188 @@
+#ifndef __RCM_CSR_H
+#define __RCM_CSR_H
+
+#include "complex_ops.h"
+#include "utils.h"
+#include "openmp.h"
+
+// reordered csr format: the csr matrix (Ap,Aj,Ax) stores the rows and columns of a square matrix A in the order of the
+// permutation P, i.e. row k of the stored matrix is row P[k] of A and column j is column P[j] of A. The product
+// y = a * A x reads the state at the permuted columns and writes row k to y[P[k]], so that neither x nor y has to be
+// permuted into the order of the matrix.
+
+template<typename I, typename T1,typename T2>
+void rcm_csr_matvec(const bool parallel,
+                const bool overwrite_y,
+                const I n_row,
+                const I Ap[],
+                const I Aj[],
+                const T1 Ax[],
+                const npy_intp P[],
+                const T1 a,
+                const npy_intp x_stride,
+                const T2 x[],
+                const npy_intp y_stride,
+                      T2 y[])
+{
+    #pragma omp parallel for schedule(static) if(parallel)
+    for(I k = 0; k<n_row; k++){
+        T2 sum = 0;
+        for(I jj = Ap[k]; jj < Ap[k+1]; jj++){
+            sum += Ax[jj] * x[P[Aj[jj]] * x_stride];
+        }
+
+        if(overwrite_y){
+            y[P[k] * y_stride] = a * sum;
+        }
+        else{
+            y[P[k] * y_stride] += a * sum;
+        }
+    }
+}
+
+template<typename I, typename T1,typename T2>
+void rcm_csr_matvecs(const bool parallel,
+                const bool overwrite_y,
+                const I n_row,
+                const npy_intp n_vecs,
+                const I Ap[],
+                const I Aj[],
+                const T1 Ax[],
+                const npy_intp P[],
+                const T1 a,
+                const npy_intp x_stride_row,
+                const npy_intp x_stride_col,
+                const T2 x[],
+                const npy_intp y_stride_row,
+                const npy_intp y_stride_col,
+                      T2 y[])
+{
+    #pragma omp parallel for schedule(static) if(parallel)
+    for(I k = 0; k<n_row; k++){
+        T2 * y_row = y + y_stride_row * P[k];
+
+        if(overwrite_y){
+            for(npy_intp i = 0; i < n_vecs; i++){
+                y_row[i * y_stride_col] = 0;
+            }
+        }
+
+        for(I jj = Ap[k]; jj < Ap[k+1]; jj++){
+            const T2 ax = a * Ax[jj];
+            const T2 * x_row = x + x_stride_row * P[Aj[jj]];
+            axpy_strided(n_vecs, ax, x_stride_col, x_row, y_stride_col, y_row);
+        }
+    }
+}
+
+template<typename I, typename T1,typename T2>
+inline void rcm_csr_matvec_noomp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const I Ap[],
+                        const I Aj[],
+                        const T1 Ax[],
+                        const npy_intp P[],
+                        const T1 a,
+                        const npy_intp x_stride_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride = y_stride_byte/sizeof(T2);
+    const npy_intp x_stride = x_stride_byte/sizeof(T2);
+
+    if(y_stride == 1 && x_stride == 1){
+        rcm_csr_matvec(false,overwrite_y,n_row,Ap,Aj,Ax,P,a,1,x,1,y);
+    }
+    else{
+        rcm_csr_matvec(false,overwrite_y,n_row,Ap,Aj,Ax,P,a,x_stride,x,y_stride,y);
+    }
+}
+
+template<typename I, typename T1,typename T2>
+inline void rcm_csr_matvec_omp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const I Ap[],
+                        const I Aj[],
+                        const T1 Ax[],
+                        const npy_intp P[],
+                        const T1 a,
+                        const npy_intp x_stride_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride = y_stride_byte/sizeof(T2);
+    const npy_intp x_stride = x_stride_byte/sizeof(T2);
+
+    if(y_stride == 1 && x_stride == 1){
+        rcm_csr_matvec(true,overwrite_y,n_row,Ap,Aj,Ax,P,a,1,x,1,y);
+    }
+    else{
+        rcm_csr_matvec(true,overwrite_y,n_row,Ap,Aj,Ax,P,a,x_stride,x,y_stride,y);
+    }
+}
+
+template<typename I, typename T1,typename T2>
+inline void rcm_csr_matvecs_noomp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const npy_intp n_vecs,
+                        const I Ap[],
+                        const I Aj[],
+                        const T1 Ax[],
+                        const npy_intp P[],
+                        const T1 a,
+                        const npy_intp x_stride_row_byte,
+                        const npy_intp x_stride_col_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_row_byte,
+                        const npy_intp y_stride_col_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride_row = y_stride_row_byte/sizeof(T2);
+    const npy_intp y_stride_col = y_stride_col_byte/sizeof(T2);
+    const npy_intp x_stride_row = x_stride_row_byte/sizeof(T2);
+    const npy_intp x_stride_col = x_stride_col_byte/sizeof(T2);
+
+    if(y_stride_col == 1 && x_stride_col == 1){
+        rcm_csr_matvecs(false,overwrite_y,n_row,n_vecs,Ap,Aj,Ax,P,a,x_stride_row,1,x,y_stride_row,1,y);
+    }
+    else{
+        rcm_csr_matvecs(false,overwrite_y,n_row,n_vecs,Ap,Aj,Ax,P,a,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+    }
+}
+
+template<typename I, typename T1,typename T2>
+inline void rcm_csr_matvecs_omp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const npy_intp n_vecs,
+                        const I Ap[],
+                        const I Aj[],
+                        const T1 Ax[],
+                        const npy_intp P[],
+                        const T1 a,
+                        const npy_intp x_stride_row_byte,
+                        const npy_intp x_stride_col_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_row_byte,
+                        const npy_intp y_stride_col_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride_row = y_stride_row_byte/sizeof(T2);
+    const npy_intp y_stride_col = y_stride_col_byte/sizeof(T2);
+    const npy_intp x_stride_row = x_stride_row_byte/sizeof(T2);
+    const npy_intp x_stride_col = x_stride_col_byte/sizeof(T2);
+
+    if(y_stride_col == 1 && x_stride_col == 1){
+        rcm_csr_matvecs(true,overwrite_y,n_row,n_vecs,Ap,Aj,Ax,P,a,x_stride_row,1,x,y_stride_row,1,y);
+    }
+    else{
+        rcm_csr_matvecs(true,overwrite_y,n_row,n_vecs,Ap,Aj,Ax,P,a,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+    }
+}
+
+#endif
@@ -0,0 +1,229 @@
+#ifndef __SELL_H
+#define __SELL_H
+
+#include <vector>
+#include "complex_ops.h"
+#include "utils.h"
+#include "openmp.h"
+
+// sliced ELLPACK format (SELL-C-sigma): the rows are sorted by their number of nonzeros within windows of sigma rows
+// and the sorted rows are grouped into slices of C rows. Every slice is padded to the length of its longest row and
+// stored column major, i.e. the j-th entry of lane l of slice s is found at Sp[s] + j*C + l. The C lanes of a slice
+// are independent, so the innermost loop over the lanes has unit stride in Sj and Sx and can be vectorized.
+// perm[r] is the original row of the sorted row r. Padding entries have value 0 and a valid column index.
+
+template<typename I, typename T1,typename T2>
+void sell_matvec(const bool parallel,
+                const bool overwrite_y,
+                const I n_row,
+                const I C,
+                const I Sp[],
+                const I Sj[],
+                const T1 Sx[],
+                const I perm[],
+                const T1 a,
+                const npy_intp x_stride,
+                const T2 x[],
+                const npy_intp y_stride,
+                      T2 y[])
+{
+    const I n_slices = (n_row + C - 1)/C;
+
+    #pragma omp parallel if(parallel)
+    {
+        std::vector<T2> sum_vec(C);
+        T2 * sum = &sum_vec[0];
+
+        #pragma omp for schedule(static)
+        for(I s = 0; s < n_slices; s++){
+            const I width = (Sp[s+1] - Sp[s])/C;
+            const I * Sj_s = Sj + Sp[s];
+            const T1 * Sx_s = Sx + Sp[s];
+
+            for(I l = 0; l < C; l++){
+                sum[l] = 0;
+            }
+
+            for(I j = 0; j < width; j++){
+                const I * Sj_j = Sj_s + j*C;
+                const T1 * Sx_j = Sx_s + j*C;
+                for(I l = 0; l < C; l++){
+                    sum[l] += Sx_j[l] * x[Sj_j[l] * x_stride];
+                }
+            }
+
+            const I n_lanes = std::min(C,n_row - s*C);
+            const I * perm_s = perm + s*C;
+            if(overwrite_y){
+                for(I l = 0; l < n_lanes; l++){
+                    y[perm_s[l] * y_stride] = a * sum[l];
+                }
+            }
+            else{
+                for(I l = 0; l < n_lanes; l++){
+                    y[perm_s[l] * y_stride] += a * sum[l];
+                }
+            }
+        }
+    }
+}
+
+template<typename I, typename T1,typename T2>
+void sell_matvecs(const bool parallel,
+                const bool overwrite_y,
+                const I n_row,
+                const npy_intp n_vecs,
+                const I C,
+                const I Sp[],
+                const I Sj[],
+                const T1 Sx[],
+                const I perm[],
+                const T1 a,
+                const npy_intp x_stride_row,
+                const npy_intp x_stride_col,
+                const T2 x[],
+                const npy_intp y_stride_row,
+                const npy_intp y_stride_col,
+                      T2 y[])
+{
+    const I n_slices = (n_row + C - 1)/C;
+
+    #pragma omp parallel for schedule(static) if(parallel)
+    for(I s = 0; s < n_slices; s++){
+        const I width = (Sp[s+1] - Sp[s])/C;
+        const I n_lanes = std::min(C,n_row - s*C);
+
+        for(I l = 0; l < n_lanes; l++){
+            T2 * y_row = y + y_stride_row * perm[s*C + l];
+
+            if(overwrite_y){
+                for(npy_intp i = 0; i < n_vecs; i++){
+                    y_row[i * y_stride_col] = 0;
+                }
+            }
+
+            for(I j = 0; j < width; j++){
+                const I jj = Sp[s] + j*C + l;
+                const T2 ax = a * Sx[jj];
+                const T2 * x_row = x + x_stride_row * Sj[jj];
+                axpy_strided(n_vecs, ax, x_stride_col, x_row, y_stride_col, y_row);
+            }
+        }
+    }
+}
+
+template<typename I, typename T1,typename T2>
+inline void sell_matvec_noomp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const I C,
+                        const I Sp[],
+                        const I Sj[],
+                        const T1 Sx[],
+                        const I perm[],
+                        const T1 a,
+                        const npy_intp x_stride_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride = y_stride_byte/sizeof(T2);
+    const npy_intp x_stride = x_stride_byte/sizeof(T2);
+
+    if(y_stride == 1 && x_stride == 1){
+        sell_matvec(false,overwrite_y,n_row,C,Sp,Sj,Sx,perm,a,1,x,1,y);
+    }
+    else{
+        sell_matvec(false,overwrite_y,n_row,C,Sp,Sj,Sx,perm,a,x_stride,x,y_stride,y);
+    }
+}
+
+template<typename I, typename T1,typename T2>
+inline void sell_matvec_omp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const I C,
+                        const I Sp[],
+                        const I Sj[],
+                        const T1 Sx[],
+                        const I perm[],
+                        const T1 a,
+                        const npy_intp x_stride_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride = y_stride_byte/sizeof(T2);
+    const npy_intp x_stride = x_stride_byte/sizeof(T2);
+
+    if(y_stride == 1 && x_stride == 1){
+        sell_matvec(true,overwrite_y,n_row,C,Sp,Sj,Sx,perm,a,1,x,1,y);
+    }
+    else{
+        sell_matvec(true,overwrite_y,n_row,C,Sp,Sj,Sx,perm,a,x_stride,x,y_stride,y);
+    }
+}
+
+template<typename I, typename T1,typename T2>
+inline void sell_matvecs_noomp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const npy_intp n_vecs,
+                        const I C,
+                        const I Sp[],
+                        const I Sj[],
+                        const T1 Sx[],
+                        const I perm[],
+                        const T1 a,
+                        const npy_intp x_stride_row_byte,
+                        const npy_intp x_stride_col_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_row_byte,
+                        const npy_intp y_stride_col_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride_row = y_stride_row_byte/sizeof(T2);
+    const npy_intp y_stride_col = y_stride_col_byte/sizeof(T2);
+    const npy_intp x_stride_row = x_stride_row_byte/sizeof(T2);
+    const npy_intp x_stride_col = x_stride_col_byte/sizeof(T2);
+
+    if(y_stride_col == 1 && x_stride_col == 1){
+        sell_matvecs(false,overwrite_y,n_row,n_vecs,C,Sp,Sj,Sx,perm,a,x_stride_row,1,x,y_stride_row,1,y);
+    }
+    else{
+        sell_matvecs(false,overwrite_y,n_row,n_vecs,C,Sp,Sj,Sx,perm,a,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+    }
+}
+
+template<typename I, typename T1,typename T2>
+inline void sell_matvecs_omp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const npy_intp n_vecs,
+                        const I C,
+                        const I Sp[],
+                        const I Sj[],
+                        const T1 Sx[],
+                        const I perm[],
+                        const T1 a,
+                        const npy_intp x_stride_row_byte,
+                        const npy_intp x_stride_col_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_row_byte,
+                        const npy_intp y_stride_col_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride_row = y_stride_row_byte/sizeof(T2);
+    const npy_intp y_stride_col = y_stride_col_byte/sizeof(T2);
+    const npy_intp x_stride_row = x_stride_row_byte/sizeof(T2);
+    const npy_intp x_stride_col = x_stride_col_byte/sizeof(T2);
+
+    if(y_stride_col == 1 && x_stride_col == 1){
+        sell_matvecs(true,overwrite_y,n_row,n_vecs,C,Sp,Sj,Sx,perm,a,x_stride_row,1,x,y_stride_row,1,y);
+    }
+    else{
+        sell_matvecs(true,overwrite_y,n_row,n_vecs,C,Sp,Sj,Sx,perm,a,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+    }
+}
+
+#endif
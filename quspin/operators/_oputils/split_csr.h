@@ -0,0 +1,190 @@
+#ifndef __SPLIT_CSR_H
+#define __SPLIT_CSR_H
+
+#include "complex_ops.h"
+#include "utils.h"
+#include "openmp.h"
+
+// split csr format: the diagonal of a square matrix A is stored as a dense vector Ad and the off-diagonal entries as a
+// csr matrix (Ap,Aj,Ax) which does not contain any diagonal entries. The product y = a * A x adds Ad[k] * x[k] to the
+// sweep over row k, so that the diagonal does not need column indices and is streamed contiguously.
+
+template<typename I, typename T1,typename T2>
+void split_csr_matvec(const bool parallel,
+                const bool overwrite_y,
+                const I n_row,
+                const I Ap[],
+                const I Aj[],
+                const T1 Ax[],
+                const T1 Ad[],
+                const T1 a,
+                const npy_intp x_stride,
+                const T2 x[],
+                const npy_intp y_stride,
+                      T2 y[])
+{
+    #pragma omp parallel for schedule(static) if(parallel)
+    for(I k = 0; k<n_row; k++){
+        T2 sum = Ad[k] * x[k * x_stride];
+        for(I jj = Ap[k]; jj < Ap[k+1]; jj++){
+            sum += Ax[jj] * x[Aj[jj] * x_stride];
+        }
+
+        if(overwrite_y){
+            y[k * y_stride] = a * sum;
+        }
+        else{
+            y[k * y_stride] += a * sum;
+        }
+    }
+}
+
+template<typename I, typename T1,typename T2>
+void split_csr_matvecs(const bool parallel,
+                const bool overwrite_y,
+                const I n_row,
+                const npy_intp n_vecs,
+                const I Ap[],
+                const I Aj[],
+                const T1 Ax[],
+                const T1 Ad[],
+                const T1 a,
+                const npy_intp x_stride_row,
+                const npy_intp x_stride_col,
+                const T2 x[],
+                const npy_intp y_stride_row,
+                const npy_intp y_stride_col,
+                      T2 y[])
+{
+    #pragma omp parallel for schedule(static) if(parallel)
+    for(I k = 0; k<n_row; k++){
+        T2 * y_row = y + y_stride_row * k;
+
+        if(overwrite_y){
+            for(npy_intp i = 0; i < n_vecs; i++){
+                y_row[i * y_stride_col] = 0;
+            }
+        }
+
+        const T2 ad = a * Ad[k];
+        axpy_strided(n_vecs, ad, x_stride_col, x + x_stride_row * k, y_stride_col, y_row);
+
+        for(I jj = Ap[k]; jj < Ap[k+1]; jj++){
+            const T2 ax = a * Ax[jj];
+            const T2 * x_row = x + x_stride_row * Aj[jj];
+            axpy_strided(n_vecs, ax, x_stride_col, x_row, y_stride_col, y_row);
+        }
+    }
+}
+
+template<typename I, typename T1,typename T2>
+inline void split_csr_matvec_noomp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const I Ap[],
+                        const I Aj[],
+                        const T1 Ax[],
+                        const T1 Ad[],
+                        const T1 a,
+                        const npy_intp x_stride_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride = y_stride_byte/sizeof(T2);
+    const npy_intp x_stride = x_stride_byte/sizeof(T2);
+
+    if(y_stride == 1 && x_stride == 1){
+        split_csr_matvec(false,overwrite_y,n_row,Ap,Aj,Ax,Ad,a,1,x,1,y);
+    }
+    else{
+        split_csr_matvec(false,overwrite_y,n_row,Ap,Aj,Ax,Ad,a,x_stride,x,y_stride,y);
+    }
+}
+
+template<typename I, typename T1,typename T2>
+inline void split_csr_matvec_omp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const I Ap[],
+                        const I Aj[],
+                        const T1 Ax[],
+                        const T1 Ad[],
+                        const T1 a,
+                        const npy_intp x_stride_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride = y_stride_byte/sizeof(T2);
+    const npy_intp x_stride = x_stride_byte/sizeof(T2);
+
+    if(y_stride == 1 && x_stride == 1){
+        split_csr_matvec(true,overwrite_y,n_row,Ap,Aj,Ax,Ad,a,1,x,1,y);
+    }
+    else{
+        split_csr_matvec(true,overwrite_y,n_row,Ap,Aj,Ax,Ad,a,x_stride,x,y_stride,y);
+    }
+}
+
+template<typename I, typename T1,typename T2>
+inline void split_csr_matvecs_noomp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const npy_intp n_vecs,
+                        const I Ap[],
+                        const I Aj[],
+                        const T1 Ax[],
+                        const T1 Ad[],
+                        const T1 a,
+                        const npy_intp x_stride_row_byte,
+                        const npy_intp x_stride_col_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_row_byte,
+                        const npy_intp y_stride_col_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride_row = y_stride_row_byte/sizeof(T2);
+    const npy_intp y_stride_col = y_stride_col_byte/sizeof(T2);
+    const npy_intp x_stride_row = x_stride_row_byte/sizeof(T2);
+    const npy_intp x_stride_col = x_stride_col_byte/sizeof(T2);
+
+    if(y_stride_col == 1 && x_stride_col == 1){
+        split_csr_matvecs(false,overwrite_y,n_row,n_vecs,Ap,Aj,Ax,Ad,a,x_stride_row,1,x,y_stride_row,1,y);
+    }
+    else{
+        split_csr_matvecs(false,overwrite_y,n_row,n_vecs,Ap,Aj,Ax,Ad,a,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+    }
+}
+
+template<typename I, typename T1,typename T2>
+inline void split_csr_matvecs_omp(const bool overwrite_y,
+                        const I n_row,
+                        const I n_col,
+                        const npy_intp n_vecs,
+                        const I Ap[],
+                        const I Aj[],
+                        const T1 Ax[],
+                        const T1 Ad[],
+                        const T1 a,
+                        const npy_intp x_stride_row_byte,
+                        const npy_intp x_stride_col_byte,
+                        const T2 x[],
+                        const npy_intp y_stride_row_byte,
+                        const npy_intp y_stride_col_byte,
+                              T2 y[])
+{
+    const npy_intp y_stride_row = y_stride_row_byte/sizeof(T2);
+    const npy_intp y_stride_col = y_stride_col_byte/sizeof(T2);
+    const npy_intp x_stride_row = x_stride_row_byte/sizeof(T2);
+    const npy_intp x_stride_col = x_stride_col_byte/sizeof(T2);
+
+    if(y_stride_col == 1 && x_stride_col == 1){
+        split_csr_matvecs(true,overwrite_y,n_row,n_vecs,Ap,Aj,Ax,Ad,a,x_stride_row,1,x,y_stride_row,1,y);
+    }
+    else{
+        split_csr_matvecs(true,overwrite_y,n_row,n_vecs,Ap,Aj,Ax,Ad,a,x_stride_row,x_stride_col,x,y_stride_row,y_stride_col,y);
+    }
+}
+
+#endif
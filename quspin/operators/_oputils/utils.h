@@ -1,6 +1,15 @@
 #ifndef __UTILS_H
 #define __UTILS_H
 
+#include <algorithm>
+
+// number of vectors the threaded multi-vector kernels process together, such that the entries of a single
+// row of the block of vectors span a few cache lines only.
+template <typename T>
+inline npy_intp matvecs_block_size(){
+    return std::max<npy_intp>(1,512/sizeof(T));
+}
+
 // y += a*x
 template <typename I, typename T>
 void axpy_strided(const I n, const T a,const I x_stride, const T * x,const I y_stride, T * y){
@@ -200,6 +200,39 @@ def generate_csc():
 						   matvecs_nogil_body=matvecs_nogil_body,matvecs_gil_body=matvecs_gil_body)	
 
 
+def generate_herm_csr():
+	switch_num = 0
+	matvec_gil_body = ""
+	matvec_nogil_body = ""
+	matvecs_gil_body = ""
+	matvecs_nogil_body = ""
+	case_tmp = "\n\t\tcase {} :\n\t\t\t{}\n\t\t\tbreak;"
+	matvec_tmp = "{fmt}_matvec_{omp}<{T1},{T2},{T3}>(overwrite_y,(const {T1})n_row,(const {T1})n_col,(const {T1}*)Ap,(const {T1}*)Aj,(const {T2}*)Ax,*(const {T2}*)a,x_stride_byte,(const {T3}*)x,y_stride_byte,({T3}*)y);"
+	matvecs_tmp = "{fmt}_matvecs_{omp}<{T1},{T2},{T3}>(overwrite_y,(const {T1})n_row,(const {T1})n_col,n_vecs,(const {T1}*)Ap,(const {T1}*)Aj,(const {T2}*)Ax,*(const {T2}*)a,x_stride_row_byte,x_stride_col_byte,(const {T3}*)x,y_stride_row_byte,y_stride_col_byte,({T3}*)y);"
+	for T1 in I_types:
+		for T2 in T_types:
+			for T3 in T_types:
+				if np.can_cast(T2,T3):
+					call = matvec_tmp.format(fmt="herm_csr",omp="omp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvec_nogil_body = matvec_nogil_body + case_tmp.format(switch_num,call)
+
+					call = matvec_tmp.format(fmt="herm_csr",omp="noomp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvec_gil_body = matvec_gil_body + case_tmp.format(switch_num,call)
+
+					call = matvecs_tmp.format(fmt="herm_csr",omp="omp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvecs_nogil_body = matvecs_nogil_body + case_tmp.format(switch_num,call)
+
+					call = matvecs_tmp.format(fmt="herm_csr",omp="noomp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvecs_gil_body = matvecs_gil_body + case_tmp.format(switch_num,call)
+
+					switch_num += 1
+
+
+
+	return comp_body.format(fmt="herm_csr",matvec_nogil_body=matvec_nogil_body,matvec_gil_body=matvec_gil_body,
+						   matvecs_nogil_body=matvecs_nogil_body,matvecs_gil_body=matvecs_gil_body)	
+
+
 dia_body = """
 
 #include "dia.h"
@@ -323,6 +356,685 @@ def generate_dia():
 						   matvecs_nogil_body=matvecs_nogil_body,matvecs_gil_body=matvecs_gil_body)	
 
 
+fused_csr_body = """
+
+#include "fused_csr.h"
+
+void fused_csr_matvec_gil(const int switch_num,
+					const bool overwrite_y,
+					const npy_intp n_row,
+					const npy_intp n_col,
+						  void * Ap,
+						  void * Aj,
+						  void * At,
+						  void * Ax,
+						  void * c,
+					const npy_intp x_stride_byte,
+						  void * x,
+					const npy_intp y_stride_byte,
+						  void * y)
+{{
+	switch(switch_num){{{matvec_gil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}
+
+void fused_csr_matvec_nogil(const int switch_num,
+					  const bool overwrite_y,
+					  const npy_intp n_row,
+					  const npy_intp n_col,
+						    void * Ap,
+						    void * Aj,
+						    void * At,
+						    void * Ax,
+						    void * c,
+					  const npy_intp x_stride_byte,
+						    void * x,
+					  const npy_intp y_stride_byte,
+						    void * y)
+{{
+	switch(switch_num){{{matvec_nogil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}
+
+void fused_csr_matvecs_gil(const int switch_num,
+					  const bool overwrite_y,
+					  const npy_intp n_row,
+					  const npy_intp n_col,
+					  const npy_intp n_vecs,
+						    void * Ap,
+						    void * Aj,
+						    void * At,
+						    void * Ax,
+						    void * c,
+					  const npy_intp x_stride_row_byte,
+					  const npy_intp x_stride_col_byte,
+						    void * x,
+					  const npy_intp y_stride_row_byte,
+					  const npy_intp y_stride_col_byte,
+						    void * y)
+{{
+	switch(switch_num){{{matvecs_gil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}
+
+void fused_csr_matvecs_nogil(const int switch_num,
+					  const bool overwrite_y,
+					  const npy_intp n_row,
+					  const npy_intp n_col,
+					  const npy_intp n_vecs,
+						    void * Ap,
+						    void * Aj,
+						    void * At,
+						    void * Ax,
+						    void * c,
+					  const npy_intp x_stride_row_byte,
+					  const npy_intp x_stride_col_byte,
+						    void * x,
+					  const npy_intp y_stride_row_byte,
+					  const npy_intp y_stride_col_byte,
+						    void * y)
+{{
+	switch(switch_num){{{matvecs_nogil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}
+
+void fused_csr_matvecs_coeffs_gil(const int switch_num,
+					  const bool overwrite_y,
+					  const npy_intp n_row,
+					  const npy_intp n_col,
+					  const npy_intp n_vecs,
+						    void * Ap,
+						    void * Aj,
+						    void * At,
+						    void * Ax,
+						    void * c,
+					  const npy_intp x_stride_row_byte,
+					  const npy_intp x_stride_col_byte,
+						    void * x,
+					  const npy_intp y_stride_row_byte,
+					  const npy_intp y_stride_col_byte,
+						    void * y)
+{{
+	switch(switch_num){{{matvecs_coeffs_gil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}
+
+void fused_csr_matvecs_coeffs_nogil(const int switch_num,
+					  const bool overwrite_y,
+					  const npy_intp n_row,
+					  const npy_intp n_col,
+					  const npy_intp n_vecs,
+						    void * Ap,
+						    void * Aj,
+						    void * At,
+						    void * Ax,
+						    void * c,
+					  const npy_intp x_stride_row_byte,
+					  const npy_intp x_stride_col_byte,
+						    void * x,
+					  const npy_intp y_stride_row_byte,
+					  const npy_intp y_stride_col_byte,
+						    void * y)
+{{
+	switch(switch_num){{{matvecs_coeffs_nogil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}"""
+
+def generate_fused_csr():
+	switch_num = 0
+	matvec_gil_body = ""
+	matvec_nogil_body = ""
+	matvecs_gil_body = ""
+	matvecs_nogil_body = ""
+	matvecs_coeffs_gil_body = ""
+	matvecs_coeffs_nogil_body = ""
+	case_tmp = "\n\t\tcase {} :\n\t\t\t{}\n\t\t\tbreak;"
+	matvec_tmp = "fused_csr_matvec_{omp}<{T1},npy_uint16,{T2},{T3}>(overwrite_y,(const {T1})n_row,(const {T1})n_col,(const {T1}*)Ap,(const {T1}*)Aj,(const npy_uint16*)At,(const {T2}*)Ax,(const {T2}*)c,x_stride_byte,(const {T3}*)x,y_stride_byte,({T3}*)y);"
+	matvecs_tmp = "fused_csr_matvecs_{omp}<{T1},npy_uint16,{T2},{T3}>(overwrite_y,(const {T1})n_row,(const {T1})n_col,n_vecs,(const {T1}*)Ap,(const {T1}*)Aj,(const npy_uint16*)At,(const {T2}*)Ax,(const {T2}*)c,x_stride_row_byte,x_stride_col_byte,(const {T3}*)x,y_stride_row_byte,y_stride_col_byte,({T3}*)y);"
+	matvecs_coeffs_tmp = "fused_csr_matvecs_coeffs_{omp}<{T1},npy_uint16,{T2},{T3}>(overwrite_y,(const {T1})n_row,(const {T1})n_col,n_vecs,(const {T1}*)Ap,(const {T1}*)Aj,(const npy_uint16*)At,(const {T2}*)Ax,(const {T2}*)c,x_stride_row_byte,x_stride_col_byte,(const {T3}*)x,y_stride_row_byte,y_stride_col_byte,({T3}*)y);"
+	for T1 in I_types:
+		for T2 in T_types:
+			for T3 in T_types:
+				if np.can_cast(T2,T3):
+					call = matvec_tmp.format(omp="omp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvec_nogil_body = matvec_nogil_body + case_tmp.format(switch_num,call)
+
+					call = matvec_tmp.format(omp="noomp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvec_gil_body = matvec_gil_body + case_tmp.format(switch_num,call)
+
+					call = matvecs_tmp.format(omp="omp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvecs_nogil_body = matvecs_nogil_body + case_tmp.format(switch_num,call)
+
+					call = matvecs_tmp.format(omp="noomp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvecs_gil_body = matvecs_gil_body + case_tmp.format(switch_num,call)
+
+					call = matvecs_coeffs_tmp.format(omp="omp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvecs_coeffs_nogil_body = matvecs_coeffs_nogil_body + case_tmp.format(switch_num,call)
+
+					call = matvecs_coeffs_tmp.format(omp="noomp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvecs_coeffs_gil_body = matvecs_coeffs_gil_body + case_tmp.format(switch_num,call)
+
+					switch_num += 1
+
+
+
+	return fused_csr_body.format(matvec_nogil_body=matvec_nogil_body,matvec_gil_body=matvec_gil_body,
+						   matvecs_nogil_body=matvecs_nogil_body,matvecs_gil_body=matvecs_gil_body,
+						   matvecs_coeffs_nogil_body=matvecs_coeffs_nogil_body,matvecs_coeffs_gil_body=matvecs_coeffs_gil_body)	
+
+
+sell_body = """
+
+#include "sell.h"
+
+void sell_matvec_gil(const int switch_num,
+					const bool overwrite_y,
+					const npy_intp n_row,
+					const npy_intp n_col,
+					const npy_intp C,
+						  void * Sp,
+						  void * Sj,
+						  void * Sx,
+						  void * perm,
+						  void * a,
+					const npy_intp x_stride_byte,
+						  void * x,
+					const npy_intp y_stride_byte,
+						  void * y)
+{{
+	switch(switch_num){{{matvec_gil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}
+
+void sell_matvec_nogil(const int switch_num,
+					  const bool overwrite_y,
+					  const npy_intp n_row,
+					  const npy_intp n_col,
+					  const npy_intp C,
+						    void * Sp,
+						    void * Sj,
+						    void * Sx,
+						    void * perm,
+						    void * a,
+					  const npy_intp x_stride_byte,
+						    void * x,
+					  const npy_intp y_stride_byte,
+						    void * y)
+{{
+	switch(switch_num){{{matvec_nogil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}
+
+void sell_matvecs_gil(const int switch_num,
+					  const bool overwrite_y,
+					  const npy_intp n_row,
+					  const npy_intp n_col,
+					  const npy_intp n_vecs,
+					  const npy_intp C,
+						    void * Sp,
+						    void * Sj,
+						    void * Sx,
+						    void * perm,
+						    void * a,
+					  const npy_intp x_stride_row_byte,
+					  const npy_intp x_stride_col_byte,
+						    void * x,
+					  const npy_intp y_stride_row_byte,
+					  const npy_intp y_stride_col_byte,
+						    void * y)
+{{
+	switch(switch_num){{{matvecs_gil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}
+
+void sell_matvecs_nogil(const int switch_num,
+					  const bool overwrite_y,
+					  const npy_intp n_row,
+					  const npy_intp n_col,
+					  const npy_intp n_vecs,
+					  const npy_intp C,
+						    void * Sp,
+						    void * Sj,
+						    void * Sx,
+						    void * perm,
+						    void * a,
+					  const npy_intp x_stride_row_byte,
+					  const npy_intp x_stride_col_byte,
+						    void * x,
+					  const npy_intp y_stride_row_byte,
+					  const npy_intp y_stride_col_byte,
+						    void * y)
+{{
+	switch(switch_num){{{matvecs_nogil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}"""
+
+def generate_sell():
+	switch_num = 0
+	matvec_gil_body = ""
+	matvec_nogil_body = ""
+	matvecs_gil_body = ""
+	matvecs_nogil_body = ""
+	case_tmp = "\n\t\tcase {} :\n\t\t\t{}\n\t\t\tbreak;"
+	matvec_tmp = "sell_matvec_{omp}<{T1},{T2},{T3}>(overwrite_y,(const {T1})n_row,(const {T1})n_col,(const {T1})C,(const {T1}*)Sp,(const {T1}*)Sj,(const {T2}*)Sx,(const {T1}*)perm,*(const {T2}*)a,x_stride_byte,(const {T3}*)x,y_stride_byte,({T3}*)y);"
+	matvecs_tmp = "sell_matvecs_{omp}<{T1},{T2},{T3}>(overwrite_y,(const {T1})n_row,(const {T1})n_col,n_vecs,(const {T1})C,(const {T1}*)Sp,(const {T1}*)Sj,(const {T2}*)Sx,(const {T1}*)perm,*(const {T2}*)a,x_stride_row_byte,x_stride_col_byte,(const {T3}*)x,y_stride_row_byte,y_stride_col_byte,({T3}*)y);"
+	for T1 in I_types:
+		for T2 in T_types:
+			for T3 in T_types:
+				if np.can_cast(T2,T3):
+					call = matvec_tmp.format(omp="omp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvec_nogil_body = matvec_nogil_body + case_tmp.format(switch_num,call)
+
+					call = matvec_tmp.format(omp="noomp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvec_gil_body = matvec_gil_body + case_tmp.format(switch_num,call)
+
+					call = matvecs_tmp.format(omp="omp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvecs_nogil_body = matvecs_nogil_body + case_tmp.format(switch_num,call)
+
+					call = matvecs_tmp.format(omp="noomp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvecs_gil_body = matvecs_gil_body + case_tmp.format(switch_num,call)
+
+					switch_num += 1
+
+
+
+	return sell_body.format(matvec_nogil_body=matvec_nogil_body,matvec_gil_body=matvec_gil_body,
+						   matvecs_nogil_body=matvecs_nogil_body,matvecs_gil_body=matvecs_gil_body)	
+
+
+palette_csr_body = """
+
+#include "palette_csr.h"
+
+void palette_csr_matvec_gil(const int switch_num,
+					const bool overwrite_y,
+					const npy_intp n_row,
+					const npy_intp n_col,
+						  void * Ap,
+						  void * Aj,
+					const int code_size,
+						  void * Ak,
+						  void * V,
+						  void * a,
+					const npy_intp x_stride_byte,
+						  void * x,
+					const npy_intp y_stride_byte,
+						  void * y)
+{{
+	switch(switch_num){{{matvec_gil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}
+
+void palette_csr_matvec_nogil(const int switch_num,
+					  const bool overwrite_y,
+					  const npy_intp n_row,
+					  const npy_intp n_col,
+						    void * Ap,
+						    void * Aj,
+					  const int code_size,
+						    void * Ak,
+						    void * V,
+						    void * a,
+					  const npy_intp x_stride_byte,
+						    void * x,
+					  const npy_intp y_stride_byte,
+						    void * y)
+{{
+	switch(switch_num){{{matvec_nogil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}
+
+void palette_csr_matvecs_gil(const int switch_num,
+					  const bool overwrite_y,
+					  const npy_intp n_row,
+					  const npy_intp n_col,
+					  const npy_intp n_vecs,
+						    void * Ap,
+						    void * Aj,
+					  const int code_size,
+						    void * Ak,
+						    void * V,
+						    void * a,
+					  const npy_intp x_stride_row_byte,
+					  const npy_intp x_stride_col_byte,
+						    void * x,
+					  const npy_intp y_stride_row_byte,
+					  const npy_intp y_stride_col_byte,
+						    void * y)
+{{
+	switch(switch_num){{{matvecs_gil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}
+
+void palette_csr_matvecs_nogil(const int switch_num,
+					  const bool overwrite_y,
+					  const npy_intp n_row,
+					  const npy_intp n_col,
+					  const npy_intp n_vecs,
+						    void * Ap,
+						    void * Aj,
+					  const int code_size,
+						    void * Ak,
+						    void * V,
+						    void * a,
+					  const npy_intp x_stride_row_byte,
+					  const npy_intp x_stride_col_byte,
+						    void * x,
+					  const npy_intp y_stride_row_byte,
+					  const npy_intp y_stride_col_byte,
+						    void * y)
+{{
+	switch(switch_num){{{matvecs_nogil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}"""
+
+def generate_palette_csr():
+	switch_num = 0
+	matvec_gil_body = ""
+	matvec_nogil_body = ""
+	matvecs_gil_body = ""
+	matvecs_nogil_body = ""
+	case_tmp = "\n\t\tcase {} :\n\t\t\t{}\n\t\t\tbreak;"
+	matvec_tmp = "palette_csr_matvec_{omp}<{T1},{T2},{T3}>(overwrite_y,(const {T1})n_row,(const {T1})n_col,(const {T1}*)Ap,(const {T1}*)Aj,code_size,(const void*)Ak,(const {T2}*)V,*(const {T2}*)a,x_stride_byte,(const {T3}*)x,y_stride_byte,({T3}*)y);"
+	matvecs_tmp = "palette_csr_matvecs_{omp}<{T1},{T2},{T3}>(overwrite_y,(const {T1})n_row,(const {T1})n_col,n_vecs,(const {T1}*)Ap,(const {T1}*)Aj,code_size,(const void*)Ak,(const {T2}*)V,*(const {T2}*)a,x_stride_row_byte,x_stride_col_byte,(const {T3}*)x,y_stride_row_byte,y_stride_col_byte,({T3}*)y);"
+	for T1 in I_types:
+		for T2 in T_types:
+			for T3 in T_types:
+				if np.can_cast(T2,T3):
+					call = matvec_tmp.format(omp="omp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvec_nogil_body = matvec_nogil_body + case_tmp.format(switch_num,call)
+
+					call = matvec_tmp.format(omp="noomp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvec_gil_body = matvec_gil_body + case_tmp.format(switch_num,call)
+
+					call = matvecs_tmp.format(omp="omp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvecs_nogil_body = matvecs_nogil_body + case_tmp.format(switch_num,call)
+
+					call = matvecs_tmp.format(omp="noomp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvecs_gil_body = matvecs_gil_body + case_tmp.format(switch_num,call)
+
+					switch_num += 1
+
+
+
+	return palette_csr_body.format(matvec_nogil_body=matvec_nogil_body,matvec_gil_body=matvec_gil_body,
+						   matvecs_nogil_body=matvecs_nogil_body,matvecs_gil_body=matvecs_gil_body)	
+
+
+split_csr_body = """
+
+#include "split_csr.h"
+
+void split_csr_matvec_gil(const int switch_num,
+					const bool overwrite_y,
+					const npy_intp n_row,
+					const npy_intp n_col,
+						  void * Ap,
+						  void * Aj,
+						  void * Ax,
+						  void * Ad,
+						  void * a,
+					const npy_intp x_stride_byte,
+						  void * x,
+					const npy_intp y_stride_byte,
+						  void * y)
+{{
+	switch(switch_num){{{matvec_gil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}
+
+void split_csr_matvec_nogil(const int switch_num,
+					  const bool overwrite_y,
+					  const npy_intp n_row,
+					  const npy_intp n_col,
+						    void * Ap,
+						    void * Aj,
+						    void * Ax,
+						    void * Ad,
+						    void * a,
+					  const npy_intp x_stride_byte,
+						    void * x,
+					  const npy_intp y_stride_byte,
+						    void * y)
+{{
+	switch(switch_num){{{matvec_nogil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}
+
+void split_csr_matvecs_gil(const int switch_num,
+					  const bool overwrite_y,
+					  const npy_intp n_row,
+					  const npy_intp n_col,
+					  const npy_intp n_vecs,
+						    void * Ap,
+						    void * Aj,
+						    void * Ax,
+						    void * Ad,
+						    void * a,
+					  const npy_intp x_stride_row_byte,
+					  const npy_intp x_stride_col_byte,
+						    void * x,
+					  const npy_intp y_stride_row_byte,
+					  const npy_intp y_stride_col_byte,
+						    void * y)
+{{
+	switch(switch_num){{{matvecs_gil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}
+
+void split_csr_matvecs_nogil(const int switch_num,
+					  const bool overwrite_y,
+					  const npy_intp n_row,
+					  const npy_intp n_col,
+					  const npy_intp n_vecs,
+						    void * Ap,
+						    void * Aj,
+						    void * Ax,
+						    void * Ad,
+						    void * a,
+					  const npy_intp x_stride_row_byte,
+					  const npy_intp x_stride_col_byte,
+						    void * x,
+					  const npy_intp y_stride_row_byte,
+					  const npy_intp y_stride_col_byte,
+						    void * y)
+{{
+	switch(switch_num){{{matvecs_nogil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}"""
+
+def generate_split_csr():
+	switch_num = 0
+	matvec_gil_body = ""
+	matvec_nogil_body = ""
+	matvecs_gil_body = ""
+	matvecs_nogil_body = ""
+	case_tmp = "\n\t\tcase {} :\n\t\t\t{}\n\t\t\tbreak;"
+	matvec_tmp = "split_csr_matvec_{omp}<{T1},{T2},{T3}>(overwrite_y,(const {T1})n_row,(const {T1})n_col,(const {T1}*)Ap,(const {T1}*)Aj,(const {T2}*)Ax,(const {T2}*)Ad,*(const {T2}*)a,x_stride_byte,(const {T3}*)x,y_stride_byte,({T3}*)y);"
+	matvecs_tmp = "split_csr_matvecs_{omp}<{T1},{T2},{T3}>(overwrite_y,(const {T1})n_row,(const {T1})n_col,n_vecs,(const {T1}*)Ap,(const {T1}*)Aj,(const {T2}*)Ax,(const {T2}*)Ad,*(const {T2}*)a,x_stride_row_byte,x_stride_col_byte,(const {T3}*)x,y_stride_row_byte,y_stride_col_byte,({T3}*)y);"
+	for T1 in I_types:
+		for T2 in T_types:
+			for T3 in T_types:
+				if np.can_cast(T2,T3):
+					call = matvec_tmp.format(omp="omp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvec_nogil_body = matvec_nogil_body + case_tmp.format(switch_num,call)
+
+					call = matvec_tmp.format(omp="noomp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvec_gil_body = matvec_gil_body + case_tmp.format(switch_num,call)
+
+					call = matvecs_tmp.format(omp="omp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvecs_nogil_body = matvecs_nogil_body + case_tmp.format(switch_num,call)
+
+					call = matvecs_tmp.format(omp="noomp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvecs_gil_body = matvecs_gil_body + case_tmp.format(switch_num,call)
+
+					switch_num += 1
+
+
+
+	return split_csr_body.format(matvec_nogil_body=matvec_nogil_body,matvec_gil_body=matvec_gil_body,
+						   matvecs_nogil_body=matvecs_nogil_body,matvecs_gil_body=matvecs_gil_body)	
+
+
+rcm_csr_body = """
+
+#include "rcm_csr.h"
+
+void rcm_csr_matvec_gil(const int switch_num,
+					const bool overwrite_y,
+					const npy_intp n_row,
+					const npy_intp n_col,
+						  void * Ap,
+						  void * Aj,
+						  void * Ax,
+						  void * P,
+						  void * a,
+					const npy_intp x_stride_byte,
+						  void * x,
+					const npy_intp y_stride_byte,
+						  void * y)
+{{
+	switch(switch_num){{{matvec_gil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}
+
+void rcm_csr_matvec_nogil(const int switch_num,
+					  const bool overwrite_y,
+					  const npy_intp n_row,
+					  const npy_intp n_col,
+						    void * Ap,
+						    void * Aj,
+						    void * Ax,
+						    void * P,
+						    void * a,
+					  const npy_intp x_stride_byte,
+						    void * x,
+					  const npy_intp y_stride_byte,
+						    void * y)
+{{
+	switch(switch_num){{{matvec_nogil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}
+
+void rcm_csr_matvecs_gil(const int switch_num,
+					  const bool overwrite_y,
+					  const npy_intp n_row,
+					  const npy_intp n_col,
+					  const npy_intp n_vecs,
+						    void * Ap,
+						    void * Aj,
+						    void * Ax,
+						    void * P,
+						    void * a,
+					  const npy_intp x_stride_row_byte,
+					  const npy_intp x_stride_col_byte,
+						    void * x,
+					  const npy_intp y_stride_row_byte,
+					  const npy_intp y_stride_col_byte,
+						    void * y)
+{{
+	switch(switch_num){{{matvecs_gil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}
+
+void rcm_csr_matvecs_nogil(const int switch_num,
+					  const bool overwrite_y,
+					  const npy_intp n_row,
+					  const npy_intp n_col,
+					  const npy_intp n_vecs,
+						    void * Ap,
+						    void * Aj,
+						    void * Ax,
+						    void * P,
+						    void * a,
+					  const npy_intp x_stride_row_byte,
+					  const npy_intp x_stride_col_byte,
+						    void * x,
+					  const npy_intp y_stride_row_byte,
+					  const npy_intp y_stride_col_byte,
+						    void * y)
+{{
+	switch(switch_num){{{matvecs_nogil_body:}
+	    default:
+	        throw std::runtime_error("internal error: invalid argument typenums");
+	}}
+}}"""
+
+def generate_rcm_csr():
+	switch_num = 0
+	matvec_gil_body = ""
+	matvec_nogil_body = ""
+	matvecs_gil_body = ""
+	matvecs_nogil_body = ""
+	case_tmp = "\n\t\tcase {} :\n\t\t\t{}\n\t\t\tbreak;"
+	matvec_tmp = "rcm_csr_matvec_{omp}<{T1},{T2},{T3}>(overwrite_y,(const {T1})n_row,(const {T1})n_col,(const {T1}*)Ap,(const {T1}*)Aj,(const {T2}*)Ax,(const npy_intp*)P,*(const {T2}*)a,x_stride_byte,(const {T3}*)x,y_stride_byte,({T3}*)y);"
+	matvecs_tmp = "rcm_csr_matvecs_{omp}<{T1},{T2},{T3}>(overwrite_y,(const {T1})n_row,(const {T1})n_col,n_vecs,(const {T1}*)Ap,(const {T1}*)Aj,(const {T2}*)Ax,(const npy_intp*)P,*(const {T2}*)a,x_stride_row_byte,x_stride_col_byte,(const {T3}*)x,y_stride_row_byte,y_stride_col_byte,({T3}*)y);"
+	for T1 in I_types:
+		for T2 in T_types:
+			for T3 in T_types:
+				if np.can_cast(T2,T3):
+					call = matvec_tmp.format(omp="omp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvec_nogil_body = matvec_nogil_body + case_tmp.format(switch_num,call)
+
+					call = matvec_tmp.format(omp="noomp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvec_gil_body = matvec_gil_body + case_tmp.format(switch_num,call)
+
+					call = matvecs_tmp.format(omp="omp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvecs_nogil_body = matvecs_nogil_body + case_tmp.format(switch_num,call)
+
+					call = matvecs_tmp.format(omp="noomp",T1=numpy_ctypes[T1],T2=numpy_ctypes[T2],T3=numpy_ctypes[T3])
+					matvecs_gil_body = matvecs_gil_body + case_tmp.format(switch_num,call)
+
+					switch_num += 1
+
+
+
+	return rcm_csr_body.format(matvec_nogil_body=matvec_nogil_body,matvec_gil_body=matvec_gil_body,
+						   matvecs_nogil_body=matvecs_nogil_body,matvecs_gil_body=matvecs_gil_body)	
+
+
 oputils_impl_header = """#ifndef __OPUTILS_IMPL_H__
 #define __OPUTILS_IMPL_H__
 
@@ -341,6 +1053,12 @@ def generate_oputils():
 	header_body = header_body + generate_csr()
 	header_body = header_body + generate_csc()
 	header_body = header_body + generate_dia()
+	header_body = header_body + generate_herm_csr()
+	header_body = header_body + generate_fused_csr()
+	header_body = header_body + generate_sell()
+	header_body = header_body + generate_palette_csr()
+	header_body = header_body + generate_split_csr()
+	header_body = header_body + generate_rcm_csr()
 	oputils_impl_header.format(header_body=header_body)
 	path = os.path.join(os.path.dirname(__file__),"_oputils","oputils_impl.h")
 	IO = open(path,"w")
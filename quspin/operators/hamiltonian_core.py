@@ -4,9 +4,12 @@ from ..basis import spin_basis_1d as _default_basis
 from ..basis import isbasis as _isbasis
 
 from ..tools.evolution import evolve
+from ..tools.misc import num_threads as _num_threads
+from .._parallel import _numa_zeros,_numa_array
 
 from ._oputils import matvec as _matvec
 from ._oputils import _get_matvec_function
+from ._oputils import _csr_dot_coeffs
 
 # from .exp_op_core import isexp_op,exp_op
 
@@ -14,7 +17,11 @@ from ._make_hamiltonian import make_static
 from ._make_hamiltonian import make_dynamic
 from ._make_hamiltonian import test_function
 from ._make_hamiltonian import _check_almost_zero
+from ._make_hamiltonian import _matrix_free_operator
+from ._make_hamiltonian import _herm_csr_matrix,_sell_matrix,_palette_csr_matrix,_split_diag_matrix,_reordered_csr_matrix,_custom_sparse_formats
+from ._make_hamiltonian import _fused_csr_matrix
 from ._functions import function
+from ._functions import memoize as _memoize
 
 # need linear algebra packages
 import scipy
@@ -164,6 +171,14 @@ def _hamiltonian_dot(hamiltonian,time,v):
 	return hamiltonian.dot(v,time=time,check=False)
 
 
+def _get_matvec(mat_obj):
+	"""Returns matvec function for static or dynamic part of a hamiltonian."""
+	if isinstance(mat_obj,_matrix_free_operator):
+		return _matrix_free_operator._matvec
+	else:
+		return _get_matvec_function(mat_obj)
+
+
 class hamiltonian(object):
 	"""Constructs time-dependent (hermitian and nonhermitian) operators.
 
@@ -198,7 +213,7 @@ class hamiltonian(object):
 
 	"""
 
-	def __init__(self,static_list,dynamic_list,N=None,basis=None,shape=None,dtype=_np.complex128,static_fmt=None,dynamic_fmt=None,copy=True,check_symm=True,check_herm=True,check_pcon=True,**basis_kwargs):
+	def __init__(self,static_list,dynamic_list,N=None,basis=None,shape=None,dtype=_np.complex128,static_fmt=None,dynamic_fmt=None,copy=True,check_symm=True,check_herm=True,check_pcon=True,matrix_free=False,fused=False,storage_dtype=None,**basis_kwargs):
 		"""Intializes the `hamtilonian` object (any quantum operator).
 
 		Parameters
@@ -219,13 +234,28 @@ class hamiltonian(object):
 
 				>>> f_val = fun(t,*fun_args)
 
+			Products at many times (e.g. `dot` with an array of times) call `fun` with the whole array of times if it
+			supports arrays, which is tested on the first such call. Set the attribute `fun.vectorize = True` to skip 
+			this test, or `fun.vectorize = False` to always call `fun` once per time (e.g. for drives with side effects).
+
 			If the operator is time-INdependent, one must pass an empty list: `dynamic_list = []`.
 		N : int, optional
 			Number of lattice sites for the `hamiltonian` object.
 		dtype : numpy.datatype, optional
 			Data type (e.g. numpy.float64) to construct the operator with.
-		static_fmt : str {"csr","csc","dia","dense"}, optional
-			Specifies format of static part of Hamiltonian.
+		static_fmt : str {"csr","csc","dia","dense","herm","sell","palette","split","rcm"}, optional
+			Specifies format of static part of Hamiltonian. The "herm" format only stores the upper triangle of a hermitian 
+			static part, which halves its memory and the memory traffic of matrix-vector products (raises ValueError if the 
+			static part is not hermitian). The "sell" format (sliced ELLPACK) stores groups of rows with similar lengths 
+			padded to equal length, which allows for vectorized matrix-vector products. The "palette" format stores a table of 
+			the distinct matrix elements and a 1 or 2 byte code per nonzero, which reduces the memory of operators with few 
+			distinct matrix elements (raises ValueError for more than 65536 distinct matrix elements). The "split" format stores 
+			the diagonal as a dense vector and the off-diagonal part in csr format, which saves the column indices of diagonal 
+			terms and makes `diagonal()`, `trace()` and shifts by diagonal matrices O(Ns) operations. The "rcm" format stores 
+			the rows and columns in reverse Cuthill-McKee order, which moves the nonzeros close to the diagonal. `evolve` and 
+			`eigsh` permute the states into this order once, so that their matrix-vector products read the states from nearby 
+			memory for large Ns. Other methods (e.g. `dot`) read and write the states through the permutation in every 
+			product, which is slower than "csr".
 		dynamic_fmt: str {"csr","csc","dia","dense"} or  dict, keys: (func,func_args), values: str {"csr","csc","dia","dense"}
 			Specifies the format of the dynamic parts of the hamiltonian. To specify a particular dynamic part of the hamiltonian use a tuple (func,func_args) which matches a function+argument pair
 			used in the construction of the hamiltonian as a key in the dictionary.
@@ -239,6 +269,25 @@ class hamiltonian(object):
 			Enable/Disable hermiticity check on `static_list` and `dynamic_list`.
 		check_pcon : bool, optional
 			Enable/Disable particle conservation check on `static_list` and `dynamic_list`.
+		matrix_free : bool, optional
+			If set to `True`, the operator matrices are not constructed. Instead the operator strings in `static_list`
+			and `dynamic_list` are applied to the states on the fly using `basis.inplace_Op`. This reduces the memory 
+			to that of the states at the cost of speed. Only methods which act with the operator on states (e.g. `dot`,
+			`expt_value`, `evolve`, `eigsh`, `aslinearoperator`) are available in this mode. Requires one of the general
+			basis classes (e.g. `spin_basis_general`), which apply the operators in place without building matrix elements;
+			other basis classes raise a `TypeError`. Default is `False`.
+		fused : bool, optional
+			If set to `True`, the static and dynamic parts are additionally stored in a joint sparse format in which
+			every matrix element carries the index of the part it belongs to. Products with states (e.g. `dot` and 
+			the equations of motion in `evolve`) then evaluate :math:`H(t)|V\\rangle` in a single pass over the state,
+			instead of one pass per dynamic part. This roughly doubles the memory used by the matrices and is ignored
+			if the operator has no dynamic part, dense or matrix free parts. Default is `False`.
+		storage_dtype : numpy.datatype, optional
+			Data type (e.g. numpy.complex64) to store the matrices with, if it differs from `dtype` (mixed precision). 
+			Products with states are computed in the precision of `dtype`, so that only the stored matrix elements 
+			(and the coefficients they are multiplied with) are rounded to `storage_dtype`. Single precision storage 
+			halves the memory traffic of the matrix-vector products in e.g. `dot` and `evolve`. Must be castable to 
+			`dtype` and of the same kind (real or complex), default is `None` which stores the matrices in `dtype`.
 		basis_kwargs : dict
 			Optional additional arguments to pass to the `basis` class, if not already using a `basis` object
 			to create the operator.
@@ -248,12 +297,26 @@ class hamiltonian(object):
 		self._is_dense = False
 		self._ndim = 2
 		self._basis = basis
+		self._fused_fmt = fused
 
 
 		if not (dtype in supported_dtypes):
 			raise TypeError('hamiltonian does not support type: '+str(dtype))
 		else:
 			self._dtype=dtype
+
+		if storage_dtype is not None:
+			if not (storage_dtype in supported_dtypes):
+				raise TypeError('hamiltonian does not support storage type: '+str(storage_dtype))
+			if not _np.can_cast(storage_dtype,dtype):
+				raise TypeError('storage type {0} can not be cast to {1}.'.format(_np.dtype(storage_dtype).name,_np.dtype(dtype).name))
+			if _np.dtype(storage_dtype).kind != _np.dtype(dtype).kind:
+				# the kernels scale the matrices with coefficients of the storage type.
+				raise TypeError('storage type {0} drops the imaginary part of the coefficients of {1} operators.'.format(_np.dtype(storage_dtype).name,_np.dtype(dtype).name))
+			if _np.dtype(storage_dtype) == _np.dtype(dtype):
+				storage_dtype = None
+
+		self._storage_dtype = storage_dtype
 		
 
 
@@ -316,8 +379,8 @@ class hamiltonian(object):
 
 
 
-			self._static=make_static(self._basis,static_opstr_list,dtype)
-			self._dynamic=make_dynamic(self._basis,dynamic_opstr_list,dtype)
+			self._static=make_static(self._basis,static_opstr_list,dtype,matrix_free=matrix_free)
+			self._dynamic=make_dynamic(self._basis,dynamic_opstr_list,dtype,matrix_free=matrix_free)
 			self._shape = self._static.shape
 
 		if static_other_list or dynamic_other_list:
@@ -369,6 +432,14 @@ class hamiltonian(object):
 					except NotImplementedError:
 						self._static = self._static + O.astype(self._dtype)
 
+				elif isinstance(O,_matrix_free_operator):
+					self._mat_checks(O)
+					self._static = self._static + O.astype(self._dtype)
+
+				elif isinstance(O,_custom_sparse_formats):
+					self._mat_checks(O)
+					self._static = self._static + O.astype(self._dtype,copy=copy)
+
 				else:
 					O = _np.asarray(O,dtype=self._dtype)
 					self._mat_checks(O)
@@ -384,7 +455,7 @@ class hamiltonian(object):
 					except NotImplementedError:
 						self._static = self._static + O.astype(self._dtype)
 
-			if not _sp.issparse(self._static):
+			if not (_sp.issparse(self._static) or isinstance(self._static,(_matrix_free_operator,)+_custom_sparse_formats)):
 				self._static = _np.asarray(self._static)
 
 
@@ -407,6 +478,10 @@ class hamiltonian(object):
 					self._mat_checks(O)
 
 					O = O.astype(self._dtype,copy=copy)
+				elif isinstance(O,_matrix_free_operator):
+					self._mat_checks(O)
+
+					O = O.astype(self._dtype)
 				else:
 					O = _np.array(O,copy=copy,dtype=self._dtype)
 					self._mat_checks(O)
@@ -544,25 +619,107 @@ class hamiltonian(object):
 			else:
 				nbytes += Hd.nbytes	
 
+		if self._fused is not None:
+			nbytes += self._fused.nbytes
+
 		return nbytes	
 
 	def check_is_dense(self):
 		""" updates attribute `_.is_dense`."""
-		is_sparse = _sp.issparse(self._static)
+		is_sparse = _sp.issparse(self._static) or isinstance(self._static,(_matrix_free_operator,)+_custom_sparse_formats)
 		for Hd in itervalues(self._dynamic):
-			is_sparse *= _sp.issparse(Hd)
+			is_sparse *= _sp.issparse(Hd) or isinstance(Hd,_matrix_free_operator)
 
 		self._is_dense = not is_sparse
 
+	@property
+	def _matrix_free(self):
+		if isinstance(self._static,_matrix_free_operator):
+			return True
+
+		return any(isinstance(Hd,_matrix_free_operator) for Hd in itervalues(self._dynamic))
+
+	@property
+	def storage_dtype(self):
+		"""type: data type the matrices of the `hamiltonian` object are stored with."""
+		return _np.dtype(self._dtype if self._storage_dtype is None else self._storage_dtype).name
+
+	def _cast_storage(self):
+		"""casts all parts to `storage_dtype` (if set)."""
+		if self._storage_dtype is None:
+			return
+
+		if not isinstance(self._static,_matrix_free_operator):
+			self._static = self._static.astype(self._storage_dtype,copy=False)
+
+		for func,Hd in iteritems(self._dynamic):
+			if not isinstance(Hd,_matrix_free_operator):
+				self._dynamic[func] = Hd.astype(self._storage_dtype,copy=False)
+
 	def _get_matvecs(self):
-		self._static_matvec = _get_matvec_function(self._static)
+		self._cast_storage()
+		self._static_matvec = _get_matvec(self._static)
 		self._dynamic_matvec = {}
 		for func,Hd in iteritems(self._dynamic):
-			self._dynamic_matvec[func] = _get_matvec_function(Hd)
+			self._dynamic_matvec[func] = _get_matvec(Hd)
+
+		self._fused = None
+		if self._fused_fmt and self._dynamic and len(self._dynamic) < _fused_csr_matrix.max_terms:
+			if _sp.issparse(self._static) and all(_sp.issparse(Hd) for Hd in itervalues(self._dynamic)):
+				self._fused = _fused_csr_matrix(self._static,self._dynamic,_np.dtype(self.storage_dtype))
+
+	@property
+	def _csr_parts(self):
+		"""all parts of the operator are stored as csr matrices (or the static part vanishes)."""
+		if not (_sp.isspmatrix_csr(self._static) or (_sp.issparse(self._static) and self._static.nnz == 0)):
+			return False
+
+		return all(_sp.isspmatrix_csr(Hd) for Hd in itervalues(self._dynamic))
+
+	def _reordered_parts(self):
+		"""permutation of the "rcm" static part and a copy of the operator with all parts in this order."""
+		perm = self._static.perm
+		dynamic = []
+		for func,Hd in iteritems(self._dynamic):
+			if _sp.issparse(Hd) or isinstance(Hd,_custom_sparse_formats):
+				Hd = _reordered_csr_matrix(Hd,perm=perm).reordered
+			else:
+				Hd = _np.ascontiguousarray(Hd[perm,:][:,perm])
+
+			dynamic.append([Hd,func])
+
+		H = hamiltonian([self._static.reordered],dynamic,dtype=self._dtype,copy=False,fused=self._fused_fmt,storage_dtype=self._storage_dtype)
+		return perm,H
+
+	def _dot_times(self,times,V):
+		"""out[:,i] = H(times[i]).V[:,i], all columns are computed by one multi-vector kernel per csr matrix."""
+		if self._fused is not None:
+			return _csr_dot_coeffs(self._fused,self._fused.coefficient_table(times),V)
+
+		if _sp.isspmatrix_csr(self._static):
+			out = _csr_dot_coeffs(self._static,1.0,V)
+		else:
+			out = _numa_zeros(V.shape,dtype=V.dtype)
+
+		for func,Hd in iteritems(self._dynamic):
+			_csr_dot_coeffs(Hd,func.vectorized(times),V,out=out,overwrite_out=False)
+
+		return out
+
+	def _matvec_time(self,time,V,out=None,a=1.0,overwrite_out=True):
+		"""out (+)= a*H(time).V, using the fused format if available."""
+		if self._fused is not None:
+			return self._fused.dot(V,time,out=out,a=a,overwrite_out=overwrite_out)
+
+		out = self._static_matvec(self._static,V,out=out,a=a,overwrite_out=overwrite_out)
+		for func,Hd in iteritems(self._dynamic):
+			self._dynamic_matvec[func](Hd,V,out=out,a=a*func(time),overwrite_out=False)
+
+		return out
 
 	### state manipulation/observable routines
 
-	def dot(self,V,time=0,check=True,out=None,overwrite_out=True):
+	def dot(self,V,time=0,check=True,out=None,overwrite_out=True,n_threads=None):
 		"""Matrix-vector multiplication of `hamiltonian` operator at time `time`, with state `V`.
 
 		.. math::
@@ -573,6 +730,12 @@ class hamiltonian(object):
 		It is faster to multiply the individual (static, dynamic) parts of the Hamiltonian first, then add all those 
 		vectors together.
 
+		This method is thread-safe. For numpy arrays `V` of the result dtype and a preallocated `out`, no temporary 
+		arrays are created and the matrix-vector kernels run without holding the GIL, so that several python threads 
+		can apply (different or the same) operators concurrently, e.g. in a `concurrent.futures.ThreadPoolExecutor`. 
+		This does not hold for the "dense" format or for matrix free operators, which are still thread-safe but hold the 
+		GIL for (part of) the product.
+
 		Parameters
 		-----------
 		V : {numpy.ndarray, scipy.spmatrix}
@@ -593,6 +756,9 @@ class hamiltonian(object):
 		overwrite_out : bool, optional
 			flag used to toggle between two different ways to treat `out`. If set to `True` all values in `out` will be overwritten with the result. 
 			If `False` the result of the dot product will be added to the values of `out`. 
+		n_threads : int, optional
+			number of OpenMP threads used for this product only, see `quspin.tools.misc.num_threads`. Default is 
+			`None`, which uses the current thread count of the calling thread.
 
 		Returns
 		--------
@@ -609,6 +775,9 @@ class hamiltonian(object):
 
 		from .exp_op_core import isexp_op
 
+		if n_threads is not None:
+			with _num_threads(n_threads):
+				return self.dot(V,time=time,check=check,out=out,overwrite_out=overwrite_out)
 		
 		if ishamiltonian(V):
 			return self * V
@@ -649,14 +818,15 @@ class hamiltonian(object):
 				if V.ndim == 3 and V.shape[0] != V.shape[1]:
 					raise ValueError("Density matricies must be square!")
 
+				if V.ndim == 2 and self._csr_parts:
+					return self._dot_times(times,_np.asarray(V,dtype=result_dtype))
+
 				# allocate C-contiguous array to output results in.
-				out = _np.zeros(V.shape[-1:]+V.shape[:-1],dtype=result_dtype)
+				out = _numa_zeros(V.shape[-1:]+V.shape[:-1],dtype=result_dtype)
 
 				for i,t in enumerate(time):
 					v = _np.ascontiguousarray(V[...,i],dtype=result_dtype)
-					self._static_matvec(self._static,v,overwrite_out=True,out=out[i,...])
-					for func,Hd in iteritems(self._dynamic):
-						self._dynamic_matvec[func](Hd,v,overwrite_out=False,a=func(t),out=out[i,...])
+					self._matvec_time(t,v,out=out[i,...],overwrite_out=True)
 
 				# transpose, leave non-contiguous results which can be handled by numpy. 
 				if out.ndim == 2:
@@ -668,10 +838,11 @@ class hamiltonian(object):
 		
 		else:
 			if isinstance(V,_np.ndarray):
-				V = V.astype(result_dtype)
+				# the kernels read V while writing out, copy V if the two arrays overlap.
+				V = V.astype(result_dtype,copy=(out is not None and _np.shares_memory(out,V)))
 
 				if out is None:
-					out = self._static_matvec(self._static,V)
+					out = self._matvec_time(time,V)
 				else:
 					try:
 						if out.dtype != result_dtype:
@@ -684,10 +855,7 @@ class hamiltonian(object):
 					except AttributeError:
 						raise TypeError("'out' must be array with correct dtype and dimensions for output array.")
 
-					self._static_matvec(self._static,V,out=out,overwrite_out=overwrite_out)
-
-				for func,Hd in iteritems(self._dynamic):
-					self._dynamic_matvec[func](Hd,V,overwrite_out=False,a=func(time),out=out)
+					self._matvec_time(time,V,out=out,overwrite_out=overwrite_out)
 
 			elif _sp.issparse(V):
 				if out is not None:
@@ -1176,6 +1344,23 @@ class hamiltonian(object):
 			else:
 				return _np.array([],dtype=self._dtype).real
 
+		if self._matrix_free:
+			return _sla.eigsh(self.aslinearoperator(time=time),**eigsh_args)
+
+		if isinstance(self._static,_reordered_csr_matrix): # iterate in the order of the matrix, see evolve.
+			perm,H = self._reordered_parts()
+			if eigsh_args.get("v0") is not None:
+				eigsh_args["v0"] = _np.asarray(eigsh_args["v0"])[perm]
+
+			if not eigsh_args.get("return_eigenvectors",True):
+				return H.eigsh(time=time,**eigsh_args)
+
+			E,V = H.eigsh(time=time,**eigsh_args)
+			return E,V[self._static.inv_perm]
+
+		if isinstance(self._static,_custom_sparse_formats) and "sigma" not in eigsh_args: # use the kernels of the format.
+			return _sla.eigsh(self.aslinearoperator(time=time),**eigsh_args)
+
 		return _sla.eigsh(self.tocsr(time=time),**eigsh_args)
 
 	def eigh(self,time=0,**eigh_args):
@@ -1267,10 +1452,11 @@ class hamiltonian(object):
 		rho = rho.reshape((self.Ns,self.Ns))
 		self._static_matvec(self._static  ,rho  ,out=rho_out  ,a=+1.0,overwrite_out=True) # rho_out = self._static.dot(rho)
 		self._static_matvec(self._static.T,rho.T,out=rho_out.T,a=-1.0,overwrite_out=False) # rho_out -= (self._static.T.dot(rho.T)).T
-		for func,Hd in iteritems(self._dynamic):
-			ft = func(time)
-			self._dynamic_matvec[func](Hd  ,rho  ,out=rho_out  ,a=+ft,overwrite_out=False) # rho_out += ft*Hd.dot(rho)
-			self._dynamic_matvec[func](Hd.T,rho.T,out=rho_out.T,a=-ft,overwrite_out=False) # rho_out -= ft*(Hd.T.dot(rho.T)).T
+		with _memoize():
+			for func,Hd in iteritems(self._dynamic):
+				ft = func(time)
+				self._dynamic_matvec[func](Hd  ,rho  ,out=rho_out  ,a=+ft,overwrite_out=False) # rho_out += ft*Hd.dot(rho)
+				self._dynamic_matvec[func](Hd.T,rho.T,out=rho_out.T,a=-ft,overwrite_out=False) # rho_out -= ft*(Hd.T.dot(rho.T)).T
 
 		rho_out *= -1j
 		return rho_out.ravel()
@@ -1287,9 +1473,8 @@ class hamiltonian(object):
 			This function is what gets passed into the ode solver. This is the Imaginary time Schrodinger operator -H(t)*|V >
 		"""
 		V = V.reshape(V_out.shape)
-		self._static_matvec(self._static,V,out=V_out,overwrite_out=True)
-		for func,Hd in iteritems(self._dynamic):
-			self._dynamic_matvec[func](Hd,V,a=func(time),out=V_out,overwrite_out=False)
+		with _memoize():
+			self._matvec_time(time,V,out=V_out,overwrite_out=True)
 
 		V_out *= -1
 		return V_out.ravel()
@@ -1310,12 +1495,9 @@ class hamiltonian(object):
 		v_dot = -Hu
 		"""
 		V = V.reshape(V_out.shape)
-		self._static_matvec(self._static,V[self._Ns:],out=V_out[:self._Ns],a=+1,overwrite_out=True) # V_dot[:self._Ns] =  self._static.dot(V[self._Ns:])
-		self._static_matvec(self._static,V[:self._Ns],out=V_out[self._Ns:],a=-1,overwrite_out=True) # V_dot[self._Ns:] = -self._static.dot(V[:self._Ns])
-		for func,Hd in iteritems(self._dynamic):
-			ft=func(time)
-			self._dynamic_matvec[func](Hd,V[self._Ns:],out=V_out[:self._Ns],a=+ft,overwrite_out=False) # V_dot[:self._Ns] += func(time)*Hd.dot(V[self._Ns:])
-			self._dynamic_matvec[func](Hd,V[:self._Ns],out=V_out[self._Ns:],a=-ft,overwrite_out=False) # V_dot[self._Ns:] += -func(time)*Hd.dot(V[:self._Ns])
+		with _memoize(): # drives are evaluated once for both halfs.
+			self._matvec_time(time,V[self._Ns:],out=V_out[:self._Ns],a=+1,overwrite_out=True) # V_dot[:self._Ns] =  H(t).dot(V[self._Ns:])
+			self._matvec_time(time,V[:self._Ns],out=V_out[self._Ns:],a=-1,overwrite_out=True) # V_dot[self._Ns:] = -H(t).dot(V[:self._Ns])
 
 		return V_out
 
@@ -1330,9 +1512,8 @@ class hamiltonian(object):
 			This function is what gets passed into the ode solver. This is the Imaginary time Schrodinger operator -H(t)*|V >
 		"""
 		V = V.reshape(V_out.shape)
-		self._static_matvec(self._static,V,out=V_out,overwrite_out=True)
-		for func,Hd in iteritems(self._dynamic):
-			self._dynamic_matvec[func](Hd,V,a=func(time),out=V_out,overwrite_out=False)
+		with _memoize():
+			self._matvec_time(time,V,out=V_out,overwrite_out=True)
 
 		V_out *= -1j
 		return V_out.ravel()
@@ -1410,6 +1591,25 @@ class hamiltonian(object):
 		if _np.iscomplexobj(times):
 			raise ValueError("times must be real number(s).")
 
+		if isinstance(self._static,_reordered_csr_matrix) and v0.shape[:1] == (self.Ns,) and (eom != "LvNE" or v0.shape == self._shape):
+			# the state is permuted into the order of the "rcm" static part once, instead of in every matrix-vector product.
+			perm,H = self._reordered_parts()
+			inv_perm = self._static.inv_perm
+			if eom == "LvNE":
+				v0 = v0[perm,:][:,perm]
+				unpermute = lambda v:v[inv_perm,:][:,inv_perm]
+			else:
+				v0 = v0[perm]
+				unpermute = lambda v:v[inv_perm]
+
+			v_t = H.evolve(v0,t0,times,eom=eom,solver_name=solver_name,stack_state=stack_state,verbose=verbose,
+				iterate=iterate,imag_time=imag_time,**solver_args)
+
+			if iterate:
+				return (unpermute(v) for v in v_t)
+			else:
+				return unpermute(v_t)
+
 		evolve_args = (v0,t0,times)
 		evolve_kwargs = solver_args
 		evolve_kwargs["solver_name"]=solver_name
@@ -1431,7 +1631,7 @@ class hamiltonian(object):
 
 				evolve_args  = evolve_args + (self.__ISO,)					
 				result_dtype = _np.result_type(v0.dtype,self.dtype,_np.float64)
-				v0 = _np.array(v0,dtype=result_dtype,copy=True,order="C")
+				v0 = _numa_array(v0,dtype=result_dtype)
 				evolve_kwargs["f_params"]=(v0,)
 				evolve_kwargs["real"] = not _np.iscomplexobj(v0)
 
@@ -1441,12 +1641,12 @@ class hamiltonian(object):
 					if _np.iscomplexobj(_np.array(1,dtype=self.dtype)): # no idea how to do this in python :D
 						raise ValueError('stack_state option cannot be used with complex-valued Hamiltonians')
 					shape = (v0.shape[0]*2,)+v0.shape[1:]
-					v0 = _np.zeros(shape,dtype=_np.float64,order="C")
+					v0 = _numa_zeros(shape,dtype=_np.float64)
 					evolve_kwargs["f_params"]=(v0,)
 
 					evolve_args = evolve_args + (self.__SO_real,)
 				else:
-					v0 = _np.array(v0,dtype=_np.complex128,copy=True,order="C")
+					v0 = _numa_array(v0,dtype=_np.complex128)
 					evolve_kwargs["f_params"]=(v0,)
 					evolve_args = evolve_args + (self.__SO,)
 
@@ -1464,7 +1664,7 @@ class hamiltonian(object):
 				if stack_state:
 					raise NotImplementedError("stack_state not implemented for Liouville-von Neumann dynamics")
 				else:
-					v0 = _np.array(v0,dtype=_np.complex128,copy=True,order="C")
+					v0 = _numa_array(v0,dtype=_np.complex128)
 					evolve_kwargs["f_params"]=(v0,)
 					evolve_args = evolve_args + (self.__LO,)
 		else:
@@ -1529,7 +1729,13 @@ class hamiltonian(object):
 			raise TypeError('expecting scalar argument for time')
 
 
-		H = _sp.csr_matrix(self._static)
+		if isinstance(self._static,_custom_sparse_formats):
+			H = self._static.tocsr()
+		else:
+			H = _sp.csr_matrix(self._static)
+
+		if self._storage_dtype is not None: # return the full precision matrix.
+			H = H.astype(self._dtype)
 
 		for func,Hd in iteritems(self._dynamic):
 			Hd = _sp.csr_matrix(Hd)
@@ -1565,7 +1771,14 @@ class hamiltonian(object):
 		if _np.array(time).ndim > 0:
 			raise TypeError('expecting scalar argument for time')
 
-		H = _sp.csc_matrix(self._static)
+		if isinstance(self._static,_custom_sparse_formats):
+			H = self._static.tocsc()
+		else:
+			H = _sp.csc_matrix(self._static)
+
+		if self._storage_dtype is not None: # return the full precision matrix.
+			H = H.astype(self._dtype)
+
 		for func,Hd in iteritems(self._dynamic):
 			Hd = _sp.csc_matrix(Hd)
 			try:
@@ -1621,7 +1834,7 @@ class hamiltonian(object):
 			out = _np.zeros(self._shape,dtype=self.dtype)
 			out = _np.asmatrix(out)
 
-		if _sp.issparse(self._static):
+		if _sp.issparse(self._static) or isinstance(self._static,_custom_sparse_formats):
 			self._static.todense(order=order,out=out)
 		else:
 			out[:] = self._static[:]
@@ -1667,7 +1880,7 @@ class hamiltonian(object):
 		if out is None:
 			out = _np.zeros(self._shape,dtype=self.dtype)
 
-		if _sp.issparse(self._static):
+		if _sp.issparse(self._static) or isinstance(self._static,_custom_sparse_formats):
 			self._static.toarray(order=order,out=out)
 		else:
 			out[:] = self._static[:]
@@ -1682,8 +1895,11 @@ class hamiltonian(object):
 
 		Parameters
 		-----------
-		static_fmt : str {"csr","csc","dia","dense"}
-			Specifies format of static part of Hamiltonian.
+		static_fmt : str {"csr","csc","dia","dense","herm","sell","palette","split","rcm"}
+			Specifies format of static part of Hamiltonian, "herm" stores the upper triangle of a hermitian static part only, 
+			"sell" uses the sliced ELLPACK format, "palette" stores codes into a table of the distinct matrix elements, 
+			"split" stores the diagonal as a dense vector next to the off-diagonal csr matrix, "rcm" stores the matrix in 
+			bandwidth reducing (reverse Cuthill-McKee) order.
 		dynamic_fmt: str {"csr","csc","dia","dense"} or  dict, keys: (func,func_args), values: str {"csr","csc","dia","dense"}
 			Specifies the format of the dynamic parts of the hamiltonian. To specify a particular dynamic part of the hamiltonian use a tuple (func,func_args) which matches a function+argument pair
 			used in the construction of the hamiltonian as a key in the dictionary.
@@ -1698,20 +1914,36 @@ class hamiltonian(object):
 
 
 		"""
+		if self._matrix_free and (static_fmt is not None or dynamic_fmt is not None):
+			raise ValueError("matrix formats can not be changed for matrix free operators.")
+
 		if static_fmt is not None:
 			if type(static_fmt) is not str:
 				raise ValueError("Expecting string for 'sparse_fmt'")
 
-			if static_fmt not in ["csr","csc","dia","dense"]:
+			if static_fmt not in ["csr","csc","dia","dense","herm","sell","palette","split","rcm"]:
 				raise ValueError("'{0}' is not a valid sparse format for Hamiltonian class.".format(static_fmt))
 
 
 			if static_fmt == "dense":
-				if _sp.issparse(self._static):
+				if _sp.issparse(self._static) or isinstance(self._static,_custom_sparse_formats):
 					self._static = self._static.toarray()
 				else:
 					self._static = _np.ascontiguousarray(self._static)
+			elif static_fmt == "herm":
+				self._static = _herm_csr_matrix(self._static)
+			elif static_fmt == "sell":
+				self._static = _sell_matrix(self._static)
+			elif static_fmt == "palette":
+				self._static = _palette_csr_matrix(self._static)
+			elif static_fmt == "split":
+				self._static = _split_diag_matrix(self._static)
+			elif static_fmt == "rcm":
+				self._static = _reordered_csr_matrix(self._static)
 			else:
+				if isinstance(self._static,_custom_sparse_formats):
+					self._static = self._static.tocsr()
+
 				sparse_constuctor = getattr(_sp,static_fmt+"_matrix")
 				self._static = sparse_constuctor(self._static)
 
@@ -1776,7 +2008,7 @@ class hamiltonian(object):
 		>>> H_dense=H.as_dense_format()
 
 		"""
-		if _sp.issparse(self._static):
+		if _sp.issparse(self._static) or isinstance(self._static,_custom_sparse_formats):
 			new_static = self._static.toarray()
 		else:
 			new_static = _np.asarray(self._static,copy=copy)
@@ -1784,15 +2016,18 @@ class hamiltonian(object):
 		dynamic = [([M.toarray(),func] if _sp.issparse(M) else [M,func])
 						for func,M in iteritems(self.dynamic)]
 
-		return hamiltonian([new_static],dynamic,basis=self._basis,dtype=self._dtype,copy=copy)
+		return hamiltonian([new_static],dynamic,basis=self._basis,dtype=self._dtype,copy=copy,storage_dtype=self._storage_dtype)
 
 	def as_sparse_format(self,static_fmt="csr",dynamic_fmt={},copy=False):
 		"""Casts `hamiltonian` operator to SPARSE format(s).
 
 		Parameters
 		-----------
-		static_fmt : str {"csr","csc","dia","dense"}
-			Specifies format of static part of Hamiltonian.
+		static_fmt : str {"csr","csc","dia","dense","herm","sell","palette","split","rcm"}
+			Specifies format of static part of Hamiltonian, "herm" stores the upper triangle of a hermitian static part only, 
+			"sell" uses the sliced ELLPACK format, "palette" stores codes into a table of the distinct matrix elements, 
+			"split" stores the diagonal as a dense vector next to the off-diagonal csr matrix, "rcm" stores the matrix in 
+			bandwidth reducing (reverse Cuthill-McKee) order.
 		dynamic_fmt: str {"csr","csc","dia","dense"} or  dict, keys: (func,func_args), values: str {"csr","csc","dia","dense"}
 			Specifies the format of the dynamic parts of the hamiltonian. To specify a particular dynamic part of the hamiltonian use a tuple (func,func_args) which matches a function+argument pair
 			used in the construction of the hamiltonian as a key in the dictionary.
@@ -1815,7 +2050,7 @@ class hamiltonian(object):
 		"""
 		dynamic = [[M,func] for func,M in iteritems(self.dynamic)]
 		return hamiltonian([self.static],dynamic,basis=self._basis,dtype=self._dtype,
-			static_fmt=static_fmt,dynamic_fmt=dynamic_fmt,copy=copy)
+			static_fmt=static_fmt,dynamic_fmt=dynamic_fmt,copy=copy,storage_dtype=self._storage_dtype)
 
 	### algebra operations
 
@@ -1839,7 +2074,7 @@ class hamiltonian(object):
 		"""
 		dynamic = [[M.T,func] for func,M in iteritems(self.dynamic)]
 		return hamiltonian([self.static.T],dynamic,
-						basis=self._basis,dtype=self._dtype,copy=copy)
+						basis=self._basis,dtype=self._dtype,copy=copy,storage_dtype=self._storage_dtype)
 
 	def conjugate(self):
 		"""Conjugates `hamiltonian` operator.
@@ -1861,7 +2096,7 @@ class hamiltonian(object):
 		"""
 		dynamic = [[M.conj(),func.conj()] for func,M in iteritems(self.dynamic)]
 		return hamiltonian([self.static.conj()],dynamic,
-							basis=self._basis,dtype=self._dtype)		
+							basis=self._basis,dtype=self._dtype,storage_dtype=self._storage_dtype)		
 
 	def conj(self):
 		"""Same functionality as :func:`conjugate`."""
@@ -1975,17 +2210,25 @@ class hamiltonian(object):
 		if dtype not in supported_dtypes:
 			raise TypeError('hamiltonian does not support type: '+str(dtype))
 
+		# keep the storage precision if it is compatible with the new dtype (complex storage for complex dtypes).
+		storage_dtype = self._storage_dtype
+		if storage_dtype is not None:
+			if _np.dtype(dtype).kind == "c":
+				storage_dtype = _np.result_type(storage_dtype,_np.complex64).type
+			if not _np.can_cast(storage_dtype,dtype):
+				storage_dtype = None
+
 		dynamic = [[M.astype(dtype),func] for func,M in iteritems(self.dynamic)]
 		if dtype == self._dtype:
-			return hamiltonian([self.static.astype(dtype)],dynamic,basis=self._basis,dtype=dtype,copy=copy)
+			return hamiltonian([self.static.astype(dtype)],dynamic,basis=self._basis,dtype=dtype,copy=copy,fused=self._fused_fmt,storage_dtype=storage_dtype)
 		else:
-			return hamiltonian([self.static.astype(dtype)],dynamic,basis=self._basis,dtype=dtype,copy=True)
+			return hamiltonian([self.static.astype(dtype)],dynamic,basis=self._basis,dtype=dtype,copy=True,fused=self._fused_fmt,storage_dtype=storage_dtype)
 
 	def copy(self):
 		"""Returns a copy of `hamiltonian` object."""
 		dynamic = [[M,func] for func,M in iteritems(self.dynamic)]
 		return hamiltonian([self.static],dynamic,
-					basis=self._basis,dtype=self._dtype,copy=True)
+					basis=self._basis,dtype=self._dtype,copy=True,fused=self._fused_fmt,storage_dtype=self._storage_dtype)
 
 	###################
 	# special methods #
@@ -2040,7 +2283,7 @@ class hamiltonian(object):
 
 	def __neg__(self): # -self
 		dynamic = [[-M,func] for func,M in iteritems(self.dynamic)]		
-		return hamiltonian([-self.static],dynamic,basis=self._basis,dtype=self._dtype)
+		return hamiltonian([-self.static],dynamic,basis=self._basis,dtype=self._dtype,storage_dtype=self._storage_dtype)
 
 	def __call__(self,time=0): # self(time)
 		"""Return hamiltonian as a sparse or dense matrix at specific time
@@ -0,0 +1,223 @@
+from __future__ import print_function, division
+
+import scipy.sparse as _sp
+import numpy as _np
+import hashlib,os,shutil,tempfile,weakref
+
+
+__all__ = ["operator_cache"]
+
+_active_caches = []
+
+def _get_active_cache():
+	"""Returns the innermost `operator_cache` which is currently in use, `None` if caching is disabled."""
+	if _active_caches:
+		return _active_caches[-1]
+	else:
+		return None
+
+
+def _hash_update(h,obj):
+	"""Feeds a canonical byte representation of `obj` into the hash object `h`. Returns `False` if `obj` can not be hashed."""
+	if obj is None or isinstance(obj,(bool,str)):
+		h.update("{0}:{1};".format(type(obj).__name__,obj).encode("utf-8"))
+	elif isinstance(obj,_np.ndarray):
+		obj = _np.ascontiguousarray(obj)
+		if obj.dtype.hasobject:
+			return False
+		h.update("ndarray:{0}:{1};".format(obj.dtype.str,obj.shape).encode("utf-8"))
+		h.update(obj.view(_np.uint8).tobytes() if obj.size > 0 else b"")
+	elif _np.isscalar(obj):
+		value = _np.asarray(obj)
+		if value.dtype.hasobject: # python integers beyond 64 bits
+			h.update("int:{0};".format(obj).encode("utf-8"))
+		else:
+			value = value.astype(_np.complex128) if _np.iscomplexobj(value) else value
+			h.update("{0}:{1};".format(value.dtype.str,repr(value.tolist())).encode("utf-8"))
+	elif isinstance(obj,(list,tuple)):
+		h.update("{0}:{1}[".format(type(obj).__name__,len(obj)).encode("utf-8"))
+		for item in obj:
+			if not _hash_update(h,item):
+				return False
+		h.update(b"]")
+	elif isinstance(obj,(set,frozenset)):
+		items = []
+		for item in obj:
+			sub_h = hashlib.sha256()
+			if not _hash_update(sub_h,item):
+				return False
+			items.append(sub_h.digest())
+		h.update("set:{0}{{".format(len(obj)).encode("utf-8"))
+		for item in sorted(items):
+			h.update(item)
+		h.update(b"}")
+	elif isinstance(obj,_np.dtype) or (isinstance(obj,type) and issubclass(obj,_np.generic)):
+		h.update("dtype:{0};".format(_np.dtype(obj).str).encode("utf-8"))
+	elif isinstance(obj,dict):
+		h.update("dict:{0}{{".format(len(obj)).encode("utf-8"))
+		for key in sorted(obj.keys(),key=str):
+			if not (_hash_update(h,key) and _hash_update(h,obj[key])):
+				return False
+		h.update(b"}")
+	else:
+		return False
+
+	return True
+
+
+# attributes of the basis classes which are not plain data: compiled cores and kernels, which are fixed by the class 
+# and the data attributes, and bases which are built lazily from the data attributes.
+_derived_basis_attributes = frozenset(["_core","_op","_bitops","_make_n_basis","_basis_pcon"])
+
+def _hash_basis(h,basis):
+	"""Hashes the class of the basis together with all of its data attributes (N, blocks, maps, states, ...).
+
+	Returns `False` if any attribute, other than those in `_derived_basis_attributes`, can not be hashed: two bases
+	which only differ in such an attribute would otherwise share their operators.
+	"""
+	cls = basis.__class__
+	h.update("basis:{0}.{1};".format(cls.__module__,cls.__name__).encode("utf-8"))
+	for name,value in sorted(vars(basis).items()):
+		if name in _derived_basis_attributes:
+			continue
+
+		sub_h = hashlib.sha256()
+		if not _hash_update(sub_h,value):
+			return False
+
+		h.update(name.encode("utf-8"))
+		h.update(sub_h.digest())
+
+	return True
+
+
+# digests of the bases which were hashed before, hashing the states of a basis is O(Ns). The bases are not modified
+# after their construction, so that the digest is computed once per basis object.
+_basis_digests = weakref.WeakKeyDictionary()
+
+def _basis_digest(basis):
+	"""Returns the sha256 digest of `_hash_basis` for `basis`, `None` if the basis can not be hashed."""
+	try:
+		return _basis_digests[basis]
+	except KeyError:
+		pass
+
+	h = hashlib.sha256()
+	digest = h.digest() if _hash_basis(h,basis) else None
+	_basis_digests[basis] = digest
+	return digest
+
+
+class operator_cache(object):
+	"""Persistent on-disk cache for the matrices of operators built from operator strings.
+
+	While an `operator_cache` is active, the sparse matrices constructed from the operator strings of `hamiltonian`
+	and `quantum_operator` objects are stored in `cache_dir` and reloaded the next time the same operator is built
+	instead of being recomputed. The matrices are keyed on a hash of the basis (class, `N`, blocks, maps and states),
+	the consolidated site-coupling lists and the data type.
+
+	Notes
+	-----
+	* The matrices are stored as uncompressed `.npy` files of the CSR arrays. By default cache hits are memory
+		mapped copy-on-write, so that many processes on the same node share a single copy of the matrix through the page
+		cache. Modifying such a matrix in-place only changes the private copy of the process, never the cache.
+	* Only lattice basis classes (e.g. `spin_basis_1d`, `spin_basis_general`) are cached, operators in other bases
+		are always constructed. The same holds for bases with attributes which can not be hashed (e.g. states stored as
+		python integers).
+	* The cache is never cleaned up automatically, it is safe to delete `cache_dir` at any point in time.
+
+	Examples
+	--------
+
+	>>> with operator_cache("/scratch/quspin_cache"):
+	>>> 	H = hamiltonian(static,dynamic,basis=basis,dtype=np.float64)
+
+	"""
+	def __init__(self,cache_dir,mmap=True):
+		"""Intializes the `operator_cache` object.
+
+		Parameters
+		-----------
+		cache_dir : str
+			directory to store the operators in. It is created if it does not exist.
+		mmap : bool, optional
+			If set to `True` (default), operators are loaded as copy-on-write memory maps, otherwise they are read into memory.
+
+		"""
+		self._cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+		self._mmap = mmap
+		if not os.path.isdir(self._cache_dir):
+			os.makedirs(self._cache_dir)
+
+	@property
+	def cache_dir(self):
+		"""str: directory which holds the cached operators."""
+		return self._cache_dir
+
+	def __enter__(self):
+		_active_caches.append(self)
+		return self
+
+	def __exit__(self,exc_type,exc_value,traceback):
+		_active_caches.remove(self)
+
+	def _key(self,basis,op_list,dtype):
+		from ..basis.lattice import lattice_basis
+
+		if not isinstance(basis,lattice_basis):
+			return None
+
+		digest = _basis_digest(basis)
+		if digest is None:
+			return None
+
+		h = hashlib.sha256()
+		h.update(digest)
+
+		h.update("dtype:{0};".format(_np.dtype(dtype).str).encode("utf-8"))
+		terms = sorted((opstr,tuple(indx),complex(J)) for opstr,indx,J in op_list)
+		if not _hash_update(h,terms):
+			return None
+
+		return h.hexdigest()
+
+	def _load(self,path,Ns):
+		mmap_mode = "c" if self._mmap else None
+		data = _np.load(os.path.join(path,"data.npy"),mmap_mode=mmap_mode)
+		indices = _np.load(os.path.join(path,"indices.npy"),mmap_mode=mmap_mode)
+		indptr = _np.load(os.path.join(path,"indptr.npy"),mmap_mode=mmap_mode)
+
+		return _sp.csr_matrix((data,indices,indptr),shape=(Ns,Ns),copy=False)
+
+	def _store(self,path,H):
+		tmp_path = tempfile.mkdtemp(dir=self._cache_dir,prefix=".tmp_")
+		try:
+			_np.save(os.path.join(tmp_path,"data.npy"),H.data)
+			_np.save(os.path.join(tmp_path,"indices.npy"),H.indices)
+			_np.save(os.path.join(tmp_path,"indptr.npy"),H.indptr)
+			os.rename(tmp_path,path) # atomic, other processes never see partially written entries.
+		except OSError:
+			if not os.path.isdir(path): # entry was not written by another process in the meantime.
+				raise
+		finally:
+			if os.path.isdir(tmp_path):
+				shutil.rmtree(tmp_path)
+
+	def make_csr(self,basis,op_list,dtype,make):
+		"""Returns the cached csr matrix of the sum of the terms in `op_list`, calls `make()` to build and store it if missing."""
+		key = self._key(basis,op_list,dtype)
+		if key is None:
+			return make()
+
+		path = os.path.join(self._cache_dir,key)
+		if os.path.isdir(path):
+			return self._load(path,basis.Ns)
+
+		H = make().tocsr()
+		H.sort_indices()
+		self._store(path,H)
+
+		if self._mmap:
+			return self._load(path,basis.Ns)
+		else:
+			return H
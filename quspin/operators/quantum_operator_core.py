@@ -4,8 +4,10 @@ from ..basis import spin_basis_1d as _default_basis
 from ..basis import isbasis as _isbasis
 
 from ._oputils import _get_matvec_function, matvec as _matvec
+from ..tools.misc import num_threads as _num_threads
 from ._make_hamiltonian import make_static
 from ._make_hamiltonian import _check_almost_zero
+from ._make_hamiltonian import _herm_csr_matrix,_sell_matrix,_palette_csr_matrix,_split_diag_matrix,_reordered_csr_matrix,_custom_sparse_formats
 
 from . import hamiltonian_core
 
@@ -47,7 +49,7 @@ class quantum_operator(object):
 			:lines: 7-
 
 	"""
-	def __init__(self,input_dict,N=None,basis=None,shape=None,copy=True,check_symm=True,check_herm=True,check_pcon=True,matrix_formats={},dtype=_np.complex128,**basis_args):
+	def __init__(self,input_dict,N=None,basis=None,shape=None,copy=True,check_symm=True,check_herm=True,check_pcon=True,matrix_formats={},dtype=_np.complex128,storage_dtype=None,**basis_args):
 		"""Intializes the `quantum_operator` object (parameter dependent quantum quantum_operators).
 
 		Parameters
@@ -78,7 +80,15 @@ class quantum_operator(object):
 			Enable/Disable particle conservation check on `static_list` and `dynamic_list`.
 		matrix_formats: dict, optional
 			Dictionary of key,value pairs which, given a key associated with an operator in `input_dict`, the value of this key
-			specifies the sparse matrix format {"csr","csc","dia","dense"}.
+			specifies the sparse matrix format {"csr","csc","dia","dense","herm","sell","palette","split","rcm"}, where "herm" stores the 
+			upper triangle of a hermitian matrix only (raises ValueError for non-hermitian matrices), "sell" is the sliced ELLPACK format, 
+			"palette" stores codes into a table of the distinct matrix elements, "split" stores the diagonal as a dense vector 
+			and "rcm" stores the matrix in bandwidth reducing (reverse Cuthill-McKee) order (the states are read and 
+			written through the permutation in every product).
+		storage_dtype : 'type', optional
+			Data type (e.g. numpy.complex64) to store the matrices with, if it differs from `dtype` (mixed precision). 
+			Products with states are computed in the precision of `dtype`. Must be castable to `dtype` and of the same 
+			kind (real or complex), default is `None` which stores the matrices in `dtype`.
 		kw_args : dict
 			Optional additional arguments to pass to the `basis` class, if not already using a `basis` object
 			to create the quantum_operator.		
@@ -94,6 +104,19 @@ class quantum_operator(object):
 			raise TypeError('hamiltonian does not support type: '+str(dtype))
 		else:
 			self._dtype=dtype
+
+		if storage_dtype is not None:
+			if not (storage_dtype in hamiltonian_core.supported_dtypes):
+				raise TypeError('quantum_operator does not support storage type: '+str(storage_dtype))
+			if not _np.can_cast(storage_dtype,dtype):
+				raise TypeError('storage type {0} can not be cast to {1}.'.format(_np.dtype(storage_dtype).name,_np.dtype(dtype).name))
+			if _np.dtype(storage_dtype).kind != _np.dtype(dtype).kind:
+				# the kernels scale the matrices with coefficients of the storage type.
+				raise TypeError('storage type {0} drops the imaginary part of the coefficients of {1} operators.'.format(_np.dtype(storage_dtype).name,_np.dtype(dtype).name))
+			if _np.dtype(storage_dtype) == _np.dtype(dtype):
+				storage_dtype = None
+
+		self._storage_dtype = storage_dtype
 		
 		opstr_dict = {}
 		other_dict = {}
@@ -190,7 +213,7 @@ class quantum_operator(object):
 
 			for key,O_list in iteritems(other_dict):
 				for i,O in enumerate(O_list):
-					if _sp.issparse(O):
+					if _sp.issparse(O) or isinstance(O,_custom_sparse_formats):
 						self._mat_checks(O)
 						if i == 0:
 							self._quantum_operator[key] = O
@@ -328,6 +351,11 @@ class quantum_operator(object):
 		"""type: data type of `quantum_operator` object."""
 		return _np.dtype(self._dtype).name
 
+	@property
+	def storage_dtype(self):
+		"""type: data type the matrices of the `quantum_operator` object are stored with."""
+		return _np.dtype(self._dtype if self._storage_dtype is None else self._storage_dtype).name
+
 	@property
 	def T(self):
 		""":obj:`quantum_operator`: transposes the operator matrix: :math:`H_{ij}\\mapsto H_{ji}`."""
@@ -410,7 +438,7 @@ class quantum_operator(object):
 		"""
 		return self.dot(X)
 
-	def dot(self,V,pars={},check=True,out=None,overwrite_out=True):
+	def dot(self,V,pars={},check=True,out=None,overwrite_out=True,n_threads=None):
 		"""Matrix-vector multiplication of `quantum_operator` quantum_operator for parameters `pars`, with state `V`.
 
 		.. math::
@@ -418,6 +446,9 @@ class quantum_operator(object):
 
 		Notes
 		-----
+		This method is thread-safe. For numpy arrays `V` of the result dtype and a preallocated `out`, the 
+		matrix-vector kernels run without holding the GIL (except for dense and matrix free operators), so 
+		that several python threads can apply operators concurrently.
 
 		Parameters
 		-----------
@@ -433,6 +464,9 @@ class quantum_operator(object):
 		overwrite_out : bool, optional
 			flag used to toggle between two different ways to treat `out`. If set to `True` all values in `out` will be overwritten with the result of the dot product. 
 			If `False` the result of the dot product will be added to the values of `out`. 			
+		n_threads : int, optional
+			number of OpenMP threads used for this product only, see `quspin.tools.misc.num_threads`. Default is 
+			`None`, which uses the current thread count of the calling thread.
 
 		Returns
 		--------
@@ -447,6 +481,9 @@ class quantum_operator(object):
 	
 		"""
 
+		if n_threads is not None:
+			with _num_threads(n_threads):
+				return self.dot(V,pars=pars,check=check,out=out,overwrite_out=overwrite_out)
 		
 		pars = self._check_scalar_pars(pars)
 
@@ -868,10 +905,13 @@ class quantum_operator(object):
 		H = _sp.csr_matrix(self.get_shape,dtype=self._dtype)
 
 		for key,J in pars.items():
+			O = self._quantum_operator[key]
+			if isinstance(O,_custom_sparse_formats):
+				O = O.tocsr()
 			try:
-				H += J*_sp.csr_matrix(self._quantum_operator[key])
+				H += J*_sp.csr_matrix(O)
 			except:
-				H = H + J*_sp.csr_matrix(self._quantum_operator[key])
+				H = H + J*_sp.csr_matrix(O)
 
 		return H
 
@@ -902,10 +942,13 @@ class quantum_operator(object):
 		H = _sp.csc_matrix(self.get_shape,dtype=self._dtype)
 
 		for key,J in pars.items():
+			O = self._quantum_operator[key]
+			if isinstance(O,_custom_sparse_formats):
+				O = O.tocsc()
 			try:
-				H += J*_sp.csc_matrix(self._quantum_operator[key])
+				H += J*_sp.csc_matrix(O)
 			except:
-				H = H + J*_sp.csc_matrix(self._quantum_operator[key])
+				H = H + J*_sp.csc_matrix(O)
 
 		return H
 
@@ -948,7 +991,10 @@ class quantum_operator(object):
 			out = _np.asmatrix(out)
 
 		for key,J in pars.items():
-			out += J * self._quantum_operator[key]
+			O = self._quantum_operator[key]
+			if isinstance(O,_custom_sparse_formats):
+				O = O.tocsr()
+			out += J * O
 		
 		return out
 
@@ -983,7 +1029,10 @@ class quantum_operator(object):
 			out = _np.zeros(self._shape,dtype=self.dtype)
 
 		for key,J in pars.items():
-			out += J * self._quantum_operator[key]
+			O = self._quantum_operator[key]
+			if isinstance(O,_custom_sparse_formats):
+				O = O.tocsr()
+			out += J * O
 		
 		return out
 
@@ -1046,7 +1095,7 @@ class quantum_operator(object):
 				else:
 					static.append(J*self._quantum_operator[key])
 
-		return hamiltonian_core.hamiltonian(static,dynamic,dtype=self._dtype)
+		return hamiltonian_core.hamiltonian(static,dynamic,dtype=self._dtype,storage_dtype=self._storage_dtype)
 
 	def update_matrix_formats(self,matrix_formats):
 		"""Change the internal structure of the matrices in-place.
@@ -1055,7 +1104,11 @@ class quantum_operator(object):
 		-----------
 		matrix_formats: dict, optional
 			Dictionary of key,value pairs which, given a key associated with an operator in `input_dict`, the value of this key
-			specifies the sparse matrix format {"csr","csc","dia","dense"}.
+			specifies the sparse matrix format {"csr","csc","dia","dense","herm","sell","palette","split","rcm"}, where "herm" stores the 
+			upper triangle of a hermitian matrix only (raises ValueError for non-hermitian matrices), "sell" is the sliced ELLPACK format, 
+			"palette" stores codes into a table of the distinct matrix elements, "split" stores the diagonal as a dense vector 
+			and "rcm" stores the matrix in bandwidth reducing (reverse Cuthill-McKee) order (the states are read and 
+			written through the permutation in every product).
 
 		Examples
 		---------
@@ -1076,8 +1129,8 @@ class quantum_operator(object):
 		for key in self._quantum_operator.keys():
 			if key in matrix_formats:
 				fmt = matrix_formats[key]
-				if fmt not in ["dia","csr","csc","dense"]:
-					raise TypeError("sparse formats must be either 'csr','csc', 'dia' or 'dense'.")
+				if fmt not in ["dia","csr","csc","dense","herm","sell","palette","split","rcm"]:
+					raise TypeError("sparse formats must be either 'csr','csc', 'dia', 'herm', 'sell', 'palette', 'split', 'rcm' or 'dense'.")
 
 				if fmt == "dense":
 					O = self._quantum_operator[key]
@@ -1085,10 +1138,22 @@ class quantum_operator(object):
 						self._quantum_operator[key] = O.toarray()
 					except AttributeError:
 						self._quantum_operator[key] = _np.ascontiguousarray(O)
+				elif fmt == "herm":
+					self._quantum_operator[key] = _herm_csr_matrix(self._quantum_operator[key])
+				elif fmt == "sell":
+					self._quantum_operator[key] = _sell_matrix(self._quantum_operator[key])
+				elif fmt == "palette":
+					self._quantum_operator[key] = _palette_csr_matrix(self._quantum_operator[key])
+				elif fmt == "split":
+					self._quantum_operator[key] = _split_diag_matrix(self._quantum_operator[key])
+				elif fmt == "rcm":
+					self._quantum_operator[key] = _reordered_csr_matrix(self._quantum_operator[key])
 				else:
 					sparse_constuctor = getattr(_sp,fmt+"_matrix")
 					O = self._quantum_operator[key]
-					if _sp.issparse(O):
+					if isinstance(O,_custom_sparse_formats):
+						self._quantum_operator[key] = sparse_constuctor(O.tocsr())
+					elif _sp.issparse(O):
 						self._quantum_operator[key] = sparse_constuctor(O)	
 
 		self._update_matvecs()	
@@ -1115,7 +1180,7 @@ class quantum_operator(object):
 		"""
 		
 		new_dict = {key:[op.transpose()] for key,op in iteritems(self._quantum_operator)}
-		return quantum_operator(new_dict,basis=self._basis,dtype=self._dtype,shape=self._shape,copy=copy)
+		return quantum_operator(new_dict,basis=self._basis,dtype=self._dtype,shape=self._shape,copy=copy,storage_dtype=self._storage_dtype)
 
 	def conjugate(self):
 		"""Conjugates `quantum_operator` quantum_operator.
@@ -1136,7 +1201,7 @@ class quantum_operator(object):
 
 		"""
 		new_dict = {key:[op.conjugate()] for key,op in iteritems(self._quantum_operator)}
-		return quantum_operator(new_dict,basis=self._basis,dtype=self._dtype,shape=self._shape,copy=False)
+		return quantum_operator(new_dict,basis=self._basis,dtype=self._dtype,shape=self._shape,copy=False,storage_dtype=self._storage_dtype)
 
 	def conj(self):
 		"""Conjugates `quantum_operator` quantum_operator.
@@ -1182,7 +1247,7 @@ class quantum_operator(object):
 	def copy(self):
 		"""Returns a deep copy of `quantum_operator` object."""
 		new_dict = {key:[op] for key,op in iteritems(self._quantum_operator)}
-		return quantum_operator(new_dict,basis=self._basis,dtype=self._dtype,shape=self._shape,copy=True)
+		return quantum_operator(new_dict,basis=self._basis,dtype=self._dtype,shape=self._shape,copy=True,storage_dtype=self._storage_dtype)
 
 	def astype(self,dtype,copy=False):
 		""" Changes data type of `quantum_operator` object.
@@ -1204,12 +1269,20 @@ class quantum_operator(object):
 		if dtype not in hamiltonian_core.supported_dtypes:
 			raise ValueError("quantum_operator can only be cast to floating point types")
 
+		# keep the storage precision if it is compatible with the new dtype (complex storage for complex dtypes).
+		storage_dtype = self._storage_dtype
+		if storage_dtype is not None:
+			if _np.dtype(dtype).kind == "c":
+				storage_dtype = _np.result_type(storage_dtype,_np.complex64).type
+			if not _np.can_cast(storage_dtype,dtype):
+				storage_dtype = None
+
 		new_dict = {key:[op] for key,op in iteritems(self._quantum_operator)}
 
 		if dtype == self._dtype:
-			return quantum_operator(new_dict,basis=self._basis,dtype=dtype,shape=self._shape,copy=copy)
+			return quantum_operator(new_dict,basis=self._basis,dtype=dtype,shape=self._shape,copy=copy,storage_dtype=storage_dtype)
 		else:
-			return quantum_operator(new_dict,basis=self._basis,dtype=dtype,shape=self._shape,copy=True)
+			return quantum_operator(new_dict,basis=self._basis,dtype=dtype,shape=self._shape,copy=True,storage_dtype=storage_dtype)
 
 
 	### lin-alg operations
@@ -1431,6 +1504,10 @@ class quantum_operator(object):
 				raise ValueError('cannot cast types')	
 
 	def _update_matvecs(self):
+		if self._storage_dtype is not None:
+			for key,O in iteritems(self._quantum_operator):
+				self._quantum_operator[key] = O.astype(self._storage_dtype,copy=False)
+
 		self._matvec_functions = {}
 
 		for key in self._quantum_operator.keys():
@@ -0,0 +1,169 @@
+from __future__ import print_function, division
+
+import scipy.sparse as _sp
+import numpy as _np
+from collections import OrderedDict
+
+
+__all__ = ["symbolic_plans"]
+
+_active_plans = []
+
+def _get_active_plans():
+	"""Returns the innermost `symbolic_plans` object which is currently in use, `None` if plans are disabled."""
+	if _active_plans:
+		return _active_plans[-1]
+	else:
+		return None
+
+
+class _symbolic_plan(object):
+	"""
+	description:
+		sparsity pattern of the sum of a fixed set of terms (opstr,indx) in a basis. For every term the plan records
+		which entries of the csr `data` array it contributes to, together with the matrix element for unit coupling.
+		These are stored as a sparse (nnz x n_terms) matrix, so that the data array for a coupling vector J is the
+		product `data = P.dot(J)`, which does not touch the basis at all. The matrix elements are computed in the 
+		dtype of the operator, terms with complex matrix elements use the complex type of the same precision.
+	"""
+	def __init__(self,basis,structure,dtype):
+		"""
+		args:
+			basis = basis object used to compute the matrix elements of the terms.
+			structure = list of (opstr,indx) pairs.
+			dtype = the low level C-type of the matrix elements.
+		"""
+		Ns = basis.Ns
+		self._Ns = Ns
+		self._columns = {term:i for i,term in enumerate(structure)}
+
+		# matrix elements of all terms in coordinate format, the term ids follow from the number of elements per term.
+		rows = []
+		cols = []
+		vals = []
+		for opstr,indx in structure:
+			try:
+				ME,row,col = basis.Op(opstr,indx,1.0,dtype)
+			except TypeError: # complex matrix elements for unit coupling, the couplings may still give a real matrix.
+				ME,row,col = basis.Op(opstr,indx,1.0,_np.result_type(dtype,_np.complex64))
+			rows.append(_np.asarray(row,dtype=_np.int64))
+			cols.append(_np.asarray(col,dtype=_np.int64))
+			vals.append(ME)
+
+		terms = _np.repeat(_np.arange(len(structure),dtype=_np.int32),[len(ME) for ME in vals])
+		rows = _np.concatenate(rows)
+		cols = _np.concatenate(cols)
+
+		# the unique (row,col) pairs in row major order are the slots of the csr data array.
+		keys,slots = _np.unique(rows*Ns+cols,return_inverse=True)
+
+		index_type = _np.result_type(_np.min_scalar_type(max(len(keys),Ns)),_np.int32)
+		self._indices = (keys % Ns).astype(index_type)
+		self._indptr = _np.zeros(Ns+1,dtype=index_type)
+		_np.cumsum(_np.bincount(keys // Ns,minlength=Ns),out=self._indptr[1:])
+
+		self._P = _sp.csr_matrix((_np.concatenate(vals),(slots,terms)),shape=(len(keys),len(structure)))
+
+	@property
+	def nnz(self):
+		return len(self._indices)
+
+	def tocsr(self,op_list,dtype):
+		"""
+		args:
+			op_list=[(opstr_1,indx_1,J_1),...,(opstr_n,indx_n,J_n)], consolidated list of terms which are part of the plan.
+			dtype = the low level C-type which the matrix should store its values with.
+		returns:
+			H: csr_matrix representation of the sum of all terms in op_list.
+		"""
+		J = _np.zeros(self._P.shape[1],dtype=_np.complex128)
+		for opstr,indx,J_term in op_list:
+			J[self._columns[(opstr,tuple(indx))]] += J_term
+
+		data = self._P.dot(J)
+
+		if not _np.iscomplexobj(_np.zeros(1,dtype=dtype)):
+			if _np.any(_np.abs(data.imag) > 100*_np.finfo(dtype).eps*_np.abs(data).max(initial=1.0)):
+				raise TypeError("attemping to use real type for complex matrix elements.")
+			data = data.real
+
+		H = _sp.csr_matrix((data.astype(dtype),self._indices.copy(),self._indptr.copy()),shape=(self._Ns,self._Ns),copy=False)
+		H.has_sorted_indices = True
+		H.eliminate_zeros()
+
+		return H
+
+
+class symbolic_plans(object):
+	"""Reuses the sparsity pattern of operators which only differ by the values of the couplings.
+
+	While a `symbolic_plans` object is active, every operator built from operator strings first looks for a plan
+	matching its basis and set of terms (the operator strings and site indices without the couplings).
+	On the first build, the plan records for every term which entries of the sparse matrix it fills. Subsequent builds
+	with the same terms but different couplings then only re-fill the matrix elements by a sparse matrix-vector product,
+	without calling the basis again. This is useful for e.g. disorder averages, where the same Hamiltonian is constructed
+	many times with different random couplings.
+
+	Notes
+	-----
+	* Building a plan costs about as much as constructing every term separately, it only pays off if the same
+		terms are used more than once.
+	* Terms with vanishing couplings are dropped before the plan is looked up. If a coupling happens to be exactly
+		zero, a new plan is built for the remaining terms.
+	* Plans hold a reference to their basis; the `max_plans` least recently used plans are kept.
+
+	Examples
+	--------
+
+	>>> with symbolic_plans():
+	>>> 	for i in range(n_realizations):
+	>>> 		h_list = [[np.random.uniform(-W,W),i] for i in range(L)]
+	>>> 		H = hamiltonian(static+[["z",h_list]],[],basis=basis,dtype=np.float64)
+
+	"""
+	def __init__(self,max_plans=16):
+		"""Intializes the `symbolic_plans` object.
+
+		Parameters
+		-----------
+		max_plans : int, optional
+			maximum number of plans to keep at any time.
+
+		"""
+		if max_plans < 1:
+			raise ValueError("max_plans must be a positive integer.")
+
+		self._max_plans = int(max_plans)
+		self._plans = OrderedDict()
+
+	@property
+	def n_plans(self):
+		"""int: number of plans currently stored."""
+		return len(self._plans)
+
+	def clear(self):
+		"""Removes all stored plans."""
+		self._plans.clear()
+
+	def __enter__(self):
+		_active_plans.append(self)
+		return self
+
+	def __exit__(self,exc_type,exc_value,traceback):
+		_active_plans.remove(self)
+
+	def make_csr(self,basis,op_list,dtype):
+		"""Returns the csr matrix of the sum of the terms in `op_list`, building a new plan if the terms were not seen before."""
+		structure = tuple(sorted(set((opstr,tuple(indx)) for opstr,indx,_ in op_list)))
+		key = (id(basis),structure,_np.dtype(dtype))
+
+		if key in self._plans: # the stored reference to the basis keeps id(basis) unique.
+			_,plan = self._plans.pop(key)
+		else:
+			plan = _symbolic_plan(basis,structure,dtype)
+
+		self._plans[key] = (basis,plan)
+		while len(self._plans) > self._max_plans:
+			self._plans.popitem(last=False)
+
+		return plan.tocsr(op_list,dtype)
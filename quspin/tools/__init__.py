@@ -64,6 +64,10 @@ misc
    project_op
    KL_div
    mean_level_spacing
+   interpolated_function
+   num_threads
+   get_num_threads
+   set_num_threads
 
 """
 from . import evolution
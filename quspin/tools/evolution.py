@@ -10,6 +10,7 @@ from numpy.linalg import norm
 
 # needed for isinstance only
 from .expm_multiply_parallel_core import expm_multiply_parallel
+from .._parallel import _numa_zeros,_numa_array
 
 __all__ =  ["ED_state_vs_time", 
 			"evolve",
@@ -289,11 +290,11 @@ def evolve(v0,t0,times,f,solver_name="dop853",real=False,stack_state=False,verbo
 		complex_valued = False
 		v1 = v0.copy()
 		if ndim == 1:
-			v0 = _np.zeros(2*shape0[0],dtype=v1.real.dtype)
+			v0 = _numa_zeros(2*shape0[0],dtype=v1.real.dtype)
 			v0[:shape0[0]] = v1.real
 			v0[shape0[0]:] = v1.imag
 		else:
-			v0 = _np.zeros(2*shape0_ravelled[0],dtype=v1.real.dtype)
+			v0 = _numa_zeros(2*shape0_ravelled[0],dtype=v1.real.dtype)
 			v0[:shape0_ravelled[0]] = v1.real
 			v0[shape0_ravelled[0]:] = v1.imag
 
@@ -310,7 +311,7 @@ def evolve(v0,t0,times,f,solver_name="dop853",real=False,stack_state=False,verbo
 			v0 = v0.astype(_np.complex128,copy=False).view(_np.float64)
 		except ValueError:
 			# copy initial state v0 to make it contiguous
-			v0 = v0.astype(_np.complex128,copy=True).view(_np.float64)
+			v0 = _numa_array(v0,dtype=_np.complex128).view(_np.float64)
 		solver = ode(_cmplx_f) # y_f = f(t,y,*args)
 		solver.set_f_params(f,f_params)
 
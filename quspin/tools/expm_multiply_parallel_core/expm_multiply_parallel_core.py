@@ -1,5 +1,7 @@
 from scipy.sparse.linalg import LinearOperator,onenormest,aslinearoperator
 from .expm_multiply_parallel_wrapper import _wrapper_expm_multiply,_wrapper_csr_trace
+from ..._parallel import num_threads as _num_threads
+from ..._parallel import _numa_zeros,_numa_array
 import scipy.sparse as _sp
 import numpy as _np
 
@@ -89,7 +91,7 @@ class expm_multiply_parallel(object):
 		else:
 			raise ValueError("expecting 'a' to be scalar.")
 
-	def dot(self,v,work_array=None,overwrite_v=False):
+	def dot(self,v,work_array=None,overwrite_v=False,n_threads=None):
 		"""Calculates the action of :math:`\\mathrm{e}^{aA}` on a vector :math:`v`. 
 
 		Examples
@@ -108,6 +110,9 @@ class expm_multiply_parallel(object):
 			array of `shape = (2*len(v),)` which is used as work_array space for the underlying c-code. This saves extra memory allocation for function operations.
 		overwrite_v : bool
 			if set to `True`, the data in `v` is overwritten by the function. This saves extra memory allocation for the results.
+		n_threads : int, optional
+			number of OpenMP threads used for this calculation only, see `quspin.tools.misc.num_threads`. Default is 
+			`None`, which uses the current thread count of the calling thread.
 
 		Returns
 		--------
@@ -138,10 +143,10 @@ class expm_multiply_parallel(object):
 			if v.ndim != 1:
 				raise ValueError("array must have ndim of 1.")
 		else:
-			v = v.astype(v_dtype,order="C",copy=True)
+			v = _numa_array(v,dtype=v_dtype)
 
 		if work_array is None:
-			work_array = _np.zeros((2*self._A.shape[0],),dtype=v.dtype)
+			work_array = _numa_zeros((2*self._A.shape[0],),dtype=v.dtype)
 		else:
 			work_array = _np.ascontiguousarray(work_array)
 			if work_array.shape != (2*self._A.shape[0],):
@@ -150,8 +155,9 @@ class expm_multiply_parallel(object):
 				raise ValueError("work_array must be array of dtype which matches the result of the matrix-vector multiplication.")
 
 		a = _np.array(self._a,dtype=v_dtype)
-		_wrapper_expm_multiply(self._A.indptr,self._A.indices,self._A.data,
-					self._m_star,self._s,a,self._tol,self._mu,v,work_array)
+		with _num_threads(n_threads):
+			_wrapper_expm_multiply(self._A.indptr,self._A.indices,self._A.data,
+						self._m_star,self._s,a,self._tol,self._mu,v,work_array)
 
 		return v
 
@@ -8,12 +8,17 @@ import numpy as _np
 
 
 from .expm_multiply_parallel_core import csr_matvec
+from .._parallel import num_threads,get_num_threads,set_num_threads
 
 import warnings
 
 __all__ =  ["project_op", 
 			"KL_div",
-			"mean_level_spacing"
+			"mean_level_spacing",
+			"interpolated_function",
+			"num_threads",
+			"get_num_threads",
+			"set_num_threads"
 			]
 
 def project_op(Obs,proj,dtype=_np.complex128):
@@ -221,3 +226,90 @@ def mean_level_spacing(E,verbose=True):
 	
 
 
+class interpolated_function(object):
+	"""Cubic spline interpolation table of a smooth time-dependent drive.
+
+	Evaluating a drive which is expensive to compute (e.g. a sum of many Fourier components) once per 
+	evaluation of the equations of motion can take a visible fraction of the time evolution. This class 
+	tabulates the drive once on a uniform grid and evaluates a cubic spline afterwards. The object can be
+	used in place of the drive in the `dynamic_list` of a `hamiltonian`; the arguments of the drive are 
+	fixed by the table, so the list of function arguments in `dynamic_list` has to be empty. 
+
+	Examples
+	--------
+
+	>>> drive = interpolated_function(f,0.0,T,n_points=10001,f_args=(Omega,))
+	>>> H = hamiltonian(static,[["x",h_list,drive,[]]],basis=basis)
+
+	"""
+	# the table accepts arrays of times, see `dynamic_list` of `hamiltonian`.
+	vectorize = True
+
+	def __init__(self,f,t_min,t_max,n_points=1001,f_args=()):
+		"""Intializes the `interpolated_function` object.
+
+		Parameters
+		-----------
+		f : callable
+			drive to tabulate, `f(t,*f_args)`. It is evaluated on the whole grid at once if it accepts arrays.
+		t_min : float
+			smallest time of the table.
+		t_max : float
+			largest time of the table.
+		n_points : int, optional
+			number of points in the table. Default is `n_points = 1001`.
+		f_args : tuple, optional
+			extra arguments of `f`.
+
+		"""
+		from scipy.interpolate import CubicSpline
+
+		if not t_max > t_min:
+			raise ValueError("expecting t_max > t_min.")
+		if n_points < 4:
+			raise ValueError("expecting at least 4 points for cubic interpolation.")
+
+		times = _np.linspace(t_min,t_max,n_points)
+		try:
+			values = _np.asarray(f(times,*f_args))
+		except Exception:
+			values = None
+
+		if values is None or values.shape != times.shape:
+			values = _np.array([f(t,*f_args) for t in times])
+
+		self._spline = CubicSpline(times,values,extrapolate=False)
+		self._t_min = float(t_min)
+		self._t_max = float(t_max)
+		self._inv_dt = (n_points-1)/(self._t_max-self._t_min)
+		self._n_intervals = n_points-1
+		# polynomial coefficients of the intervals as python lists: fast evaluation at single times.
+		self._c = [self._spline.c[i].tolist() for i in range(4)]
+		self._times = times.tolist()
+		self.__name__ = "interpolated_"+getattr(f,"__name__","function")
+
+	@property
+	def t_min(self):
+		"""float: smallest time of the table."""
+		return self._t_min
+
+	@property
+	def t_max(self):
+		"""float: largest time of the table."""
+		return self._t_max
+
+	def __call__(self,t):
+		if hasattr(t,"__len__"): # array of times
+			values = self._spline(t)
+			if _np.any(_np.isnan(values)):
+				raise ValueError("times outside of the table [{0},{1}].".format(self._t_min,self._t_max))
+			return values
+
+		if not (self._t_min <= t <= self._t_max):
+			raise ValueError("time {0} outside of the table [{1},{2}].".format(t,self._t_min,self._t_max))
+
+		i = min(int((t-self._t_min)*self._inv_dt),self._n_intervals-1)
+		x = t-self._times[i]
+		c3,c2,c1,c0 = self._c
+		return ((c3[i]*x+c2[i])*x+c1[i])*x+c0[i]
+
@@ -0,0 +1,101 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_general,boson_basis_general,spinless_fermion_basis_general,spinful_fermion_basis_general
+import numpy as np
+from itertools import product
+
+
+
+def check_count(basis_constructor,q_lists,**maps):
+	names = list(maps.keys())
+	basis_0 = basis_constructor(make_basis=False,**{name:(maps[name],q_lists[name][0]) for name in names})
+
+	for qs in product(*[q_lists[name] for name in names]):
+		blocks = {name:(maps[name],q) for name,q in zip(names,qs)}
+
+		basis_ref = basis_constructor(make_basis=False,**blocks)
+		basis_ref.make(Ns_block_est=basis_ref.sps**basis_ref.N)
+
+		assert(basis_ref.count_states() == basis_ref.Ns)
+		assert(basis_0.count_states(**dict(zip(names,qs))) == basis_ref.Ns)
+
+		# basis allocated with the exact size.
+		basis = basis_constructor(make_basis=False,**blocks)
+		basis.make()
+		np.testing.assert_array_equal(basis.states,basis_ref.states)
+		np.testing.assert_array_equal(basis._n,basis_ref._n)
+
+
+
+L = 10
+s = np.arange(L)
+T = (s+1)%L
+P = s[::-1]
+Z = -(s+1)
+
+for Nup in [None,L//2,[3,4]]:
+	check_count(lambda **kw:spin_basis_general(L,Nup=Nup,**kw),dict(kblock=range(L)),kblock=T)
+	check_count(lambda **kw:spin_basis_general(L,Nup=Nup,**kw),dict(kblock=[0,L//2],pblock=[0,1]),kblock=T,pblock=P)
+
+for Nup in [None,L//2]:
+	check_count(lambda **kw:spin_basis_general(L,Nup=Nup,**kw),dict(kblock=[0,1,L//2],zblock=[0,1],pblock=[0,1]),kblock=T,zblock=Z,pblock=P)
+
+L = 6
+s = np.arange(L)
+T = (s+1)%L
+P = s[::-1]
+Z = -(s+1)
+
+for Nup in [None,L]:
+	check_count(lambda **kw:spin_basis_general(L,S="1",Nup=Nup,**kw),dict(kblock=range(L),zblock=[0,1]),kblock=T,zblock=Z)
+
+for Nb in [3,[2,4]]:
+	check_count(lambda **kw:boson_basis_general(L,Nb=Nb,sps=4,**kw),dict(kblock=range(L)),kblock=T)
+	check_count(lambda **kw:boson_basis_general(L,Nb=Nb,sps=4,**kw),dict(kblock=[0,L//2],pblock=[0,1]),kblock=T,pblock=P)
+
+L = 10
+s = np.arange(L)
+T = (s+1)%L
+P = s[::-1]
+
+for Nf in [None,4,5,[2,3]]:
+	check_count(lambda **kw:spinless_fermion_basis_general(L,Nf=Nf,**kw),dict(kblock=range(L)),kblock=T)
+	check_count(lambda **kw:spinless_fermion_basis_general(L,Nf=Nf,**kw),dict(kblock=[0,L//2],pblock=[0,1]),kblock=T,pblock=P)
+
+L = 4
+s = np.arange(L)
+T = (s+1)%L
+S = -(s+1) # exchange of the species.
+
+for Nf in [(2,1),[(1,2),(2,2)]]:
+	check_count(lambda **kw:spinful_fermion_basis_general(L,Nf=Nf,**kw),dict(kblock=range(L)),kblock=T)
+
+for Nf in [None,(2,2)]:
+	check_count(lambda **kw:spinful_fermion_basis_general(L,Nf=Nf,**kw),dict(kblock=range(L),sblock=[0,1]),kblock=T,sblock=S)
+
+# particle-hole symmetry of fermions: no count, the basis is still constructed.
+L = 8
+s = np.arange(L)
+basis = spinless_fermion_basis_general(L,Nf=L//2,phblock=(-(s+1),0),make_basis=False)
+try:
+	basis.count_states()
+except ValueError:
+	pass
+else:
+	raise AssertionError("count of states with fermionic particle-hole symmetry.")
+
+basis.make()
+assert(basis.Ns > 0)
+
+try:
+	basis.count_states(kblock=0)
+except ValueError:
+	pass
+else:
+	raise AssertionError("unknown block accepted.")
+
+print("basis count states test passed!")
@@ -0,0 +1,88 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_general,boson_basis_general,spinless_fermion_basis_general
+from quspin.operators import hamiltonian
+import numpy as np
+
+
+
+no_checks = dict(check_symm=False,check_herm=False,check_pcon=False)
+
+def check_lookup(basis_constructor,static_list,**blocks):
+	basis_ref = basis_constructor(**blocks)
+	H_ref = hamiltonian(static_list,[],basis=basis_ref,dtype=np.complex128,**no_checks).toarray()
+
+	np.random.seed(0)
+	v = np.random.uniform(-1,1,size=(basis_ref.Ns,3))
+	v_ref = np.vstack([basis_ref.inplace_Op(v,opstr,indx,1.0,np.complex128) for opstr,indx in static_list])
+
+	for index in ["hash","prefix"]:
+		basis = basis_constructor(make_basis=False,**blocks)
+		basis.make(index=index)
+		np.testing.assert_array_equal(basis.states,basis_ref.states)
+
+		for i,s in enumerate(basis.states):
+			assert(basis.index(s) == i)
+
+		H = hamiltonian(static_list,[],basis=basis,dtype=np.complex128,**no_checks).toarray()
+		np.testing.assert_allclose(H,H_ref,atol=1e-13)
+
+		v_out = np.vstack([basis.inplace_Op(v,opstr,indx,1.0,np.complex128) for opstr,indx in static_list])
+		np.testing.assert_allclose(v_out,v_ref,atol=1e-13)
+
+		np.testing.assert_allclose(basis.get_vec(v,sparse=False),basis_ref.get_vec(v,sparse=False),atol=1e-13)
+
+		# states which are not representatives are not found.
+		states = set(int(s) for s in basis.states)
+		for s in range(min(2**10,basis.sps**basis.N)):
+			if s not in states:
+				try:
+					basis.index(s)
+				except ValueError:
+					pass
+				else:
+					raise AssertionError("state not in basis was found.")
+
+
+
+L = 12
+s = np.arange(L)
+T = (s+1)%L
+P = s[::-1]
+Z = -(s+1)
+hop = [[1.0,i,(i+1)%L] for i in range(L)]
+pot = [[1.0,i] for i in range(L)]
+
+spin_ops = [["+-",hop],["-+",hop],["zz",hop],["z",pot]]
+for blocks in [dict(kblock=(T,0)),dict(kblock=(T,0),pblock=(P,1)),dict(Nup=L//2,kblock=(T,0),zblock=(Z,0)),dict(Nup=[3,4],kblock=(T,2))]:
+	check_lookup(lambda **kw:spin_basis_general(L,pauli=False,**kw),spin_ops,**blocks)
+
+L = 8
+s = np.arange(L)
+T = (s+1)%L
+hop = [[1.0,i,(i+1)%L] for i in range(L)]
+pot = [[1.0,i] for i in range(L)]
+
+boson_ops = [["+-",hop],["-+",hop],["nn",hop],["n",pot]]
+for blocks in [dict(Nb=3,kblock=(T,0)),dict(Nb=[2,4],kblock=(T,1))]:
+	check_lookup(lambda **kw:boson_basis_general(L,sps=3,**kw),boson_ops,**blocks)
+
+fermion_ops = [["+-",hop],["-+",hop],["nn",hop],["n",pot]]
+for blocks in [dict(Nf=4,kblock=(T,0)),dict(kblock=(T,3))]:
+	check_lookup(lambda **kw:spinless_fermion_basis_general(L,**kw),fermion_ops,**blocks)
+
+# no index.
+basis = spin_basis_general(8,make_basis=False)
+basis.make(index=None)
+try:
+	basis.make(index="tree")
+except ValueError:
+	pass
+else:
+	raise AssertionError("invalid index accepted.")
+
+print("basis lookup test passed!")
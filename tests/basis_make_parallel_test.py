@@ -0,0 +1,62 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_general,boson_basis_general,spinless_fermion_basis_general,spinful_fermion_basis_general
+import numpy as np
+
+
+
+def check_make(basis_constructor,**blocks):
+	basis_ref = basis_constructor(make_basis=False,**blocks)
+	basis_ref.make(n_threads=1)
+
+	for n_threads in [2,3,4]:
+		basis = basis_constructor(make_basis=False,**blocks)
+		basis.make(n_threads=n_threads)
+		np.testing.assert_array_equal(basis.states,basis_ref.states)
+		np.testing.assert_array_equal(basis._n,basis_ref._n)
+
+	if basis_ref.Ns > 1:
+		basis = basis_constructor(make_basis=False,**blocks)
+		try:
+			basis.make(Ns_block_est=basis_ref.Ns//2,n_threads=4)
+		except ValueError:
+			pass
+		else:
+			raise AssertionError("basis constructed with too little memory.")
+
+
+
+L = 16
+s = np.arange(L)
+T = (s+1)%L
+P = s[::-1]
+Z = -(s+1)
+
+for blocks in [dict(Nup=L//2),dict(Nup=5,kblock=(T,0)),dict(Nup=L//2,kblock=(T,3),zblock=(Z,1)),dict(Nup=[6,7],pblock=(P,0)),dict(kblock=(T,1))]:
+	check_make(lambda **kw:spin_basis_general(L,**kw),**blocks)
+
+L = 10
+s = np.arange(L)
+T = (s+1)%L
+P = s[::-1]
+
+for blocks in [dict(Nup=8),dict(Nup=10,kblock=(T,0)),dict(Nup=7,kblock=(T,2),pblock=(P,1))]:
+	check_make(lambda **kw:spin_basis_general(L,S="1",**kw),**blocks)
+
+for blocks in [dict(Nb=6),dict(Nb=6,kblock=(T,1)),dict(Nb=[4,5],kblock=(T,0))]:
+	check_make(lambda **kw:boson_basis_general(L,sps=4,**kw),**blocks)
+
+for blocks in [dict(Nf=4),dict(Nf=5,kblock=(T,0),pblock=(P,0))]:
+	check_make(lambda **kw:spinless_fermion_basis_general(L,**kw),**blocks)
+
+L = 8
+s = np.arange(L)
+T = (s+1)%L
+for blocks in [dict(Nf=(3,4)),dict(Nf=(4,4),kblock=(T,0)),dict(Nf=[(2,3),(3,3)],kblock=(T,1))]:
+	check_make(lambda **kw:spinful_fermion_basis_general(L,**kw),**blocks)
+
+print("parallel basis construction test passed!")
@@ -0,0 +1,108 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_general,boson_basis_general,spinless_fermion_basis_general,spinful_fermion_basis_general
+import numpy as np
+
+
+
+def check_index(basis,single_sector=True):
+	for i,s in enumerate(basis.states):
+		assert(basis.index(s) == i)
+
+	if single_sector:
+		# flipping the lowest bit changes the particle number.
+		for s in basis.states[:10]:
+			try:
+				basis.index(int(s)^1)
+			except ValueError:
+				pass
+			else:
+				raise AssertionError("state outside of the sector found in basis.")
+
+
+def check_op(basis,static_list):
+	# compare operators with the index enabled to the binary search over the basis.
+	Ms = []
+	for opstr,indx in static_list:
+		Ms.append(basis.Op(opstr,indx,1.0,np.complex128))
+
+	basis._core.set_pcon_index(basis._basis,None)
+	for (opstr,indx),(ME,row,col) in zip(static_list,Ms):
+		ME_bs,row_bs,col_bs = basis.Op(opstr,indx,1.0,np.complex128)
+		np.testing.assert_allclose(ME,ME_bs,atol=1e-13)
+		np.testing.assert_array_equal(row,row_bs)
+		np.testing.assert_array_equal(col,col_bs)
+
+	basis._core.set_pcon_index(basis._basis,basis._Np)
+
+
+def check_get_vec(basis_symm):
+	np.random.seed(0)
+	v = np.random.uniform(-1,1,size=(basis_symm.Ns,2))
+	v_full = basis_symm.get_vec(v,sparse=False,pcon=True)
+	P = basis_symm.get_proj(np.complex128,pcon=True)
+
+	basis_symm._core.set_pcon_index(basis_symm._basis,None)
+	np.testing.assert_allclose(v_full,basis_symm.get_vec(v,sparse=False,pcon=True),atol=1e-13)
+	np.testing.assert_allclose(P.toarray(),basis_symm.get_proj(np.complex128,pcon=True).toarray(),atol=1e-13)
+	basis_symm._core.set_pcon_index(basis_symm._basis,basis_symm._Np)
+
+
+
+L = 10
+s = np.arange(L)
+T = (s+1)%L
+P = s[::-1]
+hop = [[1.0,i,(i+1)%L] for i in range(L)]
+pot = [[1.0,i] for i in range(L)]
+
+for Nup in [0,1,4,5,10]:
+	basis = spin_basis_general(L,Nup=Nup)
+	check_index(basis)
+	check_op(basis,[("+-",hop),("zz",hop),("z",pot)])
+	check_get_vec(spin_basis_general(L,Nup=Nup,kblock=(T,0)))
+
+for S in ["1","3/2"]:
+	for Nup in [0,3,L]:
+		basis = spin_basis_general(L,S=S,Nup=Nup)
+		check_index(basis)
+		check_op(basis,[("+-",hop),("zz",hop),("z",pot)])
+		check_get_vec(spin_basis_general(L,S=S,Nup=Nup,pblock=(P,0)))
+
+for sps in [3,4]:
+	for Nb in [0,2,L//2]:
+		basis = boson_basis_general(L,Nb=Nb,sps=sps)
+		check_index(basis)
+		check_op(basis,[("+-",hop),("nn",hop),("n",pot)])
+		check_get_vec(boson_basis_general(L,Nb=Nb,sps=sps,kblock=(T,0)))
+
+for Nf in [0,3,5]:
+	basis = spinless_fermion_basis_general(L,Nf=Nf)
+	check_index(basis)
+	check_op(basis,[("+-",hop),("nn",hop),("n",pot)])
+	check_get_vec(spinless_fermion_basis_general(L,Nf=Nf,kblock=(T,0)))
+
+L = 6
+s = np.arange(L)
+T = (s+1)%L
+hop = [[1.0,i,(i+1)%L] for i in range(L)]
+pot = [[1.0,i,i] for i in range(L)]
+for Nf in [(0,0),(2,1),(3,3),(1,4)]:
+	basis = spinful_fermion_basis_general(L,Nf=Nf)
+	for i,s in enumerate(basis.states):
+		up_state = int(s) >> L
+		down_state = int(s) & ((1<<L)-1)
+		assert(basis.index(up_state,down_state) == i)
+
+	check_op(basis,[("+-|",hop),("|+-",hop),("n|n",pot)])
+	check_get_vec(spinful_fermion_basis_general(L,Nf=Nf,kblock=(T,0)))
+
+# multiple sectors fall back to the binary search.
+basis = spin_basis_general(10,Nup=[3,4])
+check_index(basis,single_sector=False)
+
+print("pcon index test passed!")
@@ -0,0 +1,110 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_general,spinful_fermion_basis_general
+from quspin.basis import get_basis_type,basis_int_to_python_int,python_int_to_basis_int,basis_zeros,basis_ones
+from quspin.basis import bitwise_not,bitwise_and,bitwise_or,bitwise_xor,bitwise_leftshift,bitwise_rightshift
+from quspin.basis import uint64,uint128,uint256
+from quspin.operators import hamiltonian
+import numpy as np
+
+
+
+# dtype selection
+assert(get_basis_type(64,None,2) == uint64)
+assert(get_basis_type(65,None,2) == uint128)
+assert(get_basis_type(128,None,2) == uint128)
+assert(get_basis_type(129,None,2) == uint256)
+assert(get_basis_type(80,None,3) == uint128)
+assert(get_basis_type(81,None,3) == uint256)
+assert(get_basis_type(80,1,3) == uint128)
+
+# conversion to and from python integers
+np.random.seed(0)
+for nbits in [1,63,64,65,100,127,128]:
+	for i in range(10):
+		s = int(np.random.randint(0,2**30)) << (nbits-30) if nbits > 30 else int(np.random.randint(0,2**nbits))
+		s |= 1 << (nbits-1)
+		b = python_int_to_basis_int(s,dtype=uint128)
+		assert(basis_int_to_python_int(b) == s)
+		if nbits > 64:
+			assert(python_int_to_basis_int(s).dtype == uint128)
+
+try:
+	python_int_to_basis_int(1<<128,dtype=uint128)
+except ValueError:
+	pass
+else:
+	raise AssertionError("integer larger than 128 bits accepted.")
+
+assert(basis_int_to_python_int(basis_zeros(3,dtype=uint128)[1]) == 0)
+assert(basis_int_to_python_int(basis_ones(3,dtype=uint128)[2]) == 1)
+
+# bitwise operations
+x1 = [(1<<127)|12345,(1<<100)+7,2**128-1]
+x2 = [(1<<64)|3,2**70-1,1<<127]
+a1 = basis_zeros(3,dtype=uint128)
+a2 = basis_zeros(3,dtype=uint128)
+for i in range(3):
+	a1[i] = python_int_to_basis_int(x1[i],dtype=uint128)
+	a2[i] = python_int_to_basis_int(x2[i],dtype=uint128)
+mask = 2**128-1
+for quspin_func,func in [(bitwise_and,lambda a,b:a&b),(bitwise_or,lambda a,b:a|b),(bitwise_xor,lambda a,b:a^b)]:
+	y = quspin_func(a1,a2)
+	assert([basis_int_to_python_int(s) for s in y] == [func(a,b) for a,b in zip(x1,x2)])
+
+assert([basis_int_to_python_int(s) for s in bitwise_not(a1)] == [mask^a for a in x1])
+shifts = np.array([1,27,64],dtype=np.uint32)
+assert([basis_int_to_python_int(s) for s in bitwise_leftshift(a1,shifts)] == [(a<<int(n))&mask for a,n in zip(x1,shifts)])
+assert([basis_int_to_python_int(s) for s in bitwise_rightshift(a1,shifts)] == [a>>int(n) for a,n in zip(x1,shifts)])
+
+# single particle on a ring with 100 sites: E(q) = cos(2*pi*q/L).
+L = 100
+s = np.arange(L)
+T = (s+1)%L
+hop = [[0.5,i,(i+1)%L] for i in range(L)]
+static = [["+-",hop],["-+",hop]]
+no_checks = dict(check_symm=False,check_herm=False,check_pcon=False)
+
+basis = spin_basis_general(L,Nup=1,pauli=False)
+assert(basis.states.dtype == uint128)
+assert(basis.Ns == L)
+for i,s in enumerate(basis.states):
+	assert(basis.index(s) == i)
+	assert(basis_int_to_python_int(s) == 1 << (L-i-1))
+
+E = np.linalg.eigvalsh(hamiltonian(static,[],basis=basis,dtype=np.float64,**no_checks).toarray())
+np.testing.assert_allclose(E,np.sort(np.cos(2*np.pi*np.arange(L)/L)),atol=1e-12)
+
+for q in [0,1,17,50]:
+	basis = spin_basis_general(L,Nup=1,pauli=False,kblock=(T,q))
+	assert(basis.states.dtype == uint128)
+	H = hamiltonian(static,[],basis=basis,dtype=np.complex128,**no_checks).toarray()
+	np.testing.assert_allclose(H,[[np.cos(2*np.pi*q/L)]],atol=1e-12)
+
+# two species of fermions on 40 sites: one particle of each species.
+L = 40
+s = np.arange(L)
+T = (s+1)%L
+hop = [[-1.0,i,(i+1)%L] for i in range(L)]
+hop_hc = [[1.0,i,(i+1)%L] for i in range(L)]
+static = [["+-|",hop],["-+|",hop_hc],["|+-",hop],["|-+",hop_hc]]
+
+basis = spinful_fermion_basis_general(L,Nf=(1,1))
+assert(basis.states.dtype == uint128)
+E = np.linalg.eigvalsh(hamiltonian(static,[],basis=basis,dtype=np.float64,**no_checks).toarray())
+e = -2*np.cos(2*np.pi*np.arange(L)/L)
+np.testing.assert_allclose(E,np.sort(np.add.outer(e,e).ravel()),atol=1e-10)
+
+for q in [0,3]:
+	basis = spinful_fermion_basis_general(L,Nf=(1,1),kblock=(T,q))
+	assert(basis.states.dtype == uint128)
+	E = np.linalg.eigvalsh(hamiltonian(static,[],basis=basis,dtype=np.complex128,**no_checks).toarray())
+	k = np.arange(L)
+	E_q = np.sort([e[k1]+e[(q-k1)%L] for k1 in k])
+	np.testing.assert_allclose(E,E_q,atol=1e-10)
+
+print("uint128 basis test passed!")
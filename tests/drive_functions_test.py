@@ -0,0 +1,107 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_1d
+from quspin.operators import hamiltonian
+from quspin.operators._functions import function,memoize
+from quspin.tools.misc import interpolated_function
+import numpy as np
+import math
+
+
+
+n_calls = [0]
+def drive(t,Omega):
+	n_calls[0] += 1
+	return np.cos(Omega*t)
+
+def scalar_drive(t,Omega):
+	return math.cos(Omega*t)
+
+
+# memoization
+f = function(drive,(2.0,))
+f_prod = f*f.conj()
+
+n_calls[0] = 0
+f(0.3); f(0.3); f_prod(0.3)
+assert(n_calls[0] == 4)
+
+n_calls[0] = 0
+with memoize():
+	f(0.3); f(0.3); f_prod(0.3)
+	assert(n_calls[0] == 1)
+	f(0.4)
+	assert(n_calls[0] == 2)
+
+np.testing.assert_allclose(f_prod(0.3),np.cos(0.6)**2)
+
+
+# vectorized evaluation
+times = np.linspace(0,2,11)
+for func in [function(drive,(2.0,)),function(scalar_drive,(2.0,))]:
+	np.testing.assert_allclose(func.vectorized(times),np.cos(2.0*times))
+	np.testing.assert_allclose(func.vectorized(times),np.cos(2.0*times)) # second call uses the stored mode.
+	np.testing.assert_allclose((func*func).vectorized(times),np.cos(2.0*times)**2)
+
+# drives which declare that they do (not) accept arrays are called once.
+def counting_drive(t,Omega):
+	n_calls[0] += 1
+	return np.cos(Omega*t)
+
+for vectorize,n_expected in [(True,1),(False,len(times))]:
+	counting_drive.vectorize = vectorize
+	n_calls[0] = 0
+	np.testing.assert_allclose(function(counting_drive,(2.0,)).vectorized(times),np.cos(2.0*times))
+	assert(n_calls[0] == n_expected)
+
+# only TypeError and ValueError fall back to single times.
+def failing_drive(t):
+	raise RuntimeError("drive failed")
+
+try:
+	function(failing_drive).vectorized(times)
+except RuntimeError:
+	pass
+else:
+	raise AssertionError("expecting RuntimeError of the drive.")
+
+
+# interpolation tables
+T = 2.0
+table = interpolated_function(drive,0.0,T,n_points=2001,f_args=(2.0,))
+np.testing.assert_allclose(table(times),np.cos(2.0*times),atol=1e-10)
+np.testing.assert_allclose([table(t) for t in times],np.cos(2.0*times),atol=1e-10)
+
+table_scalar = interpolated_function(scalar_drive,0.0,T,n_points=2001,f_args=(2.0,))
+np.testing.assert_allclose([table_scalar(t) for t in times],np.cos(2.0*times),atol=1e-10)
+
+try:
+	table(T+0.1)
+except ValueError:
+	pass
+else:
+	raise AssertionError("expecting ValueError for times outside of the table.")
+
+
+L = 6
+basis = spin_basis_1d(L)
+static = [["zz",[[1.0,i,(i+1)%L] for i in range(L)]]]
+h_list = [[0.5,i] for i in range(L)]
+
+H = hamiltonian(static,[["x",h_list,drive,[2.0]]],basis=basis,dtype=np.float64)
+H_table = hamiltonian(static,[["x",h_list,table,[]]],basis=basis,dtype=np.float64)
+
+psi0 = np.zeros(basis.Ns,dtype=np.complex128)
+psi0[0] = 1.0
+psi_t = H.evolve(psi0,0.0,times,atol=1e-12,rtol=1e-12)
+psi_t_table = H_table.evolve(psi0,0.0,times,atol=1e-12,rtol=1e-12)
+np.testing.assert_allclose(psi_t,psi_t_table,atol=1e-8)
+
+V = np.random.uniform(-1,1,size=(basis.Ns,len(times)))
+np.testing.assert_allclose(H.dot(V,time=times),H_table.dot(V,time=times),atol=1e-8)
+
+print("drive functions test passed!")
@@ -0,0 +1,123 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_general,boson_basis_general,spinful_fermion_basis_general
+from quspin.basis.base import basis
+from quspin.basis.basis_general import base_general
+from quspin.operators._make_hamiltonian import _consolidate_static
+from itertools import product
+import numpy as np
+
+
+
+dtypes = [np.float32,np.float64,np.complex64,np.complex128]
+
+def eps(dtype):
+	return 100*np.finfo(dtype).eps
+
+
+def check_op_list(b,static,dtype):
+	op_list = _consolidate_static(static)
+
+	H1 = b._make_csr(op_list,dtype,two_pass=False) # single pass over basis in the core
+	H2 = basis._make_csr(b,op_list,dtype) # one call to Op for every term
+	H3 = b._make_csr(op_list,dtype,two_pass=True) # count then fill csr arrays
+
+	assert(H1.dtype == np.dtype(dtype))
+	assert(H1.has_sorted_indices)
+	np.testing.assert_allclose((H1-H2).toarray(),0,atol=eps(dtype))
+
+	assert(H3.dtype == np.dtype(dtype))
+	H3.has_sorted_indices = False # force check of the ordering
+	H3_sorted = H3.sorted_indices()
+	np.testing.assert_array_equal(H3.indices,H3_sorted.indices)
+	np.testing.assert_array_equal(H3.indptr,H1.indptr)
+	np.testing.assert_allclose((H3-H2).toarray(),0,atol=eps(dtype))
+
+
+Lx = 3
+Ly = 2
+N = Lx*Ly
+
+i = np.arange(N)
+x = i%Lx
+y = i//Lx
+tx = (x+1)%Lx + y*Lx
+ty = x + ((y+1)%Ly)*Lx
+px = x[::-1] + y*Lx
+py = x + y[::-1]*Lx
+z = -(1+i)
+
+Jzz_list = [[1.0,i,tx[i]] for i in range(N)]+[[1.0,i,ty[i]] for i in range(N)]
+Jxy_list = [[0.5,i,tx[i]] for i in range(N)]+[[0.5,i,ty[i]] for i in range(N)]
+h_list = [[0.3,i] for i in range(N)]
+
+spin_static = [["+-",Jxy_list],["-+",Jxy_list],["zz",Jzz_list],["z",h_list]]
+spin_static_x = spin_static + [["x",h_list]]
+
+for pauli in [0,1,-1]:
+	basis_full = spin_basis_general(N,pauli=pauli)
+	basis_pcon = spin_basis_general(N,m=0.0,pauli=pauli)
+	basis_pcon_symm = spin_basis_general(N,m=0.0,tx=(tx,0),ty=(ty,0),px=(px,0),py=(py,0),z=(z,0),pauli=pauli)
+	basis_symm = spin_basis_general(N,tx=(tx,1),ty=(ty,0),pauli=pauli)
+
+	for dtype in dtypes:
+		for b in [basis_full,basis_pcon,basis_pcon_symm]:
+			check_op_list(b,spin_static,dtype)
+
+		check_op_list(basis_full,spin_static_x,dtype)
+
+	for dtype in [np.complex64,np.complex128]:
+		check_op_list(basis_symm,spin_static_x,dtype)
+
+
+# complex matrix elements can not be stored in real matrices.
+b = spin_basis_general(N)
+for dtype,two_pass in product([np.float32,np.float64],[False,True]):
+	try:
+		b._make_csr(_consolidate_static([["y",h_list]]),dtype,two_pass=two_pass)
+	except TypeError:
+		pass
+	else:
+		raise AssertionError("expecting TypeError for complex matrix elements.")
+
+
+# small blocks to check that states are split up correctly.
+MAX_BLOCK_ELEMENTS = base_general._MAX_BLOCK_ELEMENTS
+base_general._MAX_BLOCK_ELEMENTS = 17
+try:
+	b = spin_basis_general(N,m=0.0,tx=(tx,0),ty=(ty,0))
+	for dtype in dtypes:
+		check_op_list(b,spin_static,dtype)
+finally:
+	base_general._MAX_BLOCK_ELEMENTS = MAX_BLOCK_ELEMENTS
+
+
+# higher spin and bosons
+for S,dtype in product(["1","3/2"],dtypes):
+	b = spin_basis_general(4,S=S)
+	check_op_list(b,[["+-",[[0.5,i,(i+1)%4] for i in range(4)]],["-+",[[0.5,i,(i+1)%4] for i in range(4)]],["zz",[[1.0,i,(i+1)%4] for i in range(4)]]],dtype)
+
+t = (np.arange(4)+1)%4
+for dtype in dtypes:
+	b = boson_basis_general(4,Nb=3,sps=3,t=(t,0))
+	check_op_list(b,[["+-",[[-1.0,i,(i+1)%4] for i in range(4)]],["-+",[[-1.0,i,(i+1)%4] for i in range(4)]],["nn",[[0.5,i,i] for i in range(4)]]],dtype)
+
+
+# spinful fermions with the simple opstr format
+L = 4
+t = (np.arange(L)+1)%L
+hop = [[-1.0,i,(i+1)%L] for i in range(L)]
+U = [[2.0,i,i] for i in range(L)]
+fermion_static = [["+-|",hop],["-+|",hop],["|+-",hop],["|-+",hop],["n|n",U]]
+for dtype in dtypes:
+	b = spinful_fermion_basis_general(L,Nf=(2,2))
+	check_op_list(b,fermion_static,dtype)
+
+	b = spinful_fermion_basis_general(L,Nf=(2,2),t=(t,0))
+	check_op_list(b,fermion_static,dtype)
+
+print("general_op_list test passed!")
@@ -0,0 +1,58 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_1d
+from quspin.operators import hamiltonian
+from itertools import product
+import numpy as np
+
+
+
+dtypes = [np.float32,np.float64,np.complex64,np.complex128]
+
+def eps(dtype):
+	return 1000*np.finfo(dtype).eps
+
+
+def drive(t,Omega):
+	return np.cos(Omega*t)
+
+L = 8
+basis = spin_basis_1d(L)
+
+Jzz_list = [[1.0,i,(i+1)%L] for i in range(L)]
+Jxy_list = [[0.5,i,(i+1)%L] for i in range(L)]
+h_list = [[0.3,i] for i in range(L)]
+
+static = [["+-",Jxy_list],["-+",Jxy_list],["zz",Jzz_list]]
+dynamic = [["x",h_list,drive,[1.0]],["z",h_list,drive,[2.5]]]
+
+nt = 5
+times = np.linspace(0,2,nt)
+
+for dtype,V_dtype,fused in product(dtypes,[np.float64,np.complex128],[False,True]):
+	for static_list in [static,[]]: # the static part can be empty.
+		H = hamiltonian(static_list,dynamic,basis=basis,dtype=dtype,fused=fused)
+
+		V = np.random.uniform(-1,1,size=(basis.Ns,nt)).astype(V_dtype)
+		out = H.dot(V,time=times)
+
+		out_ref = np.vstack([H.dot(V[:,i],time=t) for i,t in enumerate(times)]).T
+		np.testing.assert_allclose(out,out_ref,atol=eps(dtype))
+
+		# non-contiguous input
+		V = np.random.uniform(-1,1,size=(2*nt,basis.Ns)).astype(V_dtype).T[:,::2]
+		out = H.dot(V,time=times)
+
+		out_ref = np.vstack([H.dot(np.ascontiguousarray(V[:,i]),time=t) for i,t in enumerate(times)]).T
+		np.testing.assert_allclose(out,out_ref,atol=eps(dtype))
+
+		# expectation values at many times use the same path.
+		E = H.expt_value(V,time=times)
+		E_ref = [H.expt_value(np.ascontiguousarray(V[:,i]),time=t) for i,t in enumerate(times)]
+		np.testing.assert_allclose(E,E_ref,atol=100*eps(dtype))
+
+print("hamiltonian dot times test passed!")
@@ -0,0 +1,81 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_1d
+from quspin.operators import hamiltonian
+from itertools import product
+import numpy as np
+
+
+
+dtypes = [np.float32,np.float64,np.complex64,np.complex128]
+
+def eps(dtype):
+	return 1000*np.finfo(dtype).eps
+
+
+def drive(t,Omega,phi):
+	return np.cos(Omega*t+phi)
+
+L = 8
+basis = spin_basis_1d(L)
+
+Jzz_list = [[1.0,i,(i+1)%L] for i in range(L)]
+Jxy_list = [[0.5,i,(i+1)%L] for i in range(L)]
+
+static = [["+-",Jxy_list],["-+",Jxy_list],["zz",Jzz_list]]
+# every site has its own drive, giving L dynamic parts.
+dynamic = [["x",[[0.3,i]],drive,[1.0+0.1*i,0.2*i]] for i in range(L)]
+dynamic += [["z",[[0.1,i]],drive,[2.0,0.3*i]] for i in range(L)]
+
+
+for dtype in dtypes:
+	H = hamiltonian(static,dynamic,basis=basis,dtype=dtype,check_herm=False)
+	H_f = hamiltonian(static,dynamic,basis=basis,dtype=dtype,check_herm=False,fused=True)
+
+	assert(H_f._fused is not None)
+	assert(H_f.nbytes > H.nbytes)
+
+	atol = eps(dtype)
+
+	for time in [0.0,0.7]:
+		v = np.random.uniform(-1,1,size=(basis.Ns,)) + 1j*np.random.uniform(-1,1,size=(basis.Ns,))
+		v /= np.linalg.norm(v)
+		np.testing.assert_allclose(H.dot(v,time=time),H_f.dot(v,time=time),atol=atol)
+
+		V = np.random.uniform(-1,1,size=(basis.Ns,3))
+		np.testing.assert_allclose(H.dot(V,time=time),H_f.dot(V,time=time),atol=atol)
+		np.testing.assert_allclose(H.dot(V[:,::2],time=time),H_f.dot(V[:,::2],time=time),atol=atol)
+
+		out = np.ones_like(V,dtype=np.result_type(V.dtype,dtype))
+		H_f.dot(V,time=time,out=out,overwrite_out=False)
+		np.testing.assert_allclose(1+H.dot(V,time=time),out,atol=atol)
+
+	times = np.linspace(0,1,3)
+	V = np.random.uniform(-1,1,size=(basis.Ns,3))
+	np.testing.assert_allclose(H.dot(V,time=times),H_f.dot(V,time=times),atol=atol)
+
+	# fused format is kept by copies and updated after in-place operations.
+	H_f2 = H_f.copy()
+	H_f2 += H_f
+	assert(H_f2._fused is not None)
+	np.testing.assert_allclose((2*H).dot(V,time=0.3),H_f2.dot(V,time=0.3),atol=10*atol)
+
+	if dtype in [np.float64,np.complex128]:
+		v0 = np.zeros(basis.Ns,dtype=np.complex128)
+		v0[0] = 1.0
+		np.testing.assert_allclose(H.evolve(v0,0.0,times),H_f.evolve(v0,0.0,times),atol=1e-10)
+		np.testing.assert_allclose(H.evolve(v0.real,0.0,times,imag_time=True),H_f.evolve(v0.real,0.0,times,imag_time=True),atol=1e-10)
+
+		if dtype == np.float64:
+			np.testing.assert_allclose(H.evolve(v0,0.0,times,stack_state=True),H_f.evolve(v0,0.0,times,stack_state=True),atol=1e-10)
+
+
+# no dynamic part: nothing to fuse.
+H = hamiltonian(static,[],basis=basis,dtype=np.float64,fused=True)
+assert(H._fused is None)
+
+print("hamiltonian fused test passed!")
@@ -0,0 +1,129 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_1d
+from quspin.operators import hamiltonian,quantum_operator
+from itertools import product
+import numpy as np
+
+
+
+dtypes = [np.float32,np.float64,np.complex64,np.complex128]
+
+def eps(dtype):
+	return 1000*np.finfo(dtype).eps
+
+
+def drive(t,Omega):
+	return np.cos(Omega*t)
+
+drive_args = [2.0]
+
+L = 8
+J_list = [[1.0,i,(i+1)%L] for i in range(L)]
+J_pm = [[0.5*np.exp(0.3j),i,(i+1)%L] for i in range(L)]
+J_mp = [[0.5*np.exp(-0.3j),i,(i+1)%L] for i in range(L)]
+h_list = [[0.3,i] for i in range(L)]
+
+static_real = [["+-",J_list],["-+",J_list],["zz",J_list],["x",h_list]]
+static_cpx = [["+-",J_pm],["-+",J_mp],["zz",J_list],["x",h_list]]
+dynamic = [["z",h_list,drive,drive_args]]
+
+for pblock in [None,1]:
+	basis = spin_basis_1d(L,m=0.0,kblock=0,pblock=pblock) if pblock else spin_basis_1d(L)
+	for dtype in dtypes:
+		static = static_real if np.dtype(dtype).kind == "f" else static_cpx
+		if pblock is not None:
+			static = static_real
+
+		H = hamiltonian(static,dynamic,basis=basis,dtype=dtype,check_symm=False,check_pcon=False)
+		H_herm = hamiltonian(static,dynamic,basis=basis,dtype=dtype,static_fmt="herm",check_symm=False,check_pcon=False)
+
+		atol = eps(dtype)
+
+		assert(H_herm.static.format == "herm")
+		assert(H_herm.nbytes < H.nbytes)
+		np.testing.assert_allclose(H_herm.toarray(time=0.5),H.toarray(time=0.5),atol=atol)
+		np.testing.assert_allclose((H_herm.tocsr(time=0.5)-H.tocsr(time=0.5)).toarray(),0,atol=atol)
+		np.testing.assert_allclose(H_herm.diagonal(time=0.5),H.diagonal(time=0.5),atol=atol)
+
+		for time in [0.0,0.7]:
+			v = np.random.uniform(-1,1,size=(basis.Ns,)) + 1j*np.random.uniform(-1,1,size=(basis.Ns,))
+			v /= np.linalg.norm(v)
+
+			np.testing.assert_allclose(H_herm.dot(v,time=time),H.dot(v,time=time),atol=atol)
+			np.testing.assert_allclose(H_herm.T.dot(v,time=time),H.T.dot(v,time=time),atol=atol)
+			np.testing.assert_allclose(H_herm.conj().dot(v,time=time),H.conj().dot(v,time=time),atol=atol)
+			np.testing.assert_allclose(H_herm.H.dot(v,time=time),H.H.dot(v,time=time),atol=atol)
+			np.testing.assert_allclose((2.0*H_herm).dot(v,time=time),(2.0*H).dot(v,time=time),atol=atol)
+			np.testing.assert_allclose((1j*H_herm).dot(v,time=time),(1j*H).dot(v,time=time),atol=atol)
+			np.testing.assert_allclose((H_herm+H_herm).dot(v,time=time),(H+H).dot(v,time=time),atol=atol)
+			np.testing.assert_allclose((H_herm-H).dot(v,time=time),0,atol=atol)
+			np.testing.assert_allclose(H_herm.expt_value(v,time=time),H.expt_value(v,time=time),atol=atol)
+
+			for order in ["C","F"]:
+				V = np.random.uniform(-1,1,size=(basis.Ns,3))
+				V = np.asarray(V,order=order)
+				np.testing.assert_allclose(H_herm.dot(V,time=time),H.dot(V,time=time),atol=atol)
+
+				out = np.ones_like(V,dtype=np.result_type(V.dtype,dtype))
+				H_herm.dot(V,time=time,out=out,overwrite_out=False)
+				np.testing.assert_allclose(1+H.dot(V,time=time),out,atol=atol)
+
+		assert((H_herm+H_herm).static.format == "herm")
+		assert((2.0*H_herm).static.format == "herm")
+		assert(H_herm.copy().static.format == "herm")
+		assert(H_herm.astype(np.complex128).static.format == "herm")
+
+		if dtype in [np.float64,np.complex128]:
+			E = H.eigsh(time=0.0,k=2,which="SA",return_eigenvectors=False)
+			E_herm = H_herm.eigsh(time=0.0,k=2,which="SA",return_eigenvectors=False)
+			np.testing.assert_allclose(np.sort(E),np.sort(E_herm),atol=1e-10)
+
+			times = np.linspace(0,1,3)
+			v0 = np.zeros(basis.Ns,dtype=np.complex128)
+			v0[0] = 1.0
+			v_t = H.evolve(v0,0.0,times)
+			v_t_herm = H_herm.evolve(v0,0.0,times)
+			np.testing.assert_allclose(v_t,v_t_herm,atol=1e-10)
+
+		H_herm.update_matrix_formats(static_fmt="csr",dynamic_fmt=None)
+		assert(H_herm.static.format == "csr")
+		np.testing.assert_allclose(H_herm.toarray(),H.toarray(),atol=atol)
+
+
+# quantum_operator
+basis = spin_basis_1d(L)
+input_dict = dict(J=static_cpx[:3],h=[["x",h_list]])
+for dtype in [np.complex64,np.complex128]:
+	O = quantum_operator(input_dict,basis=basis,dtype=dtype,check_symm=False,check_pcon=False)
+	O_herm = quantum_operator(input_dict,basis=basis,dtype=dtype,matrix_formats=dict(J="herm",h="herm"),check_symm=False,check_pcon=False)
+	assert(O_herm._quantum_operator["J"].format == "herm")
+
+	pars = dict(J=0.3,h=1.1)
+	V = np.random.uniform(-1,1,size=(basis.Ns,3)).astype(dtype)
+	np.testing.assert_allclose(O_herm.dot(V,pars=pars),O.dot(V,pars=pars),atol=eps(dtype))
+	np.testing.assert_allclose(O_herm.toarray(pars=pars),O.toarray(pars=pars),atol=eps(dtype))
+	np.testing.assert_allclose(O_herm.T.tocsr(pars=pars).toarray(),O.T.tocsr(pars=pars).toarray(),atol=eps(dtype))
+
+	O_herm.update_matrix_formats(dict(J="csr"))
+	assert(O_herm._quantum_operator["J"].format == "csr")
+
+try:
+	quantum_operator(dict(h=[["+",h_list]]),basis=basis,matrix_formats=dict(h="herm"),check_herm=False,check_pcon=False)
+except ValueError:
+	pass
+else:
+	raise AssertionError("expecting ValueError for non-hermitian operator in hermitian format.")
+
+try:
+	hamiltonian([["+",h_list]],[],basis=basis,dtype=np.float64,static_fmt="herm",check_herm=False)
+except ValueError:
+	pass
+else:
+	raise AssertionError("expecting ValueError for non-hermitian static part in hermitian format.")
+
+print("hamiltonian herm test passed!")
@@ -0,0 +1,154 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_1d,spin_basis_general
+from quspin.operators import hamiltonian
+from itertools import product
+import numpy as np
+
+
+
+dtypes = [np.float32,np.float64,np.complex64,np.complex128]
+
+def eps(dtype):
+	return 1000*np.finfo(dtype).eps
+
+
+def drive(t,Omega):
+	return np.cos(Omega*t)
+
+drive_args = [2.0]
+
+L = 8
+i = np.arange(L)
+t = (i+1)%L
+p = i[::-1]
+
+Jzz_list = [[1.0,i,(i+1)%L] for i in range(L)]
+Jxy_list = [[0.5,i,(i+1)%L] for i in range(L)]
+h_list = [[0.3,i] for i in range(L)]
+
+static = [["+-",Jxy_list],["-+",Jxy_list],["zz",Jzz_list]]
+dynamic = [["z",h_list,drive,drive_args]]
+dynamic_x = [["x",h_list,drive,drive_args]]
+
+bases = [
+	(spin_basis_general(L),dynamic_x),
+	(spin_basis_general(L,m=0.0,kblock=(t,0),pblock=(p,0)),dynamic),
+]
+
+
+for (b,dyn),dtype in product(bases,dtypes):
+	H = hamiltonian(static,dyn,basis=b,dtype=dtype)
+	H_mf = hamiltonian(static,dyn,basis=b,dtype=dtype,matrix_free=True)
+
+	atol = eps(dtype)
+
+	assert(H_mf.nbytes == 0)
+
+	for time in [0.0,0.7]:
+		v = np.random.uniform(-1,1,size=(b.Ns,)) + 1j*np.random.uniform(-1,1,size=(b.Ns,))
+		v /= np.linalg.norm(v)
+
+		np.testing.assert_allclose(H.dot(v,time=time),H_mf.dot(v,time=time),atol=atol)
+		np.testing.assert_allclose(H.T.dot(v,time=time),H_mf.T.dot(v,time=time),atol=atol)
+		np.testing.assert_allclose(H.conj().dot(v,time=time),H_mf.conj().dot(v,time=time),atol=atol)
+		np.testing.assert_allclose(H.H.dot(v,time=time),H_mf.H.dot(v,time=time),atol=atol)
+		np.testing.assert_allclose((2.0*H).dot(v,time=time),(2.0*H_mf).dot(v,time=time),atol=atol)
+		np.testing.assert_allclose((H+H).dot(v,time=time),(H_mf+H_mf).dot(v,time=time),atol=atol)
+		np.testing.assert_allclose(H.expt_value(v,time=time),H_mf.expt_value(v,time=time),atol=atol)
+		np.testing.assert_allclose(H.diagonal(time=time),H_mf.diagonal(time=time),atol=atol)
+
+		V = np.random.uniform(-1,1,size=(b.Ns,3))
+		np.testing.assert_allclose(H.dot(V,time=time),H_mf.dot(V,time=time),atol=atol)
+
+		out = np.ones_like(V,dtype=np.result_type(V.dtype,dtype))
+		H_mf.dot(V,time=time,out=out,overwrite_out=False)
+		np.testing.assert_allclose(1+H.dot(V,time=time),out,atol=atol)
+
+	times = np.linspace(0,1,3)
+	V = np.random.uniform(-1,1,size=(b.Ns,3))
+	np.testing.assert_allclose(H.dot(V,time=times),H_mf.dot(V,time=times),atol=atol)
+
+	if dtype in [np.float64,np.complex128]:
+		E = H.eigsh(time=0.0,k=2,which="SA",return_eigenvectors=False)
+		E_mf = H_mf.eigsh(time=0.0,k=2,which="SA",return_eigenvectors=False)
+		np.testing.assert_allclose(np.sort(E),np.sort(E_mf),atol=1e-10)
+
+		v0 = np.zeros(b.Ns,dtype=np.complex128)
+		v0[0] = 1.0
+		v_t = H.evolve(v0,0.0,times)
+		v_t_mf = H_mf.evolve(v0,0.0,times)
+		np.testing.assert_allclose(v_t,v_t_mf,atol=1e-10)
+
+		rho0 = np.outer(v0,v0.conj())
+		rho_t = H.evolve(rho0,0.0,times,eom="LvNE")
+		rho_t_mf = H_mf.evolve(rho0,0.0,times,eom="LvNE")
+		np.testing.assert_allclose(rho_t,rho_t_mf,atol=1e-10)
+
+
+# complex non-hermitian terms: the transposed and conjugated operators all differ.
+b = bases[0][0]
+hop_nh = [[1j,i,(i+1)%L] for i in range(L)]
+hop_2_nh = [[0.3-0.2j,i,(i+2)%L] for i in range(L)]
+h_nh = [[0.4+0.1j,i] for i in range(L)]
+static_nh = [["+-",hop_nh],["zz",hop_2_nh],["+",h_nh]]
+dynamic_nh = [["-+",hop_2_nh,drive,drive_args]]
+no_checks = dict(check_herm=False,check_symm=False,check_pcon=False)
+
+H = hamiltonian(static_nh,dynamic_nh,basis=b,dtype=np.complex128,**no_checks)
+H_mf = hamiltonian(static_nh,dynamic_nh,basis=b,dtype=np.complex128,matrix_free=True,**no_checks)
+
+for time in [0.0,0.7]:
+	v = np.random.uniform(-1,1,size=(b.Ns,)) + 1j*np.random.uniform(-1,1,size=(b.Ns,))
+	H_csr = H.tocsr(time=time)
+
+	assert(np.linalg.norm(H_csr.T.dot(v)-H_csr.dot(v)) > 1e-3)
+	assert(np.linalg.norm(H_csr.conj().dot(v)-H_csr.dot(v)) > 1e-3)
+	assert(np.linalg.norm(H_csr.H.dot(v)-H_csr.dot(v)) > 1e-3)
+
+	np.testing.assert_allclose(H_mf.dot(v,time=time),H_csr.dot(v),atol=1e-12)
+	np.testing.assert_allclose(H_mf.T.dot(v,time=time),H_csr.T.dot(v),atol=1e-12)
+	np.testing.assert_allclose(H_mf.conj().dot(v,time=time),H_csr.conj().dot(v),atol=1e-12)
+	np.testing.assert_allclose(H_mf.H.dot(v,time=time),H_csr.H.dot(v),atol=1e-12)
+
+# matrices of the transposed/conjugated matrix free parts.
+H_static = H.tocsr(time=np.pi/(2*drive_args[0])) # drive vanishes.
+for op in [lambda A:A,lambda A:A.T,lambda A:A.conj(),lambda A:A.getH()]:
+	np.testing.assert_allclose(op(H_mf._static).tocsr().toarray(),op(H_static).toarray(),atol=1e-13)
+
+# terms which vanish on the basis are not stored.
+b_m0 = spin_basis_general(L,m=0.0)
+H_m0 = hamiltonian([["++",Jxy_list],["zz",Jzz_list]],[["++",[[0.3,0,1]],drive,drive_args]],basis=b_m0,matrix_free=True,**no_checks)
+assert(len(H_m0._static._terms) == L)
+assert(len(H_m0._dynamic) == 0)
+
+# products with sparse matrices use the matrix of the matrix free parts.
+V = H_static[:,:3].tocsc()
+np.testing.assert_allclose(H_mf.dot(V,time=np.pi/(2*drive_args[0])).toarray(),(H_static*V).toarray(),atol=1e-13)
+
+try:
+	H_mf._static._matvec(V)
+except TypeError:
+	pass
+else:
+	raise AssertionError("expecting TypeError for sparse input of matrix free matvec.")
+
+try:
+	hamiltonian(static,[],basis=bases[0][0],matrix_free=True,static_fmt="csr")
+except ValueError:
+	pass
+else:
+	raise AssertionError("expecting ValueError for matrix format of matrix free operator.")
+
+try:
+	hamiltonian(static,[],basis=spin_basis_1d(L),matrix_free=True)
+except TypeError:
+	pass
+else:
+	raise AssertionError("expecting TypeError for matrix free operator with basis without inplace kernels.")
+
+print("hamiltonian matrix free test passed!")
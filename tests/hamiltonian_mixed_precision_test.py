@@ -0,0 +1,149 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_general
+from quspin.operators import hamiltonian,quantum_operator
+from itertools import product
+import numpy as np
+
+
+
+def drive(t,Omega):
+	return np.cos(Omega*t)
+
+drive_args = [2.0]
+
+L = 10
+J_list = [[1.0,i,(i+1)%L] for i in range(L)]
+h_list = [[0.3,i] for i in range(L)]
+
+static = [["+-",J_list],["-+",J_list],["zz",J_list],["z",h_list]]
+dynamic = [["x",h_list,drive,drive_args]]
+
+basis = spin_basis_general(L)
+
+# (dtype,storage_dtype) pairs
+dtype_pairs = [(np.float64,np.float32),(np.complex128,np.complex64)]
+
+for (dtype,storage_dtype),fmt,fused in product(dtype_pairs,["csr","csc","dia"],[False,True]):
+	H = hamiltonian(static,dynamic,basis=basis,dtype=dtype,static_fmt=fmt,check_symm=False,check_pcon=False,fused=fused)
+	H_mp = hamiltonian(static,dynamic,basis=basis,dtype=dtype,static_fmt=fmt,storage_dtype=storage_dtype,
+		check_symm=False,check_pcon=False,fused=fused)
+
+	assert(H_mp.dtype == np.dtype(dtype).name)
+	assert(H_mp.storage_dtype == np.dtype(storage_dtype).name)
+	assert(H_mp.static.dtype == storage_dtype)
+	assert(all(Hd.dtype == storage_dtype for Hd in H_mp.dynamic.values()))
+	assert(H_mp.tocsr(time=0.3).dtype == dtype)
+
+	# the matrix elements are rounded to single precision, the products are accumulated in double precision.
+	H_rounded = H.astype(storage_dtype).astype(dtype)
+
+	for time in [0.0,0.7]:
+		v = np.random.uniform(-1,1,size=(basis.Ns,)) + 1j*np.random.uniform(-1,1,size=(basis.Ns,))
+		v /= np.linalg.norm(v)
+		v = v.astype(dtype) if np.dtype(dtype).kind == "c" else v.real.astype(dtype)
+		V = np.random.uniform(-1,1,size=(basis.Ns,3)).astype(dtype)
+
+		# the drive coefficients are rounded to the storage type as well, cos(0) = 1 is exact.
+		atol = 1e-12 if time == 0.0 else 1e-6
+
+		w = H_mp.dot(v,time=time)
+		assert(w.dtype == dtype)
+		np.testing.assert_allclose(w,H_rounded.dot(v,time=time),atol=atol)
+		np.testing.assert_allclose(w,H.dot(v,time=time),atol=1e-5)
+		np.testing.assert_allclose(H_mp.dot(V,time=time),H_rounded.dot(V,time=time),atol=atol)
+
+	for H_new in [H_mp.copy(),H_mp.T,H_mp.H,H_mp.conj(),-H_mp,2*H_mp,H_mp+H_mp]:
+		assert(H_new.storage_dtype == np.dtype(storage_dtype).name)
+		assert(H_new.static.dtype == storage_dtype)
+
+	# complex operators keep the single precision with complex storage.
+	assert(H_mp.astype(np.complex128).storage_dtype == "complex64")
+	assert(H_mp.astype(np.complex128).static.dtype == np.complex64)
+
+	assert(H_mp.astype(np.float32).storage_dtype == "float32")
+	assert(H_mp.astype(np.float32).static.dtype == np.float32)
+
+	if dtype == np.complex128:
+		v0 = np.random.uniform(-1,1,size=(basis.Ns,)) + 1j*np.random.uniform(-1,1,size=(basis.Ns,))
+		v0 /= np.linalg.norm(v0)
+		times = np.linspace(0,1,5)
+		v_t = H.evolve(v0,0.0,times,atol=1e-8,rtol=1e-8)
+		v_t_mp = H_mp.evolve(v0,0.0,times,atol=1e-8,rtol=1e-8)
+		np.testing.assert_allclose(v_t_mp,v_t,atol=1e-5)
+
+
+try:
+	hamiltonian(static,[],basis=basis,dtype=np.float64,storage_dtype=np.complex64,check_symm=False,check_pcon=False)
+except TypeError:
+	pass
+else:
+	raise AssertionError("expecting TypeError for storage type which can not be cast to dtype.")
+
+# real storage would drop the imaginary part of complex coefficients.
+for storage_dtype in [np.float32,np.float64]:
+	try:
+		hamiltonian(static,dynamic,basis=basis,dtype=np.complex128,storage_dtype=storage_dtype,check_symm=False,check_pcon=False)
+	except TypeError:
+		pass
+	else:
+		raise AssertionError("expecting TypeError for real storage type of complex operator.")
+
+	try:
+		quantum_operator(dict(J=static),basis=basis,dtype=np.complex128,storage_dtype=storage_dtype,check_symm=False,check_pcon=False)
+	except TypeError:
+		pass
+	else:
+		raise AssertionError("expecting TypeError for real storage type of complex operator.")
+
+
+# complex drive and complex parameters.
+def complex_drive(t,Omega):
+	return np.exp(1j*Omega*t)
+
+dynamic_cpx = [["x",h_list,complex_drive,drive_args],["zz",J_list,complex_drive,drive_args]]
+
+for fmt,fused in product(["csr","csc","dia"],[False,True]):
+	H = hamiltonian(static,dynamic_cpx,basis=basis,dtype=np.complex128,static_fmt=fmt,check_symm=False,check_herm=False,check_pcon=False,fused=fused)
+	H_mp = hamiltonian(static,dynamic_cpx,basis=basis,dtype=np.complex128,static_fmt=fmt,storage_dtype=np.complex64,
+		check_symm=False,check_herm=False,check_pcon=False,fused=fused)
+
+	V = (np.random.uniform(-1,1,size=(basis.Ns,2)) + 1j*np.random.uniform(-1,1,size=(basis.Ns,2))).astype(np.complex128)
+	for time in [0.3,0.7]:
+		out = H_mp.dot(V,time=time)
+		np.testing.assert_allclose(out,H.dot(V,time=time),atol=1e-5)
+		np.testing.assert_allclose(out,H.tocsr(time=time).dot(V),atol=1e-5)
+
+H = hamiltonian(static,[],basis=basis,dtype=np.float64,storage_dtype=np.float64,check_symm=False,check_pcon=False)
+assert(H.storage_dtype == "float64")
+
+
+# quantum_operator
+input_dict = dict(J=static[:3],h=[["z",h_list]])
+for dtype,storage_dtype in dtype_pairs:
+	O = quantum_operator(input_dict,basis=basis,dtype=dtype,check_symm=False,check_pcon=False)
+	O_mp = quantum_operator(input_dict,basis=basis,dtype=dtype,storage_dtype=storage_dtype,check_symm=False,check_pcon=False)
+	assert(O_mp.storage_dtype == np.dtype(storage_dtype).name)
+	assert(all(op.dtype == storage_dtype for op in O_mp._quantum_operator.values()))
+
+	pars_list = [dict(J=0.3,h=1.1)]
+	if np.dtype(dtype).kind == "c":
+		pars_list.append(dict(J=0.3-0.4j,h=1.1j))
+
+	for pars in pars_list:
+		V = np.random.uniform(-1,1,size=(basis.Ns,3)).astype(dtype)
+		out = O_mp.dot(V,pars=pars)
+		assert(out.dtype == dtype)
+		np.testing.assert_allclose(out,O.dot(V,pars=pars),atol=1e-5)
+		np.testing.assert_allclose(out,O.tohamiltonian(pars=pars).tocsr().dot(V),atol=1e-5)
+
+	H_mp = O_mp.tohamiltonian(pars=pars)
+	assert(H_mp.storage_dtype == np.dtype(storage_dtype).name)
+	assert(O_mp.T.storage_dtype == np.dtype(storage_dtype).name)
+	assert(O_mp.copy().storage_dtype == np.dtype(storage_dtype).name)
+
+print("hamiltonian mixed precision test passed!")
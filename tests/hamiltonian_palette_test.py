@@ -0,0 +1,134 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_general
+from quspin.operators import hamiltonian,quantum_operator
+from quspin.operators._make_hamiltonian import _palette_csr_matrix
+from scipy.sparse import random
+from itertools import product
+import numpy as np
+
+
+
+dtypes = [np.float32,np.float64,np.complex64,np.complex128]
+
+def eps(dtype):
+	return 1000*np.finfo(dtype).eps
+
+
+def drive(t,Omega):
+	return np.cos(Omega*t)
+
+drive_args = [2.0]
+
+L = 8
+i = np.arange(L)
+t = (i+1)%L
+J_list = [[1.0,i,(i+1)%L] for i in range(L)]
+h_list = [[0.3,i] for i in range(L)]
+
+static = [["+-",J_list],["-+",J_list],["zz",J_list],["x",h_list]]
+dynamic = [["z",h_list,drive,drive_args]]
+
+bases = [spin_basis_general(L),spin_basis_general(L,kblock=(t,0))]
+
+for basis,dtype in product(bases,dtypes):
+	H = hamiltonian(static,dynamic,basis=basis,dtype=dtype,check_symm=False,check_pcon=False)
+	H_pal = hamiltonian(static,dynamic,basis=basis,dtype=dtype,static_fmt="palette",check_symm=False,check_pcon=False)
+
+	atol = eps(dtype)
+
+	assert(H_pal.static.format == "palette")
+	np.testing.assert_allclose(H_pal.toarray(time=0.5),H.toarray(time=0.5),atol=atol)
+	np.testing.assert_allclose((H_pal.tocsr(time=0.5)-H.tocsr(time=0.5)).toarray(),0,atol=atol)
+	np.testing.assert_allclose(H_pal.diagonal(time=0.5),H.diagonal(time=0.5),atol=atol)
+
+	for time in [0.0,0.7]:
+		v = np.random.uniform(-1,1,size=(basis.Ns,)) + 1j*np.random.uniform(-1,1,size=(basis.Ns,))
+		v /= np.linalg.norm(v)
+
+		np.testing.assert_allclose(H_pal.dot(v,time=time),H.dot(v,time=time),atol=atol)
+		np.testing.assert_allclose(H_pal.T.dot(v,time=time),H.T.dot(v,time=time),atol=atol)
+		np.testing.assert_allclose(H_pal.H.dot(v,time=time),H.H.dot(v,time=time),atol=atol)
+		np.testing.assert_allclose((1j*H_pal).dot(v,time=time),(1j*H).dot(v,time=time),atol=atol)
+		np.testing.assert_allclose((H_pal+H_pal).dot(v,time=time),(H+H).dot(v,time=time),atol=atol)
+		np.testing.assert_allclose((H_pal-H).dot(v,time=time),0,atol=atol)
+
+		for order in ["C","F"]:
+			V = np.random.uniform(-1,1,size=(basis.Ns,3))
+			V = np.asarray(V,order=order)
+			np.testing.assert_allclose(H_pal.dot(V,time=time),H.dot(V,time=time),atol=atol)
+
+			out = np.ones_like(V,dtype=np.result_type(V.dtype,dtype))
+			H_pal.dot(V,time=time,out=out,overwrite_out=False)
+			np.testing.assert_allclose(1+H.dot(V,time=time),out,atol=atol)
+
+	assert((H_pal+H_pal).static.format == "palette")
+	assert((2.0*H_pal).static.format == "palette")
+	assert(H_pal.T.static.format == "palette")
+	assert(H_pal.astype(np.complex128).static.format == "palette")
+
+	if dtype in [np.float64,np.complex128]:
+		E = H.eigsh(time=0.0,k=2,which="SA",return_eigenvectors=False)
+		E_pal = H_pal.eigsh(time=0.0,k=2,which="SA",return_eigenvectors=False)
+		np.testing.assert_allclose(np.sort(E),np.sort(E_pal),atol=1e-10)
+
+	H_pal.update_matrix_formats(static_fmt="csr",dynamic_fmt=None)
+	assert(H_pal.static.format == "csr")
+	np.testing.assert_allclose(H_pal.toarray(),H.toarray(),atol=atol)
+
+
+# random couplings: uint8 and uint16 codes, too many distinct values.
+N = 1003
+for dtype,n_values in product(dtypes,[1,7,256,257,5000]):
+	A = random(N,N,density=0.01,format="csr")
+	A.data = np.random.randint(n_values,size=A.nnz) + 1.0
+	A[:5,:] = np.random.randint(n_values,size=(5,N)) + 1.0
+	A = A.astype(dtype) if np.dtype(dtype).kind == "c" else A.real.astype(dtype)
+	atol = eps(dtype)*np.sqrt(N)
+
+	H = hamiltonian([A],[],dtype=dtype)
+	H_pal = hamiltonian([_palette_csr_matrix(A)],[],dtype=dtype)
+	assert(H_pal.static.format == "palette")
+	assert(H_pal.static.codes.dtype == (np.uint8 if len(np.unique(A.data)) <= 256 else np.uint16))
+
+	np.testing.assert_allclose(H_pal.static.toarray(),A.toarray(),atol=0)
+	for ndim,order in [(1,"C"),(2,"C"),(2,"F")]:
+		V = np.random.uniform(-1,1,size=(N,7)[:ndim]).astype(dtype)
+		V = np.asarray(V,order=order)
+		np.testing.assert_allclose(H_pal.dot(V),H.dot(V),atol=atol)
+
+A = random(N,N,density=0.1,format="csr")
+try:
+	_palette_csr_matrix(A)
+except ValueError:
+	pass
+else:
+	raise AssertionError("expecting ValueError for too many distinct values.")
+
+B = _palette_csr_matrix(A.sign())
+C = B + _palette_csr_matrix(A.sign()*(1+1e-6*np.random.uniform(size=A.nnz)))
+assert(C.format == "csr")
+
+
+# quantum_operator
+basis = spin_basis_general(L)
+input_dict = dict(J=static[:3],h=[["x",h_list]])
+for dtype in dtypes:
+	O = quantum_operator(input_dict,basis=basis,dtype=dtype,check_symm=False,check_pcon=False)
+	O_pal = quantum_operator(input_dict,basis=basis,dtype=dtype,matrix_formats=dict(J="palette"),check_symm=False,check_pcon=False)
+	assert(O_pal._quantum_operator["J"].format == "palette")
+
+	pars = dict(J=0.3,h=1.1)
+	V = np.random.uniform(-1,1,size=(basis.Ns,3)).astype(dtype)
+	np.testing.assert_allclose(O_pal.dot(V,pars=pars),O.dot(V,pars=pars),atol=eps(dtype))
+	np.testing.assert_allclose(O_pal.toarray(pars=pars),O.toarray(pars=pars),atol=eps(dtype))
+	np.testing.assert_allclose(O_pal.T.tocsr(pars=pars).toarray(),O.T.tocsr(pars=pars).toarray(),atol=eps(dtype))
+
+	O_pal.update_matrix_formats(dict(J="csr"))
+	assert(O_pal._quantum_operator["J"].format == "csr")
+
+print("hamiltonian palette test passed!")
@@ -0,0 +1,172 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_general
+from quspin.operators import hamiltonian,quantum_operator
+from quspin.operators._make_hamiltonian import _reordered_csr_matrix
+from scipy.sparse import diags,random
+from itertools import product
+import numpy as np
+
+
+
+dtypes = [np.float32,np.float64,np.complex64,np.complex128]
+
+def eps(dtype):
+	return 1000*np.finfo(dtype).eps
+
+
+def drive(t,Omega):
+	return np.cos(Omega*t)
+
+drive_args = [2.0]
+
+L = 10
+i = np.arange(L)
+t = (i+1)%L
+J_list = [[1.0,i,(i+1)%L] for i in range(L)]
+h_list = [[0.3,i] for i in range(L)]
+
+static = [["+-",J_list],["-+",J_list],["zz",J_list],["x",h_list]]
+dynamic = [["z",h_list,drive,drive_args]]
+
+bases = [spin_basis_general(L,Nup=L//2),spin_basis_general(L,kblock=(t,0))]
+
+for basis,dtype in product(bases,dtypes):
+	H = hamiltonian(static,dynamic,basis=basis,dtype=dtype,check_symm=False,check_pcon=False)
+	H_rcm = hamiltonian(static,dynamic,basis=basis,dtype=dtype,static_fmt="rcm",check_symm=False,check_pcon=False)
+
+	atol = eps(dtype)
+
+	assert(H_rcm.static.format == "rcm")
+	np.testing.assert_allclose(H_rcm.toarray(time=0.5),H.toarray(time=0.5),atol=atol)
+	np.testing.assert_allclose(H_rcm.diagonal(time=0.5),H.diagonal(time=0.5),atol=atol)
+
+	for time in [0.0,0.7]:
+		v = np.random.uniform(-1,1,size=(basis.Ns,)) + 1j*np.random.uniform(-1,1,size=(basis.Ns,))
+		v /= np.linalg.norm(v)
+
+		np.testing.assert_allclose(H_rcm.dot(v,time=time),H.dot(v,time=time),atol=atol)
+		np.testing.assert_allclose(H_rcm.T.dot(v,time=time),H.T.dot(v,time=time),atol=atol)
+		np.testing.assert_allclose(H_rcm.H.dot(v,time=time),H.H.dot(v,time=time),atol=atol)
+		np.testing.assert_allclose((1j*H_rcm).dot(v,time=time),(1j*H).dot(v,time=time),atol=atol)
+		np.testing.assert_allclose((H_rcm+H_rcm).dot(v,time=time),(H+H).dot(v,time=time),atol=atol)
+		np.testing.assert_allclose((H_rcm-H).dot(v,time=time),0,atol=atol)
+		np.testing.assert_allclose(H_rcm.expt_value(v,time=time),H.expt_value(v,time=time),atol=atol)
+
+		for order in ["C","F"]:
+			V = np.random.uniform(-1,1,size=(basis.Ns,3))
+			V = np.asarray(V,order=order)
+			np.testing.assert_allclose(H_rcm.dot(V,time=time),H.dot(V,time=time),atol=atol)
+
+			out = np.ones_like(V,dtype=np.result_type(V.dtype,dtype))
+			H_rcm.dot(V,time=time,out=out,overwrite_out=False)
+			np.testing.assert_allclose(1+H.dot(V,time=time),out,atol=atol)
+
+	assert((H_rcm+H_rcm).static.format == "rcm")
+	assert((2.0*H_rcm).static.format == "rcm")
+	assert(H_rcm.T.static.format == "rcm")
+	assert(H_rcm.astype(np.complex128).static.format == "rcm")
+
+	if dtype in [np.float64,np.complex128]:
+		E = H.eigsh(time=0.0,k=2,which="SA",return_eigenvectors=False)
+		E_rcm = H_rcm.eigsh(time=0.0,k=2,which="SA",return_eigenvectors=False)
+		np.testing.assert_allclose(np.sort(E),np.sort(E_rcm),atol=1e-10)
+
+		v0 = np.random.uniform(-1,1,size=(basis.Ns,)) + 1j*np.random.uniform(-1,1,size=(basis.Ns,))
+		v0 /= np.linalg.norm(v0)
+		times = np.linspace(0,1,5)
+		v_t = H.evolve(v0,0.0,times,atol=1e-12,rtol=1e-12)
+		v_t_rcm = H_rcm.evolve(v0,0.0,times,atol=1e-12,rtol=1e-12)
+		np.testing.assert_allclose(v_t_rcm,v_t,atol=1e-8)
+
+		# evolve and eigsh work in the order of the reordered matrix and return states in the order of the basis.
+		for v,v_rcm in zip(H.evolve(v0,0.0,times,iterate=True,atol=1e-12,rtol=1e-12),H_rcm.evolve(v0,0.0,times,iterate=True,atol=1e-12,rtol=1e-12)):
+			np.testing.assert_allclose(v_rcm,v,atol=1e-8)
+
+		V0 = np.random.uniform(-1,1,size=(basis.Ns,2))
+		np.testing.assert_allclose(H_rcm.evolve(V0,0.0,times,imag_time=True),H.evolve(V0,0.0,times,imag_time=True),atol=1e-6)
+
+		rho0 = np.outer(v0,v0.conj())
+		rho_t = H.evolve(rho0,0.0,times[:2],eom="LvNE",atol=1e-12,rtol=1e-12)
+		rho_t_rcm = H_rcm.evolve(rho0,0.0,times[:2],eom="LvNE",atol=1e-12,rtol=1e-12)
+		np.testing.assert_allclose(rho_t_rcm,rho_t,atol=1e-8)
+
+		E,V = H.eigsh(time=0.0,k=1,which="SA")
+		E_rcm,V_rcm = H_rcm.eigsh(time=0.0,k=1,which="SA",v0=(v0 if np.dtype(dtype).kind == "c" else v0.real))
+		np.testing.assert_allclose(E_rcm,E,atol=1e-10)
+		np.testing.assert_allclose(H_rcm.dot(V_rcm[:,0]),E_rcm[0]*V_rcm[:,0],atol=1e-8)
+
+	H_rcm.update_matrix_formats(static_fmt="csr",dynamic_fmt=None)
+	assert(H_rcm.static.format == "csr")
+	np.testing.assert_allclose(H_rcm.toarray(),H.toarray(),atol=atol)
+
+
+# a banded matrix with randomly permuted rows and columns is brought back to a small bandwidth.
+N = 1000
+A = diags([np.random.uniform(-1,1,size=N-abs(k)) for k in range(-3,4)],list(range(-3,4)),format="csr")
+p = np.random.permutation(N)
+A_perm = A[p,:][:,p].tocsr()
+B = _reordered_csr_matrix(A_perm)
+assert(B.bandwidth <= 4*3)
+np.testing.assert_allclose(B.toarray(),A_perm.toarray(),atol=0)
+
+# the iterative methods act with the banded matrix.
+H = hamiltonian([A_perm],[],dtype=np.float64)
+H_rcm = hamiltonian([B],[],dtype=np.float64)
+perm,H_perm = H_rcm._reordered_parts()
+np.testing.assert_array_equal(perm,B.perm)
+assert(H_perm.static.format == "csr")
+assert(_reordered_csr_matrix(H_perm.static,perm=np.arange(N)).bandwidth == B.bandwidth)
+v0 = np.random.uniform(-1,1,size=N)
+v0 /= np.linalg.norm(v0)
+np.testing.assert_allclose(H_rcm.evolve(v0,0.0,[0.5],atol=1e-12,rtol=1e-12),H.evolve(v0,0.0,[0.5],atol=1e-12,rtol=1e-12),atol=1e-8)
+np.testing.assert_allclose(H_rcm.eigsh(k=2,which="LA",return_eigenvectors=False),H.eigsh(k=2,which="LA",return_eigenvectors=False),atol=1e-10)
+
+for dtype in dtypes:
+	A = random(N,N,density=0.005,format="csr")
+	A = (A + A.T + diags(np.ones(N))).astype(dtype)
+	A_rcm = _reordered_csr_matrix(A)
+	H = hamiltonian([A],[],dtype=dtype)
+	H_rcm = hamiltonian([A_rcm],[],dtype=dtype)
+	atol = eps(dtype)*np.sqrt(N)
+
+	assert(H_rcm.static.format == "rcm")
+	for ndim,order in [(1,"C"),(2,"C"),(2,"F")]:
+		V = np.random.uniform(-1,1,size=(N,7)[:ndim]).astype(dtype)
+		V = np.asarray(V,order=order)
+		np.testing.assert_allclose(H_rcm.dot(V),H.dot(V),atol=atol)
+
+	# user supplied permutation.
+	A_p = _reordered_csr_matrix(A,perm=p)
+	np.testing.assert_array_equal(A_p.perm,p)
+	np.testing.assert_allclose(A_p.dot(V),A.dot(V),atol=atol)
+
+try:
+	_reordered_csr_matrix(A,perm=np.zeros(N,dtype=int))
+except ValueError:
+	pass
+else:
+	raise AssertionError("expecting ValueError for invalid permutation.")
+
+
+# quantum_operator
+basis = spin_basis_general(L,Nup=L//2)
+input_dict = dict(J=static[:3],h=[["z",h_list]])
+for dtype in dtypes:
+	O = quantum_operator(input_dict,basis=basis,dtype=dtype,check_symm=False,check_pcon=False)
+	O_rcm = quantum_operator(input_dict,basis=basis,dtype=dtype,matrix_formats=dict(J="rcm"),check_symm=False,check_pcon=False)
+	assert(O_rcm._quantum_operator["J"].format == "rcm")
+
+	pars = dict(J=0.3,h=1.1)
+	V = np.random.uniform(-1,1,size=(basis.Ns,3)).astype(dtype)
+	np.testing.assert_allclose(O_rcm.dot(V,pars=pars),O.dot(V,pars=pars),atol=eps(dtype))
+	np.testing.assert_allclose(O_rcm.toarray(pars=pars),O.toarray(pars=pars),atol=eps(dtype))
+
+	O_rcm.update_matrix_formats(dict(J="csr"))
+	assert(O_rcm._quantum_operator["J"].format == "csr")
+
+print("hamiltonian rcm test passed!")
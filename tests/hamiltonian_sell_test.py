@@ -0,0 +1,120 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_general
+from quspin.operators import hamiltonian,quantum_operator
+from quspin.operators._make_hamiltonian import _sell_matrix
+from scipy.sparse import random
+from itertools import product
+import numpy as np
+
+
+
+dtypes = [np.float32,np.float64,np.complex64,np.complex128]
+
+def eps(dtype):
+	return 1000*np.finfo(dtype).eps
+
+
+def drive(t,Omega):
+	return np.cos(Omega*t)
+
+drive_args = [2.0]
+
+L = 8
+i = np.arange(L)
+t = (i+1)%L
+J_list = [[1.0,i,(i+1)%L] for i in range(L)]
+h_list = [[0.3,i] for i in range(L)]
+
+static = [["+-",J_list],["-+",J_list],["zz",J_list],["x",h_list]]
+dynamic = [["z",h_list,drive,drive_args]]
+
+bases = [spin_basis_general(L),spin_basis_general(L,kblock=(t,0))]
+
+for basis,dtype in product(bases,dtypes):
+	H = hamiltonian(static,dynamic,basis=basis,dtype=dtype,check_symm=False,check_pcon=False)
+	H_sell = hamiltonian(static,dynamic,basis=basis,dtype=dtype,static_fmt="sell",check_symm=False,check_pcon=False)
+
+	atol = eps(dtype)
+
+	assert(H_sell.static.format == "sell")
+	np.testing.assert_allclose(H_sell.toarray(time=0.5),H.toarray(time=0.5),atol=atol)
+	np.testing.assert_allclose((H_sell.tocsr(time=0.5)-H.tocsr(time=0.5)).toarray(),0,atol=atol)
+	np.testing.assert_allclose(H_sell.diagonal(time=0.5),H.diagonal(time=0.5),atol=atol)
+
+	for time in [0.0,0.7]:
+		v = np.random.uniform(-1,1,size=(basis.Ns,)) + 1j*np.random.uniform(-1,1,size=(basis.Ns,))
+		v /= np.linalg.norm(v)
+
+		np.testing.assert_allclose(H_sell.dot(v,time=time),H.dot(v,time=time),atol=atol)
+		np.testing.assert_allclose(H_sell.T.dot(v,time=time),H.T.dot(v,time=time),atol=atol)
+		np.testing.assert_allclose(H_sell.H.dot(v,time=time),H.H.dot(v,time=time),atol=atol)
+		np.testing.assert_allclose((1j*H_sell).dot(v,time=time),(1j*H).dot(v,time=time),atol=atol)
+		np.testing.assert_allclose((H_sell+H_sell).dot(v,time=time),(H+H).dot(v,time=time),atol=atol)
+		np.testing.assert_allclose((H_sell-H).dot(v,time=time),0,atol=atol)
+
+		for order in ["C","F"]:
+			V = np.random.uniform(-1,1,size=(basis.Ns,3))
+			V = np.asarray(V,order=order)
+			np.testing.assert_allclose(H_sell.dot(V,time=time),H.dot(V,time=time),atol=atol)
+
+			out = np.ones_like(V,dtype=np.result_type(V.dtype,dtype))
+			H_sell.dot(V,time=time,out=out,overwrite_out=False)
+			np.testing.assert_allclose(1+H.dot(V,time=time),out,atol=atol)
+
+	assert((H_sell+H_sell).static.format == "sell")
+	assert((2.0*H_sell).static.format == "sell")
+	assert(H_sell.T.static.format == "sell")
+	assert(H_sell.astype(np.complex128).static.format == "sell")
+
+	if dtype in [np.float64,np.complex128]:
+		E = H.eigsh(time=0.0,k=2,which="SA",return_eigenvectors=False)
+		E_sell = H_sell.eigsh(time=0.0,k=2,which="SA",return_eigenvectors=False)
+		np.testing.assert_allclose(np.sort(E),np.sort(E_sell),atol=1e-10)
+
+	H_sell.update_matrix_formats(static_fmt="csr",dynamic_fmt=None)
+	assert(H_sell.static.format == "csr")
+	np.testing.assert_allclose(H_sell.toarray(),H.toarray(),atol=atol)
+
+
+# uneven row lengths, number of rows not a multiple of the slice height.
+N = 1003
+for dtype,(C,sigma) in product(dtypes,[(1,1),(4,32),(8,256),(16,N)]):
+	A = random(N,N,density=0.01,format="csr") + 1j*random(N,N,density=0.01,format="csr")
+	A[:5,:] = np.random.uniform(-1,1,size=(5,N))
+	A = A.astype(dtype) if np.dtype(dtype).kind == "c" else A.real.astype(dtype)
+	atol = eps(dtype)*np.sqrt(N)
+
+	H = hamiltonian([A],[],dtype=dtype)
+	H_sell = hamiltonian([_sell_matrix(A,C=C,sigma=sigma)],[],dtype=dtype)
+	assert(H_sell.static.format == "sell" and H_sell.static.C == C)
+
+	np.testing.assert_allclose(H_sell.static.toarray(),A.toarray(),atol=0)
+	for ndim,order in [(1,"C"),(2,"C"),(2,"F")]:
+		V = np.random.uniform(-1,1,size=(N,7)[:ndim]).astype(dtype)
+		V = np.asarray(V,order=order)
+		np.testing.assert_allclose(H_sell.dot(V),H.dot(V),atol=atol)
+
+
+# quantum_operator
+basis = spin_basis_general(L)
+input_dict = dict(J=static[:3],h=[["x",h_list]])
+for dtype in dtypes:
+	O = quantum_operator(input_dict,basis=basis,dtype=dtype,check_symm=False,check_pcon=False)
+	O_sell = quantum_operator(input_dict,basis=basis,dtype=dtype,matrix_formats=dict(J="sell"),check_symm=False,check_pcon=False)
+	assert(O_sell._quantum_operator["J"].format == "sell")
+
+	pars = dict(J=0.3,h=1.1)
+	V = np.random.uniform(-1,1,size=(basis.Ns,3)).astype(dtype)
+	np.testing.assert_allclose(O_sell.dot(V,pars=pars),O.dot(V,pars=pars),atol=eps(dtype))
+	np.testing.assert_allclose(O_sell.toarray(pars=pars),O.toarray(pars=pars),atol=eps(dtype))
+	np.testing.assert_allclose(O_sell.T.tocsr(pars=pars).toarray(),O.T.tocsr(pars=pars).toarray(),atol=eps(dtype))
+
+	O_sell.update_matrix_formats(dict(J="csr"))
+	assert(O_sell._quantum_operator["J"].format == "csr")
+
+print("hamiltonian sell test passed!")
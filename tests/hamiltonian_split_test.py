@@ -0,0 +1,145 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_general
+from quspin.operators import hamiltonian,quantum_operator
+from quspin.operators._make_hamiltonian import _split_diag_matrix
+from scipy.sparse import random,identity
+from itertools import product
+import numpy as np
+
+
+
+dtypes = [np.float32,np.float64,np.complex64,np.complex128]
+
+def eps(dtype):
+	return 1000*np.finfo(dtype).eps
+
+
+def drive(t,Omega):
+	return np.cos(Omega*t)
+
+drive_args = [2.0]
+
+L = 8
+i = np.arange(L)
+t = (i+1)%L
+J_list = [[1.0,i,(i+1)%L] for i in range(L)]
+h_list = [[0.3,i] for i in range(L)]
+
+static = [["+-",J_list],["-+",J_list],["zz",J_list],["z",h_list]]
+dynamic = [["x",h_list,drive,drive_args]]
+
+bases = [spin_basis_general(L),spin_basis_general(L,kblock=(t,0))]
+
+for basis,dtype in product(bases,dtypes):
+	H = hamiltonian(static,dynamic,basis=basis,dtype=dtype,check_symm=False,check_pcon=False)
+	H_split = hamiltonian(static,dynamic,basis=basis,dtype=dtype,static_fmt="split",check_symm=False,check_pcon=False)
+
+	atol = eps(dtype)
+
+	assert(H_split.static.format == "split")
+	assert(np.all(H_split.static.offdiag.diagonal() == 0))
+	np.testing.assert_allclose(H_split.toarray(time=0.5),H.toarray(time=0.5),atol=atol)
+	np.testing.assert_allclose((H_split.tocsr(time=0.5)-H.tocsr(time=0.5)).toarray(),0,atol=atol)
+	np.testing.assert_allclose(H_split.diagonal(time=0.5),H.diagonal(time=0.5),atol=atol)
+	np.testing.assert_allclose(H_split.trace(time=0.5),H.trace(time=0.5),atol=atol*basis.Ns)
+
+	for time in [0.0,0.7]:
+		v = np.random.uniform(-1,1,size=(basis.Ns,)) + 1j*np.random.uniform(-1,1,size=(basis.Ns,))
+		v /= np.linalg.norm(v)
+
+		np.testing.assert_allclose(H_split.dot(v,time=time),H.dot(v,time=time),atol=atol)
+		np.testing.assert_allclose(H_split.T.dot(v,time=time),H.T.dot(v,time=time),atol=atol)
+		np.testing.assert_allclose(H_split.H.dot(v,time=time),H.H.dot(v,time=time),atol=atol)
+		np.testing.assert_allclose((1j*H_split).dot(v,time=time),(1j*H).dot(v,time=time),atol=atol)
+		np.testing.assert_allclose((H_split+H_split).dot(v,time=time),(H+H).dot(v,time=time),atol=atol)
+		np.testing.assert_allclose((H_split-H).dot(v,time=time),0,atol=atol)
+
+		for order in ["C","F"]:
+			V = np.random.uniform(-1,1,size=(basis.Ns,3))
+			V = np.asarray(V,order=order)
+			np.testing.assert_allclose(H_split.dot(V,time=time),H.dot(V,time=time),atol=atol)
+
+			out = np.ones_like(V,dtype=np.result_type(V.dtype,dtype))
+			H_split.dot(V,time=time,out=out,overwrite_out=False)
+			np.testing.assert_allclose(1+H.dot(V,time=time),out,atol=atol)
+
+	# shifts by the identity only change the dense diagonal.
+	I = identity(basis.Ns,dtype=dtype)
+	H_shift = H_split + 2.5*I
+	assert(H_shift.static.format == "split")
+	assert(H_shift.static.offdiag.nnz == H_split.static.offdiag.nnz)
+	np.testing.assert_allclose(H_shift.toarray(time=0.5),(H + 2.5*I).toarray(time=0.5),atol=atol)
+
+	assert((H_split+H_split).static.format == "split")
+	assert((2.0*H_split).static.format == "split")
+	assert(H_split.T.static.format == "split")
+	assert(H_split.astype(np.complex128).static.format == "split")
+
+	if dtype in [np.float64,np.complex128]:
+		E = H.eigsh(time=0.0,k=2,which="SA",return_eigenvectors=False)
+		E_split = H_split.eigsh(time=0.0,k=2,which="SA",return_eigenvectors=False)
+		np.testing.assert_allclose(np.sort(E),np.sort(E_split),atol=1e-10)
+
+		v0 = np.random.uniform(-1,1,size=(basis.Ns,))
+		v0 /= np.linalg.norm(v0)
+		times = np.linspace(0,1,5)
+		v_t = H.evolve(v0,0.0,times,imag_time=True,atol=1e-12,rtol=1e-12)
+		v_t_split = H_split.evolve(v0,0.0,times,imag_time=True,atol=1e-12,rtol=1e-12)
+		np.testing.assert_allclose(v_t_split,v_t,atol=1e-8)
+
+	H_split.update_matrix_formats(static_fmt="csr",dynamic_fmt=None)
+	assert(H_split.static.format == "csr")
+	np.testing.assert_allclose(H_split.toarray(),H.toarray(),atol=atol)
+
+
+# random matrices with and without diagonal entries.
+N = 1003
+for dtype,density in product(dtypes,[0.0,0.01,0.1]):
+	A = random(N,N,density=density,format="csr") + random(N,N,density=density,format="csr")*1j
+	A.setdiag(np.random.uniform(-1,1,size=N))
+	A = A.astype(dtype) if np.dtype(dtype).kind == "c" else A.real.astype(dtype)
+	atol = eps(dtype)*np.sqrt(N)
+
+	H = hamiltonian([A],[],dtype=dtype)
+	H_split = hamiltonian([_split_diag_matrix(A)],[],dtype=dtype)
+	assert(H_split.static.format == "split")
+
+	np.testing.assert_allclose(H_split.static.toarray(),A.toarray(),atol=0)
+	np.testing.assert_allclose(H_split.static.diag,A.diagonal(),atol=0)
+	for ndim,order in [(1,"C"),(2,"C"),(2,"F")]:
+		V = np.random.uniform(-1,1,size=(N,7)[:ndim]).astype(dtype)
+		V = np.asarray(V,order=order)
+		np.testing.assert_allclose(H_split.dot(V),H.dot(V),atol=atol)
+
+try:
+	_split_diag_matrix(random(N,N+1,density=0.01))
+except ValueError:
+	pass
+else:
+	raise AssertionError("expecting ValueError for non-square matrix.")
+
+
+# quantum_operator
+basis = spin_basis_general(L)
+input_dict = dict(J=static[:3],h=[["z",h_list]])
+for dtype in dtypes:
+	O = quantum_operator(input_dict,basis=basis,dtype=dtype,check_symm=False,check_pcon=False)
+	O_split = quantum_operator(input_dict,basis=basis,dtype=dtype,matrix_formats=dict(J="split",h="split"),check_symm=False,check_pcon=False)
+	assert(O_split._quantum_operator["J"].format == "split")
+	assert(O_split._quantum_operator["h"].offdiag.nnz == 0)
+
+	pars = dict(J=0.3,h=1.1)
+	V = np.random.uniform(-1,1,size=(basis.Ns,3)).astype(dtype)
+	np.testing.assert_allclose(O_split.dot(V,pars=pars),O.dot(V,pars=pars),atol=eps(dtype))
+	np.testing.assert_allclose(O_split.toarray(pars=pars),O.toarray(pars=pars),atol=eps(dtype))
+	np.testing.assert_allclose(O_split.T.tocsr(pars=pars).toarray(),O.T.tocsr(pars=pars).toarray(),atol=eps(dtype))
+
+	O_split.update_matrix_formats(dict(J="csr"))
+	assert(O_split._quantum_operator["J"].format == "csr")
+
+print("hamiltonian split test passed!")
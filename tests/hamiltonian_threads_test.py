@@ -0,0 +1,101 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_general
+from quspin.operators import hamiltonian,quantum_operator
+from multiprocessing.pool import ThreadPool
+import numpy as np
+
+
+
+def drive(t,Omega):
+	return np.cos(Omega*t)
+
+drive_args = [2.0]
+
+L = 12
+i = np.arange(L)
+J_list = [[1.0,i,(i+1)%L] for i in range(L)]
+h_list = [[0.3,i] for i in range(L)]
+
+static = [["+-",J_list],["-+",J_list],["zz",J_list],["x",h_list]]
+dynamic = [["z",h_list,drive,drive_args]]
+
+basis = spin_basis_general(L,Nup=L//2)
+
+n_tasks = 32
+static_fmts = ["csr","herm","sell","palette","split","rcm"]
+
+for dtype in [np.float64,np.complex128]:
+	result_dtype = np.result_type(dtype,np.complex128)
+	ops = [hamiltonian(static,dynamic,basis=basis,dtype=dtype,static_fmt=fmt,check_symm=False,check_pcon=False) for fmt in static_fmts]
+
+	V = np.random.uniform(-1,1,size=(basis.Ns,n_tasks)) + 1j*np.random.uniform(-1,1,size=(basis.Ns,n_tasks))
+	V = np.asarray(V,dtype=result_dtype,order="F")
+	times = np.random.uniform(0,1,size=n_tasks)
+
+	expected = np.stack([ops[j%len(ops)].dot(V[:,j],time=times[j]) for j in range(n_tasks)],axis=1)
+
+	out = np.zeros_like(V)
+	def task(j):
+		ops[j%len(ops)].dot(V[:,j],time=times[j],out=out[:,j])
+
+	pool = ThreadPool(4)
+	pool.map(task,range(n_tasks))
+	np.testing.assert_allclose(out,expected,atol=1e-12)
+
+	# same operator applied concurrently.
+	out[...] = 0
+	def task(j):
+		ops[0].dot(V[:,j],time=times[j],out=out[:,j])
+
+	pool.map(task,range(n_tasks))
+	np.testing.assert_allclose(out,np.stack([ops[0].dot(V[:,j],time=times[j]) for j in range(n_tasks)],axis=1),atol=1e-12)
+
+	# time evolution from several threads.
+	v0 = V[:,0]/np.linalg.norm(V[:,0])
+	ts = np.linspace(0,1,5)
+	expected = [H.evolve(v0,0.0,ts,atol=1e-12,rtol=1e-12) for H in ops]
+	results = pool.map(lambda H:H.evolve(v0,0.0,ts,atol=1e-12,rtol=1e-12),ops)
+	for v_t,v_t_expected in zip(results,expected):
+		np.testing.assert_allclose(v_t,v_t_expected,atol=1e-10)
+
+	pool.close()
+	pool.join()
+
+	# quantum_operator
+	O = quantum_operator(dict(J=static[:3],h=[["z",h_list]]),basis=basis,dtype=dtype,check_symm=False,check_pcon=False)
+	pars_list = [dict(J=np.random.uniform(),h=np.random.uniform()) for j in range(n_tasks)]
+	expected = np.stack([O.dot(V[:,j],pars=pars_list[j]) for j in range(n_tasks)],axis=1)
+
+	out = np.zeros_like(V)
+	def task(j):
+		O.dot(V[:,j],pars=pars_list[j],out=out[:,j])
+
+	pool = ThreadPool(4)
+	pool.map(task,range(n_tasks))
+	pool.close()
+	pool.join()
+	np.testing.assert_allclose(out,expected,atol=1e-12)
+
+	# out overlapping with V.
+	for H in ops:
+		v = np.array(V[:,0])
+		expected = H.dot(v,time=0.3)
+		H.dot(v,time=0.3,out=v)
+		np.testing.assert_allclose(v,expected,atol=1e-12)
+
+		v = np.array(V[:,0])
+		expected = v + H.dot(v,time=0.3)
+		H.dot(v,time=0.3,out=v,overwrite_out=False)
+		np.testing.assert_allclose(v,expected,atol=1e-12)
+
+		W = np.array(V[:,:2])
+		expected = H.dot(W[:,0],time=0.3)
+		H.dot(W[:,0],time=0.3,out=W[:,1])
+		np.testing.assert_allclose(W[:,1],expected,atol=1e-12)
+
+print("hamiltonian threads test passed!")
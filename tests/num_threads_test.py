@@ -0,0 +1,89 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_general
+from quspin.operators import hamiltonian,quantum_operator
+from quspin.tools.evolution import expm_multiply_parallel
+from quspin.tools.misc import num_threads,get_num_threads,set_num_threads
+from multiprocessing.pool import ThreadPool
+import numpy as np
+
+
+
+n_max = get_num_threads()
+openmp = n_max > 1 # QuSpin build with openmp on a multi-core machine.
+
+with num_threads(1):
+	assert(get_num_threads() == 1)
+	with num_threads(None):
+		assert(get_num_threads() == 1)
+
+assert(get_num_threads() == n_max)
+
+try:
+	with num_threads(1):
+		raise RuntimeError
+except RuntimeError:
+	pass
+
+assert(get_num_threads() == n_max)
+
+set_num_threads(1)
+assert(get_num_threads() == 1)
+set_num_threads(n_max)
+assert(get_num_threads() == n_max)
+
+if openmp:
+	# thread count is local to the calling python thread.
+	def task(j):
+		with num_threads(1):
+			return get_num_threads()
+
+	pool = ThreadPool(2)
+	assert(pool.map(task,range(4)) == [1,1,1,1])
+	pool.close()
+	pool.join()
+	assert(get_num_threads() == n_max)
+
+for n in [0,-1,1.5,"2"]:
+	try:
+		num_threads(n)
+	except (ValueError,TypeError):
+		pass
+	else:
+		raise AssertionError("expecting error for n_threads={}".format(n))
+
+
+L = 12
+J_list = [[1.0,i,(i+1)%L] for i in range(L)]
+h_list = [[0.3,i] for i in range(L)]
+static = [["+-",J_list],["-+",J_list],["zz",J_list],["x",h_list]]
+
+basis = spin_basis_general(L,Nup=L//2)
+basis_1 = spin_basis_general(L,Nup=L//2,make_basis=False)
+basis_1.make(n_threads=1)
+np.testing.assert_array_equal(basis_1.states,basis.states)
+
+ME,row,col = basis.Op("+-",[0,1],1.0,np.float64)
+ME_1,row_1,col_1 = basis.Op("+-",[0,1],1.0,np.float64,n_threads=1)
+np.testing.assert_allclose(ME_1,ME,atol=0)
+np.testing.assert_array_equal(row_1,row)
+np.testing.assert_array_equal(col_1,col)
+
+H = hamiltonian(static,[],basis=basis,dtype=np.float64,check_symm=False,check_pcon=False)
+O = quantum_operator(dict(H=static),basis=basis,dtype=np.float64,check_symm=False,check_pcon=False)
+V = np.random.uniform(-1,1,size=(basis.Ns,3))
+
+np.testing.assert_allclose(H.dot(V,n_threads=1),H.dot(V),atol=1e-13)
+np.testing.assert_allclose(O.dot(V,n_threads=1),O.dot(V),atol=1e-13)
+assert(get_num_threads() == n_max)
+
+U = expm_multiply_parallel(H.tocsr(),a=-0.1j)
+v = V[:,0].astype(np.complex128)
+np.testing.assert_allclose(U.dot(v,n_threads=1),U.dot(v),atol=1e-13)
+assert(get_num_threads() == n_max)
+
+print("num_threads test passed!")
@@ -0,0 +1,50 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin._parallel import _numa_zeros,_numa_array,_numa_csr
+from quspin.tools.misc import num_threads
+from scipy.sparse import random
+import numpy as np
+
+
+
+for n_threads in [1,2,3]:
+	with num_threads(n_threads):
+		for dtype in [np.float32,np.float64,np.complex128]:
+			# sizes below and above the first-touch threshold.
+			for shape in [(10,),(1000,3),(300001,),(200001,3),(100001,2,2)]:
+				for order in ["C","F"]:
+					a = _numa_zeros(shape,dtype=dtype,order=order)
+					assert(a.shape == shape and a.dtype == dtype)
+					assert(a.flags[order+"_CONTIGUOUS"])
+					assert(not a.any())
+
+					b = np.asarray(np.random.uniform(-1,1,size=shape),order=order).astype(dtype)
+					c = _numa_array(b,order=order)
+					assert(c.dtype == b.dtype and c.flags[order+"_CONTIGUOUS"])
+					np.testing.assert_array_equal(c,b)
+					assert(not np.shares_memory(b,c))
+
+					c = _numa_array(b,dtype=np.complex128)
+					assert(c.dtype == np.complex128 and c.flags["C_CONTIGUOUS"])
+					np.testing.assert_array_equal(c,b)
+
+			N = 100000
+			A = random(N,N,density=20.0/N,format="csr",dtype=np.float64).astype(dtype)
+			B = _numa_csr(A)
+			assert(B.format == "csr" and B.dtype == A.dtype and B.shape == A.shape)
+			np.testing.assert_array_equal(B.indptr,A.indptr)
+			np.testing.assert_array_equal(B.indices,A.indices)
+			np.testing.assert_array_equal(B.data,A.data)
+
+			v = np.random.uniform(-1,1,size=N).astype(dtype)
+			np.testing.assert_allclose(B.dot(v),A.dot(v),atol=1e-4)
+
+			C = A.tocsc()
+			assert(_numa_csr(C) is C)
+
+
+print("numa allocation test passed!")
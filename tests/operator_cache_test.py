@@ -0,0 +1,80 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_1d,spin_basis_general
+from quspin.operators import hamiltonian,operator_cache
+from quspin.operators.operator_cache_core import _basis_digest,_basis_digests
+import numpy as np
+import tempfile,shutil
+
+
+
+def drive(t,Omega):
+	return np.cos(Omega*t)
+
+L = 6
+i = np.arange(L)
+t = (i+1)%L
+
+Jzz_list = [[1.0,i,(i+1)%L] for i in range(L)]
+Jxy_list = [[0.5,i,(i+1)%L] for i in range(L)]
+h_list = [[0.3,i] for i in range(L)]
+
+static = [["+-",Jxy_list],["-+",Jxy_list],["zz",Jzz_list]]
+dynamic = [["z",h_list,drive,[2.0]]]
+
+def n_entries(cache_dir):
+	return len([name for name in os.listdir(cache_dir) if not name.startswith(".")])
+
+
+cache_dir = tempfile.mkdtemp()
+try:
+	bases = [spin_basis_1d(L,m=0.0,kblock=0),spin_basis_general(L,m=0.0,kblock=(t,0)),spin_basis_general(L,m=0.0)]
+
+	for mmap in [True,False]:
+		shutil.rmtree(cache_dir)
+		n = 0
+		with operator_cache(cache_dir,mmap=mmap) as cache:
+			for b in bases:
+				for dtype in [np.float64,np.complex128]:
+					H0 = hamiltonian(static,dynamic,basis=b,dtype=dtype)
+					n += 2 # one static and one dynamic matrix
+					assert(n_entries(cache.cache_dir) == n)
+
+					H1 = hamiltonian(static,dynamic,basis=b,dtype=dtype)
+					assert(n_entries(cache.cache_dir) == n)
+
+					assert(H1.dtype == np.dtype(dtype))
+					np.testing.assert_allclose((H0-H1).tocsr(time=0.3).toarray(),0,atol=1e-14)
+
+					H1 *= 2.0 # in-place modification must not change the cache.
+
+					H2 = hamiltonian(static,dynamic,basis=b,dtype=dtype)
+					np.testing.assert_allclose((H0-H2).tocsr(time=0.3).toarray(),0,atol=1e-14)
+
+			# different couplings generate new entries
+			H3 = hamiltonian([["zz",[[2.0,i,(i+1)%L] for i in range(L)]]],[],basis=bases[0],dtype=np.float64)
+			assert(n_entries(cache.cache_dir) == n+1)
+
+			# the basis is hashed once, equal bases have equal digests.
+			assert(all(b in _basis_digests for b in bases))
+			assert(_basis_digest(spin_basis_general(L,m=0.0)) == _basis_digests[bases[2]])
+			assert(_basis_digest(spin_basis_general(L,m=0.0)) != _basis_digests[bases[1]])
+
+			# bases with attributes which can not be hashed are never cached.
+			b = spin_basis_general(L,m=0.0)
+			b._user_data = object()
+			H5 = hamiltonian(static,[],basis=b,dtype=np.float64)
+			assert(n_entries(cache.cache_dir) == n+1)
+			np.testing.assert_allclose((H5-hamiltonian(static,[],basis=bases[2],dtype=np.float64)).toarray(),0,atol=1e-14)
+
+		# caching is disabled outside of the context.
+		H4 = hamiltonian([["zz",[[3.0,i,(i+1)%L] for i in range(L)]]],[],basis=bases[0],dtype=np.float64)
+		assert(n_entries(cache_dir) == n+1)
+finally:
+	shutil.rmtree(cache_dir)
+
+print("operator cache test passed!")
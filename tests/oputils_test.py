@@ -5,7 +5,7 @@ qspin_path = os.path.join(os.getcwd(),"../")
 sys.path.insert(0,qspin_path)
 
 from quspin.operators import hamiltonian
-from scipy.sparse import random,dia_matrix
+from scipy.sparse import random,dia_matrix,csr_matrix
 import numpy as np
 from itertools import product
 
@@ -30,6 +30,10 @@ for fmt in formats:
 			if fmt in ["csr","csc"]:
 			
 				A = (random(N,N,density=np.log(N)/N) + 1j*random(N,N,density=np.log(N)/N))
+				if i % 2 == 1: # a few dense rows, the number of nonzeros per row is unbalanced.
+					D = np.zeros((N,N))
+					D[:N//100,:] = np.random.uniform(-1,1,size=(N//100,N))
+					A = A + csr_matrix(D)
 				A = (A + A.H)/2.0
 				A = A.astype(dtype1).asformat(fmt)
 			else:
@@ -0,0 +1,84 @@
+from __future__ import print_function, division
+
+import sys,os
+quspin_path = os.path.join(os.getcwd(),"../")
+sys.path.insert(0,quspin_path)
+
+from quspin.basis import spin_basis_1d,spin_basis_general
+from quspin.operators import hamiltonian,symbolic_plans
+from itertools import product
+import numpy as np
+
+
+
+dtypes = [np.float32,np.float64,np.complex64,np.complex128]
+
+def eps(dtype):
+	return 100*np.finfo(dtype).eps
+
+
+def drive(t,Omega):
+	return np.cos(Omega*t)
+
+L = 6
+i = np.arange(L)
+t = (i+1)%L
+
+Jxy_list = [[0.5,i,(i+1)%L] for i in range(L)]
+
+def lists(W,op="z"):
+	Jzz_list = [[np.random.uniform(-W,W),i,(i+1)%L] for i in range(L)]
+	h_list = [[np.random.uniform(-W,W),i] for i in range(L)]
+	g_list = [[np.random.uniform(-W,W),i] for i in range(L)]
+
+	static = [["+-",Jxy_list],["-+",Jxy_list],["zz",Jzz_list],["z",h_list]]
+	dynamic = [[op,g_list,drive,[2.0]]]
+	return static,dynamic
+
+
+# the random couplings break the symmetries, both operators are projected onto the same symmetry sector.
+bases = [
+	(spin_basis_1d(L,m=0.0,kblock=0),"z"),
+	(spin_basis_general(L,m=0.0,kblock=(t,0)),"z"),
+	(spin_basis_general(L),"x"),
+]
+
+for (b,op),dtype in product(bases,dtypes):
+	plans = symbolic_plans()
+	for realization in range(4):
+		static,dynamic = lists(1.0,op)
+		with plans:
+			H = hamiltonian(static,dynamic,basis=b,dtype=dtype,check_symm=False)
+
+		assert(plans.n_plans == 2) # one static and one dynamic plan
+
+		H_ref = hamiltonian(static,dynamic,basis=b,dtype=dtype,check_symm=False)
+
+		assert(H.dtype == np.dtype(dtype))
+		for time in [0.0,0.3]:
+			np.testing.assert_allclose((H-H_ref).toarray(time=time),0,atol=eps(dtype))
+
+	# vanishing couplings drop terms which requires a new plan.
+	static,dynamic = lists(1.0,op)
+	static[-1][1][0][0] = 0.0
+	with plans:
+		H = hamiltonian(static,dynamic,basis=b,dtype=dtype,check_symm=False)
+
+	assert(plans.n_plans == 3)
+
+	H_ref = hamiltonian(static,dynamic,basis=b,dtype=dtype,check_symm=False)
+	np.testing.assert_allclose((H-H_ref).toarray(time=0.3),0,atol=eps(dtype))
+
+
+# complex matrix elements can not be stored in real matrices.
+b = spin_basis_general(L)
+for dtype in [np.float32,np.float64]:
+	with symbolic_plans():
+		try:
+			hamiltonian([["y",[[1.0,i] for i in range(L)]]],[],basis=b,dtype=dtype,check_herm=False)
+		except TypeError:
+			pass
+		else:
+			raise AssertionError("expecting TypeError for complex matrix elements.")
+
+print("symbolic plan test passed!")